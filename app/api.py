@@ -8,25 +8,46 @@ sys.path.append('.')
 
 from dotenv import load_dotenv
 import os
-from src.graph.graph_queries import GraphQueries
+from pathlib import Path
+from src.graph.backend import create_graph_queries, hub_limits_from_config
+from src.graph.autocomplete import autocomplete_path, load_autocomplete
+from src.utils.config_loader import ConfigLoader
 from src.embeddings.vector_store import VectorStore
 from src.rag.graph_traverser import GraphTraverser
 from src.rag.context_builder import ContextBuilder
 from src.rag.llm_interface import LLMInterface
 from src.extraction.entity_extractor import EntityExtractor
+from src.extraction.gazetteer import Gazetteer
 
 load_dotenv()
 
 app = FastAPI(title="Knowledge Graph RAG API")
 
-graph_queries = GraphQueries(
+config = ConfigLoader()
+graph_queries = create_graph_queries(
+    config,
     uri=os.getenv("NEO4J_URI"),
     user=os.getenv("NEO4J_USER"),
     password=os.getenv("NEO4J_PASSWORD")
 )
+autocomplete, autocomplete_mtime = None, None
 vector_store = VectorStore()
 llm = LLMInterface()
-entity_extractor = EntityExtractor()
+gazetteer = Gazetteer() if config.get('extraction.query_entities', 'gazetteer') == 'gazetteer' else None
+entity_extractor = EntityExtractor(gazetteer=gazetteer)
+
+def refresh_entity_indexes():
+    """Recharge l'autocomplétion si l'instantané a changé et n'applique au gazetteer que la différence."""
+    global autocomplete, autocomplete_mtime
+    path = Path(autocomplete_path(config))
+    mtime = path.stat().st_mtime if path.exists() else None
+    if mtime == autocomplete_mtime:
+        return
+    autocomplete, autocomplete_mtime = load_autocomplete(config), mtime
+    if gazetteer is not None and autocomplete is not None:
+        gazetteer.sync(autocomplete.entities())
+
+refresh_entity_indexes()
 
 class QuestionRequest(BaseModel):
     question: str
@@ -56,6 +77,7 @@ def read_root():
 def ask_question(request: QuestionRequest):
     """Endpoint principal pour poser une question."""
     try:
+        refresh_entity_indexes()
         entities_in_question = entity_extractor.extract_entities(request.question)
         entity_names = [e['text'] for e in entities_in_question]
         
@@ -69,7 +91,7 @@ def ask_question(request: QuestionRequest):
         
         vector_results = vector_store.search(request.question, top_k=request.top_k)
         
-        traverser = GraphTraverser(graph_queries)
+        traverser = GraphTraverser(graph_queries, hub_limits=hub_limits_from_config(config))
         graph_context = traverser.traverse_from_entities(entity_names, max_depth=request.max_depth)
         
         builder = ContextBuilder(max_context_length=12000)
@@ -99,6 +121,14 @@ def search_entity(request: EntitySearchRequest):
         raise HTTPException(status_code=404, detail="Entity not found")
     return entity_data
 
+@app.get("/entity/autocomplete")
+def autocomplete_entity(q: str, limit: int = 10, max_edits: Optional[int] = None):
+    """Complète un nom d'entité partiel ou mal orthographié (sans accents, par préfixe)."""
+    refresh_entity_indexes()
+    if autocomplete is None:
+        raise HTTPException(status_code=503, detail="Autocomplete index not built")
+    return {"query": q, "suggestions": autocomplete.complete(q, limit=limit, max_edits=max_edits)}
+
 @app.get("/entity/{entity_name}/neighbors")
 def get_entity_neighbors(entity_name: str, max_depth: int = 1):
     """Récupère les voisins d'une entité."""
@@ -123,9 +153,13 @@ def get_statistics():
             'documents': 0
         }
         
-        for etype in ['PERSON', 'ORG', 'GPE', 'DATE', 'EVENT', 'PRODUCT', 'LOC']:
-            entities = graph_queries.search_entities_by_type(etype, limit=1000)
-            stats['entities'] += len(entities) if entities else 0
+        counts = graph_queries.count_entities_by_type(['PERSON', 'ORG', 'GPE', 'DATE', 'EVENT', 'PRODUCT', 'LOC'])
+        stats['entities'] = sum(counts.values())
+        stats['entities_by_type'] = counts
+        if hasattr(graph_queries, 'filter_stats'):
+            stats['entity_filter'] = graph_queries.filter_stats()
+        if hasattr(graph_queries, 'cache_stats'):
+            stats['query_cache'] = graph_queries.cache_stats()
         
         return stats
     except Exception as e:
@@ -11,13 +11,16 @@ import traceback
 
 load_dotenv()
 
-from src.graph.graph_queries import GraphQueries
+from src.graph.backend import create_graph_queries, hub_limits_from_config
+from src.graph.autocomplete import load_autocomplete
+from src.utils.config_loader import ConfigLoader
 from src.embeddings.vector_store import VectorStore
 from src.rag.graph_traverser import GraphTraverser
 from src.rag.context_builder import ContextBuilder
 from src.rag.context_compactor import ContextCompactor
 from src.rag.llm_interface import LLMInterface
 from src.extraction.entity_extractor import EntityExtractor
+from src.extraction.gazetteer import Gazetteer
 
 st.set_page_config(
     page_title="Knowledge Graph RAG",
@@ -37,16 +40,24 @@ def init_components():
             st.info("Exécutez: python scripts/04_generate_embeddings.py")
             st.stop()
         
+        config = ConfigLoader()
+        autocomplete = load_autocomplete(config)
+        gazetteer = None
+        if config.get('extraction.query_entities', 'gazetteer') == 'gazetteer':
+            gazetteer = Gazetteer(autocomplete.entities() if autocomplete is not None else ())
         components = {
-            'graph_queries': GraphQueries(
+            'graph_queries': create_graph_queries(
+                config,
                 uri=os.getenv("NEO4J_URI"),
                 user=os.getenv("NEO4J_USER"),
                 password=os.getenv("NEO4J_PASSWORD")
             ),
             'vector_store': VectorStore(),
             'llm': LLMInterface(),
-            'entity_extractor': EntityExtractor(),
-            'compactor': ContextCompactor(max_tokens=100000)
+            'entity_extractor': EntityExtractor(gazetteer=gazetteer),
+            'compactor': ContextCompactor(max_tokens=100000),
+            'hub_limits': hub_limits_from_config(config),
+            'autocomplete': autocomplete
         }
         
         try:
@@ -72,6 +83,17 @@ if 'messages' not in st.session_state:
 if 'debug_mode' not in st.session_state:
     st.session_state.debug_mode = False
 
+def resolve_entity_names(names):
+    """Rattache les noms extraits (partiels, sans accents, avec fautes) aux noms du graphe."""
+    autocomplete = components['autocomplete']
+    if autocomplete is None:
+        return names
+    resolved = []
+    for name in names:
+        suggestions = autocomplete.complete(name, limit=1)
+        resolved.append(suggestions[0]['name'] if suggestions else name)
+    return list(dict.fromkeys(resolved))
+
 components = init_components()
 
 if components is None:
@@ -88,17 +110,31 @@ with st.sidebar:
     
     st.session_state.debug_mode = st.checkbox("Mode Debug", value=False)
     
+    st.markdown("---")
+    st.header("🔎 Entité ciblée")
+    
+    st.session_state.pinned_entity = None
+    if components['autocomplete'] is not None:
+        typed = st.text_input("Nom (autocomplétion)", placeholder="napoleon, pari...")
+        suggestions = components['autocomplete'].complete(typed, limit=8) if typed else []
+        if suggestions:
+            st.session_state.pinned_entity = st.selectbox(
+                "Suggestions", [s['name'] for s in suggestions],
+                help="Entité ajoutée en tête du parcours du graphe")
+        elif typed:
+            st.caption("Aucune entité correspondante.")
+    else:
+        st.caption("Index absent : python scripts/03_build_graph.py")
+    
     st.markdown("---")
     st.header("📊 Statistiques")
     
     if st.button("Rafraîchir les stats"):
         with st.spinner("Calcul des statistiques..."):
             try:
-                entity_types = {}
-                for etype in ['PERSON', 'ORG', 'GPE', 'DATE', 'EVENT', 'PRODUCT', 'LOC']:
-                    entities = components['graph_queries'].search_entities_by_type(etype, limit=100)
-                    if entities:
-                        entity_types[etype] = len(entities)
+                counts = components['graph_queries'].count_entities_by_type(
+                    ['PERSON', 'ORG', 'GPE', 'DATE', 'EVENT', 'PRODUCT', 'LOC'])
+                entity_types = {etype: count for etype, count in counts.items() if count}
                 
                 if entity_types:
                     st.write("**Entités par type:**")
@@ -133,7 +169,9 @@ if prompt := st.chat_input("Posez votre question..."):
             
             with st.spinner("Extraction des entités..."):
                 entities_in_question = components['entity_extractor'].extract_entities(prompt)
-                entity_names = [e['text'] for e in entities_in_question]
+                entity_names = resolve_entity_names([e['text'] for e in entities_in_question])
+                if st.session_state.pinned_entity:
+                    entity_names = list(dict.fromkeys([st.session_state.pinned_entity] + entity_names))
                 
                 if st.session_state.debug_mode:
                     st.info(f"Entités extraites: {entity_names}")
@@ -168,7 +206,7 @@ if prompt := st.chat_input("Posez votre question..."):
                     st.info(f"Résultats vectoriels: {len(vector_results)}")
             
             with st.spinner("Parcours du graphe..."):
-                traverser = GraphTraverser(components['graph_queries'])
+                traverser = GraphTraverser(components['graph_queries'], hub_limits=components['hub_limits'])
                 graph_context = traverser.traverse_from_entities(entity_names[:3], max_depth=max_depth)
                 
                 if st.session_state.debug_mode:
@@ -3,14 +3,12 @@
 import sys
 sys.path.append('.')
 
-from src.preprocessing.document_loader import DocumentLoader
-from src.preprocessing.text_cleaner import TextCleaner
-from pathlib import Path
+from src.pipeline.stages import PipelineContext, prepare_corpus, RAW_DIR, DOCUMENTS_FILE
+from src.utils.config_loader import ConfigLoader
 
 def main():
     # Configuration
-    raw_dir = Path("data/raw")
-    output_file = Path("data/processed/documents.json")
+    raw_dir = RAW_DIR
     
     print("="*60)
     print("Préparation du Corpus")
@@ -61,71 +59,14 @@ def main():
     
     print(f"\n✓ Traitement de {num_docs_to_process} document(s)")
     
-    # Charger les documents
-    print(f"\n{'='*60}")
-    print("Étape 1/3: Chargement des documents")
-    print("="*60)
-    
-    loader = DocumentLoader(raw_dir)
-    all_documents = loader.load_all_documents()
-    
-    # Limiter au nombre choisi
-    documents = all_documents[:num_docs_to_process]
-    
-    print(f"\n✓ Chargé: {len(documents)} documents (sur {len(all_documents)} disponibles)")
-    
-    if len(documents) == 0:
-        print("❌ Aucun document chargé! Vérifiez les fichiers.")
+    # Seuls les fichiers nouveaux ou modifiés depuis la dernière exécution sont relus et nettoyés
+    context = PipelineContext(ConfigLoader(), checkpoints=['prepare'])
+    try:
+        documents = prepare_corpus(context, raw_dir, limit=num_docs_to_process)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ {e}")
         return
     
-    # Nettoyer les textes
-    print(f"\n{'='*60}")
-    print("Étape 2/3: Nettoyage des textes")
-    print("="*60)
-    
-    cleaner = TextCleaner()
-    cleaned_count = 0
-    
-    for i, doc in enumerate(documents):
-        try:
-            original_length = len(doc['text'])
-            doc['text'] = cleaner.clean(doc['text'])
-            doc['paragraphs'] = cleaner.split_into_paragraphs(doc['text'])
-            cleaned_length = len(doc['text'])
-            
-            # Statistiques de nettoyage
-            reduction = 0
-            if original_length > 0:
-                reduction = ((original_length - cleaned_length) / original_length) * 100
-            
-            doc['cleaning_stats'] = {
-                'original_length': original_length,
-                'cleaned_length': cleaned_length,
-                'reduction_percent': reduction,
-                'num_paragraphs': len(doc['paragraphs'])
-            }
-            
-            cleaned_count += 1
-            
-            # Afficher la progression tous les 100 docs ou tous les 10% si moins de 100
-            progress_interval = min(100, max(1, len(documents) // 10))
-            if (i + 1) % progress_interval == 0 or (i + 1) == len(documents):
-                print(f"Progress: {i + 1}/{len(documents)} documents nettoyés...")
-                
-        except Exception as e:
-            print(f"⚠️  Erreur lors du nettoyage du document {doc.get('filename', 'unknown')}: {e}")
-            continue
-    
-    print(f"\n✓ Nettoyé: {cleaned_count}/{len(documents)} documents")
-    
-    # Sauvegarder
-    print(f"\n{'='*60}")
-    print("Étape 3/3: Sauvegarde")
-    print("="*60)
-    
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    loader.save_processed(documents, output_file)
-    
     # Statistiques finales
     total_chars = sum(len(doc['text']) for doc in documents)
     total_paragraphs = sum(len(doc.get('paragraphs', [])) for doc in documents)
@@ -136,9 +77,9 @@ def main():
     print(f"✅ Documents traités: {len(documents)}")
     print(f"📊 Caractères totaux: {total_chars:,}")
     print(f"📄 Paragraphes totaux: {total_paragraphs:,}")
-    print(f"💾 Sauvegardé dans: {output_file.absolute()}")
+    print(f"💾 Sauvegardé dans: {DOCUMENTS_FILE.absolute()}")
     print(f"\n📌 Prochain étape: python scripts/02_extract_entities.py")
     print("="*60)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,13 +3,42 @@
 import sys
 sys.path.append('.')
 
-import json
+import argparse
 import os
 from dotenv import load_dotenv
-from src.graph.graph_builder import GraphBuilder
-from pathlib import Path
+from src.graph.backend import create_graph_builder
+from src.pipeline.stages import (PipelineContext, build_graph, graph_plan, load_documents, load_extraction,
+                                 DOCUMENTS_FILE, ENTITIES_DIR, RELATIONS_DIR)
+from src.utils.config_loader import ConfigLoader
+
+def run_migration(config: ConfigLoader, title: str, migrate):
+    """Applique une migration à un graphe existant et affiche le nombre d'éléments convertis."""
+    print(f"\n{'='*60}")
+    print(title)
+    print("="*60)
+    
+    builder = create_graph_builder(config)
+    try:
+        migrated = migrate(builder)
+    finally:
+        builder.close()
+    
+    if not migrated:
+        print("\n✓ Rien à migrer pour ce backend")
+    for name, count in migrated.items():
+        print(f"  - {name}: {count:,}")
+    print("="*60)
 
 def main():
+    parser = argparse.ArgumentParser(description="Construction du graphe de connaissances")
+    parser.add_argument('--bulk-export', metavar='DIR', nargs='?', const='data/graph_import',
+                        help="génère des CSV pour neo4j-admin database import au lieu d'écrire dans Neo4j")
+    parser.add_argument('--migrate-relation-types', action='store_true',
+                        help="convertit les relations RELATES_TO d'un graphe existant en types natifs, puis s'arrête")
+    parser.add_argument('--migrate-entity-labels', action='store_true',
+                        help="ajoute les labels par type (:Person, :Gpe...) aux entités existantes, puis s'arrête")
+    args = parser.parse_args()
+    
     print("="*60)
     print("Construction du Graphe de Connaissances")
     print("="*60)
@@ -17,11 +46,21 @@ def main():
     # Charger les variables d'environnement
     load_dotenv()
     
+    if args.migrate_relation_types or args.migrate_entity_labels:
+        config = ConfigLoader()
+        if args.migrate_relation_types:
+            run_migration(config, "Migration vers les types de relation natifs",
+                          lambda builder: builder.migrate_relation_types())
+        if args.migrate_entity_labels:
+            run_migration(config, "Migration vers les labels par type d'entité",
+                          lambda builder: builder.migrate_entity_labels())
+        return
+    
     # Vérifier que les fichiers existent
     files_to_check = {
-        "documents": Path("data/processed/documents.json"),
-        "entities": Path("data/entities/entities.json"),
-        "relations": Path("data/relations/relations.json")
+        "documents": DOCUMENTS_FILE,
+        "entities": ENTITIES_DIR,
+        "relations": RELATIONS_DIR
     }
     
     missing_files = []
@@ -40,98 +79,73 @@ def main():
     
     # Charger les données avec UTF-8
     print(f"\n📂 Chargement des données...")
-    
-    print("  - Chargement des documents...")
-    with open("data/processed/documents.json", 'r', encoding='utf-8') as f:
-        documents = json.load(f)
-    print(f"    ✓ {len(documents)} documents chargés")
-    
-    print("  - Chargement des entités...")
-    with open("data/entities/entities.json", 'r', encoding='utf-8') as f:
-        entities = json.load(f)
-    
-    # Compter le total d'entités
+    config = ConfigLoader()
+    context = PipelineContext(config)
+    documents = load_documents(context)
+    extraction = load_extraction(context)
+    entities, relations = extraction['entities'], extraction['relations']
     total_entities = sum(len(doc['entities']) for doc in entities)
+    print(f"    ✓ {len(documents)} documents chargés")
     print(f"    ✓ {total_entities:,} entités chargées ({len(entities)} documents)")
-    
-    print("  - Chargement des relations...")
-    with open("data/relations/relations.json", 'r', encoding='utf-8') as f:
-        relations = json.load(f)
     print(f"    ✓ {len(relations):,} relations chargées")
     
-    # Vérifier la configuration Neo4j
-    print(f"\n{'='*60}")
-    print("Configuration Neo4j")
-    print("="*60)
-    
-    neo4j_uri = os.getenv("NEO4J_URI")
-    neo4j_user = os.getenv("NEO4J_USER")
-    neo4j_password = os.getenv("NEO4J_PASSWORD")
-    
-    if not all([neo4j_uri, neo4j_user, neo4j_password]):
-        print("\n❌ Configuration Neo4j manquante dans .env!")
-        print("Ajoutez ces variables dans votre fichier .env:")
-        print("  NEO4J_URI=bolt://localhost:7687")
-        print("  NEO4J_USER=neo4j")
-        print("  NEO4J_PASSWORD=votre_mot_de_passe")
-        return
-    
-    print(f"  URI: {neo4j_uri}")
-    print(f"  User: {neo4j_user}")
-    print(f"  Password: {'*' * len(neo4j_password)}")
+    clear = False
+    if not args.bulk_export and config.get('graph.backend', 'neo4j') == 'neo4j':
+        # Vérifier la configuration Neo4j
+        print(f"\n{'='*60}")
+        print("Configuration Neo4j")
+        print("="*60)
+        
+        neo4j_uri = os.getenv("NEO4J_URI")
+        neo4j_user = os.getenv("NEO4J_USER")
+        neo4j_password = os.getenv("NEO4J_PASSWORD")
+        
+        if not all([neo4j_uri, neo4j_user, neo4j_password]):
+            print("\n❌ Configuration Neo4j manquante dans .env!")
+            print("Ajoutez ces variables dans votre fichier .env:")
+            print("  NEO4J_URI=bolt://localhost:7687")
+            print("  NEO4J_USER=neo4j")
+            print("  NEO4J_PASSWORD=votre_mot_de_passe")
+            return
+        
+        print(f"  URI: {neo4j_uri}")
+        print(f"  User: {neo4j_user}")
+        print(f"  Password: {'*' * len(neo4j_password)}")
+        print(f"  Taille des lots: {config.get('graph.batch_size', 1000)}")
+        
+        # Sans suppression de documents, seuls les nouveaux ou modifiés sont écrits
+        plan = graph_plan(context, documents)
+        if plan['incremental'] and not plan['changed']:
+            print("\n✓ Graphe à jour: aucun document nouveau ou modifié depuis la dernière construction")
+            print(f"  (supprimez {context.manifest.path} pour forcer une reconstruction)")
+            return
+        
+        # Demander si on efface la base
+        print(f"\n{'='*60}")
+        print("Options")
+        print("="*60)
+        
+        response = input("\n⚠️  Effacer la base de données existante ? (y/n, défaut=n): ").strip().lower()
+        clear = response == 'y'
+        if clear:
+            print("\n💡 Pour une reconstruction complète, l'import hors ligne est beaucoup plus rapide:")
+            print("   python scripts/03_build_graph.py --bulk-export")
+        else:
+            print("\n➕ Ajout des données à la base existante")
+        print("\nCela peut prendre plusieurs minutes...")
     
-    # Connexion à Neo4j
-    print(f"\n🔌 Connexion à Neo4j...")
     try:
-        builder = GraphBuilder(
-            uri=neo4j_uri,
-            user=neo4j_user,
-            password=neo4j_password
-        )
-        print("✓ Connexion établie")
+        result = build_graph(context, documents, extraction, clear=clear, bulk_export_dir=args.bulk_export)
     except Exception as e:
-        print(f"\n❌ Erreur de connexion à Neo4j: {e}")
-        print("\nAssurez-vous que:")
+        print(f"\n❌ Erreur lors de la construction: {e}")
+        print("\nAvec Neo4j, assurez-vous que:")
         print("  1. Neo4j est installé et en cours d'exécution")
         print("  2. Les identifiants dans .env sont corrects")
         print("  3. Le port 7687 est accessible")
         return
-    
-    # Demander si on efface la base
-    print(f"\n{'='*60}")
-    print("Options")
-    print("="*60)
-    
-    response = input("\n⚠️  Effacer la base de données existante ? (y/n, défaut=n): ").strip().lower()
-    
-    if response == 'y':
-        print("\n🗑️  Effacement de la base...")
-        try:
-            builder.clear_database()
-            print("✓ Base effacée")
-        except Exception as e:
-            print(f"⚠️  Erreur lors de l'effacement: {e}")
-            builder.close()
-            return
-    else:
-        print("\n➕ Ajout des données à la base existante")
-    
-    # Construire le graphe
-    print(f"\n{'='*60}")
-    print("Construction du Graphe")
-    print("="*60)
-    print("\nCela peut prendre plusieurs minutes...")
-    
-    try:
-        builder.build_graph(entities, relations, documents)
-        print("\n✓ Graphe construit avec succès!")
-    except Exception as e:
-        print(f"\n❌ Erreur lors de la construction: {e}")
-        builder.close()
+    if result['mode'] in ('bulk_export', 'embedded'):
         return
     
-    builder.close()
-    
     # Résumé final
     print(f"\n{'='*60}")
     print("TERMINÉ!")
@@ -144,4 +158,4 @@ def main():
     print("="*60)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,120 +3,78 @@
 import sys
 sys.path.append('.')
 
-import subprocess
+import argparse
 from pathlib import Path
-
-def run_script(script_name):
-    """Exécute un script Python."""
-    print(f"\n{'='*60}")
-    print(f"Exécution de {script_name}")
-    print('='*60)
-    
-    try:
-        # Use utf-8 encoding for subprocess
-        result = subprocess.run(
-            ['python', script_name], 
-            check=True,
-            encoding='utf-8',
-            errors='replace'
-        )
-        return result.returncode == 0
-    except subprocess.CalledProcessError as e:
-        print(f"\n❌ Erreur lors de l'exécution de {script_name}")
-        print(f"Code de retour: {e.returncode}")
-        return False
-    except Exception as e:
-        print(f"\n❌ Erreur inattendue: {e}")
-        return False
+from dotenv import load_dotenv
+from src.pipeline.runner import PipelineRunner, default_stages
+from src.pipeline.stages import PipelineContext, RAW_DIR
+from src.utils.config_loader import ConfigLoader
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Pipeline complet (corpus → entités → graphe → embeddings) dans un seul processus, "
+                    "sans question interactive")
+    parser.add_argument('--stages', nargs='+', metavar='ÉTAPE',
+                        help="étapes à exécuter parmi prepare, extract, graph, embeddings (défaut: toutes) ; "
+                             "les sorties des étapes requises non sélectionnées sont relues depuis leur point de reprise")
+    parser.add_argument('--resume', action='store_true',
+                        help="reprend une exécution interrompue sans relancer les étapes déjà terminées")
+    parser.add_argument('--limit', type=int, help="nombre de documents de data/raw à traiter (défaut: tous)")
+    parser.add_argument('--clear-graph', action='store_true', help="efface la base Neo4j avant la construction")
+    parser.add_argument('--bulk-export', metavar='DIR', nargs='?', const='data/graph_import',
+                        help="génère des CSV pour neo4j-admin au lieu d'écrire dans Neo4j")
+    parser.add_argument('--checkpoints', nargs='*', metavar='ÉTAPE',
+                        help="étapes dont les sorties sont écrites sur disque (défaut: pipeline.checkpoints)")
+    args = parser.parse_args()
+    
     print("="*60)
     print("PIPELINE COMPLET - Knowledge Graph RAG")
     print("="*60)
     
-    # Vérifier que les répertoires de base existent
-    data_raw = Path("data/raw")
-    if not data_raw.exists():
-        print(f"\n❌ Le répertoire {data_raw} n'existe pas!")
-        print("\nVeuillez d'abord télécharger les données:")
-        print("  python scripts/00_load_data.py")
-        return
+    load_dotenv()
+    config = ConfigLoader()
+    context = PipelineContext(config, checkpoints=args.checkpoints)
+    runner = PipelineRunner(default_stages(limit=args.limit, clear_graph=args.clear_graph,
+                                           bulk_export_dir=args.bulk_export), context)
     
-    # Compter les fichiers
-    txt_files = list(data_raw.glob("*.txt"))
-    if len(txt_files) == 0:
-        print(f"\n❌ Aucun fichier trouvé dans {data_raw}!")
+    try:
+        order = runner.resolve(args.stages)
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        sys.exit(2)
+    
+    if 'prepare' in order and not any(RAW_DIR.glob("*.txt")):
+        print(f"\n❌ Aucun fichier trouvé dans {RAW_DIR}!")
         print("\nVeuillez d'abord télécharger les données:")
         print("  python scripts/00_load_data.py")
-        return
-    
-    print(f"\n✓ Trouvé {len(txt_files)} fichiers dans data/raw/")
-    
-    # Scripts à exécuter
-    scripts = [
-        ('01_prepare_corpus.py', 'Préparation du corpus'),
-        ('02_extract_entities.py', 'Extraction des entités et relations'),
-        ('03_build_graph.py', 'Construction du graphe Neo4j'),
-        ('04_generate_embeddings.py', 'Génération des embeddings')
-    ]
-    
-    print(f"\n📋 Pipeline à exécuter:")
-    for i, (script, desc) in enumerate(scripts, 1):
-        print(f"  {i}. {desc} ({script})")
+        sys.exit(1)
     
-    response = input("\n▶️  Lancer le pipeline complet? (y/n, défaut=y): ").strip().lower()
-    if response == 'n':
-        print("Pipeline annulé.")
-        return
+    print(f"\n📋 Étapes: {' → '.join(order)}")
+    print(f"💾 Points de reprise: {', '.join(sorted(context.checkpoints)) or 'aucun'}")
     
-    print("\n🚀 Démarrage du pipeline...\n")
-    
-    # Exécuter chaque script
-    for i, (script, desc) in enumerate(scripts, 1):
-        script_path = f'scripts/{script}'
-        
-        print(f"\n{'#'*60}")
-        print(f"# ÉTAPE {i}/{len(scripts)}: {desc}")
-        print(f"{'#'*60}")
-        
-        if not run_script(script_path):
-            print(f"\n❌ ÉCHEC à l'étape {i}/{len(scripts)}")
-            print(f"Script: {script}")
-            print(f"\nLe pipeline s'est arrêté. Corrigez l'erreur et relancez.")
-            return
-        
-        print(f"\n✓ Étape {i}/{len(scripts)} terminée avec succès")
+    try:
+        runner.run(order, resume=args.resume)
+    except Exception as e:
+        print(f"\n❌ ÉCHEC: {e}")
+        print("\nLe pipeline s'est arrêté. Corrigez l'erreur et relancez avec --resume.")
+        sys.exit(1)
     
     # Résumé final
     print(f"\n{'='*60}")
     print("PIPELINE TERMINÉ AVEC SUCCÈS! 🎉")
     print("="*60)
     
-    # Vérifier que tout est bien créé
     files_created = {
         "Documents traités": Path("data/processed/documents.json"),
-        "Entités extraites": Path("data/entities/entities.json"),
-        "Relations extraites": Path("data/relations/relations.json"),
+        "Entités extraites": Path("data/entities/columns"),
+        "Relations extraites": Path("data/relations/columns"),
         "Vector store": Path("chroma_db")
     }
     
-    print("\n📁 Fichiers créés:")
-    all_good = True
+    print("\n📁 Fichiers:")
     for name, filepath in files_created.items():
-        if filepath.exists():
-            if filepath.is_file():
-                size = filepath.stat().st_size / 1024 / 1024  # MB
-                print(f"  ✓ {name}: {filepath} ({size:.2f} MB)")
-            else:
-                print(f"  ✓ {name}: {filepath}")
-        else:
-            print(f"  ✗ {name}: {filepath} (manquant)")
-            all_good = False
-    
-    if all_good:
-        print("\n🎉 Tout est prêt!")
-    else:
-        print("\n⚠️  Certains fichiers sont manquants")
+        status = "✓" if filepath.exists() else "✗"
+        print(f"  {status} {name}: {filepath}")
     
     print(f"\n{'='*60}")
     print("PROCHAINES ÉTAPES")
@@ -125,11 +83,7 @@ def main():
     print("   streamlit run app/streamlit_app.py")
     print("\n2. Ou lancer l'API FastAPI:")
     print("   python app/api.py")
-    print("\n3. Tester une requête:")
-    print('   curl -X POST http://localhost:8000/ask \\')
-    print('     -H "Content-Type: application/json" \\')
-    print('     -d \'{"question": "Qui est Napoleon?"}\'')
     print("\n" + "="*60)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,88 @@
+# scripts/benchmark_cooccurrence.py
+
+"""
+Mesure l'extraction des co-occurrences sur un corpus synthétique (entités de loi
+de Zipf) : double boucle Python sur les paires de mentions (ancienne méthode),
+agrégation par partitions sur disque et produit matriciel creux XᵀX.
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import tempfile
+import time
+from collections import defaultdict
+from src.evaluation.synthetic_corpus import generate_synthetic_corpus
+from src.extraction.cooccurrence import CooccurrenceMatrix
+from src.extraction.external_aggregation import CooccurrenceAggregator
+
+
+def python_cooccurrence(entities_by_doc, min_strength):
+    """Ancienne méthode : toutes les paires de mentions de chaque document."""
+    entity_pairs = defaultdict(set)
+    for doc_entities in entities_by_doc:
+        mentions = doc_entities['entities']
+        seen_pairs = set()
+        for i, entity1 in enumerate(mentions):
+            for entity2 in mentions[i + 1:]:
+                e1, e2 = entity1['text'].lower(), entity2['text'].lower()
+                if e1 == e2:
+                    continue
+                pair = tuple(sorted([e1, e2]))
+                if pair not in seen_pairs:
+                    seen_pairs.add(pair)
+                    entity_pairs[pair].add(doc_entities['document_id'])
+    return [{'subject': e1, 'predicate': 'co_occurs_with', 'object': e2, 'method': 'cooccurrence',
+             'common_docs': list(docs), 'strength': len(docs)}
+            for (e1, e2), docs in entity_pairs.items() if len(docs) >= min_strength]
+
+
+def aggregated(engine, entities_by_doc, min_strength):
+    for doc_entities in entities_by_doc:
+        engine.add_document(doc_entities['document_id'], doc_entities['entities'])
+    return [relation for _, relation in sorted(engine.relations(min_strength=min_strength), key=lambda r: r[0])]
+
+
+def timed(label: str, func, reference: float = None):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    speedup = f"  (x{reference / elapsed:.1f})" if reference else ""
+    print(f"  {label:<28} {elapsed:>8.2f} s{speedup}")
+    return result, elapsed
+
+
+def normalized(relations):
+    return [dict(relation, common_docs=sorted(relation['common_docs'])) for relation in relations]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=100_000)
+    parser.add_argument('--mentions', type=int, default=20, help="Mentions par document")
+    parser.add_argument('--vocab', type=int, default=50_000)
+    parser.add_argument('--min-strength', type=int, default=3)
+    args = parser.parse_args()
+
+    entities, _, _ = generate_synthetic_corpus(args.docs, args.mentions, args.vocab)
+
+    print("=" * 60)
+    print(f"Co-occurrences - {len(entities):,} documents, {args.mentions} mentions/document")
+    print("=" * 60)
+
+    expected, reference = timed("double boucle Python", lambda: python_cooccurrence(entities, args.min_strength))
+    with tempfile.TemporaryDirectory() as workdir:
+        external, _ = timed("partitions sur disque", lambda: aggregated(
+            CooccurrenceAggregator(workdir), entities, args.min_strength), reference)
+    found, _ = timed("matrice creuse XᵀX", lambda: aggregated(
+        CooccurrenceMatrix(), entities, args.min_strength), reference)
+
+    print(f"\n✓ {len(found):,} relations (≥{args.min_strength} documents)")
+    for label, relations in (("partitions", external), ("matrice creuse", found)):
+        if normalized(relations) != normalized(expected):
+            print(f"⚠️  Résultats différents de la double boucle ({label})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# scripts/benchmark_entity_extraction.py
+
+"""
+Mesure le débit de la reconnaissance d'entités (documents/s) sur un corpus
+français synthétique : analyse document par document (`extract_entities`),
+puis `nlp.pipe` par lots sur 1, 2, 4 et 8 processus (`iter_entities`).
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import time
+from src.evaluation.synthetic_corpus import generate_french_texts
+from src.extraction.entity_extractor import EntityExtractor, DEFAULT_MODEL
+
+
+def timed(label: str, func, count: int):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {count / elapsed:>8.1f} docs/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=2000)
+    parser.add_argument('--sentences', type=int, default=20, help="Phrases par document")
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    args = parser.parse_args()
+
+    documents = generate_french_texts(args.docs, args.sentences)
+    extractor = EntityExtractor(args.model, batch_size=args.batch_size)
+
+    print("=" * 60)
+    print(f"Reconnaissance d'entités - {len(documents):,} documents ({args.model})")
+    print("=" * 60)
+
+    reference = timed("document par document", lambda: [
+        (doc['filename'], extractor.extract_entities(doc['text'], doc_id=doc['filename'])) for doc in documents
+    ], len(documents))
+
+    for n_process in args.processes:
+        found = timed(f"nlp.pipe, {n_process} processus", lambda: list(
+            extractor.iter_entities(documents, n_process=n_process)), len(documents))
+        if found != reference:
+            print(f"  ⚠️  Résultats différents de l'analyse document par document ({n_process} processus)")
+
+
+if __name__ == '__main__':
+    main()
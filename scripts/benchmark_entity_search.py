@@ -0,0 +1,96 @@
+# scripts/benchmark_entity_search.py
+
+"""
+Mesure la recherche de noms d'entités à grande échelle : index de trigrammes
+(backend mémoire), FTS5 trigram (backend SQLite) et balayage `CONTAINS`, puis
+l'autocomplétion (construction, chargement de l'instantané, préfixes et fautes).
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from src.graph.autocomplete import AutocompleteIndex
+from src.graph.sqlite_backend import text_search
+from src.graph.text_index import TrigramIndex, fold, query_terms
+
+FIRST = ['Jean', 'Marie', 'Élise', 'François', 'Hélène', 'Louis', 'Cécile', 'André', 'Zoé', 'Noël']
+LAST = ['Dupont', 'Lefèvre', 'Moreau', 'Girard', 'Bérénger', 'Rousseau', 'Mercier', 'Faure', 'Chevalier']
+
+
+def synthetic_names(n: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [f"{rng.choice(FIRST)} {rng.choice(LAST)}-{rng.randrange(10 ** 7):07d}" for _ in range(n)]
+
+
+def timed(label: str, func, queries):
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    print(f"  {label:<24} {(time.perf_counter() - start) / len(queries) * 1000:>8.2f} ms/requête")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entities', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    names = synthetic_names(args.entities)
+    rng = random.Random(2)
+    queries = [name.split('-')[1][:5] for name in rng.sample(names, args.queries)]
+    queries += [f"qui est {fold(name.split('-')[0])} ?" for name in rng.sample(names, args.queries)]
+
+    print("=" * 60)
+    print(f"Recherche de noms - {len(names):,} entités")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    index = TrigramIndex(names)
+    print(f"  Index trigrammes: {time.perf_counter() - start:.1f}s")
+
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE VIRTUAL TABLE entity_search USING fts5(folded, tokenize = 'trigram')")
+    start = time.perf_counter()
+    conn.executemany("INSERT INTO entity_search (rowid, folded) VALUES (?, ?)",
+                     ((i, fold(name)) for i, name in enumerate(names)))
+    print(f"  Index FTS5:       {time.perf_counter() - start:.1f}s\n")
+
+    folded = index.folded
+
+    def scan(query):
+        terms = query_terms(query)
+        return [i for i, text in enumerate(folded) if any(term in text for term in terms)][:10]
+
+    timed('TrigramIndex', lambda query: index.search(query, 10), queries)
+    timed('FTS5 trigram', lambda query: text_search(conn, 'entity_search', query, 10), queries)
+    timed('Balayage (CONTAINS)', scan, queries[:20])
+
+    print("\nAutocomplétion")
+    start = time.perf_counter()
+    autocomplete = AutocompleteIndex(names, weights=[rng.random() for _ in names])
+    print(f"  Construction:     {time.perf_counter() - start:.1f}s")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'autocomplete.npz'
+        autocomplete.save(path)
+        start = time.perf_counter()
+        autocomplete = AutocompleteIndex.load(path)
+        print(f"  Chargement:       {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"({path.stat().st_size / 1e6:.0f} Mo)\n")
+
+    prefixes = [fold(name)[:rng.randint(3, 12)] for name in rng.sample(names, args.queries)]
+    typos = []
+    for prefix in prefixes:
+        k = rng.randrange(1, len(prefix) - 1)
+        typos.append(prefix[:k - 1] + prefix[k] + prefix[k - 1] + prefix[k + 1:])
+    timed('Préfixe', lambda query: autocomplete.complete(query, 10), prefixes)
+    timed('Préfixe avec faute', lambda query: autocomplete.complete(query, 10), typos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# scripts/benchmark_graph_queries.py
+
+"""
+Mesure la latence des méthodes de GraphQueries sur un backend embarqué
+(mémoire CSR ou SQLite).
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from src.graph.memory_backend import MemoryGraphBuilder, MemoryGraphQueries
+from src.graph.sqlite_backend import SQLiteGraphBuilder, SQLiteGraphQueries
+from src.evaluation.synthetic_corpus import generate_synthetic_corpus
+
+
+def time_calls(func, args_list, repeat: int = 1) -> float:
+    """Latence moyenne par appel, en microsecondes."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for args in args_list:
+            func(*args)
+    return (time.perf_counter() - start) / (len(args_list) * repeat) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=2000)
+    parser.add_argument('--mentions', type=int, default=30)
+    parser.add_argument('--vocab', type=int, default=20000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--backend', choices=['memory', 'sqlite'], default='memory')
+    args = parser.parse_args()
+
+    entities, relations, documents = generate_synthetic_corpus(args.docs, args.mentions, args.vocab)
+
+    print("=" * 60)
+    print(f"Benchmark des requêtes - backend {args.backend}")
+    print("=" * 60)
+
+    tmp = tempfile.TemporaryDirectory()
+    if args.backend == 'memory':
+        builder, load = MemoryGraphBuilder(tmp.name), MemoryGraphQueries.load
+        path = tmp.name
+    else:
+        path = Path(tmp.name) / 'graph.sqlite'
+        builder, load = SQLiteGraphBuilder(path), SQLiteGraphQueries
+
+    start = time.perf_counter()
+    stats = builder.build_graph(entities, relations, documents)
+    builder.close()
+    print(f"  Construction: {time.perf_counter() - start:.2f}s  {stats}")
+
+    start = time.perf_counter()
+    queries = load(path)
+    queries.find_entity('')
+    print(f"  Ouverture:    {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    queries.search_by_query('')
+    print(f"  Index texte:  {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    rng = random.Random(1)
+    all_names = sorted({e['text'] for doc in entities for e in doc['entities']})
+    names = rng.sample(all_names, min(args.queries, len(all_names)))
+    pairs = list(zip(names, reversed(names)))
+
+    benchmarks = [
+        ('find_entity', queries.find_entity, [(n,) for n in names]),
+        ('get_entity_with_documents', queries.get_entity_with_documents, [(n, 3) for n in names]),
+        ('get_related_entities', queries.get_related_entities, [(n, 5) for n in names]),
+        ('get_neighbors (depth 1)', queries.get_neighbors, [(n, 1, 5) for n in names]),
+        ('get_neighbors (depth 2)', queries.get_neighbors, [(n, 2, 5) for n in names]),
+        ('get_neighbors_bounded (depth 2)', queries.get_neighbors_bounded, [(n, 2, 5) for n in names]),
+        ('find_path', queries.find_path, pairs[:100]),
+        ('search_entities_by_type', queries.search_entities_by_type, [('GPE', 10)] * 100),
+        ('search_by_query', queries.search_by_query, [(n, 10) for n in names]),
+    ]
+
+    print(f"\n{'Méthode':<32} {'µs/appel':>12}")
+    for name, func, calls in benchmarks:
+        print(f"{name:<32} {time_calls(func, calls):>12.1f}")
+
+    queries.close()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
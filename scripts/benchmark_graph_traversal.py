@@ -0,0 +1,118 @@
+# scripts/benchmark_graph_traversal.py
+
+"""
+Compare le parcours de GraphTraverser appel par appel (trois requêtes par entité de
+départ) et en un seul appel groupé (expand_entities).
+
+Le backend est un substitut local : le graphe synthétique est servi par le moteur
+en mémoire, et chaque appel simule la latence d'un aller-retour Bolt. Le résultat
+compte des allers-retours simulés ; il ne chronomètre pas Neo4j (le texte Cypher de
+la requête groupée est vérifié par tests/test_graph.py).
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import random
+import tempfile
+import time
+from src.graph.backend import GraphQueriesBackend
+from src.graph.memory_backend import MemoryGraphBuilder, MemoryGraphQueries
+from src.rag.graph_traverser import GraphTraverser
+from src.evaluation.synthetic_corpus import generate_synthetic_corpus
+
+
+class StandInQueries(GraphQueriesBackend):
+    """Substitut d'un moteur distant : chaque appel coûte un aller-retour simulé (pause fixe)."""
+
+    def __init__(self, inner: GraphQueriesBackend, latency_ms: float = 1.0):
+        self.inner = inner
+        self.latency = latency_ms / 1000
+        self.round_trips = 0
+
+    def _round_trip(self):
+        self.round_trips += 1
+        time.sleep(self.latency)
+
+    def get_entity_with_documents(self, entity_name: str, limit_docs: int = 5):
+        self._round_trip()
+        return self.inner.get_entity_with_documents(entity_name, limit_docs)
+
+    def get_related_entities(self, entity_name: str, limit: int = 10, relation_types=None):
+        self._round_trip()
+        return self.inner.get_related_entities(entity_name, limit, relation_types)
+
+    def get_neighbors(self, entity_name: str, max_depth: int = 1, limit: int = 10, relation_types=None):
+        self._round_trip()
+        return self.inner.get_neighbors(entity_name, max_depth, limit, relation_types)
+
+    def get_neighbors_bounded(self, entity_name: str, max_depth: int = 2, limit: int = 10, **hub_limits):
+        self._round_trip()
+        return self.inner.get_neighbors_bounded(entity_name, max_depth, limit, **hub_limits)
+
+    def expand_entities(self, entity_names, max_depth=1, limit_docs=3, limit_related=5, limit_neighbors=5,
+                        hub_limits=None):
+        self._round_trip()
+        return self.inner.expand_entities(entity_names, max_depth, limit_docs, limit_related, limit_neighbors,
+                                          hub_limits)
+
+    def document_text(self, doc_id: str, max_chars: int = None) -> str:
+        return self.inner.document_text(doc_id, max_chars)
+
+
+def run(traverser: GraphTraverser, questions, max_depth: int, batched: bool):
+    start = time.perf_counter()
+    contexts = [traverser.traverse_from_entities(names, max_depth=max_depth, batched=batched)
+                for names in questions]
+    return time.perf_counter() - start, contexts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=500)
+    parser.add_argument('--mentions', type=int, default=30)
+    parser.add_argument('--vocab', type=int, default=5000)
+    parser.add_argument('--questions', type=int, default=50)
+    parser.add_argument('--max-depth', type=int, default=2)
+    parser.add_argument('--latency-ms', type=float, default=1.0)
+    args = parser.parse_args()
+
+    entities, relations, documents = generate_synthetic_corpus(args.docs, args.mentions, args.vocab)
+
+    tmp = tempfile.TemporaryDirectory()
+    builder = MemoryGraphBuilder(tmp.name)
+    builder.build_graph(entities, relations, documents)
+    builder.close()
+    queries = StandInQueries(MemoryGraphQueries.load(tmp.name), latency_ms=args.latency_ms)
+    traverser = GraphTraverser(queries)
+
+    rng = random.Random(1)
+    all_names = sorted({e['text'] for doc in entities for e in doc['entities']})
+    questions = [rng.sample(all_names, 5) for _ in range(args.questions)]
+
+    print("=" * 60)
+    print("Benchmark du parcours du graphe")
+    print("=" * 60)
+    print(f"  {args.questions} questions x 5 entités, profondeur {args.max_depth}, "
+          f"latence simulée {args.latency_ms} ms par aller-retour")
+    print("  Moteur en mémoire derrière une latence fixe : compte les allers-retours simulés,")
+    print("  ne mesure pas Neo4j (coût des requêtes côté serveur non inclus)")
+
+    results = {}
+    for mode, batched in (('appel par appel', False), ('appel groupé', True)):
+        queries.round_trips = 0
+        elapsed, contexts = run(traverser, questions, args.max_depth, batched)
+        results[mode] = (elapsed, contexts)
+        print(f"\n{mode}: {elapsed / args.questions * 1000:.1f} ms/question, "
+              f"{queries.round_trips / args.questions:.0f} allers-retours/question")
+
+    same = results['appel par appel'][1] == results['appel groupé'][1]
+    print(f"\nContextes identiques: {'oui' if same else 'NON'}")
+    print(f"⚡ Accélération simulée: x{results['appel par appel'][0] / results['appel groupé'][0]:.1f} "
+          f"(allers-retours simulés, pas Neo4j)")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
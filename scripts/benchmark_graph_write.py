@@ -0,0 +1,127 @@
+# scripts/benchmark_graph_write.py
+
+"""
+Compare l'écriture ligne par ligne et l'écriture par lots UNWIND de GraphBuilder.
+
+Par défaut, le graphe est un substitut local qui simule la latence d'un aller-retour
+Bolt; avec --neo4j, le benchmark utilise la base configurée dans .env (elle est effacée).
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import os
+import tempfile
+import time
+from src.graph.graph_builder import GraphBuilder
+from src.evaluation.synthetic_corpus import generate_synthetic_corpus
+
+
+class _StandInResult:
+    def consume(self):
+        return None
+
+    def single(self):
+        return None
+
+    def __iter__(self):
+        return iter(())
+
+
+class StandInSession:
+    """Session qui compte les allers-retours et simule leur latence."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def run(self, query, parameters=None, **kwargs):
+        params = dict(parameters or {}, **kwargs)
+        self.driver.round_trips += 1
+        self.driver.rows += len(params.get('rows', [None]))
+        time.sleep(self.driver.latency + self.driver.row_cost * len(params.get('rows', [None])))
+        return _StandInResult()
+
+    def execute_write(self, func, *args, **kwargs):
+        return func(self, *args, **kwargs)
+
+
+class StandInDriver:
+    """Substitut local du driver Neo4j (latence fixe par requête + coût par ligne)."""
+
+    def __init__(self, latency_ms: float = 0.5, row_cost_us: float = 20.0):
+        self.latency = latency_ms / 1000
+        self.row_cost = row_cost_us / 1_000_000
+        self.round_trips = 0
+        self.rows = 0
+
+    def session(self, **kwargs):
+        return StandInSession(self)
+
+    def close(self):
+        pass
+
+
+def run(builder: GraphBuilder, entities, relations, documents, batched: bool) -> float:
+    start = time.perf_counter()
+    builder.build_graph(entities, relations, documents, batched=batched)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=200)
+    parser.add_argument('--mentions', type=int, default=30, help="mentions par document")
+    parser.add_argument('--vocab', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--latency-ms', type=float, default=0.5)
+    parser.add_argument('--row-cost-us', type=float, default=20.0)
+    parser.add_argument('--neo4j', action='store_true', help="utiliser la base Neo4j de .env")
+    args = parser.parse_args()
+
+    entities, relations, documents = generate_synthetic_corpus(args.docs, args.mentions, args.vocab)
+    total_rows = len(documents) + 2 * sum(len(e['entities']) for e in entities) + len(relations)
+
+    print("=" * 60)
+    print("Benchmark d'écriture du graphe")
+    print("=" * 60)
+    print(f"  Documents: {len(documents):,} | Mentions: {total_rows - len(documents) - len(relations):,} "
+          f"(entités + liens) | Relations: {len(relations):,}")
+
+    results = {}
+    store_dir = tempfile.TemporaryDirectory()
+    for mode, batched in (('ligne par ligne', False), ('lots UNWIND', True)):
+        if args.neo4j:
+            from dotenv import load_dotenv
+            load_dotenv()
+            builder = GraphBuilder(os.getenv("NEO4J_URI"), os.getenv("NEO4J_USER"),
+                                   os.getenv("NEO4J_PASSWORD"), batch_size=args.batch_size,
+                                   document_store_path=store_dir.name)
+            builder.clear_database()
+        else:
+            builder = GraphBuilder(None, None, None, batch_size=args.batch_size,
+                                   driver=StandInDriver(latency_ms=args.latency_ms,
+                                                       row_cost_us=args.row_cost_us),
+                                   document_store_path=store_dir.name)
+
+        elapsed = run(builder, entities, relations, documents, batched)
+        round_trips = getattr(builder.driver, 'round_trips', None)
+        builder.close()
+
+        results[mode] = elapsed
+        print(f"\n{mode}: {elapsed:.2f}s ({total_rows / elapsed:,.0f} lignes/s)"
+              + (f", {round_trips:,} allers-retours" if round_trips is not None else ""))
+
+    store_dir.cleanup()
+    speedup = results['ligne par ligne'] / results['lots UNWIND']
+    print(f"\n⚡ Accélération: x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ sys.path.append('.')
 import os
 from pathlib import Path
 from dotenv import load_dotenv
-import json
+from src.utils.manifest import PipelineManifest
 
 def check_files():
     """Check if required data files exist."""
@@ -20,28 +20,24 @@ def check_files():
     
     files = {
         "Documents traités": "data/processed/documents.json",
-        "Entités extraites": "data/entities/entities.json",
-        "Relations extraites": "data/relations/relations.json",
+        "Entités extraites": "data/entities/columns",
+        "Relations extraites": "data/relations/columns",
         "Vector store (ChromaDB)": "chroma_db",
     }
     
+    # Comptes lus dans le manifeste du pipeline, sans charger les artefacts
+    manifest = PipelineManifest()
+    
     all_good = True
     for name, filepath in files.items():
         path = Path(filepath)
         if path.exists():
-            if path.is_file():
-                try:
-                    # Try to load JSON files
-                    if filepath.endswith('.json'):
-                        with open(path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        count = len(data)
-                        print(f"  ✓ {name}: {count:,} items")
-                    else:
-                        size = path.stat().st_size / 1024 / 1024
-                        print(f"  ✓ {name}: {size:.2f} MB")
-                except Exception as e:
-                    print(f"  ⚠️  {name}: exists but error reading ({e})")
+            count = manifest.artifact_count(path)
+            if count is not None:
+                print(f"  ✓ {name}: {count:,} items")
+            elif path.is_file():
+                size = path.stat().st_size / 1024 / 1024
+                print(f"  ✓ {name}: {size:.2f} MB (absent du manifeste, relancez l'étape qui le produit)")
             else:
                 print(f"  ✓ {name}: directory exists")
         else:
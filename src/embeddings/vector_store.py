@@ -1,14 +1,19 @@
 # src/embeddings/vector_store.py
 
 import chromadb
+import hashlib
 from typing import List, Dict
 import json
 
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
 class VectorStore:
     """Gestion du stockage vectoriel avec ChromaDB."""
     
-    def __init__(self, collection_name: str = "kg_entities", persist_directory: str = "./chroma_db"):
-        """Initialize ChromaDB client and collection."""
+    def __init__(self, collection_name: str = "kg_entities", persist_directory: str = "./chroma_db",
+                 model=None):
+        """Initialize ChromaDB client and collection (`model` : encodeur déjà chargé, partagé)."""
+        self._model = model
         # Use PersistentClient for newer ChromaDB versions
         try:
             self.client = chromadb.PersistentClient(path=persist_directory)
@@ -32,12 +37,18 @@ class VectorStore:
             print(f"Warning: Could not set metadata: {e}")
             self.collection = self.client.get_or_create_collection(name=collection_name)
     
+    @property
+    def model(self):
+        """Encodeur sentence-transformers, chargé une seule fois par instance."""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            print(f"  Chargement du modèle d'embeddings...")
+            self._model = SentenceTransformer(EMBEDDING_MODEL)
+        return self._model
+    
     def add_entities(self, entities: List[Dict]):
         """Ajoute des entités au store vectoriel."""
-        from sentence_transformers import SentenceTransformer
-        
-        print(f"  Chargement du modèle d'embeddings...")
-        model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+        model = self.model
         
         # Préparer les données
         texts = [e['text'] for e in entities]
@@ -80,12 +91,46 @@ class VectorStore:
         
         print(f"  ✓ {len(entities)} entités ajoutées au vector store")
     
+    @staticmethod
+    def entity_id(entity: Dict) -> str:
+        """Identifiant stable d'une entité (nom et type), pour les mises à jour incrémentales."""
+        key = f"{entity.get('label', 'unknown')}\x1f{entity['text']}"
+        return 'entity_' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    
+    def upsert_entities(self, entities: List[Dict]) -> int:
+        """Ajoute ou remplace des entités (une par nom et type) sans toucher au reste du store."""
+        unique = {}
+        for entity in entities:
+            unique.setdefault(self.entity_id(entity), entity)
+        if not unique:
+            return 0
+        
+        ids = list(unique)
+        texts = [unique[i]['text'] for i in ids]
+        embeddings = self.model.encode(texts, show_progress_bar=False).tolist()
+        metadatas = [
+            {
+                'text': unique[i]['text'],
+                'label': unique[i].get('label', 'unknown'),
+                'start': str(unique[i].get('start', 0)),
+                'end': str(unique[i].get('end', 0))
+            }
+            for i in ids
+        ]
+        
+        batch_size = 1000
+        for i in range(0, len(ids), batch_size):
+            self.collection.upsert(
+                embeddings=embeddings[i:i + batch_size],
+                documents=texts[i:i + batch_size],
+                metadatas=metadatas[i:i + batch_size],
+                ids=ids[i:i + batch_size]
+            )
+        return len(ids)
+    
     def search(self, query: str, top_k: int = 10) -> List[Dict]:
         """Recherche les entités similaires."""
-        from sentence_transformers import SentenceTransformer
-        
-        model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
-        query_embedding = model.encode([query]).tolist()
+        query_embedding = self.model.encode([query]).tolist()
         
         try:
             results = self.collection.query(
@@ -0,0 +1,68 @@
+# src/evaluation/synthetic_corpus.py
+
+import random
+from itertools import accumulate
+from typing import List, Dict, Tuple
+
+LABELS = ["PERSON", "ORG", "GPE", "DATE"]
+
+def generate_synthetic_corpus(num_docs: int, mentions_per_doc: int, vocab_size: int,
+                              seed: int = 0) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """Génère (entities, relations, documents) au format de 02_extract_entities.py.
+
+    Les entités suivent une loi de Zipf, comme sur Wikipédia : quelques entités
+    très fréquentes (« France », « 2017 ») et une longue traîne.
+    """
+    rng = random.Random(seed)
+    vocab = [(f"Entité {i}", LABELS[i % len(LABELS)]) for i in range(vocab_size)]
+    weights = list(accumulate(1.0 / (rank + 1) for rank in range(vocab_size)))
+
+    documents, entities = [], []
+    for d in range(num_docs):
+        filename = f"wiki_{d:05d}.txt"
+        text = f"# Document {d}\n" + "Lorem ipsum dolor sit amet. " * 40
+        documents.append({'filename': filename, 'path': f"data/raw/{filename}", 'text': text})
+
+        doc_entities = []
+        for name, label in rng.choices(vocab, cum_weights=weights, k=mentions_per_doc):
+            start = rng.randrange(0, len(text) - 20)
+            doc_entities.append({'text': name, 'label': label, 'start': start, 'end': start + len(name)})
+        entities.append({'document_id': filename, 'entities': doc_entities, 'text': text})
+
+    relations = []
+    for _ in range(num_docs * 2):
+        a, b = rng.choices(vocab, cum_weights=weights, k=2)
+        if a == b:
+            continue
+        if rng.random() < 0.5:
+            relations.append({'subject': a[0], 'predicate': 'co_occurs_with', 'object': b[0],
+                              'method': 'cooccurrence', 'common_docs': [], 'strength': rng.randint(2, 10)})
+        else:
+            relations.append({'subject': a[0], 'predicate': 'near', 'object': b[0],
+                              'method': 'proximity', 'distance': rng.randint(0, 150)})
+    return entities, relations, documents
+
+PEOPLE = ["Victor Hugo", "Marie Curie", "Charles de Gaulle", "Simone Veil", "Louis Pasteur", "Jeanne d'Arc"]
+PLACES = ["Paris", "Lyon", "Marseille", "Bordeaux", "la Bretagne", "l'Alsace", "Toulouse"]
+ORGS = ["l'Académie française", "le CNRS", "l'Institut Pasteur", "la SNCF", "l'Assemblée nationale"]
+SENTENCES = [
+    "{person} est né à {place} en {year}.",
+    "En {year}, {person} rejoint {org} après plusieurs années passées à {place}.",
+    "{org} a ouvert un nouveau centre à {place} au mois de mai {year}.",
+    "Selon {person}, la ville de {place} a profondément changé depuis {year}.",
+    "Les archives de {org} conservent de nombreuses lettres de {person}.",
+]
+
+def generate_french_texts(num_docs: int, sentences_per_doc: int = 20, seed: int = 0) -> List[Dict]:
+    """Documents en français ({'filename', 'path', 'text'}) avec personnes, lieux,
+    organisations et dates, pour mesurer l'analyse spaCy."""
+    rng = random.Random(seed)
+    documents = []
+    for d in range(num_docs):
+        filename = f"wiki_{d:05d}.txt"
+        sentences = [rng.choice(SENTENCES).format(person=rng.choice(PEOPLE), place=rng.choice(PLACES),
+                                                  org=rng.choice(ORGS), year=rng.randint(1800, 2020))
+                     for _ in range(sentences_per_doc)]
+        text = f"# Document {d}\n" + " ".join(s[0].upper() + s[1:] for s in sentences)
+        documents.append({'filename': filename, 'path': f"data/raw/{filename}", 'text': text})
+    return documents
@@ -0,0 +1,147 @@
+# src/extraction/cooccurrence.py
+
+"""
+Co-occurrences de documents par produit matriciel creux : X (documents × entités
+normalisées) vaut 1 quand le document cite l'entité, et XᵀX donne pour chaque
+paire le nombre de documents communs. Seules les paires d'au moins `min_strength`
+documents sont ensuite matérialisées en relations.
+"""
+
+import math
+from array import array
+from pathlib import Path
+from typing import List, Dict, Iterator, Tuple
+import numpy as np
+from scipy import sparse
+from ..utils.columnar import StringDictionary
+
+FLUSH_ENTRIES = 1 << 20
+
+
+class CooccurrenceMatrix:
+    """Mêmes relations que l'ancienne double boucle de `extract_cooccurrence_relations`, dans
+    le même ordre (première apparition de la paire) et avec le même sujet (nom le plus
+    petit) ; les documents communs sont donnés dans l'ordre des documents, dont les
+    identifiants sont supposés uniques.
+
+    Chaque document n'ajoute qu'une entrée (document, entité) par entité distincte, dans
+    l'ordre de première mention ; avec `workdir`, ces entrées sont écrites sur disque au
+    fil de l'eau. Le calcul charge toutefois la table d'incidence et XᵀX en mémoire
+    (proportionnelle au nombre d'entrées et de paires distinctes) : pour une mémoire
+    bornée, voir CooccurrenceAggregator.
+    """
+
+    def __init__(self, workdir: str | Path = None, block_docs: int = 4096):
+        self.workdir = Path(workdir) if workdir else None
+        self.block_docs = block_docs
+        self.names = StringDictionary()
+        self.documents = StringDictionary()
+        self.entries = array('i')
+
+    def _path(self) -> Path:
+        return self.workdir / 'incidence.bin'
+
+    def add_document(self, doc_id: str, entities: List[Dict]):
+        """Entités distinctes (normalisées) du document, dans l'ordre de première mention."""
+        doc = self.documents.encode(doc_id)
+        seen = set()
+        for entity in entities:
+            name = entity['text'].lower()
+            if name not in seen:
+                seen.add(name)
+                self.entries.extend((doc, self.names.encode(name)))
+        if self.workdir is not None and len(self.entries) >= FLUSH_ENTRIES:
+            self.flush()
+
+    def flush(self):
+        if self.workdir is not None and self.entries:
+            with open(self._path(), 'ab') as f:
+                self.entries.tofile(f)
+            self.entries = array('i')
+
+    def _incidence(self) -> np.ndarray:
+        """Entrées (document, entité), une ligne par entrée, dans l'ordre d'ajout."""
+        self.flush()
+        entries = np.frombuffer(self.entries, dtype=np.intc)
+        if self.workdir is not None and self._path().exists():
+            entries = np.fromfile(self._path(), dtype=np.intc)
+            self._path().unlink()
+        return entries.reshape(-1, 2)
+
+    def _frequent_pairs(self, docs: np.ndarray, entity_ids: np.ndarray, keys: np.ndarray):
+        """(paire fréquente, document, rang) de chaque apparition d'une paire de `keys`
+        (a * nombre d'entités + b, a < b, trié), bloc de documents par bloc ; le rang suit
+        l'ordre de la double boucle (document, première mention, seconde mention)."""
+        num_names = len(self.names)
+        doc_starts = np.flatnonzero(np.r_[True, docs[1:] != docs[:-1]])
+        doc_ends = np.r_[doc_starts[1:], len(docs)]
+        found, seen = [], 0
+        for block in range(0, len(doc_starts), self.block_docs):
+            starts, ends = doc_starts[block:block + self.block_docs], doc_ends[block:block + self.block_docs]
+            # Paires (i, j), i < j, des entrées de chaque document
+            entry = np.arange(starts[0], ends[-1])
+            partners = np.repeat(ends, ends - starts) - entry - 1
+            left = np.repeat(entry, partners)
+            run_starts = np.cumsum(partners) - partners
+            right = left + 1 + np.arange(len(left)) - np.repeat(run_starts, partners)
+            a, b = entity_ids[left].astype(np.int64), entity_ids[right].astype(np.int64)
+            pair_keys = np.minimum(a, b) * num_names + np.maximum(a, b)
+            pair = np.minimum(np.searchsorted(keys, pair_keys), len(keys) - 1)
+            frequent = np.flatnonzero(keys[pair] == pair_keys)
+            found.append((pair[frequent], docs[left[frequent]], seen + frequent))
+            seen += len(left)
+        return [np.concatenate(column) for column in zip(*found)]
+
+    def relations(self, min_strength: int = 2, scores: bool = False) -> Iterator[Tuple[int, Dict]]:
+        """(rang de première apparition, relation) des paires présentes dans au moins
+        `min_strength` documents, dans l'ordre. Avec `scores`, chaque relation porte aussi
+        son information mutuelle ponctuelle (`pmi`) et sa version normalisée (`npmi`)."""
+        entries = self._incidence()
+        num_docs, num_names = len(self.documents), len(self.names)
+        docs, entity_ids = entries[:, 0], entries[:, 1]
+        incidence = sparse.csr_matrix((np.ones(len(entries), dtype=np.int32), (docs, entity_ids)),
+                                      shape=(num_docs, num_names))
+        document_frequency = np.asarray(incidence.sum(axis=0)).ravel()
+        counts = (incidence.T @ incidence).tocoo()
+        keep = (counts.row < counts.col) & (counts.data >= min_strength)
+        keys = counts.row[keep].astype(np.int64) * num_names + counts.col[keep]
+        del counts, incidence
+        if not len(keys):
+            return
+        order = np.argsort(keys)
+        keys = keys[order]
+
+        # Documents communs des seules paires fréquentes, groupés par paire dans l'ordre d'apparition
+        pair, pair_docs, seq = self._frequent_pairs(docs, entity_ids, keys)
+        grouped = np.lexsort((seq, pair))
+        pair, pair_docs, seq = pair[grouped], pair_docs[grouped], seq[grouped]
+        starts = np.flatnonzero(np.r_[True, pair[1:] != pair[:-1]])
+        ends = np.r_[starts[1:], len(pair)]
+
+        names, documents = self.names.values, self.documents.values
+        group_keys, pair_docs = keys[pair[starts]].tolist(), pair_docs.tolist()
+        starts, ends = starts.tolist(), ends.tolist()
+        for rank, group in enumerate(np.argsort(seq[starts], kind='stable').tolist()):
+            start, end, key = starts[group], ends[group], group_keys[group]
+            a, b = names[key // num_names], names[key % num_names]
+            if a > b:
+                a, b = b, a
+            relation = {
+                'subject': a,
+                'predicate': 'co_occurs_with',
+                'object': b,
+                'method': 'cooccurrence',
+                'common_docs': [documents[d] for d in pair_docs[start:end]],
+                'strength': end - start
+            }
+            if scores:
+                relation.update(association_scores(end - start, int(document_frequency[key // num_names]),
+                                                   int(document_frequency[key % num_names]), num_docs))
+            yield rank, relation
+
+
+def association_scores(count: int, frequency_a: int, frequency_b: int, num_docs: int) -> Dict[str, float]:
+    """PMI et NPMI d'une paire vue dans `count` documents sur `num_docs`."""
+    pmi = math.log(count * num_docs / (frequency_a * frequency_b))
+    joint = -math.log(count / num_docs)
+    return {'pmi': pmi, 'npmi': pmi / joint if joint > 0 else 1.0}
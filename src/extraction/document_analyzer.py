@@ -0,0 +1,174 @@
+# src/extraction/document_analyzer.py
+
+import json
+import secrets
+from collections import defaultdict
+from pathlib import Path
+from typing import List, Dict, Iterable, Iterator, Tuple
+from .entity_extractor import EntityExtractor
+from .relation_extractor import RelationExtractor
+from ..preprocessing.text_splitter import TextSplitter
+
+INDEX_FILE = 'index.json'
+
+
+class DocBinStore:
+    """Documents spaCy analysés, sérialisés en `DocBin` (fichiers `.spacy` par lots) pour
+    ne plus les ré-analyser. `index.json` associe chaque document à (fichier, position) ;
+    une écriture n'est visible qu'après `close`, qui supprime les fichiers devenus inutiles."""
+
+    def __init__(self, path: str | Path, shard_size: int = 1000):
+        self.path = Path(path)
+        self.shard_size = shard_size
+        index_path = self.path / INDEX_FILE
+        self.index = json.loads(index_path.read_text(encoding='utf-8')) if index_path.exists() else {}
+        self._run = secrets.token_hex(4)
+        self._pending = None
+        self._pending_ids = []
+        self._written = {}
+        self._shards = []
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.index
+
+    def add(self, doc_id: str, doc):
+        """Ajoute un `Doc` analysé (écrit par lots de `shard_size`)."""
+        from spacy.tokens import DocBin
+
+        if self._pending is None:
+            self._pending = DocBin()
+        self._pending.add(doc)
+        self._pending_ids.append(doc_id)
+        if len(self._pending_ids) >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending_ids:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        shard = f"docs-{self._run}-{len(self._shards):05d}.spacy"
+        self._pending.to_disk(self.path / shard)
+        self._shards.append(shard)
+        for position, doc_id in enumerate(self._pending_ids):
+            self._written[doc_id] = [shard, position]
+        self._pending, self._pending_ids = None, []
+
+    def close(self, keep: Iterable[str] = None):
+        """Publie les documents ajoutés ; des anciennes entrées, garde celles de `keep` (toutes par défaut)."""
+        self.flush()
+        if keep is not None:
+            keep = set(keep)
+            self.index = {doc_id: entry for doc_id, entry in self.index.items() if doc_id in keep}
+        self.index.update(self._written)
+        self._written, self._shards = {}, []
+        if not self.path.exists():
+            return
+        tmp = self.path / (INDEX_FILE + '.tmp')
+        tmp.write_text(json.dumps(self.index, ensure_ascii=False), encoding='utf-8')
+        tmp.replace(self.path / INDEX_FILE)
+        used = {shard for shard, _ in self.index.values()}
+        for shard in self.path.glob('docs-*.spacy'):
+            if shard.name not in used:
+                shard.unlink()
+
+    def abort(self):
+        """Abandonne les documents ajoutés depuis le dernier `close`."""
+        for shard in self._shards:
+            (self.path / shard).unlink(missing_ok=True)
+        self._pending, self._pending_ids, self._written, self._shards = None, [], {}, []
+
+    def docs(self, vocab, doc_ids: Iterable[str] = None) -> Iterator[Tuple[str, object]]:
+        """(doc_id, Doc) des documents publiés (ou de `doc_ids`), fichier par fichier."""
+        from spacy.tokens import DocBin
+
+        by_shard = defaultdict(list)
+        for doc_id in (self.index if doc_ids is None else doc_ids):
+            if doc_id in self.index:
+                shard, position = self.index[doc_id]
+                by_shard[shard].append((position, doc_id))
+        for shard, entries in by_shard.items():
+            docs = list(DocBin().from_disk(self.path / shard).get_docs(vocab))
+            for position, doc_id in sorted(entries):
+                yield doc_id, docs[position]
+
+
+class DocumentAnalyzer:
+    """Analyse unique : un seul `Doc` spaCy par document donne les entités, les relations
+    de dépendance et les phrases. Le modèle est celui du registre du processus, partagé
+    par les extracteurs d'entités et de relations."""
+
+    def __init__(self, entity_extractor: EntityExtractor = None, relation_extractor: RelationExtractor = None,
+                 store: DocBinStore = None):
+        self.entity_extractor = entity_extractor or EntityExtractor()
+        self.relation_extractor = relation_extractor or RelationExtractor(self.entity_extractor.model_name)
+        self.store = store
+
+    @property
+    def nlp(self):
+        return self.entity_extractor.nlp
+
+    def analyze_doc(self, doc, doc_id: str = None, offset: int = 0) -> Dict:
+        """Entités, relations et phrases (débuts et fins en caractères) d'un `Doc` déjà
+        analysé ; `offset` (début du chunk dans le document) ramène les positions à celles
+        du document."""
+        entities = self.entity_extractor.entities_from_doc(doc, doc_id)
+        for entity in entities:
+            entity['start'] += offset
+            entity['end'] += offset
+        return {
+            'document_id': doc_id,
+            'entities': entities,
+            'relations': self.relation_extractor.relations_from_doc(doc),
+            'sentences': [(sent.start_char + offset, sent.end_char + offset) for sent in doc.sents]
+        }
+
+    def analyze(self, text: str, doc_id: str = None) -> Dict:
+        """Analyse un texte (voir `analyze_doc`)."""
+        return self.analyze_doc(self.nlp(text), doc_id)
+
+    def iter_analyses(self, documents: Iterable[Dict], chunk_chars: int = None, batch_size: int = None,
+                      n_process: int = None) -> Iterator[Tuple[str, Dict]]:
+        """(doc_id, analyse) de chaque document, dans l'ordre d'entrée, via `nlp.pipe`.
+
+        Avec `chunk_chars`, les textes sont découpés entre deux phrases (TextSplitter) en
+        chunks d'au plus `chunk_chars` caractères, analysés par lots comme des textes
+        distincts, puis réassemblés avec les positions du document : la mémoire d'un appel
+        au modèle est bornée et `nlp.max_length` n'est jamais atteint. Les `Doc` (réunis
+        par `Doc.from_docs`) sont ajoutés au `store` s'il y en a un.
+        """
+        splitter = TextSplitter(chunk_size=chunk_chars, overlap=0) if chunk_chars else None
+
+        def chunks():
+            for doc in documents:
+                text = doc['text']
+                spans = splitter.sentence_spans(text) if splitter else [(0, len(text))]
+                for n, (start, end) in enumerate(spans):
+                    yield text[start:end], (doc.get('filename', 'unknown'), start, n == len(spans) - 1)
+
+        analysis, parts = None, []
+        for parsed, (doc_id, offset, last) in self.nlp.pipe(
+                chunks(), as_tuples=True, batch_size=batch_size or self.entity_extractor.batch_size,
+                n_process=n_process or self.entity_extractor.n_process):
+            part = self.analyze_doc(parsed, doc_id, offset)
+            if analysis is None:
+                analysis = part
+            else:
+                for key in ('entities', 'relations', 'sentences'):
+                    analysis[key].extend(part[key])
+            if self.store is not None:
+                parts.append(parsed)
+            if last:
+                if self.store is not None:
+                    self.store.add(doc_id, parts[0] if len(parts) == 1 else merge_docs(parts))
+                yield doc_id, analysis
+                analysis, parts = None, []
+
+
+def merge_docs(parts: List) -> object:
+    """`Doc` unique des chunks consécutifs d'un document (texte identique à l'original)."""
+    from spacy.tokens import Doc
+
+    return Doc.from_docs(parts, ensure_whitespace=False)
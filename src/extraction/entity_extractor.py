@@ -1,19 +1,65 @@
 # src/extraction/entity_extractor.py
 
-import spacy
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Iterable, Iterator, Tuple
 from collections import defaultdict
+from .gazetteer import Gazetteer
+from .nlp_models import load_model
+
+DEFAULT_MODEL = "fr_core_news_lg"
+DEFAULT_ENTITY_TYPES = ["PERSON", "ORG", "GPE", "DATE", "EVENT", "PRODUCT", "LOC"]
+
+# Composants inutiles à la reconnaissance d'entités, désactivés en mode lot
+NER_DISABLED = ["parser", "lemmatizer", "morphologizer", "attribute_ruler"]
 
 class EntityExtractor:
-    """Extrait les entités nommées du texte."""
+    """Extrait les entités nommées du texte.
+    
+    Avec un gazetteer (entités du graphe), les entités connues sont détectées sans
+    spaCy ; le modèle n'est chargé et utilisé qu'en repli, si aucune n'est trouvée.
+    """
     
-    def __init__(self, model_name: str = "fr_core_news_lg", entity_types: List[str] = None):
-        self.nlp = spacy.load(model_name)
-        self.entity_types = entity_types or ["PERSON", "ORG", "GPE", "DATE", "EVENT", "PRODUCT", "LOC"]
+    def __init__(self, model_name: str = DEFAULT_MODEL, entity_types: List[str] = None,
+                 gazetteer: Gazetteer = None, batch_size: int = 64, n_process: int = 1):
+        self.model_name = model_name
+        self.gazetteer = gazetteer
+        self._nlp = load_model(model_name) if gazetteer is None else None
+        self.entity_types = entity_types or list(DEFAULT_ENTITY_TYPES)
+        self.batch_size = batch_size
+        self.n_process = n_process
+    
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self._nlp = load_model(self.model_name)
+        return self._nlp
+    
+    def detect_known_entities(self, text: str, doc_id: str = None) -> List[Dict]:
+        """Entités du graphe citées dans le texte (`text` = nom dans le graphe)."""
+        entities = []
+        for match in self.gazetteer.find(text):
+            if match['label'] in self.entity_types:
+                entity = {
+                    'text': match['name'],
+                    'label': match['label'],
+                    'start': match['start'],
+                    'end': match['end']
+                }
+                if doc_id:
+                    entity['doc_id'] = doc_id
+                entities.append(entity)
+        return entities
     
     def extract_entities(self, text: str, doc_id: str = None) -> List[Dict]:
         """Extrait les entités d'un texte."""
-        doc = self.nlp(text)
+        if self.gazetteer is not None:
+            entities = self.detect_known_entities(text, doc_id)
+            if entities:
+                return entities
+        
+        return self.entities_from_doc(self.nlp(text), doc_id)
+    
+    def entities_from_doc(self, doc, doc_id: str = None) -> List[Dict]:
+        """Entités retenues d'un `Doc` spaCy déjà analysé."""
         entities = []
         
         for ent in doc.ents:
@@ -30,6 +76,26 @@ class EntityExtractor:
         
         return entities
     
+    def iter_entities(self, documents: Iterable[Dict], batch_size: int = None,
+                      n_process: int = None) -> Iterator[Tuple[str, List[Dict]]]:
+        """(doc_id, entités) de chaque document, dans l'ordre d'entrée et au fil de l'eau.
+        
+        Les textes passent par `nlp.pipe` par lots de `batch_size`, sur `n_process`
+        processus, sans les composants inutiles à la NER (NER_DISABLED).
+        """
+        if self.gazetteer is not None:
+            for doc in documents:
+                doc_id = doc.get('filename', 'unknown')
+                yield doc_id, self.extract_entities(doc['text'], doc_id=doc_id)
+            return
+        
+        disabled = [name for name in NER_DISABLED if name in self.nlp.pipe_names]
+        texts = ((doc['text'], doc.get('filename', 'unknown')) for doc in documents)
+        for parsed, doc_id in self.nlp.pipe(texts, as_tuples=True, disable=disabled,
+                                            batch_size=batch_size or self.batch_size,
+                                            n_process=n_process or self.n_process):
+            yield doc_id, self.entities_from_doc(parsed, doc_id)
+    
     def extract_and_normalize(self, text: str) -> Dict[str, Set[str]]:
         """Extrait et normalise les entités par type."""
         entities = self.extract_entities(text)
@@ -42,12 +108,10 @@ class EntityExtractor:
         return dict(normalized)
     
     def extract_from_documents(self, documents: List[Dict]) -> List[Dict]:
-        """Extrait les entités de plusieurs documents."""
+        """Extrait les entités de plusieurs documents (par lots, voir `iter_entities`)."""
         results = []
         
-        for doc in documents:
-            doc_id = doc.get('filename', 'unknown')
-            entities = self.extract_entities(doc['text'], doc_id=doc_id)
+        for doc, (doc_id, entities) in zip(documents, self.iter_entities(documents)):
             results.append({
                 'document_id': doc_id,
                 'entities': entities,
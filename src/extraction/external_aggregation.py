@@ -0,0 +1,158 @@
+# src/extraction/external_aggregation.py
+
+"""
+Agrégations hors mémoire de l'extraction des relations : les enregistrements sont
+répartis par hachage dans des fichiers de partition, puis chaque partition est
+agrégée seule. La mémoire dépend de la taille d'une partition et du vocabulaire
+des entités, pas de la taille du corpus.
+"""
+
+import heapq
+import json
+import zlib
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Iterator, Tuple, Callable
+from ..utils.columnar import StringDictionary
+
+PAIR_DTYPE = np.dtype([('a', '<i4'), ('b', '<i4'), ('doc', '<i4'), ('seq', '<i8')])
+FLUSH_RECORDS = 1 << 16
+
+
+class CooccurrenceAggregator:
+    """Co-occurrences de documents (mêmes relations que `extract_cooccurrence_relations`) :
+    les paires (entité, entité, document) sont écrites par partition puis comptées
+    partition par partition."""
+
+    def __init__(self, workdir: str | Path, partitions: int = 64):
+        self.workdir = Path(workdir)
+        self.partitions = partitions
+        self.names = StringDictionary()
+        self.documents = StringDictionary()
+        self.buffers = [[] for _ in range(partitions)]
+        self.buffered = 0
+        self.seq = 0
+
+    def _path(self, p: int) -> Path:
+        return self.workdir / f'cooccurrence-{p:04d}.bin'
+
+    def add_document(self, doc_id: str, entities: List[Dict]):
+        """Paires d'entités distinctes (normalisées) du document, dans l'ordre de première apparition."""
+        doc = self.documents.encode(doc_id)
+        names = [entity['text'].lower() for entity in entities]
+        seen_pairs = set()
+        for i, e1 in enumerate(names):
+            for e2 in names[i + 1:]:
+                if e1 == e2:
+                    continue
+                pair = (e1, e2) if e1 < e2 else (e2, e1)
+                if pair in seen_pairs:
+                    continue
+                seen_pairs.add(pair)
+                a, b = self.names.encode(pair[0]), self.names.encode(pair[1])
+                self.buffers[(a * 1000003 + b) % self.partitions].append((a, b, doc, self.seq))
+                self.seq += 1
+        self.buffered += len(seen_pairs)
+        if self.buffered >= FLUSH_RECORDS:
+            self.flush()
+
+    def flush(self):
+        for p, buffer in enumerate(self.buffers):
+            if buffer:
+                with open(self._path(p), 'ab') as f:
+                    f.write(np.array(buffer, dtype=PAIR_DTYPE).tobytes())
+                buffer.clear()
+        self.buffered = 0
+
+    def relations(self, min_strength: int = 2) -> Iterator[Tuple[int, Dict]]:
+        """(rang de première apparition, relation) des paires présentes dans au moins
+        `min_strength` documents, partition par partition."""
+        self.flush()
+        names, documents = self.names.values, self.documents.values
+        for p in range(self.partitions):
+            path = self._path(p)
+            if not path.exists():
+                continue
+            pairs = np.fromfile(path, dtype=PAIR_DTYPE)
+            path.unlink()
+            pairs = pairs[np.lexsort((pairs['seq'], pairs['b'], pairs['a']))]
+            starts = np.flatnonzero(np.r_[True, (pairs['a'][1:] != pairs['a'][:-1])
+                                          | (pairs['b'][1:] != pairs['b'][:-1])])
+            counts = np.diff(np.r_[starts, len(pairs)])
+            for start, count in zip(starts[counts >= min_strength].tolist(), counts[counts >= min_strength].tolist()):
+                pair = pairs[start]
+                yield int(pair['seq']), {
+                    'subject': names[pair['a']],
+                    'predicate': 'co_occurs_with',
+                    'object': names[pair['b']],
+                    'method': 'cooccurrence',
+                    'common_docs': [documents[d] for d in pairs['doc'][start:start + count].tolist()],
+                    'strength': count
+                }
+
+
+class ExternalDeduplicator:
+    """Déduplication hors mémoire : les relations sont réparties par clé normalisée,
+    chaque partition est dédupliquée dans l'ordre d'arrivée (`merge` fusionne les
+    doublons dans la première occurrence), puis les partitions sont fusionnées
+    dans l'ordre global."""
+
+    def __init__(self, workdir: str | Path, key: Callable[[Dict], Tuple], merge: Callable[[Dict, Dict], None],
+                 partitions: int = 64):
+        self.workdir = Path(workdir)
+        self.key = key
+        self.merge = merge
+        self.partitions = partitions
+        self.buffers = [[] for _ in range(partitions)]
+        self.buffered = 0
+        self.count = 0
+
+    def _path(self, p: int, kind: str = 'in') -> Path:
+        return self.workdir / f'dedup-{kind}-{p:04d}.jsonl'
+
+    def add(self, order, relation: Dict):
+        """Ajoute une relation ; `order` (comparable, sérialisable en JSON) fixe son rang global."""
+        p = zlib.crc32(json.dumps(self.key(relation), ensure_ascii=False).encode('utf-8')) % self.partitions
+        self.buffers[p].append(json.dumps([order, relation], ensure_ascii=False))
+        self.count += 1
+        self.buffered += 1
+        if self.buffered >= FLUSH_RECORDS:
+            self.flush()
+
+    def flush(self):
+        for p, buffer in enumerate(self.buffers):
+            if buffer:
+                with open(self._path(p), 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(buffer) + '\n')
+                buffer.clear()
+        self.buffered = 0
+
+    def _deduplicate_partition(self, p: int) -> Path:
+        with open(self._path(p), 'r', encoding='utf-8') as f:
+            records = sorted((json.loads(line) for line in f), key=lambda record: record[0])
+        self._path(p).unlink()
+        seen = {}
+        for order, relation in records:
+            key = self.key(relation)
+            if key in seen:
+                self.merge(seen[key][1], relation)
+            else:
+                seen[key] = (order, relation)
+        run = self._path(p, 'run')
+        with open(run, 'w', encoding='utf-8') as f:
+            for record in seen.values():
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return run
+
+    @staticmethod
+    def _read_run(path: Path) -> Iterator:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Relations dédupliquées, dans l'ordre de leur première occurrence."""
+        self.flush()
+        runs = [self._deduplicate_partition(p) for p in range(self.partitions) if self._path(p).exists()]
+        for _, relation in heapq.merge(*(self._read_run(run) for run in runs), key=lambda record: record[0]):
+            yield relation
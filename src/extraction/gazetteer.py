@@ -0,0 +1,148 @@
+# src/extraction/gazetteer.py
+
+import unicodedata
+from collections import deque
+from typing import List, Dict, Iterable, Sequence, Tuple
+from ..graph.text_index import STOPWORDS
+
+MIN_NAME_LENGTH = 2
+
+
+def fold_with_offsets(text: str) -> Tuple[str, Sequence[int]]:
+    """Texte replié (minuscules, sans accents) et, pour chaque caractère, sa position d'origine."""
+    if text.isascii():
+        return text.lower(), range(len(text))
+    chars, offsets = [], []
+    for i, c in enumerate(text):
+        for f in unicodedata.normalize('NFKD', c.lower()):
+            if not unicodedata.combining(f):
+                chars.append(f)
+                offsets.append(i)
+    return ''.join(chars), offsets
+
+
+class Gazetteer:
+    """Automate d'Aho-Corasick sur les noms d'entités du graphe, repliés.
+
+    Détecte en une passe toutes les occurrences, garde les plus longues (sans
+    chevauchement) et seulement aux frontières de mots. Les ajouts et retraits
+    modifient le trie en place ; les liens d'échec sont recalculés à la recherche
+    suivante.
+    """
+
+    def __init__(self, entities: Iterable[Tuple[str, str]] = ()):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [-1]
+        self.keyword = [None]
+        self.entities = {}
+        self._dirty = False
+        self.add(entities)
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    @staticmethod
+    def key(name: str) -> str:
+        return fold_with_offsets(name)[0].strip()
+
+    def add(self, entities: Iterable[Tuple[str, str]]) -> int:
+        """Ajoute des (nom, type) ; un nom déjà présent (une fois replié) garde sa première entité."""
+        added = 0
+        for name, entity_type in entities:
+            key = self.key(name)
+            if len(key) < MIN_NAME_LENGTH or key in STOPWORDS or key in self.entities:
+                continue
+
+            node = 0
+            for c in key:
+                child = self.goto[node].get(c)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[node][c] = child
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(-1)
+                    self.keyword.append(None)
+                node = child
+            self.keyword[node] = key
+            self.entities[key] = {'name': name, 'label': entity_type}
+            added += 1
+        self._dirty = self._dirty or added > 0
+        return added
+
+    def remove(self, names: Iterable[str]) -> int:
+        """Retire des noms ; les nœuds restent dans le trie mais ne produisent plus de correspondance."""
+        removed = 0
+        for name in names:
+            key = self.key(name)
+            if self.entities.pop(key, None) is None:
+                continue
+            node = 0
+            for c in key:
+                node = self.goto[node][c]
+            self.keyword[node] = None
+            removed += 1
+        self._dirty = self._dirty or removed > 0
+        return removed
+
+    def sync(self, entities: Iterable[Tuple[str, str]]) -> Dict[str, int]:
+        """Aligne l'automate sur l'ensemble courant des entités du graphe, en n'appliquant que la différence."""
+        wanted = {}
+        for name, entity_type in entities:
+            wanted.setdefault(self.key(name), (name, entity_type))
+        removed = self.remove([self.entities[key]['name'] for key in list(self.entities) if key not in wanted])
+        added = self.add(value for key, value in wanted.items() if key not in self.entities)
+        return {'added': added, 'removed': removed}
+
+    def _link(self):
+        """Liens d'échec et de sortie (suffixe le plus long qui est un nom), en largeur d'abord."""
+        queue = deque()
+        for child in self.goto[0].values():
+            self.fail[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            fail = self.fail[node]
+            self.output[node] = fail if self.keyword[fail] is not None else self.output[fail]
+            for c, child in self.goto[node].items():
+                state = fail
+                while state and c not in self.goto[state]:
+                    state = self.fail[state]
+                target = self.goto[state].get(c, 0)
+                self.fail[child] = target if target != child else 0
+                queue.append(child)
+        self._dirty = False
+
+    def find(self, text: str) -> List[Dict]:
+        """Entités connues citées dans le texte : plus longues d'abord, sans chevauchement, dans l'ordre."""
+        if self._dirty:
+            self._link()
+
+        folded, offsets = fold_with_offsets(text)
+        goto, fail, output, keyword = self.goto, self.fail, self.output, self.keyword
+        matches = []
+        node = 0
+        for end, c in enumerate(folded, 1):
+            while node and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            hit = node if keyword[node] is not None else output[node]
+            while hit > 0:
+                start = end - len(keyword[hit])
+                if ((start == 0 or not folded[start - 1].isalnum())
+                        and (end == len(folded) or not folded[end].isalnum())):
+                    matches.append((start, end, keyword[hit]))
+                hit = output[hit]
+
+        entities = []
+        last_end = 0
+        for start, end, key in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+            if start < last_end:
+                continue
+            entity = dict(self.entities[key])
+            entity['start'] = offsets[start]
+            entity['end'] = offsets[end - 1] + 1
+            entities.append(entity)
+            last_end = end
+        return entities
@@ -0,0 +1,28 @@
+# src/extraction/nlp_models.py
+
+import threading
+from typing import Dict
+
+_models: Dict[str, object] = {}
+_lock = threading.Lock()
+
+
+def load_model(model_name: str):
+    """Modèle spaCy partagé par tout le processus : chargé une seule fois par nom."""
+    with _lock:
+        if model_name not in _models:
+            import spacy
+            _models[model_name] = spacy.load(model_name)
+        return _models[model_name]
+
+
+def loaded_models() -> list:
+    """Noms des modèles déjà chargés dans ce processus."""
+    with _lock:
+        return list(_models)
+
+
+def clear_models():
+    """Libère les modèles chargés (tests, changement de configuration)."""
+    with _lock:
+        _models.clear()
@@ -1,18 +1,29 @@
 # src/extraction/relation_extractor.py
 
-import spacy
 from typing import List, Dict, Set, Tuple
 from collections import defaultdict
+from .nlp_models import load_model
 
 class RelationExtractor:
     """Extrait les relations entre entités avec déduplication intelligente."""
     
-    def __init__(self):
-        self.nlp = spacy.load("fr_core_news_lg")
+    def __init__(self, model_name: str = "fr_core_news_lg"):
+        self.model_name = model_name
+        self._nlp = None
+    
+    @property
+    def nlp(self):
+        """Modèle spaCy, chargé au premier usage (co-occurrence et proximité n'en ont pas besoin)."""
+        if self._nlp is None:
+            self._nlp = load_model(self.model_name)
+        return self._nlp
     
     def extract_with_dependencies(self, text: str) -> List[Dict]:
         """Extrait les relations via les dépendances syntaxiques."""
-        doc = self.nlp(text)
+        return self.relations_from_doc(self.nlp(text))
+    
+    def relations_from_doc(self, doc) -> List[Dict]:
+        """Relations de dépendance d'un `Doc` spaCy déjà analysé."""
         relations = []
         
         for token in doc:
@@ -60,67 +71,39 @@ class RelationExtractor:
                 seen[key] = rel
                 deduplicated.append(rel)
             else:
-                # Fusionner les informations (ex: augmenter strength)
-                existing = seen[key]
-                if 'strength' in rel:
-                    existing['strength'] = existing.get('strength', 1) + 1
-                if 'common_docs' in rel:
-                    existing_docs = set(existing.get('common_docs', []))
-                    new_docs = set(rel.get('common_docs', []))
-                    existing['common_docs'] = list(existing_docs | new_docs)
+                self.merge_relation(seen[key], rel)
         
         return deduplicated
     
-    def extract_cooccurrence_relations(self, entities_by_doc: List[Dict], min_strength: int = 2) -> List[Dict]:
-        """Extrait uniquement les co-occurrences significatives (≥2 documents)."""
-        entity_docs = defaultdict(list)
-        
-        for doc_entities in entities_by_doc:
-            doc_id = doc_entities['document_id']
-            seen_in_doc = set()
-            
-            for entity in doc_entities['entities']:
-                entity_key = (entity['text'].lower(), entity['label'])
-                if entity_key not in seen_in_doc:
-                    entity_docs[entity_key].append(doc_id)
-                    seen_in_doc.add(entity_key)
+    @staticmethod
+    def merge_relation(existing: Dict, rel: Dict):
+        """Fusionne un doublon dans la première occurrence (ex: augmenter strength)."""
+        if 'strength' in rel:
+            existing['strength'] = existing.get('strength', 1) + 1
+        if 'common_docs' in rel:
+            existing_docs = set(existing.get('common_docs', []))
+            new_docs = set(rel.get('common_docs', []))
+            existing['common_docs'] = list(existing_docs | new_docs)
+        if 'doc_id' in rel:
+            # Relations propres à un document : tous les documents dont elles sont extraites
+            doc_ids = existing.setdefault('doc_ids', [existing['doc_id']] if 'doc_id' in existing else [])
+            known = set(doc_ids)
+            doc_ids.extend(doc_id for doc_id in rel.get('doc_ids', [rel['doc_id']]) if doc_id not in known)
+    
+    def extract_cooccurrence_relations(self, entities_by_doc: List[Dict], min_strength: int = 2,
+                                       scores: bool = False) -> List[Dict]:
+        """Extrait uniquement les co-occurrences significatives (≥2 documents).
         
-        entity_pairs = defaultdict(set)
+        Comptage par matrice creuse (XᵀX, voir CooccurrenceMatrix) ; avec `scores`,
+        chaque relation porte aussi ses PMI et NPMI.
+        """
+        from .cooccurrence import CooccurrenceMatrix
         
+        matrix = CooccurrenceMatrix()
         for doc_entities in entities_by_doc:
-            doc_id = doc_entities['document_id']
-            doc_entities_list = doc_entities['entities']
-            seen_pairs = set()
-            
-            for i, entity1 in enumerate(doc_entities_list):
-                for entity2 in doc_entities_list[i+1:]:
-                    if entity1['text'].lower() == entity2['text'].lower():
-                        continue
-                    
-                    e1_norm = entity1['text'].lower()
-                    e2_norm = entity2['text'].lower()
-                    
-                    pair_key = tuple(sorted([e1_norm, e2_norm]))
-                    if pair_key in seen_pairs:
-                        continue
-                    
-                    seen_pairs.add(pair_key)
-                    entity_pairs[pair_key].add(doc_id)
+            matrix.add_document(doc_entities['document_id'], doc_entities['entities'])
         
-        relations = []
-        for (e1, e2), docs in entity_pairs.items():
-            strength = len(docs)
-            if strength >= min_strength:
-                relations.append({
-                    'subject': e1,
-                    'predicate': 'co_occurs_with',
-                    'object': e2,
-                    'method': 'cooccurrence',
-                    'common_docs': list(docs),
-                    'strength': strength
-                })
-        
-        return relations
+        return [relation for _, relation in matrix.relations(min_strength, scores=scores)]
     
     def extract_proximity_relations(self, doc_entities: Dict, window: int = 100, max_per_doc: int = 50) -> List[Dict]:
         """Extrait uniquement les relations de proximité les plus proches."""
@@ -170,19 +153,17 @@ class RelationExtractor:
         entity_counts = defaultdict(int)
         
         for doc_entities in entities_by_doc:
-            seen_in_doc = set()
-            for entity in doc_entities['entities']:
-                entity_norm = entity['text'].lower()
-                if entity_norm not in seen_in_doc:
-                    entity_counts[entity_norm] += 1
-                    seen_in_doc.add(entity_norm)
-        
-        filtered = []
-        for rel in relations:
-            subject = rel['subject'].lower()
-            obj = rel['object'].lower()
-            
-            if entity_counts[subject] >= min_mentions or entity_counts[obj] >= min_mentions:
-                filtered.append(rel)
+            self.count_entity_documents(doc_entities, entity_counts)
         
-        return filtered
\ No newline at end of file
+        return [rel for rel in relations if self.is_frequent(rel, entity_counts, min_mentions)]
+    
+    @staticmethod
+    def count_entity_documents(doc_entities: Dict, entity_counts: Dict[str, int]):
+        """Ajoute 1 au nombre de documents de chaque entité (normalisée) citée par le document."""
+        for entity_norm in {entity['text'].lower() for entity in doc_entities['entities']}:
+            entity_counts[entity_norm] = entity_counts.get(entity_norm, 0) + 1
+    
+    @staticmethod
+    def is_frequent(rel: Dict, entity_counts: Dict[str, int], min_mentions: int) -> bool:
+        return (entity_counts.get(rel['subject'].lower(), 0) >= min_mentions
+                or entity_counts.get(rel['object'].lower(), 0) >= min_mentions)
\ No newline at end of file
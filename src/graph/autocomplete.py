@@ -0,0 +1,217 @@
+# src/graph/autocomplete.py
+
+import re
+from pathlib import Path
+from typing import List, Dict, Iterable
+import numpy as np
+from .mention_aggregator import MentionAggregator
+from .text_index import fold
+
+# Clés : début de chaque mot du nom replié, tronqué (octets UTF-8) ; tableau trié pour la recherche binaire
+KEY_BYTES = 32
+MAX_WORDS = 4
+
+# Au-delà, on ne garde que les candidats les plus importants d'un intervalle de clés
+MAX_RANGE = 256
+
+
+def normalize(text: str) -> str:
+    """Nom replié, mots séparés par une seule espace (`Napoléon Ier` → `napoleon ier`)."""
+    return ' '.join(re.findall(r'\w+', fold(text)))
+
+
+def default_max_edits(query: str) -> int:
+    """Fautes tolérées selon la longueur de la saisie (0, 1 puis 2)."""
+    return 0 if len(query) < 4 else 1 if len(query) < 8 else 2
+
+
+def _step(row: List[int], before: List[int], byte: int, previous_byte: int, query: bytes) -> List[int]:
+    """Ligne suivante de la matrice de distance (Levenshtein + transposition) après un octet de la clé."""
+    new = [row[0] + 1]
+    for j in range(1, len(query) + 1):
+        cost = 0 if query[j - 1] == byte else 1
+        value = min(new[j - 1] + 1, row[j] + 1, row[j - 1] + cost)
+        if before is not None and j > 1 and query[j - 1] == previous_byte and query[j - 2] == byte:
+            value = min(value, before[j - 2] + 1)
+        new.append(value)
+    return new
+
+
+class AutocompleteIndex:
+    """Complétion de noms d'entités par préfixe, sans accents et tolérante aux fautes.
+
+    Les clés triées forment un trie implicite : la recherche approchée le parcourt
+    en profondeur et saute par recherche binaire tout sous-arbre trop éloigné.
+    """
+
+    def __init__(self, names: List[str], types: List[str] = None, weights: Iterable[float] = None):
+        encoded = [name.encode('utf-8') for name in names]
+        types = list(types) if types is not None else [None] * len(encoded)
+        type_values = sorted({t for t in types if t is not None})
+        type_codes = {t: code for code, t in enumerate(type_values)}
+
+        keys, owners = [], []
+        for i, name in enumerate(names):
+            words = normalize(name).split(' ')
+            for w in range(min(len(words), MAX_WORDS)):
+                key = ' '.join(words[w:]).encode('utf-8')[:KEY_BYTES]
+                if key:
+                    keys.append(key)
+                    owners.append(i)
+        keys = np.array(keys, dtype=f'S{KEY_BYTES}')
+        order = np.argsort(keys, kind='stable')
+
+        self._set_arrays(
+            names=np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            name_ends=np.cumsum([len(name) for name in encoded], dtype=np.int64),
+            type_values=np.array(type_values, dtype=str),
+            type_codes=np.array([type_codes.get(t, -1) for t in types], dtype=np.int16),
+            weights=(np.asarray(weights, dtype=np.float32) if weights is not None
+                     else np.zeros(len(encoded), dtype=np.float32)),
+            keys=keys[order],
+            key_entity=np.array(owners, dtype=np.int32)[order])
+
+    def _set_arrays(self, **arrays):
+        """Tableaux de l'index (ceux de l'instantané) ; les noms ne sont décodés qu'à la lecture."""
+        self.arrays = arrays
+        self._blob = arrays['names'].tobytes()
+        self._starts = np.concatenate(([0], arrays['name_ends'][:-1])).astype(np.int64)
+        self._ends = arrays['name_ends']
+        self._type_values = arrays['type_values'].tolist()
+        self.type_codes = arrays['type_codes']
+        self.weights = arrays['weights']
+        self.keys = arrays['keys']
+        self.key_entity = arrays['key_entity']
+
+    @classmethod
+    def from_entities(cls, entities_data: List[Dict]) -> 'AutocompleteIndex':
+        """Index depuis entities.json ; importance = nombre de documents citant l'entité."""
+        aggregator = MentionAggregator().add_documents(entities_data)
+        rows = aggregator.entity_rows()
+        documents = {}
+        for mention in aggregator.mention_rows():
+            documents[mention['entity_name']] = documents.get(mention['entity_name'], 0) + 1
+        return cls([row['name'] for row in rows], [row['type'] for row in rows],
+                   [documents.get(row['name'], 0) for row in rows])
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def name(self, i: int) -> str:
+        return self._blob[self._starts[i]:self._ends[i]].decode('utf-8')
+
+    def entity_type(self, i: int) -> str:
+        code = self.type_codes[i]
+        return self._type_values[code] if code >= 0 else None
+
+    def entities(self) -> Iterable:
+        """(nom, type) de toutes les entités indexées (pour le gazetteer de requête)."""
+        return ((self.name(i), self.entity_type(i)) for i in range(len(self)))
+
+    def _prefix_range(self, prefix: bytes):
+        lo = int(np.searchsorted(self.keys, prefix))
+        if len(prefix) < KEY_BYTES:
+            return lo, int(np.searchsorted(self.keys, prefix + b'\xff'))
+        return lo, int(np.searchsorted(self.keys, prefix, side='right'))
+
+    def _fuzzy_ranges(self, query: bytes, max_edits: int):
+        """Intervalles de clés dont un préfixe est à au plus max_edits de la saisie : (lo, hi, distance)."""
+        keys = self.keys
+        rows = [list(range(len(query) + 1))]
+        best = [rows[0][-1]]
+        previous = b''
+        i = 0
+        while i < len(keys):
+            key = bytes(keys[i])
+            # Lignes communes avec la clé précédente (même chemin dans le trie)
+            common = 0
+            limit = min(len(previous), len(key), len(rows) - 1)
+            while common < limit and previous[common] == key[common]:
+                common += 1
+            del rows[common + 1:]
+            del best[common + 1:]
+
+            next_i = i + 1
+            for depth in range(common, len(key)):
+                before, previous_byte = (rows[-2], key[depth - 1]) if depth else (None, None)
+                row = _step(rows[-1], before, key[depth], previous_byte, query)
+                rows.append(row)
+                best.append(min(best[-1], row[-1]))
+                if min(row) >= min(best[-1], max_edits + 1):
+                    # Aucun descendant ne fera mieux : tout le sous-arbre a la même distance (ou est trop loin)
+                    lo, hi = self._prefix_range(key[:depth + 1])
+                    if best[-1] <= max_edits:
+                        yield lo, hi, best[-1]
+                    next_i = hi
+                    break
+            else:
+                if best[-1] <= max_edits:
+                    yield i, i + 1, best[-1]
+            previous = key
+            i = max(next_i, i + 1)
+
+    def _candidates(self, lo: int, hi: int) -> np.ndarray:
+        ids = self.key_entity[lo:hi]
+        if len(ids) > MAX_RANGE:
+            ids = ids[np.argpartition(-self.weights[ids], MAX_RANGE)[:MAX_RANGE]]
+        return ids
+
+    def complete(self, query: str, limit: int = 10, max_edits: int = None) -> List[Dict]:
+        """Entités dont un mot commence par la saisie (à max_edits fautes près), les plus proches
+        puis les plus importantes d'abord."""
+        text = normalize(query)
+        if not text:
+            return []
+        prefix = text.encode('utf-8')[:KEY_BYTES]
+        if max_edits is None:
+            max_edits = default_max_edits(text)
+
+        distances = {}
+        lo, hi = self._prefix_range(prefix)
+        for i in self._candidates(lo, hi).tolist():
+            distances[i] = 0
+        if len(distances) < limit and max_edits > 0:
+            for lo, hi, distance in self._fuzzy_ranges(prefix, max_edits):
+                for i in self._candidates(lo, hi).tolist():
+                    if distance < distances.get(i, max_edits + 1):
+                        distances[i] = distance
+
+        names = {i: self.name(i) for i in distances}
+        ranked = sorted(distances, key=lambda i: (distances[i], normalize(names[i]) != text,
+                                                  -self.weights[i], len(names[i]), names[i]))
+        return [{
+            'name': names[i],
+            'type': self.entity_type(i),
+            'distance': distances[i],
+            'weight': float(self.weights[i])
+        } for i in ranked[:limit]]
+
+    def save(self, path: str | Path):
+        """Instantané unique (.npz non compressé) : noms en bloc UTF-8, types codés, clés triées."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, **self.arrays)
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'AutocompleteIndex':
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Index d'autocomplétion introuvable: {path} "
+                                    f"(exécutez: python scripts/03_build_graph.py)")
+
+        with np.load(path) as snapshot:
+            arrays = {name: snapshot[name] for name in snapshot.files}
+        index = cls.__new__(cls)
+        index._set_arrays(**arrays)
+        return index
+
+
+def autocomplete_path(config=None) -> str:
+    default = 'data/graph/autocomplete.npz'
+    return config.get('graph.autocomplete_path', default) if config else default
+
+
+def load_autocomplete(config=None) -> AutocompleteIndex:
+    """Instantané de `graph.autocomplete_path`, ou None s'il n'a pas encore été construit."""
+    path = autocomplete_path(config)
+    return AutocompleteIndex.load(path) if Path(path).exists() else None
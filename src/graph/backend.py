@@ -0,0 +1,261 @@
+# src/graph/backend.py
+
+import os
+import re
+from typing import List, Dict
+
+# Parcours borné autour des hubs (graph.traversal dans config.yaml)
+DEFAULT_FANOUT = 20
+DEFAULT_HUB_TYPES = ('DATE',)
+DEFAULT_HUB_DEGREE = 1000
+
+# Types natifs des relations entité — entité (un type Neo4j par famille de prédicats)
+RELATION_TYPES = ('CO_OCCURS_WITH', 'NEAR', 'SYNTACTIC')
+
+
+def relation_type(predicate: str) -> str:
+    """Type natif d'un prédicat : co_occurs_with, near, sinon SYNTACTIC (verbes des dépendances)."""
+    predicate = (predicate or '').lower().strip()
+    if predicate == 'co_occurs_with':
+        return 'CO_OCCURS_WITH'
+    if predicate == 'near':
+        return 'NEAR'
+    return 'SYNTACTIC'
+
+
+def entity_label(entity_type: str) -> str:
+    """Label secondaire d'un type d'entité (`PERSON` → `Person`, `WORK_OF_ART` → `WorkOfArt`).
+
+    None si le type ne donne pas un label sûr (caractères hors [A-Za-z0-9_], ou label réservé).
+    """
+    if not entity_type or not re.fullmatch(r'[A-Za-z][A-Za-z0-9_]*', entity_type):
+        return None
+    label = ''.join(part.capitalize() for part in entity_type.split('_') if part)
+    return label if label not in ('Entity', 'Document') else None
+
+
+def check_relation_types(relation_types: List[str] = None) -> List[str]:
+    """Types de relation autorisés, validés (None ou vide : tous les types)."""
+    if not relation_types:
+        return list(RELATION_TYPES)
+    types = [t.upper() for t in relation_types]
+    unknown = sorted(set(types) - set(RELATION_TYPES))
+    if unknown:
+        raise ValueError(f"Types de relation inconnus: {unknown} (attendus: {list(RELATION_TYPES)})")
+    return types
+
+class GraphQueriesBackend:
+    """Contrat commun des moteurs de requêtes sur le graphe (Neo4j, mémoire, ...)."""
+
+    def close(self):
+        pass
+
+    def find_entity(self, entity_name: str) -> Dict:
+        raise NotImplementedError
+
+    def get_entity_with_documents(self, entity_name: str, limit_docs: int = 5) -> Dict:
+        raise NotImplementedError
+
+    def get_neighbors(self, entity_name: str, max_depth: int = 1, limit: int = 10,
+                      relation_types: List[str] = None) -> List[Dict]:
+        """Voisins jusqu'à max_depth par toutes les relations (documents compris, comme `-[*1..d]-`),
+        ou seulement par les relations entité — entité de `relation_types` (voir RELATION_TYPES)."""
+        raise NotImplementedError
+
+    def get_neighbors_bounded(self, entity_name: str, max_depth: int = 2, limit: int = 10,
+                              fanout: int = DEFAULT_FANOUT, hub_types: List[str] = DEFAULT_HUB_TYPES,
+                              hub_degree: int = DEFAULT_HUB_DEGREE, relation_types: List[str] = None) -> List[Dict]:
+        """Voisins par relations entité — entité (`relation_types`, toutes par défaut), un saut à la fois.
+
+        Chaque entité développée ne suit que ses `fanout` relations les plus fortes
+        (`strength`) ; au-delà du premier saut, les entités de type `hub_types` ou de
+        degré >= `hub_degree` sont renvoyées mais pas développées.
+        """
+        raise NotImplementedError
+
+    def find_path(self, entity1: str, entity2: str) -> Dict:
+        raise NotImplementedError
+
+    def search_entities_by_type(self, entity_type: str, limit: int = 10) -> List[Dict]:
+        raise NotImplementedError
+
+    def count_entities_by_type(self, entity_types: List[str]) -> Dict[str, int]:
+        """Nombre d'entités de chaque type (sans les charger)."""
+        raise NotImplementedError
+
+    def get_related_entities(self, entity_name: str, limit: int = 10,
+                             relation_types: List[str] = None) -> List[Dict]:
+        raise NotImplementedError
+
+    def search_by_query(self, query_text: str, limit: int = 10) -> Dict:
+        raise NotImplementedError
+
+    def get_document(self, doc_id: str) -> Dict:
+        raise NotImplementedError
+
+    def get_document_by_title(self, title: str) -> Dict:
+        raise NotImplementedError
+
+    def document_text(self, doc_id: str, max_chars: int = None) -> str:
+        """Texte d'un document, lu à la demande pour ceux qui entrent dans le contexte."""
+        raise NotImplementedError
+
+    def expand_entities(self, entity_names: List[str], max_depth: int = 1, limit_docs: int = 3,
+                        limit_related: int = 5, limit_neighbors: int = 5, hub_limits: Dict = None) -> List[Dict]:
+        """Documents, entités reliées et voisins de plusieurs entités en un seul appel.
+
+        Renvoie, dans l'ordre des noms, {'name', 'entity_data', 'related', 'neighbors'} ;
+        `neighbors` n'est rempli que si max_depth > 1 ; avec `hub_limits` (fanout, hub_types,
+        hub_degree), il provient de get_neighbors_bounded. Les moteurs distants redéfinissent
+        cette méthode pour tout récupérer en un aller-retour.
+        """
+        return expand_entities_per_call(self, entity_names, max_depth, limit_docs,
+                                        limit_related, limit_neighbors, hub_limits)
+
+
+def expand_entities_per_call(queries: GraphQueriesBackend, entity_names: List[str], max_depth: int = 1,
+                             limit_docs: int = 3, limit_related: int = 5, limit_neighbors: int = 5,
+                             hub_limits: Dict = None) -> List[Dict]:
+    """Implémentation de expand_entities par appels successifs (trois par entité)."""
+    expanded = []
+    for name in entity_names:
+        neighbors = []
+        if max_depth > 1 and hub_limits is not None:
+            neighbors = queries.get_neighbors_bounded(name, max_depth=max_depth, limit=limit_neighbors,
+                                                      **hub_limits)
+        elif max_depth > 1:
+            neighbors = queries.get_neighbors(name, max_depth=max_depth, limit=limit_neighbors)
+        expanded.append({
+            'name': name,
+            'entity_data': queries.get_entity_with_documents(name, limit_docs=limit_docs),
+            'related': queries.get_related_entities(name, limit=limit_related),
+            'neighbors': neighbors
+        })
+    return expanded
+
+
+class GraphBuilderBackend:
+    """Contrat commun des constructeurs de graphe."""
+
+    # Tampon de version (query_cache.GraphVersion) changé après chaque écriture, si fourni
+    version = None
+
+    def mark_changed(self):
+        """Invalide les caches de résultats des lecteurs du graphe."""
+        if self.version is not None:
+            self.version.bump()
+
+    def close(self):
+        pass
+
+    def clear_database(self):
+        raise NotImplementedError
+
+    def build_graph(self, entities_data: List[Dict], relations: List[Dict], documents: List[Dict]):
+        raise NotImplementedError
+
+    def get_statistics(self) -> Dict:
+        raise NotImplementedError
+
+    def compute_metrics(self, metrics=None) -> Dict:
+        """Calcule et enregistre l'importance des entités (PageRank, voir GraphMetrics)."""
+        raise NotImplementedError
+
+    def migrate_relation_types(self) -> Dict:
+        """Convertit un graphe existant vers les types de relation natifs ({type: relations migrées})."""
+        return {}
+
+    def migrate_entity_labels(self) -> Dict:
+        """Ajoute les labels par type aux entités d'un graphe existant ({label: entités étiquetées})."""
+        return {}
+
+
+def hub_limits_from_config(config=None) -> Dict:
+    """Paramètres de get_neighbors_bounded (`graph.traversal`), ou None si le parcours n'est pas borné."""
+    traversal = (config.get('graph.traversal', {}) if config else {}) or {}
+    if not traversal.get('bounded', False):
+        return None
+    return {
+        'fanout': traversal.get('fanout', DEFAULT_FANOUT),
+        'hub_types': traversal.get('hub_types', list(DEFAULT_HUB_TYPES)),
+        'hub_degree': traversal.get('hub_degree', DEFAULT_HUB_DEGREE)
+    }
+
+
+def _backend_name(config) -> str:
+    return (config.get('graph.backend', 'neo4j') if config else 'neo4j').lower()
+
+
+def _document_store_path(config) -> str:
+    default = 'data/graph/documents'
+    return config.get('graph.document_store_path', default) if config else default
+
+
+def create_graph_queries(config=None, uri: str = None, user: str = None, password: str = None) -> GraphQueriesBackend:
+    """Instancie le moteur de requêtes choisi par `graph.backend` dans config.yaml, précédé du
+    cache de résultats (`graph.cache`) et du filtre des entités absentes (`graph.entity_filter`)."""
+    from .entity_filter import with_entity_filter
+    from .query_cache import graph_version, with_query_cache
+    queries = with_query_cache(_create_backend_queries(config, uri, user, password), config)
+    return with_entity_filter(queries, config, graph_version(config))
+
+
+def _create_backend_queries(config, uri: str, user: str, password: str) -> GraphQueriesBackend:
+    backend = _backend_name(config)
+
+    if backend == 'memory':
+        from .memory_backend import MemoryGraphQueries
+        return MemoryGraphQueries.load(config.get('graph.memory_path', 'data/graph/memory'),
+                                       _document_store_path(config))
+
+    if backend == 'sqlite':
+        from .sqlite_backend import SQLiteGraphQueries
+        return SQLiteGraphQueries(config.get('graph.sqlite_path', 'data/graph/graph.sqlite'),
+                                  _document_store_path(config))
+
+    if backend == 'neo4j':
+        from .graph_queries import GraphQueries
+        return GraphQueries(
+            uri=uri or os.getenv("NEO4J_URI"),
+            user=user or os.getenv("NEO4J_USER"),
+            password=password or os.getenv("NEO4J_PASSWORD"),
+            document_store_path=_document_store_path(config)
+        )
+
+    raise ValueError(f"Backend de graphe inconnu: {backend}")
+
+
+def create_graph_builder(config=None, uri: str = None, user: str = None, password: str = None) -> GraphBuilderBackend:
+    """Instancie le constructeur de graphe choisi par `graph.backend` dans config.yaml ;
+    ses écritures changent la version du graphe (`graph.cache.version_path`)."""
+    from .query_cache import graph_version
+    builder = _create_backend_builder(config, uri, user, password)
+    builder.version = graph_version(config)
+    return builder
+
+
+def _create_backend_builder(config, uri: str, user: str, password: str) -> GraphBuilderBackend:
+    backend = _backend_name(config)
+    batch_size = config.get('graph.batch_size', 1000) if config else 1000
+
+    if backend == 'memory':
+        from .memory_backend import MemoryGraphBuilder
+        return MemoryGraphBuilder(config.get('graph.memory_path', 'data/graph/memory'),
+                                  _document_store_path(config))
+
+    if backend == 'sqlite':
+        from .sqlite_backend import SQLiteGraphBuilder
+        return SQLiteGraphBuilder(config.get('graph.sqlite_path', 'data/graph/graph.sqlite'),
+                                  _document_store_path(config))
+
+    if backend == 'neo4j':
+        from .graph_builder import GraphBuilder
+        return GraphBuilder(
+            uri=uri or os.getenv("NEO4J_URI"),
+            user=user or os.getenv("NEO4J_USER"),
+            password=password or os.getenv("NEO4J_PASSWORD"),
+            batch_size=batch_size,
+            document_store_path=_document_store_path(config)
+        )
+
+    raise ValueError(f"Backend de graphe inconnu: {backend}")
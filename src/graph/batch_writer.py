@@ -0,0 +1,319 @@
+# src/graph/batch_writer.py
+
+import time
+from typing import List, Dict, Iterable, Iterator
+from .backend import RELATION_TYPES, entity_label
+
+# Motif Cypher de toutes les relations entité — entité
+ENTITY_RELATIONSHIPS = '|'.join(RELATION_TYPES)
+
+DOCUMENTS_QUERY = """
+UNWIND $rows AS row
+MERGE (d:Document {id: row.id})
+SET d.filename = row.filename,
+    d.title = row.title,
+    d.path = row.path,
+    d.num_chars = row.num_chars,
+    d.content_hash = row.content_hash
+REMOVE d.text
+"""
+
+ENTITIES_QUERY = """
+UNWIND $rows AS row
+MERGE (e:Entity {name: row.name})
+SET e.type = row.type,
+    e.normalized_name = row.normalized_name
+"""
+
+# Label secondaire par type (`:Person`, `:Gpe`...) ; les autres labels de type du lot sont
+# retirés pour qu'un changement de type ne laisse pas l'ancien label
+LABELED_ENTITIES_QUERY = ENTITIES_QUERY + """SET e:%s
+"""
+REMOVE_LABELS = """REMOVE e:%s
+"""
+LABELS_QUERY = "CALL db.labels() YIELD label RETURN label"
+
+
+def entities_query(label: str, other_labels: List[str] = ()) -> str:
+    """Requête d'écriture des entités d'un label (ENTITIES_QUERY si le type n'a pas de label)."""
+    if label is None:
+        return ENTITIES_QUERY
+    query = LABELED_ENTITIES_QUERY % label
+    others = [other for other in other_labels if other != label]
+    return query + (REMOVE_LABELS % ':'.join(others) if others else '')
+
+MENTIONS_QUERY = """
+UNWIND $rows AS row
+MATCH (e:Entity {name: row.entity_name})
+MATCH (d:Document {id: row.document_id})
+MERGE (e)-[r:MENTIONED_IN]->(d)
+SET r.context = coalesce(row.context, r.context),
+    r.count = coalesce(row.count, 1),
+    r.first_offset = row.first_offset
+"""
+
+# Le type d'une relation ne peut pas être un paramètre Cypher : une requête par type natif
+RELATIONS_QUERY = """
+UNWIND $rows AS row
+MATCH (a:Entity {name: row.subject})
+MATCH (b:Entity {name: row.object})
+MERGE (a)-[r:%s {type: row.predicate}]->(b)
+SET r += row.props
+"""
+
+METRICS_QUERY = """
+UNWIND $rows AS row
+MATCH (e:Entity {name: row.name})
+SET e.pagerank = row.pagerank,
+    e.weighted_degree = row.weighted_degree,
+    e.betweenness = row.betweenness
+"""
+
+ADJACENCY_QUERY = """
+MATCH (a:Entity)-[r:%s]->(b:Entity)
+RETURN a.name AS src, b.name AS dst, coalesce(r.strength, 1) AS weight
+""" % ENTITY_RELATIONSHIPS
+
+# Statistiques de degré, utilisées pour reconnaître les hubs lors des parcours
+DEGREE_STATS_QUERY = """
+MATCH (e:Entity)
+SET e.degree = COUNT { (e)-[:%s]-() },
+    e.document_count = COUNT { (e)-[:MENTIONED_IN]->() }
+""" % ENTITY_RELATIONSHIPS
+
+# Ingestion incrémentale : empreintes des documents déjà présents
+DOCUMENT_HASHES_QUERY = """
+UNWIND $ids AS id
+MATCH (d:Document {id: id})
+RETURN d.id AS id, d.content_hash AS content_hash
+"""
+
+# Retire les mentions des documents modifiés et renvoie les entités qu'ils citaient
+DETACH_MENTIONS_QUERY = """
+UNWIND $ids AS id
+MATCH (e:Entity)-[r:MENTIONED_IN]->(d:Document {id: id})
+DELETE r
+RETURN d.id AS id, collect(e.name) AS names
+"""
+
+# Documents qui citent chaque nom normalisé (toutes casses confondues), comme le
+# comptage de l'extraction
+ENTITY_DOCUMENTS_QUERY = """
+UNWIND $names AS name
+MATCH (e:Entity {normalized_name: name})-[:MENTIONED_IN]->(d:Document)
+RETURN name, collect(DISTINCT d.id) AS docs
+"""
+
+# Noms normalisés cités dans un même document que chaque nom
+ENTITY_PARTNERS_QUERY = """
+UNWIND $names AS name
+MATCH (:Entity {normalized_name: name})-[:MENTIONED_IN]->(:Document)<-[:MENTIONED_IN]-(other:Entity)
+WHERE other.normalized_name <> name
+RETURN name, collect(DISTINCT other.normalized_name) AS partners
+"""
+
+# Remplace la relation de co-occurrence d'une paire (noms normalisés, comme RELATIONS_QUERY
+# lors d'une construction complète) ; `keep` à faux, elle est seulement supprimée
+COOCCURRENCE_QUERY = """
+UNWIND $rows AS row
+MATCH (a:Entity {name: row.subject})
+MATCH (b:Entity {name: row.object})
+OPTIONAL MATCH (a)-[old:CO_OCCURS_WITH]-(b)
+WITH a, b, row, collect(old) AS previous
+FOREACH (r IN previous | DELETE r)
+WITH a, b, row WHERE row.keep
+CREATE (a)-[:CO_OCCURS_WITH {type: 'co_occurs_with', method: 'cooccurrence',
+                             common_docs: row.common_docs, strength: row.strength}]->(b)
+"""
+
+# Relations propres aux documents (proximité, syntaxe) : comme après la déduplication de
+# l'extraction, une seule relation par paire et prédicat, dont `doc_ids` liste les documents
+# d'où elle est extraite
+DOCUMENT_RELATION_TYPES = ('NEAR', 'SYNTACTIC')
+
+DOCUMENT_RELATIONS_QUERY = """
+UNWIND $rows AS row
+MATCH (a:Entity {name: row.subject})
+MATCH (b:Entity {name: row.object})
+MERGE (a)%s(b)
+ON CREATE SET r += row.props
+SET r.doc_ids = coalesce(r.doc_ids, []) +
+    [id IN coalesce(row.props.doc_ids, []) WHERE NOT id IN coalesce(r.doc_ids, [])]
+"""
+
+# Retire des documents des relations qui les citent et supprime celles qui n'en ont plus ;
+# une liste n'étant pas indexable, les relations du type sont parcourues
+STALE_RELATIONS_QUERY = """
+MATCH (:Entity)-[r:%s]->(:Entity)
+WHERE any(id IN r.doc_ids WHERE id IN $ids)
+SET r.doc_ids = [id IN r.doc_ids WHERE NOT id IN $ids]
+WITH r WHERE size(r.doc_ids) = 0
+DELETE r
+"""
+
+
+def document_relations_query(rel_type: str) -> str:
+    """Requête d'ajout de relations propres aux documents (RELATIONS_QUERY pour les autres types) ;
+    NEAR est symétrique, la relation existante est reprise dans les deux sens."""
+    if rel_type not in DOCUMENT_RELATION_TYPES:
+        return RELATIONS_QUERY % rel_type
+    arrow = '-' if rel_type == 'NEAR' else '->'
+    return DOCUMENT_RELATIONS_QUERY % f"-[r:{rel_type} {{type: row.predicate}}]{arrow}"
+
+# Entités qui ne sont plus citées par aucun document
+ORPHAN_ENTITIES_QUERY = """
+UNWIND $rows AS row
+MATCH (e:Entity {name: row.name})
+WHERE NOT (e)-[:MENTIONED_IN]->()
+DETACH DELETE e
+"""
+
+# DEGREE_STATS_QUERY limitée aux entités touchées
+ENTITY_DEGREE_QUERY = """
+UNWIND $rows AS row
+MATCH (e:Entity {name: row.name})
+SET e.degree = COUNT { (e)-[:%s]-() },
+    e.document_count = COUNT { (e)-[:MENTIONED_IN]->() }
+""" % ENTITY_RELATIONSHIPS
+
+# Migration des graphes antérieurs : RELATES_TO {type: prédicat} → type natif, par lots
+MIGRATE_RELATIONS_QUERY = """
+MATCH (a:Entity)-[r:RELATES_TO]->(b:Entity)
+WITH a, r, b, coalesce(r.type, 'relates_to') AS predicate
+WHERE %s
+WITH a, r, b, predicate LIMIT $batch_size
+MERGE (a)-[t:%s {type: predicate}]->(b)
+SET t += properties(r), t.type = predicate
+DELETE r
+RETURN count(*) AS migrated
+"""
+
+# Migration des labels par type : étiquette par lots les entités d'un type qui ne l'ont pas
+LABEL_ENTITIES_QUERY = """
+MATCH (e:Entity)
+WHERE e.type = $type AND NOT e:%s
+WITH e LIMIT $batch_size
+SET e:%s
+RETURN count(*) AS migrated
+"""
+
+# Nettoyage des labels hérités d'un type précédent
+STALE_LABEL_QUERY = """
+MATCH (e:Entity:%s)
+WHERE e.type IS NULL OR NOT e.type IN $types
+REMOVE e:%s
+RETURN count(*) AS removed
+"""
+
+# Prédicats de chaque type natif (même règle que backend.relation_type)
+MIGRATION_FILTERS = {
+    'CO_OCCURS_WITH': "toLower(trim(predicate)) = 'co_occurs_with'",
+    'NEAR': "toLower(trim(predicate)) = 'near'",
+    'SYNTACTIC': "NOT toLower(trim(predicate)) IN ['co_occurs_with', 'near']"
+}
+
+
+def iter_batches(rows: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    """Regroupe un flux de lignes en lots de taille fixe."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class BatchWriter:
+    """Écrit le graphe par lots `UNWIND $rows` dans des transactions explicites."""
+
+    def __init__(self, driver, batch_size: int = 1000):
+        self.driver = driver
+        self.batch_size = max(1, int(batch_size))
+        self.stats = {}
+
+    def _run_batch(self, tx, query: str, rows: List[Dict]):
+        tx.run(query, rows=rows).consume()
+
+    def write_rows(self, phase: str, query: str, rows: Iterable[Dict]) -> Dict:
+        """Écrit un flux de lignes, un lot par transaction, et mesure le débit."""
+        total = 0
+        batches = 0
+        start = time.perf_counter()
+
+        with self.driver.session() as session:
+            for batch in iter_batches(rows, self.batch_size):
+                session.execute_write(self._run_batch, query, batch)
+                total += len(batch)
+                batches += 1
+
+        elapsed = time.perf_counter() - start
+        self.stats[phase] = {
+            'rows': total,
+            'batches': batches,
+            'seconds': elapsed,
+            'rows_per_sec': total / elapsed if elapsed > 0 else 0.0
+        }
+        return self.stats[phase]
+
+    def write_documents(self, rows: Iterable[Dict]) -> Dict:
+        return self.write_rows('documents', DOCUMENTS_QUERY, rows)
+
+    def write_grouped(self, phase: str, rows: Iterable[Dict], key, query_for) -> Dict:
+        """Écrit des lignes dont une valeur (type, label) fait partie du texte Cypher : un tampon
+        par valeur de `key(row)`, écrit avec la requête `query_for(valeur)` dès qu'il atteint
+        `batch_size` lignes (au plus un lot en mémoire par valeur), débit cumulé."""
+        buffers = {}
+        total = {'rows': 0, 'batches': 0, 'seconds': 0.0}
+
+        def flush(value):
+            stats = self.write_rows(phase, query_for(value), buffers.pop(value))
+            for name in total:
+                total[name] += stats[name]
+
+        for row in rows:
+            value = key(row)
+            buffer = buffers.setdefault(value, [])
+            buffer.append(row)
+            if len(buffer) >= self.batch_size:
+                flush(value)
+        for value in list(buffers):
+            flush(value)
+        total['rows_per_sec'] = total['rows'] / total['seconds'] if total['seconds'] > 0 else 0.0
+        self.stats[phase] = total
+        return total
+
+    def type_labels(self) -> List[str]:
+        """Labels de type présents dans la base (tous sauf Entity et Document)."""
+        with self.driver.session() as session:
+            return [record['label'] for record in session.run(LABELS_QUERY)
+                    if record['label'] not in ('Entity', 'Document')]
+
+    def write_entities(self, rows: Iterable[Dict]) -> Dict:
+        """Écrit les entités avec leur label de type, une requête par label ; les autres labels de
+        type présents dans la base leur sont retirés."""
+        labels = self.type_labels()
+        return self.write_grouped('entities', rows, lambda row: entity_label(row['type']),
+                                  lambda label: entities_query(label, labels))
+
+    def write_mentions(self, rows: Iterable[Dict]) -> Dict:
+        return self.write_rows('mentions', MENTIONS_QUERY, rows)
+
+    def write_relations(self, rows: Iterable[Dict]) -> Dict:
+        """Écrit les relations regroupées par type natif (`rel_type`)."""
+        return self.write_grouped('relations', rows, lambda row: row['rel_type'],
+                                  lambda rel_type: RELATIONS_QUERY % rel_type)
+
+    def write_document_relations(self, rows: Iterable[Dict]) -> Dict:
+        """Ajoute des relations propres aux documents à celles du graphe (union des `doc_ids`)."""
+        return self.write_grouped('relations', rows, lambda row: row['rel_type'],
+                                  document_relations_query)
+
+    def report(self) -> str:
+        """Résumé lisible du débit par phase."""
+        lines = []
+        for phase, s in self.stats.items():
+            lines.append(f"  - {phase}: {s['rows']:,} lignes en {s['seconds']:.2f}s "
+                         f"({s['rows_per_sec']:,.0f} lignes/s, {s['batches']} lots)")
+        return "\n".join(lines)
@@ -0,0 +1,165 @@
+# src/graph/bulk_exporter.py
+
+import csv
+from collections import Counter
+from pathlib import Path
+from typing import List, Dict, Iterable
+from .mention_aggregator import MentionAggregator
+from .graph_builder import GraphBuilder
+from .document_store import content_hash, write_document_store
+from .backend import relation_type, entity_label
+
+DOCUMENT_HEADER = ['uid:ID(Document)', 'id', 'filename', 'title', 'path', 'num_chars:int', 'content_hash', ':LABEL']
+ENTITY_HEADER = ['uid:ID(Entity)', 'name', 'type', 'normalized_name', 'degree:int', 'document_count:int', ':LABEL']
+MENTION_HEADER = [':START_ID(Entity)', ':END_ID(Document)', 'context', 'count:int', 'first_offset:int', ':TYPE']
+RELATION_HEADER = [':START_ID(Entity)', ':END_ID(Entity)', 'type', 'method', 'strength:int',
+                   'distance:int', 'common_docs:string[]', 'doc_ids:string[]', ':TYPE']
+
+ARRAY_DELIMITER = '|'
+
+
+class BulkExporter:
+    """Exporte le graphe en CSV (en-tête + données) pour `neo4j-admin database import`.
+
+    Documents, mentions et relations sont écrits au fil de l'itération ; seuls les
+    identifiants, les clés des relations et les agrégats par entité (labels, documents,
+    degré) restent en mémoire.
+    """
+
+    def __init__(self, output_dir: str | Path, extract_title=None,
+                 document_store_path: str | Path = 'data/graph/documents'):
+        self.output_dir = Path(output_dir)
+        self.extract_title = extract_title or GraphBuilder.extract_title_from_text
+        self.document_store_path = document_store_path
+        self.document_ids = {}
+        self.entity_ids = {}
+        self.entity_labels = {}
+        self.document_counts = Counter()
+        self.degrees = Counter()
+        self.stats = {}
+
+    def _writer(self, name: str, header: List[str]):
+        """Écrit le fichier d'en-tête et ouvre le fichier de données."""
+        with open(self.output_dir / f"{name}_header.csv", 'w', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerow(header)
+        handle = open(self.output_dir / f"{name}.csv", 'w', encoding='utf-8', newline='')
+        return handle, csv.writer(handle)
+
+    def write_documents(self, documents: Iterable[Dict], document_store_path: str | Path = None) -> int:
+        """Écrit documents.csv ; avec `document_store_path`, les textes vont dans le DocumentStore
+        pendant la même itération."""
+        handle, writer = self._writer('documents', DOCUMENT_HEADER)
+
+        def written():
+            for doc in documents:
+                doc_id = doc['filename']
+                if doc_id in self.document_ids:
+                    continue
+                uid = len(self.document_ids)
+                self.document_ids[doc_id] = uid
+                writer.writerow([uid, doc_id, doc['filename'],
+                                 self.extract_title(doc['text'], doc['filename']),
+                                 doc.get('path', ''), len(doc['text']), content_hash(doc['text']), 'Document'])
+                yield doc
+
+        with handle:
+            if document_store_path is not None:
+                return write_document_store(written(), document_store_path)['documents']
+            return sum(1 for _ in written())
+
+    def write_mentions(self, entities_data: Iterable[Dict]) -> int:
+        """Écrit les mentions document par document (une ligne par paire entité, document) et
+        compte les labels et documents de chaque entité."""
+        handle, writer = self._writer('mentions', MENTION_HEADER)
+        count = 0
+        with handle:
+            for entity_data in entities_data:
+                for entity in entity_data['entities']:
+                    name = entity['text']
+                    if name not in self.entity_ids:
+                        self.entity_ids[name] = len(self.entity_ids)
+                        self.entity_labels[name] = Counter()
+                    self.entity_labels[name][entity['label']] += 1
+
+                end = self.document_ids.get(entity_data['document_id'])
+                if end is None:
+                    continue
+                for row in MentionAggregator().add_documents([entity_data]).mention_rows():
+                    self.document_counts[row['entity_name']] += 1
+                    writer.writerow([self.entity_ids[row['entity_name']], end, row.get('context') or '',
+                                     row.get('count', 1), row.get('first_offset', ''), 'MENTIONED_IN'])
+                    count += 1
+        return count
+
+    def write_entities(self) -> int:
+        """Écrit les entités vues par write_mentions (label majoritaire, degré de write_relations)."""
+        handle, writer = self._writer('entities', ENTITY_HEADER)
+        with handle:
+            for name, uid in self.entity_ids.items():
+                entity_type = self.entity_labels[name].most_common(1)[0][0]
+                label = entity_label(entity_type)
+                writer.writerow([uid, name, entity_type, name.lower(), self.degrees.get(name, 0),
+                                 self.document_counts.get(name, 0), f"Entity;{label}" if label else 'Entity'])
+        return len(self.entity_ids)
+
+    def write_relations(self, relations: Iterable[Dict]) -> int:
+        """Écrit les relations au fil de l'itération (colonne :TYPE = type natif) ; une seule arête
+        par (sujet, prédicat, objet), la première rencontrée (les relations sont dédupliquées en
+        amont). Les degrés sont ceux de GraphBuilder.update_degree_statistics."""
+        seen = set()
+        handle, writer = self._writer('relations', RELATION_HEADER)
+        with handle:
+            for relation in relations:
+                start = self.entity_ids.get(relation['subject'])
+                end = self.entity_ids.get(relation['object'])
+                if start is None or end is None:
+                    continue
+                predicate = relation['predicate']
+                key = (start, predicate, end)
+                if key in seen:
+                    continue
+                seen.add(key)
+                self.degrees[relation['subject']] += 1
+                self.degrees[relation['object']] += 1
+
+                common_docs = relation.get('common_docs')
+                doc_ids = relation.get('doc_ids', [relation['doc_id']] if 'doc_id' in relation else None)
+                writer.writerow([
+                    start, end, predicate, relation.get('method', 'unknown'),
+                    relation.get('strength', 1) if common_docs is not None else '',
+                    relation.get('distance', ''),
+                    ARRAY_DELIMITER.join(common_docs) if common_docs is not None else '',
+                    ARRAY_DELIMITER.join(doc_ids) if doc_ids is not None else '',
+                    relation_type(predicate)
+                ])
+        return len(seen)
+
+    def export(self, entities_data: Iterable[Dict], relations: Iterable[Dict], documents: Iterable[Dict]) -> Dict:
+        """Exporte documents, entités, mentions et relations (textes dans le DocumentStore).
+
+        Chaque source n'est parcourue qu'une fois, dans cet ordre : documents, entités, relations.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        documents = self.write_documents(documents, self.document_store_path)
+        mentions = self.write_mentions(entities_data)
+        relations = self.write_relations(relations)
+        self.stats.update(documents=documents, entities=self.write_entities(), mentions=mentions,
+                          relations=relations)
+
+        with open(self.output_dir / 'import.sh', 'w', encoding='utf-8') as f:
+            f.write(self.import_command() + "\n")
+
+        return self.stats
+
+    def import_command(self, database: str = 'neo4j') -> str:
+        """Commande neo4j-admin correspondant aux fichiers générés (base arrêtée)."""
+        d = self.output_dir
+        return (
+            f"neo4j-admin database import full {database} --overwrite-destination "
+            f"--id-type=integer --multiline-fields=true --array-delimiter='{ARRAY_DELIMITER}' "
+            f"--nodes=Document={d / 'documents_header.csv'},{d / 'documents.csv'} "
+            f"--nodes=Entity={d / 'entities_header.csv'},{d / 'entities.csv'} "
+            f"--relationships=MENTIONED_IN={d / 'mentions_header.csv'},{d / 'mentions.csv'} "
+            f"--relationships={d / 'relations_header.csv'},{d / 'relations.csv'}"
+        )
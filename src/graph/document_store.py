@@ -0,0 +1,154 @@
+# src/graph/document_store.py
+
+import hashlib
+import json
+import mmap
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+INDEX_FILE = 'documents_index.json'
+# Textes d'une version du store : documents-<génération>.bin, désigné par l'index
+BLOB_PATTERN = 'documents-%s.bin'
+
+
+def read_index(path: str | Path) -> Dict:
+    """Index du store : {'blob': fichier des textes, 'documents': id → (offset, octets, caractères)}."""
+    with open(Path(path) / INDEX_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def publish_index(path: Path, index: Dict):
+    """Publie une version du store : l'index, qui désigne son fichier de textes, est remplacé
+    par un seul renommage ; un lecteur voit l'ancienne ou la nouvelle version, jamais un
+    mélange des deux. Les fichiers de textes des versions précédentes sont ensuite supprimés
+    (un store déjà ouvert garde le sien)."""
+    with open(path / (INDEX_FILE + '.tmp'), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(path / (INDEX_FILE + '.tmp'), path / INDEX_FILE)
+    for blob in path.glob(BLOB_PATTERN % '*'):
+        if blob.name != index['blob']:
+            try:
+                blob.unlink()
+            except OSError:
+                pass
+
+
+def write_document_store(documents: Iterable[Dict], path: str | Path) -> Dict:
+    """Écrit les textes bout à bout (UTF-8) dans un nouveau fichier et l'index
+    id → (offset, octets, caractères) qui le désigne (voir publish_index)."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    blob = BLOB_PATTERN % uuid.uuid4().hex
+    index = {}
+    offset = 0
+    with open(path / blob, 'wb') as f:
+        for doc in documents:
+            doc_id = doc['filename']
+            if doc_id in index:
+                continue
+            data = doc['text'].encode('utf-8')
+            f.write(data)
+            index[doc_id] = [offset, len(data), len(doc['text'])]
+            offset += len(data)
+
+    publish_index(path, {'blob': blob, 'documents': index})
+    return {'documents': len(index), 'bytes': offset}
+
+
+def content_hash(text: str) -> str:
+    """Empreinte du texte d'un document (détecte les documents modifiés)."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def append_document_store(documents: Iterable[Dict], path: str | Path) -> Dict:
+    """Ajoute des textes en fin de store, sans réécrire les textes existants.
+
+    Un document déjà présent pointe vers son nouveau texte (l'ancien reste dans le
+    fichier jusqu'à la prochaine reconstruction). Les textes sont ajoutés après les
+    octets que l'index en place désigne, qui ne changent pas, puis l'index est publié.
+    """
+    path = Path(path)
+    if not DocumentStore.exists(path):
+        return write_document_store(documents, path)
+
+    index = read_index(path)
+    entries = index['documents']
+    added = 0
+    written = 0
+    with open(path / index['blob'], 'ab') as f:
+        offset = f.tell()
+        for doc in documents:
+            data = doc['text'].encode('utf-8')
+            f.write(data)
+            entries[doc['filename']] = [offset, len(data), len(doc['text'])]
+            offset += len(data)
+            written += len(data)
+            added += 1
+
+    publish_index(path, index)
+    return {'documents': added, 'bytes': written}
+
+
+class DocumentStore:
+    """Textes des documents hors du graphe, lus par tranches via mmap."""
+
+    def __init__(self, path: str | Path):
+        path = Path(path)
+        blob = None
+        while True:
+            index = read_index(path)
+            if index['blob'] == blob:
+                raise FileNotFoundError(f"Textes du store introuvables: {path / blob}")
+            blob = index['blob']
+            try:
+                self._file = open(path / blob, 'rb')
+                break
+            except FileNotFoundError:
+                # Store republié entre la lecture de l'index et l'ouverture des textes
+                continue
+        self.index = index['documents']
+
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap refuse un fichier vide
+        self._blob = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    @staticmethod
+    def exists(path: str | Path) -> bool:
+        if not (Path(path) / INDEX_FILE).exists():
+            return False
+        return (Path(path) / read_index(path)['blob']).exists()
+
+    def close(self):
+        if isinstance(self._blob, mmap.mmap):
+            self._blob.close()
+        self._file.close()
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def num_chars(self, doc_id: str) -> int:
+        entry = self.index.get(doc_id)
+        return entry[2] if entry else 0
+
+    def text(self, doc_id: str, max_chars: int = None) -> str:
+        """Texte du document, tronqué à max_chars sans décoder le reste."""
+        entry = self.index.get(doc_id)
+        if entry is None:
+            return ''
+
+        offset, num_bytes, num_chars = entry
+        if max_chars is None or max_chars >= num_chars:
+            return str(memoryview(self._blob)[offset:offset + num_bytes], 'utf-8')
+
+        # Un caractère UTF-8 fait au plus 4 octets ; un caractère coupé en fin est ignoré
+        end = offset + min(num_bytes, 4 * max_chars)
+        return str(memoryview(self._blob)[offset:end], 'utf-8', 'ignore')[:max_chars]
+
+    def texts(self, doc_ids: List[str], max_chars: int = None) -> Dict[str, str]:
+        return {doc_id: self.text(doc_id, max_chars) for doc_id in doc_ids}
@@ -0,0 +1,232 @@
+# src/graph/entity_filter.py
+
+import hashlib
+import math
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Iterable
+import numpy as np
+from .backend import GraphQueriesBackend
+
+DEFAULT_ERROR_RATE = 0.01
+NEGATIVE_CACHE_SIZE = 10000
+
+
+def lookup_key(entity_name: str) -> str:
+    """Clé de recherche d'une entité : son nom normalisé (un nom exact y est toujours inclus)."""
+    return entity_name.lower()
+
+
+class BloomFilter:
+    """Filtre de Bloom sur tableau de bits NumPy : « absent » est certain, « présent » probable."""
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[str], error_rate: float = DEFAULT_ERROR_RATE) -> 'BloomFilter':
+        keys = list(dict.fromkeys(keys))
+        bloom = cls(len(keys), error_rate)
+        bloom.update(keys)
+        return bloom
+
+    def _positions(self, key: str) -> np.ndarray:
+        """Double hachage (Kirsch-Mitzenmacher) sur un condensé BLAKE2b de 128 bits."""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return np.array([(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)], dtype=np.int64)
+
+    def update(self, keys: Iterable[str]):
+        for key in keys:
+            positions = self._positions(key)
+            np.bitwise_or.at(self.bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+            self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._positions(key)
+        return bool(np.all(self.bits[positions >> 3] & (1 << (positions & 7)).astype(np.uint8)))
+
+    def save(self, path: str | Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, bits=self.bits, params=np.array([self.num_bits, self.num_hashes, self.count]))
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'BloomFilter':
+        with np.load(path) as arrays:
+            bloom = cls.__new__(cls)
+            bloom.bits = arrays['bits']
+            bloom.num_bits, bloom.num_hashes, bloom.count = (int(v) for v in arrays['params'])
+        return bloom
+
+
+class FilteredGraphQueries:
+    """Répond localement aux recherches d'entités absentes du graphe avant tout appel au backend.
+
+    Le filtre de Bloom écarte les noms certainement absents ; un cache LRU borné
+    retient les faux positifs confirmés par le backend. Les autres méthodes du
+    contrat GraphQueriesBackend sont déléguées telles quelles.
+    """
+
+    def __init__(self, queries: GraphQueriesBackend, bloom: BloomFilter, negative_cache_size: int = NEGATIVE_CACHE_SIZE,
+                 version=None, path: str | Path = None):
+        self.queries = queries
+        self.bloom = bloom
+        self.negative_cache_size = negative_cache_size
+        # Quand la version du graphe change : cache négatif vidé, filtre relu depuis `path`
+        self.version = version
+        self.path = path
+        self._version = version.current() if version is not None else None
+        self._missing = OrderedDict()
+        self.counters = {'lookups': 0, 'bloom_rejected': 0, 'negative_cache_hits': 0,
+                         'backend_lookups': 0, 'backend_misses': 0}
+
+    def __getattr__(self, name):
+        return getattr(self.queries, name)
+
+    def close(self):
+        self.queries.close()
+
+    def filter_stats(self) -> Dict:
+        """Compteurs de succès / échecs du filtre et du cache négatif."""
+        stats = dict(self.counters)
+        stats['negative_cache_size'] = len(self._missing)
+        stats['filtered_names'] = self.bloom.count
+        return stats
+
+    def _check_version(self):
+        current = self.version.current()
+        if current != self._version:
+            self._version = current
+            self._missing.clear()
+            if self.path is not None and Path(self.path).exists():
+                self.bloom = BloomFilter.load(self.path)
+
+    def known(self, entity_name: str) -> bool:
+        """False si l'entité est certainement absente (filtre ou cache négatif), sans appel au backend."""
+        if self.version is not None:
+            self._check_version()
+        self.counters['lookups'] += 1
+        key = lookup_key(entity_name)
+        if key not in self.bloom:
+            self.counters['bloom_rejected'] += 1
+            return False
+        if key in self._missing:
+            self._missing.move_to_end(key)
+            self.counters['negative_cache_hits'] += 1
+            return False
+        self.counters['backend_lookups'] += 1
+        return True
+
+    def _record_miss(self, entity_name: str):
+        self.counters['backend_misses'] += 1
+        self._missing[lookup_key(entity_name)] = True
+        self._missing.move_to_end(lookup_key(entity_name))
+        while len(self._missing) > self.negative_cache_size:
+            self._missing.popitem(last=False)
+
+    def add_entities(self, entity_names: Iterable[str]):
+        """Déclare des entités ajoutées au graphe (filtre mis à jour, cache négatif purgé)."""
+        for name in entity_names:
+            key = lookup_key(name)
+            self.bloom.update([key])
+            self._missing.pop(key, None)
+
+    def find_entity(self, entity_name: str) -> Dict:
+        if not self.known(entity_name):
+            return None
+        entity = self.queries.find_entity(entity_name)
+        if entity is None:
+            self._record_miss(entity_name)
+        return entity
+
+    def get_entity_with_documents(self, entity_name: str, limit_docs: int = 5) -> Dict:
+        if not self.known(entity_name):
+            return None
+        data = self.queries.get_entity_with_documents(entity_name, limit_docs)
+        if data is None:
+            self._record_miss(entity_name)
+        return data
+
+    def get_neighbors(self, entity_name: str, max_depth: int = 1, limit: int = 10,
+                      relation_types: List[str] = None) -> List[Dict]:
+        if not self.known(entity_name):
+            return []
+        return self.queries.get_neighbors(entity_name, max_depth, limit, relation_types=relation_types)
+
+    def get_neighbors_bounded(self, entity_name: str, max_depth: int = 2, limit: int = 10, **kwargs) -> List[Dict]:
+        if not self.known(entity_name):
+            return []
+        return self.queries.get_neighbors_bounded(entity_name, max_depth, limit, **kwargs)
+
+    def get_related_entities(self, entity_name: str, limit: int = 10,
+                             relation_types: List[str] = None) -> List[Dict]:
+        if not self.known(entity_name):
+            return []
+        return self.queries.get_related_entities(entity_name, limit, relation_types=relation_types)
+
+    def find_path(self, entity1: str, entity2: str) -> Dict:
+        if not (self.known(entity1) and self.known(entity2)):
+            return None
+        return self.queries.find_path(entity1, entity2)
+
+    def expand_entities(self, entity_names: List[str], max_depth: int = 1, limit_docs: int = 3,
+                        limit_related: int = 5, limit_neighbors: int = 5, hub_limits: Dict = None) -> List[Dict]:
+        """Seules les entités possiblement présentes partent au backend ; l'ordre des noms est conservé."""
+        candidates = [name for name in entity_names if self.known(name)]
+        expanded = {}
+        if candidates:
+            for item in self.queries.expand_entities(candidates, max_depth, limit_docs, limit_related,
+                                                     limit_neighbors, hub_limits):
+                if item['entity_data'] is None:
+                    self._record_miss(item['name'])
+                expanded[item['name']] = item
+        return [expanded.get(name) or {'name': name, 'entity_data': None, 'related': [], 'neighbors': []}
+                for name in entity_names]
+
+
+def filter_settings(config=None) -> Dict:
+    """Paramètres de `graph.entity_filter` (filtre actif par défaut)."""
+    settings = (config.get('graph.entity_filter', {}) if config else {}) or {}
+    return {
+        'enabled': settings.get('enabled', True),
+        'path': settings.get('path', 'data/graph/entity_filter.npz'),
+        'error_rate': settings.get('error_rate', DEFAULT_ERROR_RATE),
+        'negative_cache_size': settings.get('negative_cache_size', NEGATIVE_CACHE_SIZE)
+    }
+
+
+def build_entity_filter(entity_names: Iterable[str], config=None) -> BloomFilter:
+    """Construit et sauvegarde le filtre des noms d'entités (appelé à la construction du graphe)."""
+    settings = filter_settings(config)
+    bloom = BloomFilter.from_keys((lookup_key(name) for name in entity_names), settings['error_rate'])
+    bloom.save(settings['path'])
+    return bloom
+
+
+def extend_entity_filter(entity_names: Iterable[str], path: str | Path) -> bool:
+    """Ajoute des noms au filtre sauvegardé (ingestion incrémentale), s'il existe.
+
+    Le filtre n'est pas redimensionné : son taux d'erreur augmente avec les ajouts,
+    jusqu'à la prochaine construction complète du graphe.
+    """
+    if not Path(path).exists():
+        return False
+    bloom = BloomFilter.load(path)
+    bloom.update(lookup_key(name) for name in entity_names)
+    bloom.save(path)
+    return True
+
+
+def with_entity_filter(queries, config=None, version=None):
+    """Place le filtre devant le backend s'il est activé et déjà construit, sinon renvoie le backend."""
+    settings = filter_settings(config)
+    if not settings['enabled'] or not Path(settings['path']).exists():
+        return queries
+    return FilteredGraphQueries(queries, BloomFilter.load(settings['path']), settings['negative_cache_size'],
+                                version, settings['path'])
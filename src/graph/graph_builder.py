@@ -1,14 +1,36 @@
 # src/graph/graph_builder.py
 
 from neo4j import GraphDatabase
-from typing import List, Dict
+from collections import Counter
+from itertools import combinations
+from typing import List, Dict, Iterable, Iterator
 from tqdm import tqdm
+import numpy as np
+from .batch_writer import (BatchWriter, DEGREE_STATS_QUERY, METRICS_QUERY, ADJACENCY_QUERY,
+                           MIGRATE_RELATIONS_QUERY, MIGRATION_FILTERS, LABEL_ENTITIES_QUERY, STALE_LABEL_QUERY,
+                           DOCUMENT_HASHES_QUERY, DETACH_MENTIONS_QUERY, ENTITY_DOCUMENTS_QUERY,
+                           ENTITY_PARTNERS_QUERY, COOCCURRENCE_QUERY, STALE_RELATIONS_QUERY,
+                           DOCUMENT_RELATION_TYPES, ORPHAN_ENTITIES_QUERY, ENTITY_DEGREE_QUERY,
+                           REMOVE_LABELS, LABELS_QUERY, entities_query)
+from .mention_aggregator import MentionAggregator
+from .backend import GraphBuilderBackend, RELATION_TYPES, relation_type, entity_label
+from .document_store import append_document_store, content_hash, write_document_store
+from .graph_metrics import GraphMetrics, metrics_summary
 
-class GraphBuilder:
+# Documents communs minimum d'une relation de co-occurrence (comme 02_extract_entities.py)
+MIN_COOCCURRENCE = 3
+# Documents minimum d'une des deux entités d'une co-occurrence (filtre is_frequent de l'extraction)
+MIN_MENTIONS = 3
+
+class GraphBuilder(GraphBuilderBackend):
     """Construit le graphe de connaissances dans Neo4j."""
     
-    def __init__(self, uri: str, user: str, password: str):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    def __init__(self, uri: str, user: str, password: str, batch_size: int = 1000, driver=None,
+                 document_store_path: str = 'data/graph/documents'):
+        self.driver = driver or GraphDatabase.driver(uri, auth=(user, password))
+        self.batch_size = batch_size
+        self.document_store_path = document_store_path
+        self.last_build_stats = {}
         self._create_constraints()
     
     def close(self):
@@ -22,6 +44,15 @@ class GraphBuilder:
                 session.run("CREATE CONSTRAINT document_id IF NOT EXISTS FOR (d:Document) REQUIRE d.id IS UNIQUE")
                 session.run("CREATE INDEX entity_type IF NOT EXISTS FOR (e:Entity) ON (e.type)")
                 session.run("CREATE INDEX entity_normalized IF NOT EXISTS FOR (e:Entity) ON (e.normalized_name)")
+                # Index plein texte (Lucene, analyseur sans accents) pour search_by_query / get_document_by_title
+                session.run("""
+                    CREATE FULLTEXT INDEX entity_names IF NOT EXISTS FOR (e:Entity) ON EACH [e.name]
+                    OPTIONS {indexConfig: {`fulltext.analyzer`: 'standard-folding'}}
+                """)
+                session.run("""
+                    CREATE FULLTEXT INDEX document_titles IF NOT EXISTS FOR (d:Document) ON EACH [d.title]
+                    OPTIONS {indexConfig: {`fulltext.analyzer`: 'standard-folding'}}
+                """)
             except:
                 pass
     
@@ -29,8 +60,10 @@ class GraphBuilder:
         """Efface toute la base de données."""
         with self.driver.session() as session:
             session.run("MATCH (n) DETACH DELETE n")
+        self.mark_changed()
     
-    def extract_title_from_text(self, text: str, filename: str) -> str:
+    @staticmethod
+    def extract_title_from_text(text: str, filename: str) -> str:
         """Extrait le titre depuis la première ligne du document."""
         lines = text.split('\n')
         
@@ -46,12 +79,13 @@ class GraphBuilder:
     
     def create_entity(self, session, entity: Dict):
         """Crée un nœud entité."""
+        label = entity_label(entity['label'])
         query = """
         MERGE (e:Entity {name: $name})
         SET e.type = $type,
-            e.normalized_name = $normalized_name
+            e.normalized_name = $normalized_name%s
         RETURN e
-        """
+        """ % (f", e:{label}" if label else '')
         session.run(query, 
                    name=entity['text'],
                    type=entity['label'],
@@ -62,9 +96,9 @@ class GraphBuilder:
         query = """
         MATCH (a:Entity {name: $subject})
         MATCH (b:Entity {name: $object})
-        MERGE (a)-[r:RELATES_TO {type: $predicate}]->(b)
+        MERGE (a)-[r:%s {type: $predicate}]->(b)
         SET r.method = $method
-        """
+        """ % relation_type(relation['predicate'])
         
         params = {
             'subject': relation['subject'],
@@ -94,8 +128,9 @@ class GraphBuilder:
         SET d.filename = $filename,
             d.title = $title,
             d.path = $path,
-            d.text = $text,
-            d.num_chars = $num_chars
+            d.num_chars = $num_chars,
+            d.content_hash = $content_hash
+        REMOVE d.text
         RETURN d
         """
         session.run(query,
@@ -103,8 +138,8 @@ class GraphBuilder:
                    filename=document['filename'],
                    title=title,
                    path=document['path'],
-                   text=document['text'],
-                   num_chars=len(document['text']))
+                   num_chars=len(document['text']),
+                   content_hash=content_hash(document['text']))
     
     def link_entity_to_document(self, session, entity_name: str, document_id: str, context: str = None):
         """Lie une entité à un document avec contexte."""
@@ -131,15 +166,92 @@ class GraphBuilder:
         end = min(len(text), entity['end'] + window)
         return text[start:end]
     
-    def build_graph(self, entities_data: List[Dict], relations: List[Dict], documents: List[Dict]):
-        """Construit le graphe complet."""
+    @staticmethod
+    def document_row(document: Dict, with_text: bool = True) -> Dict:
+        """Prépare la ligne d'écriture d'un document."""
+        row = {
+            'id': document['filename'],
+            'filename': document['filename'],
+            'title': GraphBuilder.extract_title_from_text(document['text'], document['filename']),
+            'path': document['path'],
+            'num_chars': len(document['text']),
+            'content_hash': content_hash(document['text'])
+        }
+        if with_text:
+            row['text'] = document['text']
+        return row
+    
+    @staticmethod
+    def relation_row(relation: Dict) -> Dict:
+        """Prépare la ligne d'écriture d'une relation (propriétés optionnelles incluses)."""
+        props = {'method': relation.get('method', 'unknown')}
+        
+        if 'common_docs' in relation:
+            props['common_docs'] = relation['common_docs']
+            props['strength'] = relation.get('strength', 1)
+        
+        if 'distance' in relation:
+            props['distance'] = relation['distance']
+        
+        if 'doc_id' in relation:
+            props['doc_ids'] = relation.get('doc_ids', [relation['doc_id']])
+        
+        return {
+            'subject': relation['subject'],
+            'object': relation['object'],
+            'predicate': relation['predicate'],
+            'rel_type': relation_type(relation['predicate']),
+            'props': props
+        }
+    
+    def build_graph(self, entities_data: List[Dict], relations: List[Dict], documents: List[Dict],
+                    batched: bool = True):
+        """Construit le graphe complet (par lots UNWIND, ou ligne par ligne si batched=False)."""
+        if not batched:
+            return self.build_graph_per_row(entities_data, relations, documents)
+        
+        writer = BatchWriter(self.driver, batch_size=self.batch_size)
+        
+        print(f"Écriture des textes dans {self.document_store_path}...")
+        store_stats = write_document_store(documents, self.document_store_path)
+        print(f"  {store_stats['documents']:,} documents, {store_stats['bytes']:,} octets")
+        
+        print(f"Création des documents (lots de {writer.batch_size})...")
+        writer.write_documents(self.document_row(doc, with_text=False) for doc in documents)
+        
+        print("Agrégation des mentions...")
+        aggregator = MentionAggregator().add_documents(entities_data)
+        summary = aggregator.summary()
+        print(f"  {summary['mentions']:,} mentions → {summary['unique_entities']:,} entités, "
+              f"{summary['unique_pairs']:,} paires (entité, document)")
+        
+        print("Création des entités...")
+        writer.write_entities(aggregator.entity_rows())
+        
+        print("Création des mentions...")
+        writer.write_mentions(aggregator.mention_rows())
+        
+        print("Création des relations...")
+        writer.write_relations(self.relation_row(rel) for rel in relations)
+        
+        print("Calcul des degrés des entités...")
+        self.update_degree_statistics()
+        
+        print(writer.report())
+        self.last_build_stats = writer.stats
+        self.mark_changed()
+        return writer.stats
+    
+    def build_graph_per_row(self, entities_data: List[Dict], relations: List[Dict], documents: List[Dict]):
+        """Construit le graphe complet avec une requête par ligne (mode historique)."""
+        write_document_store(documents, self.document_store_path)
+        
         with self.driver.session() as session:
             print("Création des documents...")
             for doc in tqdm(documents):
                 self.create_document_node(session, doc)
             
             print("Création des entités...")
-            entity_contexts = {}
             for entity_data in tqdm(entities_data):
                 doc_id = entity_data['document_id']
                 doc_text = entity_data.get('text', '')
@@ -148,9 +260,6 @@ class GraphBuilder:
                     self.create_entity(session, entity)
                     
                     context = self.extract_context(doc_text, entity)
-                    entity_key = (entity['text'], doc_id)
-                    entity_contexts[entity_key] = context
-                    
                     self.link_entity_to_document(session, entity['text'], doc_id, context)
             
             print("Création des relations...")
@@ -159,6 +268,234 @@ class GraphBuilder:
                     self.create_relation(session, relation)
                 except:
                     pass
+        
+        self.update_degree_statistics()
+        self.mark_changed()
+    
+    def document_hashes(self, doc_ids: List[str]) -> Dict[str, str]:
+        """Empreinte du texte des documents déjà présents dans le graphe (id → content_hash)."""
+        with self.driver.session() as session:
+            result = session.run(DOCUMENT_HASHES_QUERY, ids=list(doc_ids))
+            return {record['id']: record['content_hash'] for record in result}
+    
+    @staticmethod
+    def cooccurrence_pairs(names_by_doc: Iterable[Iterable[str]]) -> set:
+        """Paires de noms normalisés (minuscules, ordre alphabétique) cités ensemble dans
+        au moins un document, comme les co-occurrences de l'extraction."""
+        pairs = set()
+        for names in names_by_doc:
+            pairs.update(combinations(sorted({name.lower() for name in names}), 2))
+        return pairs
+    
+    @staticmethod
+    def cooccurrence_rows(pairs: Iterable[tuple], docs_by_name: Dict[str, List[str]], min_strength: int,
+                          min_mentions: int) -> Iterator[Dict]:
+        """Lignes de COOCCURRENCE_QUERY : même définition que la construction complète
+        (documents communs des noms normalisés, au moins `min_strength`, et une des deux
+        entités citée dans au moins `min_mentions` documents, voir is_frequent)."""
+        for a, b in sorted(pairs):
+            docs_a, docs_b = set(docs_by_name.get(a, ())), set(docs_by_name.get(b, ()))
+            common = sorted(docs_a & docs_b)
+            yield {
+                'subject': a,
+                'object': b,
+                'common_docs': common,
+                'strength': len(common),
+                'keep': len(common) >= min_strength and max(len(docs_a), len(docs_b)) >= min_mentions
+            }
+    
+    def entity_documents(self, names: Iterable[str]) -> Dict[str, List[str]]:
+        """Documents qui citent chaque nom normalisé (ENTITY_DOCUMENTS_QUERY)."""
+        with self.driver.session() as session:
+            result = session.run(ENTITY_DOCUMENTS_QUERY, names=sorted(names))
+            return {record['name']: record['docs'] for record in result}
+    
+    def upsert_documents(self, entities_data: List[Dict], documents: List[Dict],
+                         min_strength: int = MIN_COOCCURRENCE, relations: List[Dict] = (),
+                         min_mentions: int = MIN_MENTIONS) -> Dict:
+        """Écrit des documents nouveaux ou modifiés sans reconstruire le graphe.
+        
+        Les mentions de ces documents sont remplacées ; ils sont retirés des relations de
+        proximité et de syntaxe de leurs versions précédentes (supprimées quand plus aucun
+        document ne les porte), puis `relations` est ajouté avec le filtre de l'extraction
+        (une des entités citée dans au moins `min_mentions` documents). La co-occurrence est
+        recalculée pour les paires d'entités qu'ils citent (avant ou après modification) et
+        pour toutes les paires des entités dont le nombre de documents franchit
+        `min_mentions` ; les entités qui ne sont plus citées nulle part sont supprimées.
+        Hormis le retrait des anciennes relations de proximité et de syntaxe, qui parcourt
+        les relations de ces types, le coût dépend de la taille du lot, pas du graphe.
+        
+        Les relations de proximité et de syntaxe des autres documents gardent le filtrage
+        de la dernière construction complète.
+        """
+        writer = BatchWriter(self.driver, batch_size=self.batch_size)
+        append_document_store(documents, self.document_store_path)
+        doc_ids = [doc['filename'] for doc in documents]
+        
+        with self.driver.session() as session:
+            result = session.run(DETACH_MENTIONS_QUERY, ids=doc_ids)
+            previous = {record['id']: record['names'] for record in result}
+            for rel_type in DOCUMENT_RELATION_TYPES:
+                session.run(STALE_RELATIONS_QUERY % rel_type, ids=doc_ids).consume()
+        
+        writer.write_documents(self.document_row(doc, with_text=False) for doc in documents)
+        aggregator = MentionAggregator().add_documents(entities_data)
+        writer.write_entities(aggregator.entity_rows())
+        writer.write_mentions(aggregator.mention_rows())
+        
+        current = {}
+        for mention in aggregator.mention_rows():
+            current.setdefault(mention['document_id'], []).append(mention['entity_name'])
+        pairs = self.cooccurrence_pairs(list(previous.values()) + list(current.values()))
+        relation_rows = [self.relation_row(rel) for rel in relations]
+        cited_before = Counter(name for names in previous.values() for name in {n.lower() for n in names})
+        names = (set(cited_before) | {name.lower() for names in current.values() for name in names}
+                 | {row[end].lower() for row in relation_rows for end in ('subject', 'object')})
+        docs_by_name = self.entity_documents(names)
+        
+        # Entités dont le nombre de documents franchit min_mentions : toutes leurs paires
+        # changent de décision, y compris celles des documents inchangés
+        changed = set(doc_ids)
+        crossed = []
+        for name in sorted(names):
+            docs = set(docs_by_name.get(name, ()))
+            before = len(docs - changed) + cited_before[name]
+            if (before >= min_mentions) != (len(docs) >= min_mentions):
+                crossed.append(name)
+        if crossed:
+            with self.driver.session() as session:
+                result = session.run(ENTITY_PARTNERS_QUERY, names=crossed)
+                for record in result:
+                    pairs.update(tuple(sorted((record['name'], partner))) for partner in record['partners'])
+            partners = {name for pair in pairs for name in pair} - set(docs_by_name)
+            if partners:
+                docs_by_name.update(self.entity_documents(partners))
+        
+        def frequent(row: Dict) -> bool:
+            return max(len(docs_by_name.get(row['subject'].lower(), ())),
+                       len(docs_by_name.get(row['object'].lower(), ()))) >= min_mentions
+        
+        if relation_rows:
+            writer.write_document_relations(row for row in relation_rows if frequent(row))
+        writer.write_rows('cooccurrences', COOCCURRENCE_QUERY,
+                          self.cooccurrence_rows(pairs, docs_by_name, min_strength, min_mentions))
+        
+        removed = {name for names in previous.values() for name in names} - set(aggregator.entities)
+        writer.write_rows('orphans', ORPHAN_ENTITIES_QUERY, ({'name': name} for name in sorted(removed)))
+        
+        touched = set(aggregator.entities) | {name for pair in pairs for name in pair}
+        writer.write_rows('degrees', ENTITY_DEGREE_QUERY, ({'name': name} for name in sorted(touched)))
+        
+        self.last_build_stats = writer.stats
+        self.mark_changed()
+        return {
+            'entities': len(aggregator.entities),
+            'mentions': len(aggregator.mentions),
+            'pairs': len(pairs)
+        }
+    
+    def update_entity(self, entity_name: str, new_data: Dict) -> bool:
+        """Met à jour les propriétés d'une entité ; `type` (ou `label`) change aussi son label.
+        
+        Le nom n'est pas modifiable (clé des mentions et relations). False si l'entité est absente.
+        """
+        props = {key: value for key, value in new_data.items() if key not in ('name', 'type', 'label')}
+        entity_type = new_data.get('type', new_data.get('label'))
+        with self.driver.session() as session:
+            record = session.run("MATCH (e:Entity {name: $name}) SET e += $props RETURN e.type AS type",
+                                 name=entity_name, props=props).single()
+        if record is None:
+            return False
+        
+        if entity_type and entity_type != record['type']:
+            label, old_label = entity_label(entity_type), entity_label(record['type'])
+            query = entities_query(label, [old_label] if old_label else [])
+            if label is None and old_label:
+                query += REMOVE_LABELS % old_label
+            BatchWriter(self.driver).write_rows('entities', query, [{
+                'name': entity_name, 'type': entity_type, 'normalized_name': entity_name.lower()}])
+        self.mark_changed()
+        return True
+    
+    def update_degree_statistics(self):
+        """Met à jour `degree` (relations entité — entité) et `document_count` (MENTIONED_IN) des entités."""
+        with self.driver.session() as session:
+            session.run(DEGREE_STATS_QUERY).consume()
+    
+    @staticmethod
+    def _migrate_batch(tx, query: str, batch_size: int) -> int:
+        return tx.run(query, batch_size=batch_size).single()['migrated']
+    
+    def migrate_relation_types(self) -> Dict:
+        """Convertit les relations RELATES_TO {type: prédicat} en types natifs, par lots."""
+        migrated = {}
+        with self.driver.session() as session:
+            for rel_type in RELATION_TYPES:
+                query = MIGRATE_RELATIONS_QUERY % (MIGRATION_FILTERS[rel_type], rel_type)
+                migrated[rel_type] = 0
+                while True:
+                    count = session.execute_write(self._migrate_batch, query, self.batch_size)
+                    migrated[rel_type] += count
+                    if count < self.batch_size:
+                        break
+        
+        self.update_degree_statistics()
+        self.mark_changed()
+        return migrated
+    
+    def migrate_entity_labels(self) -> Dict:
+        """Ajoute le label de type (`:Person`, `:Gpe`...) aux entités existantes, par lots,
+        et retire les labels qui ne correspondent plus au type."""
+        labeled = {}
+        with self.driver.session() as session:
+            types = [record['type'] for record in
+                     session.run("MATCH (e:Entity) WHERE e.type IS NOT NULL RETURN DISTINCT e.type AS type")]
+            labels = {}
+            for entity_type in types:
+                label = entity_label(entity_type)
+                if label:
+                    labels.setdefault(label, []).append(entity_type)
+            
+            for label, label_types in labels.items():
+                labeled[label] = 0
+                query = LABEL_ENTITIES_QUERY % (label, label)
+                for entity_type in label_types:
+                    while True:
+                        count = session.execute_write(self._label_batch, query, entity_type, self.batch_size)
+                        labeled[label] += count
+                        if count < self.batch_size:
+                            break
+            
+            existing = [record['label'] for record in session.run(LABELS_QUERY)]
+            for label in existing:
+                if label in ('Entity', 'Document'):
+                    continue
+                session.run(STALE_LABEL_QUERY % (label, label), types=labels.get(label, [])).consume()
+        self.mark_changed()
+        return labeled
+    
+    @staticmethod
+    def _label_batch(tx, query: str, entity_type: str, batch_size: int) -> int:
+        return tx.run(query, type=entity_type, batch_size=batch_size).single()['migrated']
+    
+    def compute_metrics(self, metrics: GraphMetrics = None) -> Dict:
+        """Exporte l'adjacence, calcule PageRank (et betweenness) hors de Neo4j et réécrit par lots."""
+        metrics = metrics or GraphMetrics()
+        with self.driver.session() as session:
+            names = [record['name'] for record in session.run("MATCH (e:Entity) RETURN e.name AS name")]
+            index = {name: i for i, name in enumerate(names)}
+            src, dst, weights = [], [], []
+            for record in session.run(ADJACENCY_QUERY):
+                src.append(index[record['src']])
+                dst.append(index[record['dst']])
+                weights.append(record['weight'])
+        
+        values = metrics.compute(len(names), np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64),
+                                 np.array(weights, dtype=np.float64))
+        writer = BatchWriter(self.driver, batch_size=self.batch_size)
+        writer.write_rows('metrics', METRICS_QUERY, metrics.rows(names, values))
+        self.mark_changed()
+        return metrics_summary(names, values)
     
     def get_statistics(self) -> Dict:
         """Récupère les statistiques du graphe."""
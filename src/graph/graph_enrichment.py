@@ -27,6 +27,5 @@ class GraphEnrichment:
         return []
     
     def compute_entity_importance(self, entity: Dict) -> float:
-        """Calcule l'importance d'une entité dans le graphe."""
-        # À implémenter : degré, betweenness, etc.
-        return 0.5
+        """Importance d'une entité : PageRank précalculé (voir compute_metrics)."""
+        return float(entity.get('pagerank') or 0.0)
@@ -1,41 +1,101 @@
 # src/graph/graph_manager.py
 
 from typing import List, Dict
-from .graph_builder import GraphBuilder
+from .graph_builder import GraphBuilder, MIN_COOCCURRENCE
 from .graph_queries import GraphQueries
+from .bulk_exporter import BulkExporter
+from .document_store import content_hash
+from .entity_filter import extend_entity_filter
+from .query_cache import GraphVersion
 
 class GraphManager:
     """Gestionnaire principal du graphe de connaissances."""
     
-    def __init__(self, uri: str, user: str, password: str):
-        self.builder = GraphBuilder(uri, user, password)
-        self.queries = GraphQueries(uri, user, password)
+    def __init__(self, uri: str, user: str, password: str, batch_size: int = 1000,
+                 document_store_path: str = 'data/graph/documents', version: GraphVersion = None,
+                 entity_filter_path: str = None, driver=None):
+        self.document_store_path = document_store_path
+        self.version = version
+        self.entity_filter_path = entity_filter_path
+        self.builder = GraphBuilder(uri, user, password, batch_size=batch_size, driver=driver,
+                                    document_store_path=document_store_path)
+        self.builder.version = version
+        self.queries = GraphQueries(uri, user, password, document_store_path=document_store_path, driver=driver)
     
     def close(self):
         """Ferme les connexions."""
         self.builder.close()
         self.queries.close()
     
-    def rebuild_graph(self, entities: List[Dict], relations: List[Dict], documents: List[Dict]):
-        """Reconstruit le graphe complet."""
+    def rebuild_graph(self, entities: List[Dict], relations: List[Dict], documents: List[Dict],
+                      bulk_export_dir: str = None):
+        """Reconstruit le graphe complet.
+        
+        Avec `bulk_export_dir`, n'écrit rien dans Neo4j : génère les CSV pour
+        `neo4j-admin database import` et renvoie la commande d'import.
+        """
+        if bulk_export_dir:
+            exporter = BulkExporter(bulk_export_dir, document_store_path=self.document_store_path)
+            exporter.export(entities, relations, documents)
+            self.queries.reload_documents()
+            if self.version is not None:
+                self.version.bump()
+            return exporter.import_command()
+        
         self.builder.clear_database()
         self.builder.build_graph(entities, relations, documents)
+        self.queries.reload_documents()
     
-    def add_documents(self, documents: List[Dict]):
-        """Ajoute de nouveaux documents au graphe."""
-        # À implémenter
-        pass
+    def changed_documents(self, documents: List[Dict]) -> List[Dict]:
+        """Documents absents du graphe ou dont le texte a changé (le dernier l'emporte en cas de doublon)."""
+        known = self.builder.document_hashes(list({doc['filename'] for doc in documents}))
+        changed = {}
+        for doc in documents:
+            if known.get(doc['filename']) != content_hash(doc['text']):
+                changed[doc['filename']] = doc
+        return list(changed.values())
     
-    def update_entity(self, entity_name: str, new_data: Dict):
-        """Met à jour une entité existante."""
-        # À implémenter
-        pass
+    def add_documents(self, documents: List[Dict], entity_extractor, vector_store=None,
+                      min_strength: int = MIN_COOCCURRENCE) -> Dict:
+        """Ajoute ou met à jour des documents sans reconstruire le graphe.
+        
+        Seuls les documents nouveaux ou modifiés sont extraits (`entity_extractor`),
+        écrits dans le graphe et le DocumentStore, et leurs entités ajoutées au filtre
+        des noms et au `vector_store`. Leurs relations de proximité sont recalculées (avec
+        le filtre de fréquence de l'extraction) et celles de leurs versions précédentes
+        retirées ; les relations syntaxiques et l'index d'autocomplétion attendent la
+        prochaine construction complète.
+        """
+        from ..extraction.relation_extractor import RelationExtractor
+        
+        changed = self.changed_documents(documents)
+        stats = {'documents': len(documents), 'changed': len(changed)}
+        if not changed:
+            return stats
+        
+        entities_data = entity_extractor.extract_from_documents(changed)
+        mentions = [entity for doc_entities in entities_data for entity in doc_entities['entities']]
+        
+        # Filtre mis à jour avant le changement de version : les lecteurs relisent le nouveau
+        if self.entity_filter_path:
+            extend_entity_filter({entity['text'] for entity in mentions}, self.entity_filter_path)
+        
+        relation_extractor = RelationExtractor()
+        relations = [relation for doc_entities in entities_data
+                     for relation in relation_extractor.extract_proximity_relations(doc_entities, window=150,
+                                                                                   max_per_doc=20)]
+        stats.update(self.builder.upsert_documents(entities_data, changed, min_strength=min_strength,
+                                                   relations=relations))
+        self.queries.reload_documents()
+        
+        if vector_store is not None:
+            stats['vectors'] = vector_store.upsert_entities(mentions)
+        return stats
+    
+    def update_entity(self, entity_name: str, new_data: Dict) -> bool:
+        """Met à jour une entité existante (False si elle est absente)."""
+        return self.builder.update_entity(entity_name, new_data)
     
     def get_statistics(self) -> Dict:
         """Récupère les statistiques du graphe."""
-        # À implémenter
-        return {
-            'entities': 0,
-            'relationships': 0,
-            'documents': 0
-        }
+        return self.builder.get_statistics()
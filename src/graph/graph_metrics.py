@@ -0,0 +1,136 @@
+# src/graph/graph_metrics.py
+
+from typing import List, Dict
+import numpy as np
+from scipy import sparse
+
+
+def adjacency_matrix(num_nodes: int, src: np.ndarray, dst: np.ndarray, weights: np.ndarray = None) -> sparse.csr_matrix:
+    """Matrice d'adjacence symétrique pondérée (les relations sont parcourues dans les deux sens)."""
+    if weights is None:
+        weights = np.ones(len(src), dtype=np.float64)
+    rows = np.concatenate([src, dst])
+    cols = np.concatenate([dst, src])
+    data = np.concatenate([weights, weights]).astype(np.float64)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(num_nodes, num_nodes))
+
+
+def pagerank(adjacency: sparse.csr_matrix, damping: float = 0.85, tol: float = 1e-8,
+             max_iter: int = 100) -> np.ndarray:
+    """PageRank pondéré par itération de la puissance sur matrice creuse.
+
+    La masse des nœuds sans relation est redistribuée uniformément.
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0)
+
+    out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv_out = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    # Transition colonne-stochastique : rank' = M^T (rank / poids sortant)
+    transition = (sparse.diags(inv_out) @ adjacency).T.tocsr()
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        new_rank = damping * (transition @ rank + rank[dangling].sum() / n) + (1 - damping) / n
+        if np.abs(new_rank - rank).sum() < tol:
+            return new_rank
+        rank = new_rank
+    return rank
+
+
+def sampled_betweenness(adjacency: sparse.csr_matrix, samples: int, seed: int = 0) -> np.ndarray:
+    """Betweenness approchée (Brandes, plus courts chemins non pondérés) depuis `samples` sources."""
+    n = adjacency.shape[0]
+    betweenness = np.zeros(n)
+    if n == 0 or samples <= 0:
+        return betweenness
+
+    indptr, indices = adjacency.indptr, adjacency.indices
+    sources = np.random.default_rng(seed).choice(n, size=min(samples, n), replace=False)
+
+    for s in sources.tolist():
+        sigma = np.zeros(n)
+        sigma[s] = 1
+        distance = np.full(n, -1)
+        distance[s] = 0
+        order = [s]
+        predecessors = {s: []}
+
+        for v in order:
+            for w in indices[indptr[v]:indptr[v + 1]].tolist():
+                if distance[w] < 0:
+                    distance[w] = distance[v] + 1
+                    order.append(w)
+                    predecessors[w] = []
+                if distance[w] == distance[v] + 1:
+                    sigma[w] += sigma[v]
+                    predecessors[w].append(v)
+
+        delta = np.zeros(n)
+        for w in reversed(order):
+            for v in predecessors[w]:
+                delta[v] += sigma[v] / sigma[w] * (1 + delta[w])
+            if w != s:
+                betweenness[w] += delta[w]
+
+    # Extrapolation à toutes les sources ; chemins non orientés comptés deux fois
+    return betweenness * (n / len(sources)) / 2
+
+
+def metrics_summary(names: List[str], metrics: Dict[str, np.ndarray], top: int = 5) -> Dict:
+    """Résumé affichable : nombre d'entités et entités les plus importantes."""
+    ranking = np.argsort(-metrics['pagerank'], kind='stable')[:top]
+    return {
+        'entities': len(names),
+        'top_pagerank': [(names[i], round(float(metrics['pagerank'][i]), 6)) for i in ranking]
+    }
+
+
+class GraphMetrics:
+    """Calcule hors ligne les métriques d'importance des entités."""
+
+    def __init__(self, damping: float = 0.85, max_iter: int = 100, tol: float = 1e-8,
+                 betweenness_samples: int = 0, seed: int = 0):
+        self.damping = damping
+        self.max_iter = max_iter
+        self.tol = tol
+        self.betweenness_samples = betweenness_samples
+        self.seed = seed
+
+    def compute(self, num_entities: int, src: np.ndarray, dst: np.ndarray,
+                weights: np.ndarray = None) -> Dict[str, np.ndarray]:
+        """Degré, degré pondéré, PageRank et (optionnellement) betweenness par entité."""
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        adjacency = adjacency_matrix(num_entities, src, dst, weights)
+
+        metrics = {
+            'degree': np.bincount(np.concatenate([src, dst]), minlength=num_entities),
+            'weighted_degree': np.asarray(adjacency.sum(axis=1)).ravel(),
+            'pagerank': pagerank(adjacency, self.damping, self.tol, self.max_iter)
+        }
+        if self.betweenness_samples > 0:
+            unweighted = adjacency.copy()
+            unweighted.data[:] = 1
+            metrics['betweenness'] = sampled_betweenness(unweighted, self.betweenness_samples, self.seed)
+        return metrics
+
+    def rows(self, names: List[str], metrics: Dict[str, np.ndarray]) -> List[Dict]:
+        """Lignes {name, pagerank, weighted_degree[, betweenness]} pour l'écriture en masse."""
+        keys = [key for key in ('pagerank', 'weighted_degree', 'betweenness') if key in metrics]
+        return [{'name': name, **{key: float(metrics[key][i]) for key in keys}}
+                for i, name in enumerate(names)]
+
+
+def metrics_from_config(config=None) -> GraphMetrics:
+    """GraphMetrics paramétré par `graph.metrics`, ou None si `graph.compute_metrics` est faux."""
+    if not (config.get('graph.compute_metrics', False) if config else False):
+        return None
+    settings = config.get('graph.metrics', {}) or {}
+    return GraphMetrics(
+        damping=settings.get('damping', 0.85),
+        max_iter=settings.get('max_iter', 100),
+        betweenness_samples=settings.get('betweenness_samples', 0)
+    )
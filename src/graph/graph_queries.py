@@ -2,25 +2,198 @@
 
 from neo4j import GraphDatabase
 from typing import List, Dict
+from .backend import (GraphQueriesBackend, DEFAULT_FANOUT, DEFAULT_HUB_TYPES, DEFAULT_HUB_DEGREE,
+                      check_relation_types, entity_label)
+from .document_store import DocumentStore
+from .text_index import lucene_query
 
-class GraphQueries:
-    """Requêtes pour interroger le graphe avec optimisation mémoire."""
+# Recherche d'entité par nom exact, sinon par nom normalisé : deux recherches d'index
+# réunies par UNION (un OR entre deux propriétés empêche souvent l'usage des index)
+ENTITY_LOOKUP = """
+CALL {
+    MATCH (e:Entity {name: $name}) RETURN e, 0 AS rank
+    UNION
+    MATCH (e:Entity {normalized_name: $normalized}) RETURN e, 1 AS rank
+}
+WITH e ORDER BY rank LIMIT 1
+"""
+
+# Voisins candidats (neighbor, depth) : tous les chemins `-[*1..d]-`, ou saut par saut
+# avec fan-out borné et hubs non développés (voir bounded_hops)
+ALL_PATHS_CANDIDATES = """
+    OPTIONAL MATCH path = (start:Entity)-[*1..%d]-(neighbor:Entity)
+    WHERE start.name = name
+    WITH DISTINCT neighbor, length(path) AS depth
+"""
+
+BOUNDED_CANDIDATES = """
+    MATCH (start:Entity)
+    WHERE start.name = name
+    CALL {
+%s
+    }
+    WITH start, neighbor, min(depth) AS depth
+    WHERE neighbor <> start
+"""
+
+EXPAND_NEIGHBORS_BLOCK = """
+CALL {
+    WITH name
+%s
+    WITH neighbor, depth
+    ORDER BY depth, coalesce(neighbor.pagerank, 0) DESC
+    LIMIT $neighbor_limit
+    CALL {
+        WITH neighbor
+        OPTIONAL MATCH (neighbor)-[m:MENTIONED_IN]->(d:Document)
+        WITH m, d LIMIT 3
+        RETURN collect(CASE WHEN d IS NULL THEN NULL ELSE {
+            doc_id: d.id,
+            doc_title: d.title,
+            num_chars: d.num_chars,
+            context: m.context
+        } END) AS neighbor_docs
+    }
+    RETURN collect(CASE WHEN neighbor IS NULL THEN NULL ELSE {
+        entity: neighbor, depth: depth, documents: neighbor_docs
+    } END) AS neighbors
+}
+"""
+
+EXPAND_ENTITIES_QUERY = """
+UNWIND range(0, size($names) - 1) AS idx
+WITH idx, $names[idx] AS name
+CALL {
+    WITH name
+    CALL {
+        WITH name
+        MATCH (e:Entity {name: name}) RETURN e, 0 AS rank
+        UNION
+        WITH name
+        MATCH (e:Entity {normalized_name: toLower(name)}) RETURN e, 1 AS rank
+    }
+    WITH e ORDER BY rank LIMIT 1
+    RETURN collect(e) AS found
+}
+CALL {
+    WITH found
+    WITH found[0] AS e
+    OPTIONAL MATCH (e)-[r:MENTIONED_IN]->(d:Document)
+    WITH e, r, d
+    ORDER BY coalesce(r.count, 1) DESC
+    LIMIT $doc_limit
+    RETURN e, collect(CASE WHEN d IS NULL THEN NULL ELSE {
+        doc_id: d.id,
+        doc_title: d.title,
+        num_chars: d.num_chars,
+        context: r.context,
+        mention_count: coalesce(r.count, 1)
+    } END) AS documents
+}
+CALL {
+    WITH name
+    OPTIONAL MATCH (:Entity {name: name})-[r:%s]-(related:Entity)
+    WITH DISTINCT related, r
+    ORDER BY coalesce(related.pagerank, 0) DESC
+    LIMIT $rel_limit
+    CALL {
+        WITH related
+        OPTIONAL MATCH (related)-[m:MENTIONED_IN]->(d:Document)
+        WITH m, d LIMIT 2
+        RETURN collect(CASE WHEN d IS NULL THEN NULL ELSE {
+            doc_id: d.id,
+            doc_title: d.title,
+            num_chars: d.num_chars,
+            context: m.context
+        } END) AS related_docs
+    }
+    RETURN collect(CASE WHEN related IS NULL THEN NULL ELSE {
+        entity: related, relation: r, documents: related_docs
+    } END) AS related
+}
+%s
+RETURN name, e, documents, related, %s AS neighbors
+ORDER BY idx
+"""
+
+
+def relationship_pattern(relation_types: List[str] = None) -> str:
+    """Motif de types Cypher (`NEAR|SYNTACTIC`) : Neo4j n'examine que les relations de ces types."""
+    return '|'.join(check_relation_types(relation_types))
+
+
+def bounded_hops(max_depth: int, relation_types: List[str] = None) -> str:
+    """Branches UNION produisant (neighbor, depth) depuis `start`, un saut à la fois.
+
+    Chaque nœud développé ne suit que ses $fanout relations (de `relation_types`) les
+    plus fortes ; au-delà du premier saut, les nœuds de type $hub_types ou de degré
+    >= $hub_degree sont atteints mais pas développés.
+    """
+    pattern = relationship_pattern(relation_types)
+    branches = []
+    for depth in range(1, max_depth + 1):
+        lines = ["WITH start", "WITH start AS n0"]
+        for hop in range(1, depth + 1):
+            if hop > 1:
+                lines.append(f"WITH n{hop - 1} WHERE NOT n{hop - 1}.type IN $hub_types "
+                             f"AND coalesce(n{hop - 1}.degree, 0) < $hub_degree")
+            lines.append(f"CALL {{ WITH n{hop - 1} MATCH (n{hop - 1})-[r:{pattern}]-(n:Entity) "
+                         f"RETURN n AS n{hop} ORDER BY coalesce(r.strength, 1) DESC LIMIT $fanout }}")
+        lines.append(f"RETURN n{depth} AS neighbor, {depth} AS depth")
+        branches.append("\n".join("        " + line for line in lines))
+    return "\n        UNION ALL\n".join(branches)
+
+
+def neighbors_block(max_depth: int, bounded: bool, relation_types: List[str] = None) -> str:
+    if bounded:
+        candidates = BOUNDED_CANDIDATES % bounded_hops(max_depth, relation_types)
+    else:
+        candidates = ALL_PATHS_CANDIDATES % max_depth
+    return EXPAND_NEIGHBORS_BLOCK % candidates
+
+
+class GraphQueries(GraphQueriesBackend):
+    """Requêtes pour interroger le graphe avec optimisation mémoire.
     
-    def __init__(self, uri: str, user: str, password: str):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    Les textes ne transitent pas par Bolt : les requêtes renvoient les identifiants
+    et les textes sont lus localement dans le DocumentStore."""
+    
+    def __init__(self, uri: str, user: str, password: str, document_store_path: str = 'data/graph/documents',
+                 driver=None):
+        self.driver = driver or GraphDatabase.driver(uri, auth=(user, password))
+        self.document_store_path = document_store_path
+        self.documents = None
+        self.reload_documents()
     
     def close(self):
         self.driver.close()
+        if self.documents:
+            self.documents.close()
+    
+    def reload_documents(self):
+        """(Ré)ouvre le DocumentStore, par exemple après une reconstruction du graphe."""
+        if self.documents:
+            self.documents.close()
+        path = self.document_store_path
+        self.documents = DocumentStore(path) if DocumentStore.exists(path) else None
+    
+    def document_text(self, doc_id: str, max_chars: int = None) -> str:
+        """Lit le texte d'un document dans le DocumentStore (tranche mmap)."""
+        return self.documents.text(doc_id, max_chars) if self.documents else ''
+    
+    def _with_text(self, doc: Dict) -> Dict:
+        """Complète un nœud Document avec son texte, tronqué à 5000 caractères."""
+        text = doc.get('text') or self.document_text(doc.get('id'), 5001)
+        if len(text) > 5000:
+            text = text[:5000] + "...[texte tronqué]"
+        doc['text'] = text
+        return doc
     
     def find_entity(self, entity_name: str) -> Dict:
         """Trouve une entité par nom."""
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (e:Entity)
-                WHERE e.name = $name OR e.normalized_name = $normalized
-                RETURN e
-                LIMIT 1
-            """, name=entity_name, normalized=entity_name.lower())
+            result = session.run(ENTITY_LOOKUP + "RETURN e",
+                                 name=entity_name, normalized=entity_name.lower())
             
             record = result.single()
             return dict(record['e']) if record else None
@@ -28,16 +201,17 @@ class GraphQueries:
     def get_entity_with_documents(self, entity_name: str, limit_docs: int = 5) -> Dict:
         """Récupère une entité avec documents limités."""
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (e:Entity)-[r:MENTIONED_IN]->(d:Document)
-                WHERE e.name = $name OR e.normalized_name = $normalized
+            result = session.run(ENTITY_LOOKUP + """
+                MATCH (e)-[r:MENTIONED_IN]->(d:Document)
                 WITH e, r, d
+                ORDER BY coalesce(r.count, 1) DESC
                 LIMIT $doc_limit
                 RETURN e, collect({
                     doc_id: d.id,
                     doc_title: d.title,
-                    doc_text: substring(d.text, 0, 3000),
-                    context: r.context
+                    num_chars: d.num_chars,
+                    context: r.context,
+                    mention_count: coalesce(r.count, 1)
                 }) as documents
             """, name=entity_name, normalized=entity_name.lower(), doc_limit=limit_docs)
             
@@ -49,14 +223,16 @@ class GraphQueries:
                 }
             return None
     
-    def get_neighbors(self, entity_name: str, max_depth: int = 1, limit: int = 10) -> List[Dict]:
-        """Récupère les voisins avec limite stricte."""
+    def get_neighbors(self, entity_name: str, max_depth: int = 1, limit: int = 10,
+                      relation_types: List[str] = None) -> List[Dict]:
+        """Récupère les voisins avec limite stricte (filtrés par type pendant l'expansion)."""
+        types = ':' + relationship_pattern(relation_types) if relation_types else ''
         with self.driver.session() as session:
             query_text = """
-                MATCH path = (start:Entity)-[*1..%d]-(neighbor:Entity)
+                MATCH path = (start:Entity)-[%s*1..%d]-(neighbor:Entity)
                 WHERE start.name = $name
                 WITH DISTINCT neighbor, length(path) as depth
-                ORDER BY depth
+                ORDER BY depth, coalesce(neighbor.pagerank, 0) DESC
                 LIMIT $neighbor_limit
                 OPTIONAL MATCH (neighbor)-[r:MENTIONED_IN]->(d:Document)
                 WITH neighbor, depth, r, d
@@ -66,10 +242,10 @@ class GraphQueries:
                        collect(DISTINCT {
                            doc_id: d.id,
                            doc_title: d.title,
-                           doc_text: substring(d.text, 0, 2000),
+                           num_chars: d.num_chars,
                            context: r.context
                        })[0..3] as documents
-            """ % max_depth
+            """ % (types, max_depth)
             
             result = session.run(query_text, 
                                name=entity_name, 
@@ -82,6 +258,64 @@ class GraphQueries:
                 'documents': record['documents']
             } for record in result]
     
+    def expand_entities(self, entity_names: List[str], max_depth: int = 1, limit_docs: int = 3,
+                        limit_related: int = 5, limit_neighbors: int = 5, hub_limits: Dict = None) -> List[Dict]:
+        """Toutes les entités de départ en une seule requête (UNWIND + sous-requêtes CALL)."""
+        if not entity_names:
+            return []
+        
+        pattern = relationship_pattern()
+        if max_depth > 1:
+            query = EXPAND_ENTITIES_QUERY % (pattern, neighbors_block(max_depth, bounded=hub_limits is not None),
+                                             'neighbors')
+        else:
+            query = EXPAND_ENTITIES_QUERY % (pattern, '', '[]')
+        params = self._hub_params(**(hub_limits or {}))
+        
+        with self.driver.session() as session:
+            result = session.run(query, names=list(entity_names), doc_limit=limit_docs,
+                                 rel_limit=limit_related, neighbor_limit=limit_neighbors, **params)
+            
+            expanded = []
+            for record in result:
+                entity_data = None
+                if record['e'] is not None and record['documents']:
+                    entity_data = {'entity': dict(record['e']), 'documents': record['documents']}
+                expanded.append({
+                    'name': record['name'],
+                    'entity_data': entity_data,
+                    'related': [{
+                        'entity': dict(item['entity']),
+                        'relation': dict(item['relation']),
+                        'documents': item['documents']
+                    } for item in record['related']],
+                    'neighbors': [{
+                        'entity': dict(item['entity']),
+                        'depth': item['depth'],
+                        'documents': item['documents']
+                    } for item in record['neighbors']]
+                })
+            return expanded
+    
+    @staticmethod
+    def _hub_params(fanout: int = DEFAULT_FANOUT, hub_types: List[str] = DEFAULT_HUB_TYPES,
+                    hub_degree: int = DEFAULT_HUB_DEGREE) -> Dict:
+        return {'fanout': fanout, 'hub_types': list(hub_types or []), 'hub_degree': hub_degree}
+    
+    def get_neighbors_bounded(self, entity_name: str, max_depth: int = 2, limit: int = 10,
+                              fanout: int = DEFAULT_FANOUT, hub_types: List[str] = DEFAULT_HUB_TYPES,
+                              hub_degree: int = DEFAULT_HUB_DEGREE, relation_types: List[str] = None) -> List[Dict]:
+        """Voisins saut par saut : fan-out borné, relations les plus fortes d'abord, hubs non développés."""
+        query = "WITH $name AS name" + neighbors_block(max_depth, True, relation_types) + "RETURN neighbors"
+        with self.driver.session() as session:
+            record = session.run(query, name=entity_name, neighbor_limit=limit,
+                                 **self._hub_params(fanout, hub_types, hub_degree)).single()
+            return [{
+                'entity': dict(item['entity']),
+                'depth': item['depth'],
+                'documents': item['documents']
+            } for item in (record['neighbors'] if record else [])]
+    
     def find_path(self, entity1: str, entity2: str) -> Dict:
         """Trouve le plus court chemin."""
         with self.driver.session() as session:
@@ -102,23 +336,40 @@ class GraphQueries:
             return None
     
     def search_entities_by_type(self, entity_type: str, limit: int = 10) -> List[Dict]:
-        """Recherche des entités par type."""
+        """Recherche des entités par type (parcours du seul label de ce type)."""
+        label = entity_label(entity_type) or 'Entity'
         with self.driver.session() as session:
             result = session.run("""
-                MATCH (e:Entity)
+                MATCH (e:%s)
                 WHERE e.type = $type
                 RETURN e
                 LIMIT $limit
-            """, type=entity_type, limit=limit)
+            """ % label, type=entity_type, limit=limit)
             
             return [dict(record['e']) for record in result]
     
-    def get_related_entities(self, entity_name: str, limit: int = 10) -> List[Dict]:
-        """Récupère les entités reliées avec limite stricte."""
+    def count_entities_by_type(self, entity_types: List[str]) -> Dict[str, int]:
+        """Nombre d'entités par type, lu dans le compteur de chaque label (sans parcours)."""
+        counts = {}
+        with self.driver.session() as session:
+            for entity_type in entity_types:
+                label = entity_label(entity_type)
+                if label is None:
+                    record = session.run("MATCH (e:Entity) WHERE e.type = $type RETURN count(e) AS count",
+                                         type=entity_type).single()
+                else:
+                    record = session.run("MATCH (e:%s) RETURN count(e) AS count" % label).single()
+                counts[entity_type] = record['count']
+        return counts
+    
+    def get_related_entities(self, entity_name: str, limit: int = 10,
+                             relation_types: List[str] = None) -> List[Dict]:
+        """Récupère les entités reliées avec limite stricte (types de `relation_types`, tous par défaut)."""
         with self.driver.session() as session:
             result = session.run("""
-                MATCH (e:Entity {name: $name})-[r:RELATES_TO]-(related:Entity)
+                MATCH (e:Entity {name: $name})-[r:%s]-(related:Entity)
                 WITH DISTINCT related, r
+                ORDER BY coalesce(related.pagerank, 0) DESC
                 LIMIT $rel_limit
                 OPTIONAL MATCH (related)-[m:MENTIONED_IN]->(d:Document)
                 WITH related, r, m, d
@@ -126,10 +377,10 @@ class GraphQueries:
                 RETURN related, r, collect(DISTINCT {
                     doc_id: d.id,
                     doc_title: d.title,
-                    doc_text: substring(d.text, 0, 2000),
+                    num_chars: d.num_chars,
                     context: m.context
                 })[0..2] as documents
-            """, name=entity_name, rel_limit=limit, total_limit=limit * 2)
+            """ % relationship_pattern(relation_types), name=entity_name, rel_limit=limit, total_limit=limit * 2)
             
             return [{
                 'entity': dict(record['related']),
@@ -138,39 +389,36 @@ class GraphQueries:
             } for record in result]
     
     def search_by_query(self, query_text: str, limit: int = 10) -> Dict:
-        """Recherche optimisée avec limite de texte."""
+        """Recherche plein texte (index FULLTEXT `entity_names`), par score décroissant."""
+        search = lucene_query(query_text)
+        if not search:
+            return {'entities': []}
+
         with self.driver.session() as session:
-            normalized_query = query_text.lower()
-            
-            cypher_query = """
-                MATCH (e:Entity)
-                WHERE e.normalized_name CONTAINS $search_term
-                WITH e
-                LIMIT $result_limit
-                OPTIONAL MATCH (e)-[r:MENTIONED_IN]->(d:Document)
-                WITH e, r, d
-                LIMIT $doc_limit
-                RETURN e, collect(DISTINCT {
-                    doc_id: d.id,
-                    doc_title: d.title,
-                    doc_text: substring(d.text, 0, 2000),
-                    context: r.context
-                })[0..3] as documents
-            """
-            
-            result = session.run(cypher_query, 
-                               search_term=normalized_query, 
-                               result_limit=limit,
-                               doc_limit=limit * 3)
-            
-            entities = []
-            for record in result:
-                entities.append({
-                    'entity': dict(record['e']),
-                    'documents': record['documents']
-                })
+            result = session.run("""
+                CALL db.index.fulltext.queryNodes('entity_names', $search, {limit: $result_limit})
+                YIELD node AS e, score
+                CALL {
+                    WITH e
+                    OPTIONAL MATCH (e)-[r:MENTIONED_IN]->(d:Document)
+                    WITH d, r
+                    LIMIT 3
+                    RETURN collect({
+                        doc_id: d.id,
+                        doc_title: d.title,
+                        num_chars: d.num_chars,
+                        context: r.context
+                    }) AS documents
+                }
+                RETURN e, score, documents
+                ORDER BY score DESC
+            """, search=search, result_limit=limit)
             
-            return {'entities': entities}
+            return {'entities': [{
+                'entity': dict(record['e']),
+                'documents': record['documents'],
+                'score': record['score']
+            } for record in result]}
     
     def get_document(self, doc_id: str) -> Dict:
         """Récupère un document avec texte limité."""
@@ -188,23 +436,22 @@ class GraphQueries:
             
             record = result.single()
             if record:
-                doc = dict(record['d'])
-                if 'text' in doc and len(doc['text']) > 5000:
-                    doc['text'] = doc['text'][:5000] + "...[texte tronqué]"
                 return {
-                    'document': doc,
+                    'document': self._with_text(dict(record['d'])),
                     'entities': record['entities']
                 }
             return None
     
     def get_document_by_title(self, title: str) -> Dict:
         """Récupère un document par titre avec limites."""
+        search = lucene_query(title)
+        if not search:
+            return None
+
         with self.driver.session() as session:
             result = session.run("""
-                MATCH (d:Document)
-                WHERE d.title CONTAINS $title
-                WITH d
-                LIMIT 1
+                CALL db.index.fulltext.queryNodes('document_titles', $search, {limit: 1})
+                YIELD node AS d
                 OPTIONAL MATCH (e:Entity)-[r:MENTIONED_IN]->(d)
                 WITH d, e, r
                 LIMIT 30
@@ -212,15 +459,12 @@ class GraphQueries:
                     entity: e,
                     context: r.context
                 })[0..15] as entities
-            """, title=title)
+            """, search=search)
             
             record = result.single()
             if record:
-                doc = dict(record['d'])
-                if 'text' in doc and len(doc['text']) > 5000:
-                    doc['text'] = doc['text'][:5000] + "...[texte tronqué]"
                 return {
-                    'document': doc,
+                    'document': self._with_text(dict(record['d'])),
                     'entities': record['entities']
                 }
             return None
\ No newline at end of file
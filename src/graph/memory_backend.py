@@ -0,0 +1,613 @@
+# src/graph/memory_backend.py
+
+import json
+from pathlib import Path
+from typing import List, Dict, Iterable
+import numpy as np
+from .backend import (GraphQueriesBackend, GraphBuilderBackend, DEFAULT_FANOUT, DEFAULT_HUB_TYPES,
+                      DEFAULT_HUB_DEGREE, RELATION_TYPES, relation_type, check_relation_types)
+from .graph_builder import GraphBuilder
+from .document_store import DocumentStore, write_document_store
+from .mention_aggregator import MentionAggregator
+from .graph_metrics import GraphMetrics, metrics_summary
+from .text_index import TrigramIndex
+
+
+def csr_indptr(rows: np.ndarray, n: int) -> np.ndarray:
+    """Pointeurs de début de ligne pour des arêtes déjà triées par ligne."""
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr
+
+
+def build_csr(rows: np.ndarray, n: int):
+    """Renvoie (indptr, permutation) regroupant les arêtes par ligne."""
+    order = np.argsort(rows, kind='stable')
+    return csr_indptr(rows, n), order
+
+
+class CSRGraph:
+    """Graphe en mémoire : identifiants entiers et adjacence CSR en tableaux NumPy.
+
+    Les entités occupent les identifiants [0, E) et les documents [0, D). Les
+    mentions (entité → document) et les relations (entité — entité, non orientées)
+    sont stockées en CSR ; les chaînes restent dans des listes Python alignées.
+    """
+
+    def __init__(self, entity_names: List[str], entity_types: List[str], documents: List[Dict],
+                 mention_entity: np.ndarray, mention_doc: np.ndarray, mention_count: np.ndarray,
+                 mention_offset: np.ndarray, mention_context: List[str],
+                 relation_src: np.ndarray, relation_dst: np.ndarray, relation_props: List[Dict],
+                 entity_pagerank: np.ndarray = None, entity_betweenness: np.ndarray = None):
+        self.entity_names = entity_names
+        self.entity_types = entity_types
+        self.documents = documents
+        self.relation_props = relation_props
+
+        self.entity_index = {name: i for i, name in enumerate(entity_names)}
+        self.normalized_index = {}
+        for i, name in enumerate(entity_names):
+            self.normalized_index.setdefault(name.lower(), i)
+        self.doc_index = {doc['id']: i for i, doc in enumerate(documents)}
+
+        num_entities = len(entity_names)
+        num_docs = len(documents)
+
+        # Mentions triées par entité puis par nombre d'occurrences décroissant
+        order = np.lexsort((-mention_count, mention_entity))
+        self.mention_entity = mention_entity[order]
+        self.mention_doc = mention_doc[order]
+        self.mention_count = mention_count[order]
+        self.mention_offset = mention_offset[order]
+        self.mention_context = [mention_context[i] for i in order]
+        self.entity_doc_indptr = csr_indptr(self.mention_entity, num_entities)
+
+        # Index inverse document → mentions
+        self.doc_entity_indptr, self.doc_mentions = build_csr(self.mention_doc, num_docs)
+
+        # Adjacence non orientée entité — entité (chaque relation apparaît deux fois)
+        self.relation_src = relation_src
+        self.relation_dst = relation_dst
+        edge_ids = np.arange(len(relation_src), dtype=np.int32)
+        rows = np.concatenate([relation_src, relation_dst])
+        cols = np.concatenate([relation_dst, relation_src])
+        edges = np.concatenate([edge_ids, edge_ids])
+        self.adj_indptr, adj_order = build_csr(rows, num_entities)
+        self.adj_neighbors = cols[adj_order]
+        self.adj_edges = edges[adj_order]
+
+        # Statistiques de degré (hubs) et force des relations pour le parcours borné
+        self.entity_degree = np.diff(self.adj_indptr)
+        self.entity_document_count = np.diff(self.entity_doc_indptr)
+        self.relation_strength = np.array([props.get('strength') or 1 for props in relation_props],
+                                          dtype=np.float64)
+        # Type natif de chaque relation (indice dans RELATION_TYPES), dérivé du prédicat
+        self.relation_kind = np.array([RELATION_TYPES.index(relation_type(props.get('type')))
+                                       for props in relation_props], dtype=np.int8)
+
+        # Importance précalculée (compute_metrics) ; nulle tant qu'elle n'a pas été calculée
+        self.entity_pagerank = entity_pagerank if entity_pagerank is not None else np.zeros(num_entities)
+        self.entity_betweenness = entity_betweenness if entity_betweenness is not None else np.zeros(num_entities)
+
+        self.type_index = {}
+        types = np.array(entity_types, dtype=object)
+        for entity_type in set(entity_types):
+            self.type_index[entity_type] = np.flatnonzero(types == entity_type)
+
+        # Index de trigrammes (noms d'entités, titres), construits à la première recherche
+        self._name_index = None
+        self._title_index = None
+
+    @property
+    def name_index(self) -> TrigramIndex:
+        if self._name_index is None:
+            self._name_index = TrigramIndex(self.entity_names)
+        return self._name_index
+
+    @property
+    def title_index(self) -> TrigramIndex:
+        if self._title_index is None:
+            self._title_index = TrigramIndex([doc.get('title') or '' for doc in self.documents])
+        return self._title_index
+
+    @property
+    def num_entities(self) -> int:
+        return len(self.entity_names)
+
+    @property
+    def num_documents(self) -> int:
+        return len(self.documents)
+
+    def entity_mentions(self, i: int) -> range:
+        return range(self.entity_doc_indptr[i], self.entity_doc_indptr[i + 1])
+
+    def entity_relations(self, i: int, allowed: np.ndarray = None):
+        """Voisins et identifiants de relation d'une entité (types `allowed` seulement, si donné)."""
+        start, end = self.adj_indptr[i], self.adj_indptr[i + 1]
+        neighbors, edges = self.adj_neighbors[start:end], self.adj_edges[start:end]
+        if allowed is not None:
+            keep = allowed[self.relation_kind[edges]]
+            neighbors, edges = neighbors[keep], edges[keep]
+        return neighbors, edges
+
+    @staticmethod
+    def allowed_kinds(relation_types: List[str] = None) -> np.ndarray:
+        """Masque des types natifs autorisés, indexé par relation_kind (None : aucun filtre)."""
+        if not relation_types:
+            return None
+        types = set(check_relation_types(relation_types))
+        return np.array([t in types for t in RELATION_TYPES])
+
+    @classmethod
+    def from_rows(cls, entity_rows: Iterable[Dict], mention_rows: Iterable[Dict],
+                  relation_rows: Iterable[Dict], documents: Iterable[Dict]) -> 'CSRGraph':
+        """Construit le graphe avec la sémantique MERGE du chemin Neo4j."""
+        docs, doc_index = [], {}
+        for doc in documents:
+            if doc['id'] in doc_index:
+                docs[doc_index[doc['id']]] = doc
+            else:
+                doc_index[doc['id']] = len(docs)
+                docs.append(doc)
+
+        names, types, entity_index = [], [], {}
+        for row in entity_rows:
+            if row['name'] in entity_index:
+                types[entity_index[row['name']]] = row['type']
+            else:
+                entity_index[row['name']] = len(names)
+                names.append(row['name'])
+                types.append(row['type'])
+
+        mentions = {}
+        for row in mention_rows:
+            e = entity_index.get(row['entity_name'])
+            d = doc_index.get(row['document_id'])
+            if e is None or d is None:
+                continue
+            mentions[(e, d)] = (row.get('count', 1), row.get('first_offset', -1), row.get('context'))
+
+        relations = {}
+        for row in relation_rows:
+            a = entity_index.get(row['subject'])
+            b = entity_index.get(row['object'])
+            if a is None or b is None:
+                continue
+            key = (a, row['predicate'], b)
+            props = relations.setdefault(key, {'type': row['predicate']})
+            props.update(row['props'])
+
+        mention_keys = list(mentions.keys())
+        relation_keys = list(relations.keys())
+        return cls(
+            entity_names=names,
+            entity_types=types,
+            documents=docs,
+            mention_entity=np.array([k[0] for k in mention_keys], dtype=np.int32),
+            mention_doc=np.array([k[1] for k in mention_keys], dtype=np.int32),
+            mention_count=np.array([mentions[k][0] for k in mention_keys], dtype=np.int32),
+            mention_offset=np.array([mentions[k][1] if mentions[k][1] is not None else -1
+                                     for k in mention_keys], dtype=np.int64),
+            mention_context=[mentions[k][2] for k in mention_keys],
+            relation_src=np.array([k[0] for k in relation_keys], dtype=np.int32),
+            relation_dst=np.array([k[2] for k in relation_keys], dtype=np.int32),
+            relation_props=[relations[k] for k in relation_keys]
+        )
+
+    def save(self, path: str | Path):
+        """Sauvegarde : tableaux dans graph.npz, chaînes dans graph_meta.json."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        np.savez(path / 'graph.npz',
+                 mention_entity=self.mention_entity,
+                 mention_doc=self.mention_doc,
+                 mention_count=self.mention_count,
+                 mention_offset=self.mention_offset,
+                 relation_src=self.relation_src,
+                 relation_dst=self.relation_dst,
+                 entity_pagerank=self.entity_pagerank,
+                 entity_betweenness=self.entity_betweenness)
+
+        meta = {
+            'entity_names': self.entity_names,
+            'entity_types': self.entity_types,
+            'documents': self.documents,
+            'mention_context': self.mention_context,
+            'relation_props': self.relation_props
+        }
+        with open(path / 'graph_meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'CSRGraph':
+        path = Path(path)
+        if not (path / 'graph.npz').exists():
+            raise FileNotFoundError(f"Graphe en mémoire introuvable: {path} "
+                                    f"(exécutez: python scripts/03_build_graph.py)")
+
+        arrays = np.load(path / 'graph.npz')
+        with open(path / 'graph_meta.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        return cls(
+            entity_names=meta['entity_names'],
+            entity_types=meta['entity_types'],
+            documents=meta['documents'],
+            mention_entity=arrays['mention_entity'],
+            mention_doc=arrays['mention_doc'],
+            mention_count=arrays['mention_count'],
+            mention_offset=arrays['mention_offset'],
+            mention_context=meta['mention_context'],
+            relation_src=arrays['relation_src'],
+            relation_dst=arrays['relation_dst'],
+            relation_props=meta['relation_props'],
+            entity_pagerank=arrays['entity_pagerank'] if 'entity_pagerank' in arrays else None,
+            entity_betweenness=arrays['entity_betweenness'] if 'entity_betweenness' in arrays else None
+        )
+
+
+class MemoryGraphBuilder(GraphBuilderBackend):
+    """Construit le graphe CSR en mémoire et le sauvegarde sur disque ; les textes des
+    documents vont dans un DocumentStore (`<path>/documents` par défaut), pas dans le graphe."""
+
+    def __init__(self, path: str | Path = 'data/graph/memory', document_store_path: str | Path = None):
+        self.path = Path(path)
+        self.document_store_path = Path(document_store_path) if document_store_path else self.path / 'documents'
+        self.graph = None
+
+    def clear_database(self):
+        self.graph = None
+        for name in ('graph.npz', 'graph_meta.json'):
+            if (self.path / name).exists():
+                (self.path / name).unlink()
+        self.mark_changed()
+
+    def build_graph(self, entities_data: List[Dict], relations: List[Dict], documents: List[Dict]):
+        """Construit le graphe complet et le sauvegarde."""
+        write_document_store(documents, self.document_store_path)
+        aggregator = MentionAggregator().add_documents(entities_data)
+        self.graph = CSRGraph.from_rows(
+            aggregator.entity_rows(),
+            aggregator.mention_rows(),
+            (GraphBuilder.relation_row(rel) for rel in relations),
+            (GraphBuilder.document_row(doc, with_text=False) for doc in documents)
+        )
+        self.graph.save(self.path)
+        self.mark_changed()
+        return self.get_statistics()
+
+    def compute_metrics(self, metrics: GraphMetrics = None) -> Dict:
+        """Calcule PageRank (et betweenness échantillonnée) et les sauvegarde avec le graphe."""
+        metrics = metrics or GraphMetrics()
+        graph = self.graph or CSRGraph.load(self.path)
+        weights = graph.relation_strength
+        values = metrics.compute(graph.num_entities, graph.relation_src, graph.relation_dst, weights)
+        graph.entity_pagerank = values['pagerank']
+        if 'betweenness' in values:
+            graph.entity_betweenness = values['betweenness']
+        graph.save(self.path)
+        self.graph = graph
+        self.mark_changed()
+        return metrics_summary(graph.entity_names, values)
+
+    def get_statistics(self) -> Dict:
+        graph = self.graph or CSRGraph.load(self.path)
+        return {
+            'entities': graph.num_entities,
+            'relationships': len(graph.relation_props) + len(graph.mention_doc),
+            'documents': graph.num_documents
+        }
+
+
+class MemoryGraphQueries(GraphQueriesBackend):
+    """Implémentation en mémoire (CSR) des requêtes de GraphQueries ; les textes sont lus
+    dans le DocumentStore (tranches mmap)."""
+
+    def __init__(self, graph: CSRGraph, documents: DocumentStore = None):
+        self.graph = graph
+        self.documents = documents
+
+    @classmethod
+    def load(cls, path: str | Path, document_store_path: str | Path = None) -> 'MemoryGraphQueries':
+        store_path = document_store_path or Path(path) / 'documents'
+        return cls(CSRGraph.load(path), DocumentStore(store_path) if DocumentStore.exists(store_path) else None)
+
+    def close(self):
+        if self.documents:
+            self.documents.close()
+
+    def _exact(self, entity_name: str):
+        return self.graph.entity_index.get(entity_name)
+
+    def _lookup(self, entity_name: str):
+        """Équivalent de `e.name = $name OR e.normalized_name = $normalized`."""
+        i = self.graph.entity_index.get(entity_name)
+        if i is None:
+            i = self.graph.normalized_index.get(entity_name.lower())
+        return i
+
+    def _entity(self, i: int) -> Dict:
+        name = self.graph.entity_names[i]
+        return {'name': name, 'type': self.graph.entity_types[i], 'normalized_name': name.lower(),
+                'degree': int(self.graph.entity_degree[i]),
+                'document_count': int(self.graph.entity_document_count[i]),
+                'pagerank': float(self.graph.entity_pagerank[i])}
+
+    def _document(self, d: int) -> Dict:
+        return dict(self.graph.documents[d])
+
+    def _mention(self, m: int) -> Dict:
+        return {
+            'context': self.graph.mention_context[m],
+            'count': int(self.graph.mention_count[m]),
+            'first_offset': int(self.graph.mention_offset[m])
+        }
+
+    def _doc_refs(self, i: int, limit: int) -> List[Dict]:
+        refs = []
+        for m in self.graph.entity_mentions(i)[:limit]:
+            doc = self.graph.documents[self.graph.mention_doc[m]]
+            refs.append({
+                'doc_id': doc['id'],
+                'doc_title': doc['title'],
+                'num_chars': doc['num_chars'],
+                'context': self.graph.mention_context[m]
+            })
+        return refs
+
+    def find_entity(self, entity_name: str) -> Dict:
+        i = self._lookup(entity_name)
+        return self._entity(i) if i is not None else None
+
+    def get_entity_with_documents(self, entity_name: str, limit_docs: int = 5) -> Dict:
+        i = self._lookup(entity_name)
+        if i is None or len(self.graph.entity_mentions(i)) == 0:
+            return None
+
+        documents = self._doc_refs(i, limit_docs)
+        for doc, m in zip(documents, self.graph.entity_mentions(i)):
+            doc['mention_count'] = int(self.graph.mention_count[m])
+        return {'entity': self._entity(i), 'documents': documents}
+
+    def _expand(self, node, allowed: np.ndarray = None):
+        """Voisins d'un nœud (('e', id) ou ('d', id)) avec la relation traversée.
+
+        Avec `allowed`, seules les relations entité — entité de ces types sont suivies.
+        """
+        kind, i = node
+        g = self.graph
+        if kind == 'e':
+            neighbors, edges = g.entity_relations(i, allowed)
+            for j, edge in zip(neighbors.tolist(), edges.tolist()):
+                yield ('e', j), ('r', edge)
+            if allowed is not None:
+                return
+            for m in g.entity_mentions(i):
+                yield ('d', int(g.mention_doc[m])), ('m', m)
+        else:
+            for k in range(g.doc_entity_indptr[i], g.doc_entity_indptr[i + 1]):
+                m = int(g.doc_mentions[k])
+                yield ('e', int(g.mention_entity[m])), ('m', m)
+
+    def get_neighbors(self, entity_name: str, max_depth: int = 1, limit: int = 10,
+                      relation_types: List[str] = None) -> List[Dict]:
+        """Parcours en largeur sur toutes les relations (comme `-[*1..d]-`), ou sur `relation_types`."""
+        start = self._exact(entity_name)
+        if start is None:
+            return []
+
+        allowed = self.graph.allowed_kinds(relation_types)
+        start_node = ('e', start)
+        seen = {start_node}
+        frontier = [start_node]
+        results = []
+
+        for depth in range(1, max_depth + 1):
+            next_frontier, level = [], []
+            for node in frontier:
+                for neighbor, _ in self._expand(node, allowed):
+                    if neighbor in seen:
+                        continue
+                    seen.add(neighbor)
+                    next_frontier.append(neighbor)
+                    if neighbor[0] == 'e':
+                        level.append(neighbor[1])
+            results.extend(self._ranked_neighbors(level, depth, limit - len(results)))
+            if len(results) >= limit:
+                break
+            frontier = next_frontier
+
+        return results
+
+    def _ranked_neighbors(self, ids: List[int], depth: int, limit: int) -> List[Dict]:
+        """Entités d'un même niveau, les plus importantes (PageRank) d'abord."""
+        ids = np.asarray(ids, dtype=np.int64)
+        top = ids[np.argsort(-self.graph.entity_pagerank[ids], kind='stable')[:limit]]
+        return [{
+            'entity': self._entity(j),
+            'depth': depth,
+            'documents': self._doc_refs(j, 3)
+        } for j in top.tolist()]
+
+    def _strongest_relations(self, i: int, fanout: int, allowed: np.ndarray = None) -> List[int]:
+        """Les `fanout` voisins d'une entité par relations les plus fortes."""
+        neighbors, edges = self.graph.entity_relations(i, allowed)
+        if len(edges) > fanout:
+            top = np.argsort(-self.graph.relation_strength[edges], kind='stable')[:fanout]
+            neighbors = neighbors[top]
+        return neighbors.tolist()
+
+    def get_neighbors_bounded(self, entity_name: str, max_depth: int = 2, limit: int = 10,
+                              fanout: int = DEFAULT_FANOUT, hub_types: List[str] = DEFAULT_HUB_TYPES,
+                              hub_degree: int = DEFAULT_HUB_DEGREE, relation_types: List[str] = None) -> List[Dict]:
+        start = self._exact(entity_name)
+        if start is None:
+            return []
+
+        g = self.graph
+        allowed = g.allowed_kinds(relation_types)
+        hub_types = set(hub_types or ())
+        seen = {start}
+        frontier = [start]
+        results = []
+
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for i in frontier:
+                if depth > 1 and (g.entity_types[i] in hub_types or g.entity_degree[i] >= hub_degree):
+                    continue
+                for j in self._strongest_relations(i, fanout, allowed):
+                    if j in seen:
+                        continue
+                    seen.add(j)
+                    next_frontier.append(j)
+            results.extend(self._ranked_neighbors(next_frontier, depth, limit - len(results)))
+            if len(results) >= limit:
+                break
+            frontier = next_frontier
+
+        return results
+
+    def _node_neighbors(self, u: int):
+        """Voisins d'un nœud du graphe unifié (entités [0, E), documents [E, E+D)).
+
+        La relation traversée est codée par un entier : id de relation si ≥ 0,
+        sinon -(id de mention + 1).
+        """
+        g = self.graph
+        num_entities = g.num_entities
+        if u < num_entities:
+            neighbors, edges = g.entity_relations(u)
+            start, end = g.entity_doc_indptr[u], g.entity_doc_indptr[u + 1]
+            mentions = np.arange(start, end)
+            nodes = np.concatenate([neighbors, g.mention_doc[start:end].astype(np.int64) + num_entities])
+            rels = np.concatenate([edges, -(mentions + 1)])
+        else:
+            d = u - num_entities
+            mentions = g.doc_mentions[g.doc_entity_indptr[d]:g.doc_entity_indptr[d + 1]]
+            nodes = g.mention_entity[mentions]
+            rels = -(mentions + 1)
+        return nodes.tolist(), rels.tolist()
+
+    def find_path(self, entity1: str, entity2: str, max_length: int = 5) -> Dict:
+        """Plus court chemin (≤ 5 relations) entre deux entités, par BFS bidirectionnel."""
+        a, b = self._exact(entity1), self._exact(entity2)
+        if a is None or b is None or a == b:
+            return None
+
+        parents = ({a: None}, {b: None})
+        distances = ({a: 0}, {b: 0})
+        frontiers = ([a], [b])
+        depths = [0, 0]
+
+        while frontiers[0] and frontiers[1] and depths[0] + depths[1] < max_length:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own, other = parents[side], parents[1 - side]
+            next_frontier = []
+            meeting = None
+
+            # On termine le niveau pour garder la rencontre la plus proche de l'autre côté
+            for u in frontiers[side]:
+                nodes, rels = self._node_neighbors(u)
+                for v, rel in zip(nodes, rels):
+                    if v in own:
+                        continue
+                    own[v] = (u, rel)
+                    distances[side][v] = depths[side] + 1
+                    if v in other:
+                        if meeting is None or distances[1 - side][v] < distances[1 - side][meeting]:
+                            meeting = v
+                    else:
+                        next_frontier.append(v)
+
+            if meeting is not None:
+                return self._build_path(parents, meeting)
+
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+            depths[side] += 1
+
+        return None
+
+    def _node_dict(self, u: int) -> Dict:
+        num_entities = self.graph.num_entities
+        return self._entity(u) if u < num_entities else self._document(u - num_entities)
+
+    def _rel_dict(self, rel: int) -> Dict:
+        return dict(self.graph.relation_props[rel]) if rel >= 0 else self._mention(-rel - 1)
+
+    def _build_path(self, parents, meeting: int) -> Dict:
+        forward, backward = parents
+        nodes, relationships = [meeting], []
+
+        u = meeting
+        while forward[u] is not None:
+            u, rel = forward[u]
+            nodes.insert(0, u)
+            relationships.insert(0, rel)
+
+        u = meeting
+        while backward[u] is not None:
+            u, rel = backward[u]
+            nodes.append(u)
+            relationships.append(rel)
+
+        return {
+            'nodes': [self._node_dict(u) for u in nodes],
+            'relationships': [self._rel_dict(rel) for rel in relationships]
+        }
+
+    def search_entities_by_type(self, entity_type: str, limit: int = 10) -> List[Dict]:
+        ids = self.graph.type_index.get(entity_type)
+        if ids is None:
+            return []
+        return [self._entity(int(i)) for i in ids[:limit]]
+
+    def count_entities_by_type(self, entity_types: List[str]) -> Dict[str, int]:
+        return {t: len(self.graph.type_index.get(t, ())) for t in entity_types}
+
+    def get_related_entities(self, entity_name: str, limit: int = 10,
+                             relation_types: List[str] = None) -> List[Dict]:
+        i = self._exact(entity_name)
+        if i is None:
+            return []
+
+        neighbors, edges = self.graph.entity_relations(i, self.graph.allowed_kinds(relation_types))
+        top = np.argsort(-self.graph.entity_pagerank[neighbors], kind='stable')[:limit]
+        return [{
+            'entity': self._entity(int(j)),
+            'relation': dict(self.graph.relation_props[int(edge)]),
+            'documents': self._doc_refs(int(j), 2)
+        } for j, edge in zip(neighbors[top], edges[top])]
+
+    def search_by_query(self, query_text: str, limit: int = 10) -> Dict:
+        """Recherche plein texte (trigrammes, sans accents) dans les noms, par score décroissant."""
+        return {'entities': [{
+            'entity': self._entity(i),
+            'documents': self._doc_refs(i, 3),
+            'score': score
+        } for i, score in self.graph.name_index.search(query_text, limit)]}
+
+    def _document_with_entities(self, d: int, max_entities: int) -> Dict:
+        g = self.graph
+        doc = self._document(d)
+        doc['text'] = self.document_text(doc['id'], 5001)
+        if len(doc['text']) > 5000:
+            doc['text'] = doc['text'][:5000] + "...[texte tronqué]"
+
+        entities = []
+        for k in range(g.doc_entity_indptr[d], min(g.doc_entity_indptr[d + 1], g.doc_entity_indptr[d] + max_entities)):
+            m = int(g.doc_mentions[k])
+            entities.append({'entity': self._entity(int(g.mention_entity[m])), 'context': g.mention_context[m]})
+        return {'document': doc, 'entities': entities}
+
+    def get_document(self, doc_id: str) -> Dict:
+        d = self.graph.doc_index.get(doc_id)
+        return self._document_with_entities(d, 20) if d is not None else None
+
+    def document_text(self, doc_id: str, max_chars: int = None) -> str:
+        return self.documents.text(doc_id, max_chars) if self.documents else ''
+
+    def get_document_by_title(self, title: str) -> Dict:
+        best = self.graph.title_index.search(title, 1)
+        return self._document_with_entities(best[0][0], 15) if best else None
@@ -0,0 +1,90 @@
+# src/graph/mention_aggregator.py
+
+from collections import Counter
+from typing import List, Dict, Tuple
+
+class MentionAggregator:
+    """Réduit les mentions extraites en entités uniques et paires (entité, document) uniques."""
+
+    def __init__(self, context_window: int = 200):
+        self.context_window = context_window
+        self.entities = {}
+        self.mentions = {}
+        self._labels = {}
+        self.total_mentions = 0
+
+    def extract_context(self, text: str, entity: Dict) -> str:
+        """Extrait la fenêtre de contexte autour d'une mention."""
+        start = max(0, entity['start'] - self.context_window)
+        end = min(len(text), entity['end'] + self.context_window)
+        return text[start:end]
+
+    def add_document(self, entity_data: Dict):
+        """Ajoute les mentions d'un document (format de entities.json)."""
+        doc_id = entity_data['document_id']
+        doc_text = entity_data.get('text', '')
+
+        for entity in entity_data['entities']:
+            name = entity['text']
+            self.total_mentions += 1
+
+            if name not in self.entities:
+                self.entities[name] = {
+                    'name': name,
+                    'type': entity['label'],
+                    'normalized_name': name.lower(),
+                    'mention_count': 0
+                }
+                self._labels[name] = Counter()
+            self.entities[name]['mention_count'] += 1
+            self._labels[name][entity['label']] += 1
+
+            key = (name, doc_id)
+            mention = self.mentions.get(key)
+            if mention is None:
+                self.mentions[key] = {
+                    'entity_name': name,
+                    'document_id': doc_id,
+                    'count': 1,
+                    'first_offset': entity['start'],
+                    'context': self.extract_context(doc_text, entity) or None
+                }
+            else:
+                mention['count'] += 1
+                # Le contexte retenu est celui de la première occurrence dans le document
+                if entity['start'] < mention['first_offset']:
+                    mention['first_offset'] = entity['start']
+                    mention['context'] = self.extract_context(doc_text, entity) or None
+
+    def add_documents(self, entities_data: List[Dict]) -> 'MentionAggregator':
+        for entity_data in entities_data:
+            self.add_document(entity_data)
+        return self
+
+    def entity_rows(self) -> List[Dict]:
+        """Entités uniques; le type retenu est le label majoritaire."""
+        rows = []
+        for name, entity in self.entities.items():
+            row = dict(entity)
+            row['type'] = self._labels[name].most_common(1)[0][0]
+            rows.append(row)
+        return rows
+
+    def mention_rows(self) -> List[Dict]:
+        """Paires (entité, document) uniques avec compte, premier offset et contexte."""
+        return list(self.mentions.values())
+
+    def summary(self) -> Dict:
+        unique_rows = len(self.entities) + len(self.mentions)
+        return {
+            'mentions': self.total_mentions,
+            'unique_entities': len(self.entities),
+            'unique_pairs': len(self.mentions),
+            'reduction': (2 * self.total_mentions / unique_rows) if unique_rows else 0.0
+        }
+
+
+def aggregate_mentions(entities_data: List[Dict], context_window: int = 200) -> Tuple[List[Dict], List[Dict]]:
+    """Raccourci : renvoie (entités uniques, mentions agrégées)."""
+    aggregator = MentionAggregator(context_window).add_documents(entities_data)
+    return aggregator.entity_rows(), aggregator.mention_rows()
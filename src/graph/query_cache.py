@@ -0,0 +1,265 @@
+# src/graph/query_cache.py
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+from .backend import GraphQueriesBackend
+
+# Méthodes de lecture mises en cache (toutes les autres sont déléguées sans cache)
+CACHED_METHODS = (
+    'find_entity', 'get_entity_with_documents', 'get_related_entities', 'get_neighbors',
+    'get_neighbors_bounded', 'expand_entities', 'find_path', 'search_entities_by_type',
+    'count_entities_by_type', 'search_by_query', 'get_document', 'get_document_by_title'
+)
+
+DISK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    expires REAL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    value BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed);
+"""
+
+# Vérification de la taille du cache disque toutes les N écritures
+EVICTION_INTERVAL = 100
+
+
+class GraphVersion:
+    """Tampon de version du graphe dans un fichier, changé à chaque écriture.
+
+    Les lecteurs ne relisent le fichier que si sa date de modification a changé.
+    """
+
+    def __init__(self, path: str | Path = 'data/graph/graph_version'):
+        self.path = Path(path)
+        self._stat = None
+        self._value = None
+
+    def current(self) -> str:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return '0'
+        key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if key != self._stat:
+            self._value = self.path.read_text(encoding='utf-8').strip() or '0'
+            self._stat = key
+        return self._value
+
+    def bump(self) -> str:
+        """Nouvelle version (horodatage en ns, unique même entre processus), écrite par renommage."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        value = f"{time.time_ns()}-{os.getpid()}"
+        tmp = self.path.with_name(self.path.name + f'.{os.getpid()}.tmp')
+        tmp.write_text(value, encoding='utf-8')
+        os.replace(tmp, self.path)
+        return value
+
+
+class DiskCache:
+    """Cache partagé entre processus (workers FastAPI) : table SQLite en WAL, éviction LRU par taille."""
+
+    def __init__(self, path: str | Path, max_bytes: int):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        with self.conn:
+            self.conn.executescript(DISK_SCHEMA)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, version: str, now: float) -> Optional[bytes]:
+        row = self.conn.execute("SELECT value, expires FROM cache WHERE key = ? AND version = ?",
+                                (key, version)).fetchone()
+        if row is None or (row[1] is not None and row[1] < now):
+            return None
+        self.conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def put(self, key: str, version: str, value: bytes, expires: Optional[float], now: float):
+        self.conn.execute("INSERT OR REPLACE INTO cache (key, version, expires, size, accessed, value) "
+                          "VALUES (?, ?, ?, ?, ?, ?)", (key, version, expires, len(value), now, value))
+        self._writes += 1
+        if self._writes % EVICTION_INTERVAL == 0:
+            self.evict()
+
+    def drop_other_versions(self, version: str):
+        self.conn.execute("DELETE FROM cache WHERE version != ?", (version,))
+
+    def evict(self):
+        """Supprime les entrées les moins récemment lues jusqu'à repasser sous max_bytes."""
+        total = self.conn.execute("SELECT coalesce(sum(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        self.conn.execute("""
+            DELETE FROM cache WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, sum(size) OVER (ORDER BY accessed DESC) AS kept FROM cache
+                ) WHERE kept > ?
+            )
+        """, (self.max_bytes,))
+
+    def usage(self) -> Dict:
+        entries, size = self.conn.execute("SELECT count(*), coalesce(sum(size), 0) FROM cache").fetchone()
+        return {'disk_entries': entries, 'disk_bytes': size}
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class CachedGraphQueries:
+    """Cache des résultats de GraphQueries, clé = méthode + arguments.
+
+    LRU borné en mémoire (par processus), puis cache disque partagé optionnel.
+    Une entrée n'est valable que pour la version du graphe sous laquelle elle a
+    été calculée et, avec `ttl`, pendant ce nombre de secondes. Les valeurs sont
+    stockées sérialisées : un appelant qui modifie un résultat n'altère pas le cache.
+    """
+
+    def __init__(self, queries: GraphQueriesBackend, version: GraphVersion, max_entries: int = 10000,
+                 ttl: float = None, disk: DiskCache = None):
+        self.queries = queries
+        self.version = version
+        self.max_entries = max_entries
+        self.ttl = ttl or None
+        self.disk = disk
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def __getattr__(self, name):
+        attribute = getattr(self.queries, name)
+        if name not in CACHED_METHODS:
+            return attribute
+
+        def cached(*args, **kwargs):
+            key = name + json.dumps([args, kwargs], sort_keys=True, ensure_ascii=False, default=str)
+            return self._get_or_compute(key, lambda: attribute(*args, **kwargs))
+        return cached
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
+        self.queries.close()
+
+    def _check_version(self) -> str:
+        version = self.version.current()
+        if version != self._version:
+            with self._lock:
+                if self._version is not None:
+                    self.counters['invalidations'] += 1
+                self._memory.clear()
+                self._memory_bytes = 0
+                self._version = version
+            if self.disk is not None:
+                self.disk.drop_other_versions(version)
+        return version
+
+    def _remember(self, key: str, value: bytes, expires: Optional[float]):
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous[0])
+            self._memory[key] = (value, expires)
+            self._memory_bytes += len(value)
+            while len(self._memory) > self.max_entries:
+                evicted, _ = self._memory.popitem(last=False)[1]
+                self._memory_bytes -= len(evicted)
+
+    def _get_or_compute(self, key: str, compute):
+        version = self._check_version()
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and (entry[1] is None or entry[1] >= now):
+                self._memory.move_to_end(key)
+                self.counters['hits'] += 1
+                return pickle.loads(entry[0])
+
+        if self.disk is not None:
+            data = self.disk.get(key, version, now)
+            if data is not None:
+                self.counters['disk_hits'] += 1
+                self._remember(key, data, now + self.ttl if self.ttl else None)
+                return pickle.loads(data)
+
+        self.counters['misses'] += 1
+        result = compute()
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        expires = now + self.ttl if self.ttl else None
+        self._remember(key, data, expires)
+        if self.disk is not None:
+            self.disk.put(key, version, data, expires, now)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def cache_stats(self) -> Dict:
+        """Taux de succès (mémoire + disque) et occupation mémoire / disque."""
+        hits = self.counters['hits'] + self.counters['disk_hits']
+        total = hits + self.counters['misses']
+        stats = dict(self.counters)
+        stats.update({
+            'hit_ratio': hits / total if total else 0.0,
+            'memory_entries': len(self._memory),
+            'memory_bytes': self._memory_bytes,
+            'graph_version': self._version
+        })
+        if self.disk is not None:
+            stats.update(self.disk.usage())
+        return stats
+
+
+def cache_settings(config=None) -> Dict:
+    """Paramètres de `graph.cache` (cache actif par défaut, disque partagé si `disk_path`)."""
+    settings = (config.get('graph.cache', {}) if config else {}) or {}
+    return {
+        'enabled': settings.get('enabled', True),
+        'max_entries': settings.get('max_entries', 10000),
+        'ttl': settings.get('ttl', 0),
+        'disk_path': settings.get('disk_path'),
+        'max_disk_mb': settings.get('max_disk_mb', 256),
+        'version_path': settings.get('version_path', 'data/graph/graph_version')
+    }
+
+
+def graph_version(config=None) -> GraphVersion:
+    return GraphVersion(cache_settings(config)['version_path'])
+
+
+def with_query_cache(queries, config=None):
+    """Place le cache de résultats devant `queries` s'il est activé."""
+    settings = cache_settings(config)
+    if not settings['enabled']:
+        return queries
+    disk = DiskCache(settings['disk_path'], settings['max_disk_mb'] * 1024 * 1024) if settings['disk_path'] else None
+    return CachedGraphQueries(queries, graph_version(config), settings['max_entries'], settings['ttl'], disk)
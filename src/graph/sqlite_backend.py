@@ -0,0 +1,598 @@
+# src/graph/sqlite_backend.py
+
+import json
+import sqlite3
+import numpy as np
+import threading
+from pathlib import Path
+from typing import List, Dict, Iterable
+from .backend import (GraphQueriesBackend, GraphBuilderBackend, DEFAULT_FANOUT, DEFAULT_HUB_TYPES,
+                      DEFAULT_HUB_DEGREE, relation_type, check_relation_types)
+from .graph_builder import GraphBuilder
+from .document_store import DocumentStore, write_document_store
+from .mention_aggregator import MentionAggregator
+from .graph_metrics import GraphMetrics, metrics_summary
+from .text_index import MAX_CANDIDATES, fold, fts_query, query_terms
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    type TEXT,
+    normalized_name TEXT,
+    degree INTEGER NOT NULL DEFAULT 0,
+    document_count INTEGER NOT NULL DEFAULT 0,
+    pagerank REAL NOT NULL DEFAULT 0,
+    betweenness REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL UNIQUE,
+    filename TEXT,
+    title TEXT,
+    path TEXT,
+    num_chars INTEGER
+);
+CREATE TABLE IF NOT EXISTS mentions (
+    entity_id INTEGER NOT NULL,
+    document_id INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 1,
+    first_offset INTEGER,
+    context TEXT,
+    PRIMARY KEY (entity_id, document_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS relations (
+    id INTEGER PRIMARY KEY,
+    src INTEGER NOT NULL,
+    dst INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    rel_type TEXT NOT NULL,
+    method TEXT,
+    strength INTEGER,
+    distance INTEGER,
+    common_docs TEXT,
+    UNIQUE (src, type, dst)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS entity_search USING fts5(folded, tokenize = 'trigram');
+CREATE VIRTUAL TABLE IF NOT EXISTS document_search USING fts5(folded, tokenize = 'trigram');
+"""
+
+# Index plein texte (trigrammes FTS5) sur les noms et titres repliés (minuscules, sans accents)
+SEARCH_INDEXES = """
+DELETE FROM entity_search;
+INSERT INTO entity_search (rowid, folded) SELECT id, fold(name) FROM entities;
+DELETE FROM document_search;
+INSERT INTO document_search (rowid, folded) SELECT id, fold(coalesce(title, '')) FROM documents;
+"""
+
+# Index couvrants : chaque étape de parcours se résout dans l'index, sans accès à la table
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_entities_normalized ON entities(normalized_name, id);
+CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(type, id);
+CREATE INDEX IF NOT EXISTS idx_documents_title ON documents(title);
+CREATE INDEX IF NOT EXISTS idx_mentions_ranked ON mentions(entity_id, count DESC, document_id);
+CREATE INDEX IF NOT EXISTS idx_mentions_document ON mentions(document_id, entity_id);
+CREATE INDEX IF NOT EXISTS idx_relations_src_type ON relations(src, rel_type, dst, id);
+CREATE INDEX IF NOT EXISTS idx_relations_dst_type ON relations(dst, rel_type, src, id);
+"""
+
+# Graphe unifié pour les parcours : entité = +id, document = -id (comme `-[*]-` dans Neo4j).
+# Une étape récursive par sens de relation, chacune servie par un index couvrant.
+WALK_STEPS = """
+    SELECT r.dst, w.depth + 1 FROM walk w JOIN relations r ON r.src = w.node
+    WHERE w.node > 0 AND w.depth < :max_depth
+    UNION
+    SELECT r.src, w.depth + 1 FROM walk w JOIN relations r ON r.dst = w.node
+    WHERE w.node > 0 AND w.depth < :max_depth
+    UNION
+    SELECT -m.document_id, w.depth + 1 FROM walk w JOIN mentions m ON m.entity_id = w.node
+    WHERE w.node > 0 AND w.depth < :max_depth
+    UNION
+    SELECT m.entity_id, w.depth + 1 FROM walk w JOIN mentions m ON m.document_id = -w.node
+    WHERE w.node < 0 AND w.depth < :max_depth
+"""
+
+# Variante limitée aux relations entité — entité de certains types natifs (sans les documents)
+TYPED_WALK_STEPS = """
+    SELECT r.dst, w.depth + 1 FROM walk w JOIN relations r ON r.src = w.node
+    WHERE w.depth < :max_depth AND r.rel_type IN ({types})
+    UNION
+    SELECT r.src, w.depth + 1 FROM walk w JOIN relations r ON r.dst = w.node
+    WHERE w.depth < :max_depth AND r.rel_type IN ({types})
+"""
+
+NEIGHBORS_QUERY = """
+WITH RECURSIVE walk(node, depth) AS (
+    SELECT :start, 0
+    UNION
+    {steps}
+)
+SELECT w.node, MIN(w.depth) AS depth FROM walk w
+JOIN entities e ON e.id = w.node
+WHERE w.node > 0 AND w.node != :start
+GROUP BY w.node
+ORDER BY depth, e.pagerank DESC, w.node
+LIMIT :limit
+"""
+
+DISTANCES_QUERY = f"""
+WITH RECURSIVE walk(node, depth) AS (
+    SELECT :start, 0
+    UNION
+    {WALK_STEPS}
+)
+SELECT node, MIN(depth) AS depth FROM walk GROUP BY node
+"""
+
+NODE_NEIGHBORS_QUERY = """
+SELECT dst AS node FROM relations WHERE :node > 0 AND src = :node
+UNION ALL
+SELECT src FROM relations WHERE :node > 0 AND dst = :node
+UNION ALL
+SELECT -document_id FROM mentions WHERE :node > 0 AND entity_id = :node
+UNION ALL
+SELECT entity_id FROM mentions WHERE :node < 0 AND document_id = -:node
+"""
+
+
+# Statistiques de degré (hubs), recalculées après chaque chargement
+DEGREE_STATS_QUERY = """
+UPDATE entities SET
+    degree = (SELECT count(*) FROM relations WHERE src = entities.id)
+           + (SELECT count(*) FROM relations WHERE dst = entities.id),
+    document_count = (SELECT count(*) FROM mentions WHERE entity_id = entities.id)
+"""
+
+STRONGEST_RELATIONS_QUERY = """
+SELECT r.other, e.type, e.degree, e.pagerank FROM (
+    SELECT dst AS other, coalesce(strength, 1) AS strength, id FROM relations WHERE src = :id{filter}
+    UNION ALL
+    SELECT src, coalesce(strength, 1), id FROM relations WHERE dst = :id{filter}
+) r JOIN entities e ON e.id = r.other
+ORDER BY r.strength DESC, r.id
+LIMIT :fanout
+"""
+
+RELATED_QUERY = """
+SELECT r.* FROM (
+    SELECT dst AS other, * FROM relations WHERE src = :id{filter}
+    UNION ALL
+    SELECT src AS other, * FROM relations WHERE dst = :id{filter}
+) r JOIN entities e ON e.id = r.other
+ORDER BY e.pagerank DESC, r.id
+LIMIT :limit
+"""
+
+
+def _type_list(relation_types: List[str]) -> str:
+    """Liste SQL des types natifs autorisés (validés, donc sûrs à insérer dans la requête)."""
+    return ", ".join(f"'{t}'" for t in check_relation_types(relation_types))
+
+
+def _type_filter(relation_types: List[str] = None) -> str:
+    return f" AND rel_type IN ({_type_list(relation_types)})" if relation_types else ""
+
+def _relation_props(row) -> Dict:
+    props = {'type': row['type'], 'method': row['method']}
+    if row['strength'] is not None:
+        props['strength'] = row['strength']
+    if row['common_docs'] is not None:
+        props['common_docs'] = json.loads(row['common_docs'])
+    if row['distance'] is not None:
+        props['distance'] = row['distance']
+    return props
+
+
+def text_search(conn: sqlite3.Connection, table: str, query_text: str, limit: int) -> List[tuple]:
+    """(id, score) d'une table FTS5, meilleurs scores d'abord.
+
+    Score BM25 sur les termes rares ; si tous les termes sont courants (BM25 parcourrait
+    toute la liste), premiers candidats seulement, les noms les plus courts d'abord.
+    """
+    terms = query_terms(query_text)
+    if not terms:
+        return []
+    rare = [term for term in terms if conn.execute(f"""
+        SELECT count(*) FROM (SELECT rowid FROM {table} WHERE {table} MATCH ? LIMIT ?)
+    """, (fts_query([term]), MAX_CANDIDATES + 1)).fetchone()[0] <= MAX_CANDIDATES]
+
+    if rare:
+        return conn.execute(f"""
+            SELECT rowid AS id, -rank AS score FROM {table} WHERE {table} MATCH ? ORDER BY rank LIMIT ?
+        """, (fts_query(rare), limit)).fetchall()
+    return conn.execute(f"""
+        SELECT id, score FROM (
+            SELECT rowid AS id, ? * 1.0 / max(length(folded), 1) AS score FROM {table} WHERE {table} MATCH ? LIMIT ?
+        ) ORDER BY score DESC, id LIMIT ?
+    """, (max(len(term) for term in terms), fts_query(terms), MAX_CANDIDATES, limit)).fetchall()
+
+
+class SQLiteGraphBuilder(GraphBuilderBackend):
+    """Chargeur en masse du graphe dans un fichier SQLite unique ; les textes des documents
+    vont dans un DocumentStore (`documents/` à côté de la base par défaut)."""
+
+    def __init__(self, path: str | Path = 'data/graph/graph.sqlite', document_store_path: str | Path = None):
+        self.path = Path(path)
+        self.document_store_path = Path(document_store_path) if document_store_path else self.path.parent / 'documents'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.create_function('fold', 1, fold, deterministic=True)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def clear_database(self):
+        with self.conn:
+            for table in ('relations', 'mentions', 'documents', 'entities', 'entity_search', 'document_search'):
+                self.conn.execute(f"DELETE FROM {table}")
+        self.mark_changed()
+
+    def build_graph(self, entities_data: List[Dict], relations: List[Dict], documents: List[Dict] = None):
+        """Charge documents, entités, mentions et relations en une transaction."""
+        if documents is None:
+            # entities.json contient déjà le texte de chaque document
+            documents = [{'filename': d['document_id'], 'path': '', 'text': d.get('text', '')}
+                         for d in entities_data]
+
+        write_document_store(documents, self.document_store_path)
+        aggregator = MentionAggregator().add_documents(entities_data)
+
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO documents (doc_id, filename, title, path, num_chars)
+                VALUES (:id, :filename, :title, :path, :num_chars)
+                ON CONFLICT(doc_id) DO UPDATE SET filename = excluded.filename, title = excluded.title,
+                    path = excluded.path, num_chars = excluded.num_chars
+            """, (GraphBuilder.document_row(doc, with_text=False) for doc in documents))
+
+            self.conn.executemany("""
+                INSERT INTO entities (name, type, normalized_name) VALUES (:name, :type, :normalized_name)
+                ON CONFLICT(name) DO UPDATE SET type = excluded.type, normalized_name = excluded.normalized_name
+            """, aggregator.entity_rows())
+
+            self.conn.executemany("""
+                INSERT INTO mentions (entity_id, document_id, count, first_offset, context)
+                SELECT e.id, d.id, :count, :first_offset, :context
+                FROM entities e, documents d
+                WHERE e.name = :entity_name AND d.doc_id = :document_id
+                ON CONFLICT(entity_id, document_id) DO UPDATE SET count = excluded.count,
+                    first_offset = excluded.first_offset, context = coalesce(excluded.context, context)
+            """, aggregator.mention_rows())
+
+            self.conn.executemany("""
+                INSERT INTO relations (src, dst, type, rel_type, method, strength, distance, common_docs)
+                SELECT a.id, b.id, :predicate, :rel_type, :method, :strength, :distance, :common_docs
+                FROM entities a, entities b
+                WHERE a.name = :subject AND b.name = :object
+                ON CONFLICT(src, type, dst) DO UPDATE SET method = excluded.method,
+                    strength = coalesce(excluded.strength, strength),
+                    distance = coalesce(excluded.distance, distance),
+                    common_docs = coalesce(excluded.common_docs, common_docs)
+            """, self._relation_params(relations))
+
+            self.conn.executescript(INDEXES)
+            self.conn.executescript(SEARCH_INDEXES)
+            self.conn.execute(DEGREE_STATS_QUERY)
+
+        self.conn.execute("ANALYZE")
+        self.mark_changed()
+        return self.get_statistics()
+
+    def _relation_params(self, relations: Iterable[Dict]) -> Iterable[Dict]:
+        for relation in relations:
+            common_docs = relation.get('common_docs')
+            yield {
+                'subject': relation['subject'],
+                'object': relation['object'],
+                'predicate': relation['predicate'],
+                'rel_type': relation_type(relation['predicate']),
+                'method': relation.get('method', 'unknown'),
+                'strength': relation.get('strength', 1) if common_docs is not None else None,
+                'distance': relation.get('distance'),
+                'common_docs': json.dumps(common_docs, ensure_ascii=False) if common_docs is not None else None
+            }
+
+    def load_artifacts(self, entities_path: str = "data/entities/columns",
+                       relations_path: str = "data/relations/columns",
+                       documents_path: str = "data/processed/documents.json") -> Dict:
+        """Construit la base depuis les artefacts colonnaires du pipeline et documents.json."""
+        from ..utils.utf8_helpers import load_json_utf8, read_entities, read_relations
+
+        documents = load_json_utf8(documents_path)
+        return self.build_graph(list(read_entities(entities_path, documents)), list(read_relations(relations_path)),
+                                documents)
+
+    def compute_metrics(self, metrics: GraphMetrics = None) -> Dict:
+        """Calcule PageRank (et betweenness échantillonnée) et l'écrit dans la table entities."""
+        metrics = metrics or GraphMetrics()
+        ids = [row[0] for row in self.conn.execute("SELECT id FROM entities ORDER BY id")]
+        names = [row[0] for row in self.conn.execute("SELECT name FROM entities ORDER BY id")]
+        index = np.full(max(ids, default=0) + 1, -1, dtype=np.int64)
+        index[ids] = np.arange(len(ids))
+
+        edges = np.array(self.conn.execute("SELECT src, dst, coalesce(strength, 1) FROM relations").fetchall(),
+                         dtype=np.float64).reshape(-1, 3)
+        values = metrics.compute(len(ids), index[edges[:, 0].astype(np.int64)],
+                                 index[edges[:, 1].astype(np.int64)], edges[:, 2])
+
+        betweenness = values.get('betweenness', np.zeros(len(ids)))
+        with self.conn:
+            self.conn.executemany("UPDATE entities SET pagerank = ?, betweenness = ? WHERE id = ?",
+                                  zip(values['pagerank'].tolist(), betweenness.tolist(), ids))
+        self.mark_changed()
+        return metrics_summary(names, values)
+
+    def get_statistics(self) -> Dict:
+        count = lambda table: self.conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+        return {
+            'entities': count('entities'),
+            'relationships': count('relations') + count('mentions'),
+            'documents': count('documents')
+        }
+
+
+class SQLiteGraphQueries(GraphQueriesBackend):
+    """Implémentation SQLite (lecture seule, WAL) des requêtes de GraphQueries ; les textes
+    sont lus dans le DocumentStore (tranches mmap)."""
+
+    def __init__(self, path: str | Path = 'data/graph/graph.sqlite', document_store_path: str | Path = None):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Base SQLite introuvable: {self.path} "
+                                    f"(exécutez: python scripts/03_build_graph.py)")
+        self._local = threading.local()
+        store_path = document_store_path or self.path.parent / 'documents'
+        self.documents = DocumentStore(store_path) if DocumentStore.exists(store_path) else None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Une connexion en lecture seule par thread (lecteurs concurrents en WAL)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+        if self.documents:
+            self.documents.close()
+            self.documents = None
+
+    def _exact(self, entity_name: str):
+        row = self.conn.execute("SELECT id FROM entities WHERE name = ?", (entity_name,)).fetchone()
+        return row['id'] if row else None
+
+    def _lookup(self, entity_name: str):
+        """Équivalent de `e.name = $name OR e.normalized_name = $normalized`."""
+        row = self.conn.execute("""
+            SELECT id FROM entities WHERE name = ?
+            UNION ALL
+            SELECT id FROM (SELECT id FROM entities WHERE normalized_name = ? ORDER BY id LIMIT 1)
+            LIMIT 1
+        """, (entity_name, entity_name.lower())).fetchone()
+        return row['id'] if row else None
+
+    def _entity(self, entity_id: int) -> Dict:
+        row = self.conn.execute("""
+            SELECT name, type, normalized_name, degree, document_count, pagerank FROM entities WHERE id = ?
+        """, (entity_id,)).fetchone()
+        return dict(row)
+
+    def _document(self, document_id: int) -> Dict:
+        row = self.conn.execute("""
+            SELECT doc_id AS id, filename, title, path, num_chars FROM documents WHERE id = ?
+        """, (document_id,)).fetchone()
+        return dict(row)
+
+    def _doc_refs(self, entity_id: int, limit: int, with_counts: bool = False) -> List[Dict]:
+        rows = self.conn.execute("""
+            SELECT d.doc_id, d.title, d.num_chars, m.context, m.count
+            FROM mentions m INDEXED BY idx_mentions_ranked
+            JOIN documents d ON d.id = m.document_id
+            WHERE m.entity_id = ?
+            ORDER BY m.count DESC
+            LIMIT ?
+        """, (entity_id, limit)).fetchall()
+        refs = []
+        for row in rows:
+            ref = {
+                'doc_id': row['doc_id'],
+                'doc_title': row['title'],
+                'num_chars': row['num_chars'],
+                'context': row['context']
+            }
+            if with_counts:
+                ref['mention_count'] = row['count']
+            refs.append(ref)
+        return refs
+
+    def find_entity(self, entity_name: str) -> Dict:
+        entity_id = self._lookup(entity_name)
+        return self._entity(entity_id) if entity_id is not None else None
+
+    def get_entity_with_documents(self, entity_name: str, limit_docs: int = 5) -> Dict:
+        entity_id = self._lookup(entity_name)
+        if entity_id is None:
+            return None
+
+        documents = self._doc_refs(entity_id, limit_docs, with_counts=True)
+        if not documents:
+            return None
+        return {'entity': self._entity(entity_id), 'documents': documents}
+
+    def get_neighbors(self, entity_name: str, max_depth: int = 1, limit: int = 10,
+                      relation_types: List[str] = None) -> List[Dict]:
+        start = self._exact(entity_name)
+        if start is None:
+            return []
+
+        steps = TYPED_WALK_STEPS.format(types=_type_list(relation_types)) if relation_types else WALK_STEPS
+        rows = self.conn.execute(NEIGHBORS_QUERY.format(steps=steps),
+                                 {'start': start, 'max_depth': max_depth, 'limit': limit})
+        return [{
+            'entity': self._entity(row['node']),
+            'depth': row['depth'],
+            'documents': self._doc_refs(row['node'], 3)
+        } for row in rows.fetchall()]
+
+    def get_neighbors_bounded(self, entity_name: str, max_depth: int = 2, limit: int = 10,
+                              fanout: int = DEFAULT_FANOUT, hub_types: List[str] = DEFAULT_HUB_TYPES,
+                              hub_degree: int = DEFAULT_HUB_DEGREE, relation_types: List[str] = None) -> List[Dict]:
+        start = self._exact(entity_name)
+        if start is None:
+            return []
+
+        query = STRONGEST_RELATIONS_QUERY.format(filter=_type_filter(relation_types))
+        hub_types = set(hub_types or ())
+        seen = {start}
+        frontier = [(start, None, 0, 0.0)]
+        results = []
+
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for entity_id, entity_type, degree, _ in frontier:
+                if depth > 1 and (entity_type in hub_types or degree >= hub_degree):
+                    continue
+                for row in self.conn.execute(query, {'id': entity_id, 'fanout': fanout}):
+                    if row['other'] in seen:
+                        continue
+                    seen.add(row['other'])
+                    next_frontier.append((row['other'], row['type'], row['degree'], row['pagerank']))
+            # Niveau complet, puis les entités les plus importantes d'abord
+            for entity_id, _, _, _ in sorted(next_frontier, key=lambda node: -node[3])[:limit - len(results)]:
+                results.append({'entity': self._entity(entity_id), 'depth': depth,
+                                'documents': self._doc_refs(entity_id, 3)})
+            if len(results) >= limit:
+                break
+            frontier = next_frontier
+
+        return results
+
+    def _distances(self, start: int, max_depth: int) -> Dict[int, int]:
+        rows = self.conn.execute(DISTANCES_QUERY, {'start': start, 'max_depth': max_depth})
+        return {row['node']: row['depth'] for row in rows.fetchall()}
+
+    def _backtrack(self, node: int, distances: Dict[int, int]) -> List[int]:
+        """Remonte d'un nœud vers l'origine d'une carte de distances."""
+        chain = [node]
+        while distances[node] > 0:
+            for row in self.conn.execute(NODE_NEIGHBORS_QUERY, {'node': node}):
+                if distances.get(row['node']) == distances[node] - 1:
+                    node = row['node']
+                    break
+            chain.append(node)
+        return chain
+
+    def find_path(self, entity1: str, entity2: str, max_length: int = 5) -> Dict:
+        """Plus court chemin par BFS bidirectionnel : une carte de distances
+        (CTE récursif) par extrémité, approfondie alternativement jusqu'à rencontre."""
+        a, b = self._exact(entity1), self._exact(entity2)
+        if a is None or b is None or a == b:
+            return None
+
+        depths = [0, 0]
+        distances = [{a: 0}, {b: 0}]
+        meeting = None
+
+        while depths[0] + depths[1] < max_length:
+            side = 0 if len(distances[0]) <= len(distances[1]) else 1
+            depths[side] += 1
+            distances[side] = self._distances((a, b)[side], depths[side])
+
+            common = distances[0].keys() & distances[1].keys()
+            if common:
+                meeting = min(common, key=lambda n: distances[0][n] + distances[1][n])
+                break
+
+        if meeting is None:
+            return None
+
+        forward = self._backtrack(meeting, distances[0])
+        backward = self._backtrack(meeting, distances[1])
+        nodes = list(reversed(forward)) + backward[1:]
+        return {
+            'nodes': [self._entity(n) if n > 0 else self._document(-n) for n in nodes],
+            'relationships': [self._edge(u, v) for u, v in zip(nodes, nodes[1:])]
+        }
+
+    def _edge(self, u: int, v: int) -> Dict:
+        if u > 0 and v > 0:
+            row = self.conn.execute("""
+                SELECT * FROM relations WHERE (src = ? AND dst = ?) OR (src = ? AND dst = ?)
+                ORDER BY id LIMIT 1
+            """, (u, v, v, u)).fetchone()
+            return _relation_props(row)
+
+        entity_id, document_id = (u, -v) if u > 0 else (v, -u)
+        row = self.conn.execute("""
+            SELECT context, count, first_offset FROM mentions WHERE entity_id = ? AND document_id = ?
+        """, (entity_id, document_id)).fetchone()
+        return dict(row)
+
+    def search_entities_by_type(self, entity_type: str, limit: int = 10) -> List[Dict]:
+        rows = self.conn.execute("""
+            SELECT name, type, normalized_name, degree, document_count, pagerank FROM entities
+            WHERE type = ? ORDER BY id LIMIT ?
+        """, (entity_type, limit))
+        return [dict(row) for row in rows.fetchall()]
+
+    def count_entities_by_type(self, entity_types: List[str]) -> Dict[str, int]:
+        """Comptage dans l'index idx_entities_type, un type à la fois."""
+        return {t: self.conn.execute("SELECT count(*) FROM entities WHERE type = ?", (t,)).fetchone()[0]
+                for t in entity_types}
+
+    def get_related_entities(self, entity_name: str, limit: int = 10,
+                             relation_types: List[str] = None) -> List[Dict]:
+        entity_id = self._exact(entity_name)
+        if entity_id is None:
+            return []
+
+        rows = self.conn.execute(RELATED_QUERY.format(filter=_type_filter(relation_types)),
+                                 {'id': entity_id, 'limit': limit}).fetchall()
+        return [{
+            'entity': self._entity(row['other']),
+            'relation': _relation_props(row),
+            'documents': self._doc_refs(row['other'], 2)
+        } for row in rows]
+
+    def search_by_query(self, query_text: str, limit: int = 10) -> Dict:
+        """Recherche plein texte (FTS5 trigram, sans accents) dans les noms, par score BM25."""
+        return {'entities': [{
+            'entity': self._entity(row['id']),
+            'documents': self._doc_refs(row['id'], 3),
+            'score': row['score']
+        } for row in text_search(self.conn, 'entity_search', query_text, limit)]}
+
+    def _document_with_entities(self, document_id: int, max_entities: int) -> Dict:
+        doc = self._document(document_id)
+        doc['text'] = self.document_text(doc['id'], 5001)
+        if len(doc['text']) > 5000:
+            doc['text'] = doc['text'][:5000] + "...[texte tronqué]"
+
+        rows = self.conn.execute("""
+            SELECT m.entity_id, m.context FROM mentions m INDEXED BY idx_mentions_document
+            WHERE m.document_id = ? LIMIT ?
+        """, (document_id, max_entities)).fetchall()
+        return {
+            'document': doc,
+            'entities': [{'entity': self._entity(row['entity_id']), 'context': row['context']} for row in rows]
+        }
+
+    def get_document(self, doc_id: str) -> Dict:
+        row = self.conn.execute("SELECT id FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+        return self._document_with_entities(row['id'], 20) if row else None
+
+    def document_text(self, doc_id: str, max_chars: int = None) -> str:
+        return self.documents.text(doc_id, max_chars) if self.documents else ''
+
+    def get_document_by_title(self, title: str) -> Dict:
+        rows = text_search(self.conn, 'document_search', title, 1)
+        return self._document_with_entities(rows[0]['id'], 15) if rows else None
@@ -0,0 +1,133 @@
+# src/graph/text_index.py
+
+import math
+import re
+import unicodedata
+from typing import List, Tuple
+import numpy as np
+
+# Mots outils ignorés dans les requêtes en texte libre (les questions passent par ici)
+STOPWORDS = frozenset("""
+a au aux avec ce ces c cet cette comment d dans de des du elle elles en est et etait ete etre eu
+fut il ils j je l la le les leur leurs lui m ma mais me mes moi mon n ne nos notre nous on ou par
+pas plus pour pourquoi qu quand que quel quelle quelles quels qui quoi s sa sans se ses son sont
+sur t ta te tes toi ton tu un une vos votre vous y
+""".split())
+
+MIN_TERM_LENGTH = 3
+
+# Au-delà, un terme trop fréquent ne fait que re-noter les candidats des termes plus rares
+MAX_CANDIDATES = 2000
+
+
+def fold(text: str) -> str:
+    """Minuscules sans accents (`Élysée` → `elysee`)."""
+    decomposed = unicodedata.normalize('NFKD', (text or '').lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def query_terms(query: str) -> List[str]:
+    """Mots significatifs d'une requête, repliés, sans mots outils ni doublons."""
+    words = re.findall(r'\w+', fold(query))
+    terms = [w for w in words if len(w) >= MIN_TERM_LENGTH and w not in STOPWORDS]
+    return list(dict.fromkeys(terms))
+
+
+def lucene_query(query: str) -> str:
+    """Requête Lucene (index FULLTEXT Neo4j) : préfixe de chaque terme, combinés par OR."""
+    return ' OR '.join(f"{term}*" for term in query_terms(query))
+
+
+def fts_query(terms: List[str]) -> str:
+    """Requête FTS5 (tokenizer trigram) : chaque terme comme sous-chaîne, combinés par OR."""
+    return ' OR '.join(f'"{term}"' for term in terms)
+
+
+def trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Index inversé de trigrammes (listes triées en CSR NumPy) sur des textes repliés.
+
+    Un texte contient un terme s'il contient tous ses trigrammes (intersection des
+    listes, de la plus courte à la plus longue) et si la sous-chaîne se vérifie.
+    """
+
+    def __init__(self, texts: List[str]):
+        self.folded = [fold(text).replace('\x00', ' ') for text in texts]
+        lengths = np.array([len(text) for text in self.folded], dtype=np.int64)
+        self.lengths = np.maximum(lengths, 1).astype(np.float64)
+
+        # Tous les textes bout à bout (séparés par \x00), un trigramme = 3 points de code sur 63 bits
+        joined = '\x00'.join(self.folded) + '\x00'
+        chars = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+        owners = np.repeat(np.arange(len(self.folded), dtype=np.int64), lengths + 1)
+        keys = (chars[:-2] << 42) | (chars[1:-1] << 21) | chars[2:]
+        inside = (chars[:-2] != 0) & (chars[1:-1] != 0) & (chars[2:] != 0)
+        keys, ids = keys[inside], owners[:-2][inside]
+
+        # Paires (trigramme, texte) uniques, triées : listes de textes par trigramme
+        order = np.lexsort((ids, keys))
+        keys, ids = keys[order], ids[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = (keys[1:] != keys[:-1]) | (ids[1:] != ids[:-1])
+        keys, self.postings = keys[first], ids[first]
+
+        self.keys, counts = np.unique(keys, return_counts=True)
+        self.indptr = np.zeros(len(self.keys) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+
+    def __len__(self) -> int:
+        return len(self.folded)
+
+    @staticmethod
+    def _key(gram: str) -> int:
+        return (ord(gram[0]) << 42) | (ord(gram[1]) << 21) | ord(gram[2])
+
+    def _posting_lists(self, term: str) -> List[np.ndarray]:
+        """Listes des trigrammes du terme, la plus courte d'abord ([] si un trigramme est absent)."""
+        lists = []
+        for gram in trigrams(term):
+            key = self._key(gram)
+            code = int(np.searchsorted(self.keys, key))
+            if code == len(self.keys) or self.keys[code] != key:
+                return []
+            lists.append(self.postings[self.indptr[code]:self.indptr[code + 1]])
+        return sorted(lists, key=len)
+
+    def _matches(self, term: str, lists: List[np.ndarray]) -> List[int]:
+        ids = lists[0]
+        if len(ids) > MAX_CANDIDATES:
+            # Terme très courant : premiers candidats seulement, sans intersection coûteuse
+            ids = ids[:MAX_CANDIDATES]
+        else:
+            for other in lists[1:]:
+                ids = np.intersect1d(ids, other, assume_unique=True)
+        return [i for i in ids.tolist() if term in self.folded[i]]
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """(indice, score) des textes contenant au moins un terme, meilleurs scores d'abord.
+
+        Score : somme, sur les termes trouvés, de idf(terme) × part du texte couverte.
+        """
+        plans = []
+        for term in query_terms(query):
+            lists = self._posting_lists(term)
+            if lists:
+                plans.append((len(lists[0]), term, lists))
+        plans.sort(key=lambda plan: plan[0])
+
+        n = len(self.folded)
+        scores = {}
+        for df, term, lists in plans:
+            if scores and df > MAX_CANDIDATES:
+                ids = [i for i in scores if term in self.folded[i]]
+            else:
+                ids = self._matches(term, lists)
+            idf = math.log(1 + n / df)
+            for i in ids:
+                scores[i] = scores.get(i, 0.0) + idf * len(term) / self.lengths[i]
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(i, float(score)) for i, score in ranked[:limit]]
@@ -0,0 +1,115 @@
+# src/pipeline/runner.py
+
+from typing import List, Dict, Callable, Iterable
+from .stages import PipelineContext
+
+
+class Stage:
+    """Étape du pipeline : `run(ctx, *sorties des étapes requises)` renvoie sa sortie ;
+    `load(ctx)` la relit depuis son point de reprise (None si absent)."""
+
+    def __init__(self, name: str, run: Callable, requires: Iterable[str] = (), load: Callable = None,
+                 description: str = ''):
+        self.name = name
+        self.run = run
+        self.requires = tuple(requires)
+        self.load = load
+        self.description = description or name
+
+
+class PipelineRunner:
+    """Exécute les étapes dans un seul processus, dans l'ordre de leurs dépendances.
+
+    Les sorties passent d'une étape à l'autre en mémoire et les modèles sont partagés
+    via le contexte ; une étape requise mais non sélectionnée est relue depuis son
+    point de reprise. Avec `resume`, les étapes déjà terminées lors d'une exécution
+    interrompue (manifeste) ne sont pas relancées.
+    """
+
+    def __init__(self, stages: List[Stage], context: PipelineContext):
+        self.stages = {stage.name: stage for stage in stages}
+        self.context = context
+
+    def resolve(self, selected: Iterable[str] = None) -> List[str]:
+        """Étapes sélectionnées (toutes par défaut) triées dans l'ordre de leurs dépendances."""
+        selected = list(selected) if selected else list(self.stages)
+        unknown = [name for name in selected if name not in self.stages]
+        if unknown:
+            raise ValueError(f"Étape(s) inconnue(s): {', '.join(unknown)} (disponibles: {', '.join(self.stages)})")
+
+        order, visiting = [], set()
+
+        def visit(name):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Dépendance circulaire sur l'étape {name}")
+            visiting.add(name)
+            for required in self.stages[name].requires:
+                visit(required)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return [name for name in order if name in selected]
+
+    def output(self, name: str):
+        """Sortie d'une étape : en mémoire si elle vient de tourner, sinon depuis son point de reprise."""
+        outputs = self.context.outputs
+        if name not in outputs:
+            stage = self.stages[name]
+            outputs[name] = stage.load(self.context) if stage.load else None
+            if outputs[name] is None:
+                raise RuntimeError(f"Sortie de l'étape '{name}' indisponible : incluez-la dans la sélection "
+                                   f"ou activez son point de reprise (pipeline.checkpoints)")
+        return outputs[name]
+
+    def _completed(self) -> List[str]:
+        return self.context.manifest.data.setdefault('pipeline', {}).setdefault('completed', [])
+
+    def run(self, selected: Iterable[str] = None, resume: bool = False) -> Dict:
+        """Exécute les étapes ; renvoie les sorties des étapes exécutées."""
+        order = self.resolve(selected)
+        completed = self._completed()
+        if not resume:
+            completed.clear()
+
+        results = {}
+        for i, name in enumerate(order, 1):
+            stage = self.stages[name]
+            if name in completed:
+                print(f"\n⏭️  Étape {i}/{len(order)} déjà terminée: {stage.description}")
+                continue
+
+            print(f"\n{'#'*60}")
+            print(f"# ÉTAPE {i}/{len(order)}: {stage.description}")
+            print(f"{'#'*60}")
+            inputs = [self.output(required) for required in stage.requires]
+            results[name] = self.context.outputs[name] = stage.run(self.context, *inputs)
+
+            completed.append(name)
+            self.context.manifest.save()
+            print(f"\n✓ Étape {i}/{len(order)} terminée avec succès")
+
+        # Exécution complète : la prochaine repart du début
+        completed.clear()
+        self.context.manifest.save()
+        return results
+
+
+def default_stages(limit: int = None, clear_graph: bool = False, bulk_export_dir: str = None) -> List[Stage]:
+    """Étapes 01 à 04 du pipeline (corpus, extraction, graphe, embeddings)."""
+    from . import stages
+
+    return [
+        Stage('prepare', lambda ctx: stages.prepare_corpus(ctx, limit=limit),
+              load=stages.load_documents, description='Préparation du corpus'),
+        Stage('extract', stages.extract_corpus, requires=('prepare',),
+              load=stages.load_extraction, description='Extraction des entités et relations'),
+        Stage('graph', lambda ctx, documents, extraction: stages.build_graph(
+                  ctx, documents, extraction, clear=clear_graph, bulk_export_dir=bulk_export_dir),
+              requires=('prepare', 'extract'), description='Construction du graphe'),
+        Stage('embeddings', stages.generate_embeddings, requires=('extract',),
+              description='Génération des embeddings')
+    ]
@@ -0,0 +1,549 @@
+# src/pipeline/stages.py
+
+"""
+Étapes du pipeline (corpus → entités et relations → graphe → embeddings), sans
+saisie interactive. Utilisées par les scripts 01 à 04 et par PipelineRunner ;
+chacune ne retraite que les documents nouveaux ou modifiés (PipelineManifest)
+et ne réécrit ses artefacts que si son point de reprise est activé.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Iterable
+from tqdm import tqdm
+from ..graph.document_store import content_hash
+from ..utils.columnar import META_FILE, EntityWriter, RelationWriter
+from ..utils.manifest import PipelineManifest, document_hashes, file_hash
+from ..utils.utf8_helpers import (load_json_utf8, read_entities, read_relations, JsonArrayFile,
+                                  ENTITIES_PATH, RELATIONS_PATH)
+
+RAW_DIR = Path("data/raw")
+DOCUMENTS_FILE = Path("data/processed/documents.json")
+ENTITIES_DIR = Path(ENTITIES_PATH)
+RELATIONS_DIR = Path(RELATIONS_PATH)
+SYNTACTIC_DIR = Path("data/relations/syntactic")
+
+# Taille des chunks analysés par spaCy (découpés entre deux phrases)
+PARSE_CHUNK_CHARS = 10000
+# Relations syntaxiques gardées par document
+SYNTACTIC_PER_DOC = 20
+
+
+def section(title: str):
+    print(f"\n{'='*60}")
+    print(title)
+    print("="*60)
+
+
+class PipelineContext:
+    """État partagé d'une exécution : configuration, manifeste, modèles déjà chargés
+    et sorties des étapes (passées en mémoire à l'étape suivante)."""
+
+    def __init__(self, config=None, manifest: PipelineManifest = None, checkpoints: List[str] = None,
+                 options: Dict = None):
+        self.config = config
+        self.manifest = manifest or PipelineManifest()
+        if checkpoints is None:
+            checkpoints = config.get('pipeline.checkpoints', ['prepare', 'extract']) if config else ['prepare', 'extract']
+        self.checkpoints = set(checkpoints)
+        self.options = options or {}
+        self.outputs = {}
+        self._models = {}
+        self._scratch = None
+
+    def checkpoint(self, stage: str) -> bool:
+        """Vrai si les sorties de l'étape sont écrites sur disque (et reprises à l'exécution suivante)."""
+        return stage in self.checkpoints
+
+    def artifact_path(self, stage: str, path: Path) -> Path:
+        """Emplacement des sorties de l'étape : `path` si elle a un point de reprise, sinon un
+        répertoire temporaire supprimé avec le contexte."""
+        if self.checkpoint(stage):
+            return Path(path)
+        if self._scratch is None:
+            self._scratch = tempfile.TemporaryDirectory(prefix='pipeline-')
+        return Path(self._scratch.name) / stage / '_'.join(Path(path).parts)
+
+    def model(self, key: str, loader):
+        """Modèle chargé une seule fois pour toute l'exécution."""
+        if key not in self._models:
+            self._models[key] = loader()
+        return self._models[key]
+
+
+# ---------------------------------------------------------------- corpus
+
+def clean_documents(documents: List[Dict]) -> int:
+    """Nettoie les textes en place et ajoute paragraphes et statistiques ; renvoie le nombre nettoyé."""
+    from ..preprocessing.text_cleaner import TextCleaner
+
+    cleaner = TextCleaner()
+    cleaned_count = 0
+    for i, doc in enumerate(documents):
+        try:
+            original_length = len(doc['text'])
+            doc['text'] = cleaner.clean(doc['text'])
+            doc['paragraphs'] = cleaner.split_into_paragraphs(doc['text'])
+            cleaned_length = len(doc['text'])
+
+            reduction = 0
+            if original_length > 0:
+                reduction = ((original_length - cleaned_length) / original_length) * 100
+
+            doc['cleaning_stats'] = {
+                'original_length': original_length,
+                'cleaned_length': cleaned_length,
+                'reduction_percent': reduction,
+                'num_paragraphs': len(doc['paragraphs'])
+            }
+            cleaned_count += 1
+
+            progress_interval = min(100, max(1, len(documents) // 10))
+            if (i + 1) % progress_interval == 0 or (i + 1) == len(documents):
+                print(f"Progress: {i + 1}/{len(documents)} documents nettoyés...")
+        except Exception as e:
+            print(f"⚠️  Erreur lors du nettoyage du document {doc.get('filename', 'unknown')}: {e}")
+    return cleaned_count
+
+
+def prepare_corpus(ctx: PipelineContext, raw_dir: Path = RAW_DIR, limit: int = None) -> List[Dict]:
+    """Charge et nettoie les fichiers de `raw_dir` (les `limit` premiers) ; seuls les fichiers
+    nouveaux ou modifiés depuis la dernière exécution sont relus."""
+    from ..preprocessing.document_loader import DocumentLoader
+
+    section("Étape 1/3: Chargement des documents")
+    loader = DocumentLoader(raw_dir)
+    files = loader.list_files()[:limit]
+    if not files:
+        raise FileNotFoundError(f"Aucun document dans {raw_dir} (exécutez: python scripts/00_load_data.py)")
+
+    checkpoint = ctx.checkpoint('prepare')
+    sources = {file_path.name: file_hash(file_path) for file_path in files}
+    plan = ctx.manifest.plan('prepare', sources)
+    previous = {}
+    if checkpoint and plan['unchanged'] and DOCUMENTS_FILE.exists():
+        previous = {doc['filename']: doc for doc in load_json_utf8(DOCUMENTS_FILE)}
+    changed = set(plan['changed']) | {name for name in plan['unchanged'] if name not in previous}
+    print(f"\n✓ {len(files) - len(changed)} document(s) inchangé(s), {len(changed)} à traiter")
+
+    documents = loader.load_documents([file_path for file_path in files if file_path.name in changed])
+    print(f"\n✓ Chargé: {len(documents)} documents (sur {len(files)} sélectionnés)")
+
+    if documents:
+        section("Étape 2/3: Nettoyage des textes")
+        cleaned_count = clean_documents(documents)
+        print(f"\n✓ Nettoyé: {cleaned_count}/{len(documents)} documents")
+
+    # Fusion avec les sorties précédentes, dans l'ordre des fichiers
+    cleaned = {doc['filename']: doc for doc in documents}
+    documents = [cleaned.get(file_path.name) or previous.get(file_path.name) for file_path in files]
+    documents = [doc for doc in documents if doc is not None]
+    if not documents:
+        raise ValueError("Aucun document chargé! Vérifiez les fichiers.")
+
+    if checkpoint and (changed or plan['removed'] or not DOCUMENTS_FILE.exists()):
+        section("Étape 3/3: Sauvegarde")
+        loader.save_processed(documents, DOCUMENTS_FILE)
+        ctx.manifest.record('prepare', sources, artifacts={DOCUMENTS_FILE: len(documents)})
+        print(f"💾 Sauvegardé dans: {DOCUMENTS_FILE.absolute()}")
+    return documents
+
+
+def load_documents(ctx: PipelineContext) -> List[Dict]:
+    """Sortie de `prepare` relue depuis son point de reprise (None s'il n'existe pas)."""
+    return load_json_utf8(DOCUMENTS_FILE) if DOCUMENTS_FILE.exists() else None
+
+
+# ------------------------------------------------------ entités et relations
+
+def parse_chunk_chars(ctx: PipelineContext) -> int:
+    return ctx.config.get('extraction.parse_chunk_chars', PARSE_CHUNK_CHARS) if ctx.config else PARSE_CHUNK_CHARS
+
+
+def extraction_settings(ctx: PipelineContext) -> Dict:
+    """Paramètres de l'extraction : s'ils changent, tous les documents sont retraités."""
+    from ..extraction.entity_extractor import DEFAULT_MODEL, DEFAULT_ENTITY_TYPES
+    return {'model': DEFAULT_MODEL, 'entity_types': DEFAULT_ENTITY_TYPES,
+            'parse_chunk_chars': parse_chunk_chars(ctx)}
+
+
+def stream_documents(ctx: PipelineContext):
+    """Documents de `prepare` relus en flux depuis son point de reprise, à chaque itération."""
+    return JsonArrayFile(DOCUMENTS_FILE) if DOCUMENTS_FILE.exists() else None
+
+
+def document_entities(ctx: PipelineContext, documents: Iterable[Dict], parse: set, previous=None,
+                      previous_syntactic=None, store=None):
+    """(document, entités, relations syntaxiques) dans l'ordre des documents.
+
+    Les documents de `parse` sont analysés une seule fois (DocumentAnalyzer), par chunks de
+    `extraction.parse_chunk_chars` caractères : le même `Doc` donne entités et relations
+    de dépendance et est ajouté à `store` (DocBinStore) s'il y en a un. Les autres
+    reprennent les sorties de la dernière extraction (`previous`, `previous_syntactic`).
+
+    Les chunks passent par `nlp.pipe` (parcours supplémentaire de `documents`, filtré), par
+    lots de `extraction.batch_size` sur `extraction.n_process` processus.
+    """
+    from ..extraction.document_analyzer import DocumentAnalyzer
+    from ..extraction.entity_extractor import EntityExtractor
+    from ..extraction.relation_extractor import RelationExtractor
+
+    config = ctx.config
+    batch_size = config.get('extraction.batch_size', 64) if config else 64
+    n_process = config.get('extraction.n_process', 1) if config else 1
+
+    previous_index = {doc_id: i for i, doc_id in enumerate(previous.document_ids)} if previous is not None else {}
+    analyzed = None
+    for doc in documents:
+        doc_id = doc['filename']
+        if doc_id not in parse:
+            yield doc, previous[previous_index[doc_id]], previous_syntactic.document_relations(doc_id)
+            continue
+        if analyzed is None:
+            analyzer = DocumentAnalyzer(ctx.model('entity_extractor', EntityExtractor),
+                                        ctx.model('relation_extractor', RelationExtractor), store)
+            analyzed = analyzer.iter_analyses((d for d in documents if d['filename'] in parse),
+                                              chunk_chars=parse_chunk_chars(ctx),
+                                              batch_size=batch_size, n_process=n_process)
+        _, analysis = next(analyzed)
+        relations = analysis['relations'][:SYNTACTIC_PER_DOC]
+        for relation in relations:
+            relation['doc_id'] = doc_id
+        yield doc, {'document_id': doc_id, 'entities': analysis['entities']}, relations
+    if analyzed is not None:
+        analyzed.close()
+
+
+def extract_corpus(ctx: PipelineContext, documents: Iterable[Dict]) -> Dict:
+    """Entités (spaCy) des documents nouveaux ou modifiés, reprises des sorties précédentes pour
+    les autres, puis relations syntaxiques, de co-occurrence et de proximité.
+
+    Les documents sont lus en flux (liste ou JsonArrayFile, parcourus deux fois) ; entités
+    et relations sont écrites au fil de l'eau dans les tables colonnaires ; co-occurrences
+    (par partitions, ou par matrice creuse en mémoire avec `extraction.cooccurrence_engine`)
+    et déduplication sont agrégées hors mémoire (`pipeline.spill_dir`). Renvoie
+    {'entities', 'relations'} (tables en mmap) et le nombre de relations brutes.
+    """
+    from ..extraction.cooccurrence import CooccurrenceMatrix
+    from ..extraction.document_analyzer import DocBinStore
+    from ..extraction.external_aggregation import CooccurrenceAggregator, ExternalDeduplicator
+    from ..extraction.relation_extractor import RelationExtractor
+
+    checkpoint = ctx.checkpoint('extract')
+    settings = extraction_settings(ctx)
+    hashes = document_hashes(documents)
+    plan = ctx.manifest.plan('extract', hashes, settings)
+    outputs_exist = checkpoint and extraction_exists()
+    if not plan['changed'] and not plan['removed'] and outputs_exist:
+        print(f"\n✓ Extraction à jour ({len(hashes)} documents inchangés)")
+        return load_extraction(ctx)
+
+    previous = None
+    previous_syntactic = None
+    if plan['unchanged'] and outputs_exist:
+        previous = read_entities(ENTITIES_DIR)
+        if (SYNTACTIC_DIR / META_FILE).exists():
+            # Table en mmap, relue document par document
+            previous_syntactic = read_relations(SYNTACTIC_DIR)
+    known = set(previous.document_ids) if previous is not None else set()
+    changed = set(plan['changed']) | {doc_id for doc_id in plan['unchanged'] if doc_id not in known}
+    # Documents sans relations syntaxiques enregistrées : ré-analysés aussi
+    known_syntactic = set(previous_syntactic.document_ids) if previous_syntactic is not None else set()
+    changed |= {doc_id for doc_id in hashes if doc_id not in known_syntactic}
+    print(f"\n✓ {len(hashes) - len(changed)} document(s) inchangé(s), {len(changed)} à analyser")
+    docbin_path = (ctx.config.get('extraction.docbin_path') if ctx.config else None) or None
+    store = DocBinStore(docbin_path) if docbin_path else None
+
+    relation_extractor = ctx.model('relation_extractor', RelationExtractor)
+    entities_path = ctx.artifact_path('extract', ENTITIES_DIR)
+    relations_path = ctx.artifact_path('extract', RELATIONS_DIR)
+    syntactic_path = ctx.artifact_path('extract', SYNTACTIC_DIR)
+    partitions = ctx.config.get('pipeline.spill_partitions', 64) if ctx.config else 64
+    spill_dir = (ctx.config.get('pipeline.spill_dir') if ctx.config else None) or None
+    engine = ctx.config.get('extraction.cooccurrence_engine', 'external') if ctx.config else 'external'
+    if spill_dir:
+        Path(spill_dir).mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix='extract-', dir=spill_dir) as workdir:
+        if engine == 'sparse':
+            cooccurrence = CooccurrenceMatrix(workdir)
+        else:
+            cooccurrence = CooccurrenceAggregator(workdir, partitions)
+        deduplicator = ExternalDeduplicator(workdir, relation_extractor.normalize_relation,
+                                            relation_extractor.merge_relation, partitions)
+        entity_counts = {}
+        counts = {'entities': 0, 'syntactic': 0, 'proximity': 0}
+        entity_writer = EntityWriter(entities_path)
+        syntactic_writer = RelationWriter(syntactic_path)
+        try:
+            section("Étape 1/3: Entités, relations syntaxiques et de proximité (en flux)")
+            stream = document_entities(ctx, documents, changed, previous, previous_syntactic, store)
+            for i, (doc, doc_entities, relations) in enumerate(tqdm(stream, total=len(hashes), desc="Documents")):
+                doc_id = doc_entities['document_id']
+                entity_writer.add(doc_entities)
+                counts['entities'] += len(doc_entities['entities'])
+                relation_extractor.count_entity_documents(doc_entities, entity_counts)
+                cooccurrence.add_document(doc_id, doc_entities['entities'])
+
+                syntactic_writer.add_document(doc_id)
+                for j, relation in enumerate(relations):
+                    syntactic_writer.add(relation)
+                    deduplicator.add([0, i, j], relation)
+                counts['syntactic'] += len(relations)
+
+                for j, relation in enumerate(relation_extractor.extract_proximity_relations(
+                        doc_entities, window=150, max_per_doc=20)):
+                    deduplicator.add([2, i, j], relation)
+                    counts['proximity'] += 1
+
+            # Tables précédentes fermées avant d'être remplacées
+            stream.close()
+            stream = previous = previous_syntactic = None
+            entity_writer.close()
+            syntactic_writer.close()
+            if store is not None:
+                store.close(keep=[doc_id for doc_id in hashes if doc_id not in changed])
+        except BaseException:
+            entity_writer.abort()
+            syntactic_writer.abort()
+            if store is not None:
+                store.abort()
+            raise
+        print(f"\n✓ Entités: {counts['entities']:,}")
+        print(f"✓ Relations syntaxiques brutes: {counts['syntactic']:,}")
+        print(f"✓ Relations de proximité brutes: {counts['proximity']:,}")
+
+        section("Étape 2/3: Relations de co-occurrence (filtrées)")
+        print(f"\n🔗 Extraction des co-occurrences significatives (≥3 documents)...")
+        counts['cooccurrence'] = 0
+        for seq, relation in cooccurrence.relations(min_strength=3):
+            deduplicator.add([1, seq, 0], relation)
+            counts['cooccurrence'] += 1
+        print(f"✓ Relations de co-occurrence: {counts['cooccurrence']:,}")
+
+        section("Étape 3/3: Déduplication et filtrage")
+        print(f"\n🔄 Total avant déduplication: {deduplicator.count:,}")
+        print("🔄 Filtrage par fréquence des entités (≥3 mentions)...")
+        with RelationWriter(relations_path) as relation_writer:
+            for relation in deduplicator:
+                if relation_extractor.is_frequent(relation, entity_counts, min_mentions=3):
+                    relation_writer.add(relation)
+        print(f"✓ Après déduplication et filtrage: {relation_writer.rows:,}")
+
+    entities = read_entities(entities_path)
+    if checkpoint:
+        ctx.manifest.record('extract', hashes, settings, artifacts={
+            ENTITIES_DIR: len(entities),
+            RELATIONS_DIR: relation_writer.rows,
+            SYNTACTIC_DIR: counts['syntactic']
+        })
+    return {'entities': entities, 'relations': read_relations(relations_path), 'raw_relations': deduplicator.count}
+
+
+def extraction_exists() -> bool:
+    return (ENTITIES_DIR / META_FILE).exists() and (RELATIONS_DIR / META_FILE).exists()
+
+
+def load_extraction(ctx: PipelineContext) -> Dict:
+    """Sortie de `extract` relue depuis son point de reprise, en mmap (None s'il n'existe pas) ;
+    les entités n'y portent pas le texte des documents (voir `with_document_text`)."""
+    if not extraction_exists():
+        return None
+    return {'entities': read_entities(ENTITIES_DIR), 'relations': read_relations(RELATIONS_DIR)}
+
+
+def with_document_text(entities, documents: List[Dict]) -> List[Dict]:
+    """Entités par document complétées du texte des documents (contextes des mentions)."""
+    texts = {doc['filename']: doc['text'] for doc in documents}
+    return [doc if 'text' in doc else dict(doc, text=texts.get(doc['document_id'], '')) for doc in entities]
+
+
+# ---------------------------------------------------------------- graphe
+
+def bulk_export(entities, relations, documents, output_dir: str, document_store_path: str):
+    """Génère les CSV neo4j-admin au lieu d'écrire dans Neo4j."""
+    from ..graph.bulk_exporter import BulkExporter
+
+    section("Export pour import hors ligne (neo4j-admin)")
+    exporter = BulkExporter(output_dir, document_store_path=document_store_path)
+    stats = exporter.export(entities, relations, documents)
+
+    print(f"\n✓ Fichiers CSV écrits dans {Path(output_dir).absolute()}")
+    print(f"✓ Textes des documents dans {Path(document_store_path).absolute()}")
+    for name, count in stats.items():
+        print(f"  - {name}: {count:,}")
+    print("\nArrêtez Neo4j puis lancez l'import (voir aussi import.sh):")
+    print(f"  {exporter.import_command()}")
+    print("\nLes contraintes et index sont recréés au prochain démarrage de GraphBuilder.")
+    print("="*60)
+
+
+def compute_metrics(builder, config):
+    """Calcule l'importance des entités (PageRank) et l'écrit dans le graphe."""
+    from ..graph.graph_metrics import metrics_from_config
+
+    metrics = metrics_from_config(config)
+    if metrics is None:
+        return
+
+    print("\nCalcul de l'importance des entités (PageRank)...")
+    summary = builder.compute_metrics(metrics)
+    print(f"✓ {summary['entities']:,} entités classées")
+    for name, score in summary['top_pagerank']:
+        print(f"  - {name}: {score:.6f}")
+
+
+def build_entity_indexes(entities, config):
+    """Construit l'instantané d'autocomplétion et le filtre des noms d'entités (API et interface)."""
+    from ..graph.autocomplete import AutocompleteIndex, autocomplete_path
+    from ..graph.entity_filter import build_entity_filter, filter_settings
+    from ..graph.query_cache import graph_version
+
+    path = autocomplete_path(config)
+    print("\nConstruction de l'index d'autocomplétion...")
+    index = AutocompleteIndex.from_entities(entities)
+    index.save(path)
+    print(f"✓ {len(index):,} noms indexés dans {Path(path).absolute()}")
+
+    settings = filter_settings(config)
+    if settings['enabled']:
+        bloom = build_entity_filter((index.name(i) for i in range(len(index))), config)
+        print(f"✓ Filtre des entités ({bloom.count:,} noms, {bloom.bits.nbytes / 1024:.0f} Ko) "
+              f"dans {Path(settings['path']).absolute()}")
+
+    # Nouvelle version du graphe : les lecteurs vident leurs caches et relisent le filtre
+    graph_version(config).bump()
+
+
+def update_graph(builder, entities, relations, documents, changed):
+    """Applique au graphe existant les seuls documents nouveaux ou modifiés (voir le manifeste)."""
+    changed = set(changed)
+    print(f"\n➕ Mise à jour incrémentale: {len(changed)} document(s) nouveau(x) ou modifié(s)")
+    stats = builder.upsert_documents([doc for doc in entities if doc['document_id'] in changed],
+                                     [doc for doc in documents if doc['filename'] in changed],
+                                     relations=[rel for rel in relations
+                                                if not changed.isdisjoint(rel.get('doc_ids', [rel.get('doc_id')]))])
+    for name, count in stats.items():
+        print(f"  - {name}: {count:,}")
+
+
+def build_embedded_graph(entities, relations, documents, config):
+    """Construit le graphe embarqué (backend `memory` ou `sqlite`), sans serveur."""
+    from ..graph.backend import create_graph_builder
+
+    backend = config.get('graph.backend')
+    section(f"Construction du graphe embarqué ({backend})")
+
+    builder = create_graph_builder(config)
+    builder.clear_database()
+    stats = builder.build_graph(entities, relations, documents)
+    compute_metrics(builder, config)
+    builder.close()
+
+    print(f"\n✓ Graphe construit")
+    for name, count in stats.items():
+        print(f"  - {name}: {count:,}")
+    print("="*60)
+
+
+def graph_plan(ctx: PipelineContext, documents: List[Dict]) -> Dict:
+    """Documents à écrire dans le graphe depuis la dernière construction ; 'incremental' est vrai
+    si le delta peut être appliqué au graphe Neo4j existant (aucun document retiré)."""
+    settings = {'backend': ctx.config.get('graph.backend', 'neo4j') if ctx.config else 'neo4j'}
+    plan = ctx.manifest.plan('graph', document_hashes(documents), settings)
+    plan['settings'] = settings
+    plan['incremental'] = not plan['full'] and not plan['removed']
+    return plan
+
+
+def build_graph(ctx: PipelineContext, documents: List[Dict], extraction: Dict, clear: bool = False,
+                bulk_export_dir: str = None) -> Dict:
+    """Construit le graphe (Neo4j, embarqué ou export neo4j-admin) puis les index d'entités.
+
+    Sur Neo4j, sans `clear`, seuls les documents nouveaux ou modifiés sont écrits
+    si aucun document n'a été retiré depuis la dernière construction.
+    """
+    from ..graph.backend import create_graph_builder
+
+    config = ctx.config
+    entities = with_document_text(extraction['entities'], documents)
+    relations = list(extraction['relations'])
+    hashes = document_hashes(documents)
+    plan = graph_plan(ctx, documents)
+    document_store_path = config.get('graph.document_store_path', 'data/graph/documents') if config else 'data/graph/documents'
+
+    if bulk_export_dir:
+        bulk_export(entities, relations, documents, bulk_export_dir, document_store_path)
+        mode = 'bulk_export'
+    elif plan['settings']['backend'] in ('memory', 'sqlite'):
+        # Instantanés immuables (CSR, SQLite compacté) : toujours reconstruits en entier
+        build_embedded_graph(entities, relations, documents, config)
+        mode = 'embedded'
+    elif plan['incremental'] and not clear and not plan['changed']:
+        print("\n✓ Graphe à jour: aucun document nouveau ou modifié depuis la dernière construction")
+        return {'mode': 'unchanged', 'documents': 0}
+    else:
+        section("Construction du Graphe")
+        builder = create_graph_builder(config)
+        try:
+            if clear:
+                print("\n🗑️  Effacement de la base...")
+                builder.clear_database()
+            if plan['incremental'] and not clear:
+                update_graph(builder, entities, relations, documents, plan['changed'])
+                mode = 'incremental'
+            else:
+                builder.build_graph(entities, relations, documents)
+                mode = 'full'
+            print("\n✓ Graphe construit avec succès!")
+            compute_metrics(builder, config)
+        finally:
+            builder.close()
+
+    build_entity_indexes(entities, config)
+    ctx.manifest.record('graph', hashes, plan['settings'])
+    return {'mode': mode, 'documents': len(plan['changed']) if mode == 'incremental' else len(documents)}
+
+
+# -------------------------------------------------------------- embeddings
+
+def generate_embeddings(ctx: PipelineContext, extraction: Dict) -> Dict:
+    """Encode les entités des documents nouveaux ou modifiés dans le vector store ; un document
+    retiré ou un autre modèle impose de tout reconstruire (ses entités peuvent être citées ailleurs)."""
+    from ..embeddings.vector_store import VectorStore, EMBEDDING_MODEL
+
+    settings = {'model': EMBEDDING_MODEL}
+    entities_data = extraction['entities']
+    hashes = {doc['document_id']: content_hash(json.dumps(doc['entities'], sort_keys=True, ensure_ascii=False))
+              for doc in entities_data}
+    plan = ctx.manifest.plan('embeddings', hashes, settings)
+    rebuild = plan['full'] or bool(plan['removed'])
+    if not rebuild and not plan['changed']:
+        print("\n✓ Vector store à jour: aucune entité nouvelle ou modifiée")
+        return {'rebuild': False, 'entities': 0}
+
+    changed = set(hashes) if rebuild else set(plan['changed'])
+    print(f"✓ {len(changed)} document(s) à encoder" + (" (reconstruction complète)" if rebuild else ""))
+    entities = [entity for doc in entities_data if doc['document_id'] in changed for entity in doc['entities']]
+    if rebuild and not entities:
+        raise ValueError("Aucune entité trouvée! Vérifiez que l'extraction d'entités a bien fonctionné.")
+
+    def load_model():
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(EMBEDDING_MODEL)
+
+    # Le modèle n'est chargé que s'il y a des entités à encoder
+    model = ctx.model('sentence_transformer', load_model) if entities else None
+    vector_store = VectorStore(model=model)
+    if rebuild:
+        vector_store.delete_collection()
+        vector_store = VectorStore(model=model)
+
+    print(f"\n📝 Génération des embeddings pour {len(entities):,} entités...")
+    count = vector_store.upsert_entities(entities)
+    print(f"✓ Embeddings générés ({count:,} entités uniques)")
+
+    ctx.manifest.record('embeddings', hashes, settings,
+                        artifacts={vector_store.persist_directory: vector_store.count()})
+    return {'rebuild': rebuild, 'entities': count}
@@ -67,48 +67,54 @@ class DocumentLoader:
                 soup = BeautifulSoup(f.read(), 'html.parser')
                 return soup.get_text()
     
-    def load_all_documents(self) -> List[Dict]:
-        """Charge tous les documents du répertoire."""
-        documents = []
-        files = list(self.data_dir.rglob('*'))
-        
-        for file_path in tqdm(files, desc="Chargement des documents"):
-            if file_path.suffix.lower() not in self.supported_formats:
-                continue
+    def list_files(self) -> List[Path]:
+        """Fichiers du répertoire dans un format pris en charge."""
+        return [file_path for file_path in sorted(self.data_dir.rglob('*'))
+                if file_path.suffix.lower() in self.supported_formats and file_path.is_file()]
+    
+    def load_document(self, file_path: Path) -> Dict:
+        """Charge un document, ou None s'il est vide, trop court ou illisible."""
+        try:
+            if file_path.suffix == '.pdf':
+                text = self.load_pdf(file_path)
+            elif file_path.suffix == '.txt':
+                text = self.load_txt(file_path)
+            elif file_path.suffix == '.html':
+                text = self.load_html(file_path)
+            else:
+                return None
             
-            if not file_path.is_file():
-                continue
+            # Skip empty documents
+            if not text or len(text.strip()) < 50:
+                print(f"⚠️  Document trop court ou vide: {file_path.name}")
+                return None
             
-            try:
-                if file_path.suffix == '.pdf':
-                    text = self.load_pdf(file_path)
-                elif file_path.suffix == '.txt':
-                    text = self.load_txt(file_path)
-                elif file_path.suffix == '.html':
-                    text = self.load_html(file_path)
-                else:
-                    continue
-                
-                # Skip empty documents
-                if not text or len(text.strip()) < 50:
-                    print(f"⚠️  Document trop court ou vide: {file_path.name}")
-                    continue
-                
-                documents.append({
-                    'filename': file_path.name,
-                    'path': str(file_path),
-                    'text': text,
-                    'metadata': {
-                        'format': file_path.suffix,
-                        'size': file_path.stat().st_size
-                    }
-                })
-            except Exception as e:
-                print(f"❌ Erreur lors du chargement de {file_path.name}: {e}")
-                continue
-        
+            return {
+                'filename': file_path.name,
+                'path': str(file_path),
+                'text': text,
+                'metadata': {
+                    'format': file_path.suffix,
+                    'size': file_path.stat().st_size
+                }
+            }
+        except Exception as e:
+            print(f"❌ Erreur lors du chargement de {file_path.name}: {e}")
+            return None
+    
+    def load_documents(self, files: List[Path]) -> List[Dict]:
+        """Charge une liste de fichiers (documents illisibles ou trop courts ignorés)."""
+        documents = []
+        for file_path in tqdm(files, desc="Chargement des documents"):
+            document = self.load_document(file_path)
+            if document is not None:
+                documents.append(document)
         return documents
     
+    def load_all_documents(self) -> List[Dict]:
+        """Charge tous les documents du répertoire."""
+        return self.load_documents(self.list_files())
+    
     def save_processed(self, documents: List[Dict], output_path: Path):
         """Sauvegarde les documents traités en JSON."""
         output_path.parent.mkdir(parents=True, exist_ok=True)
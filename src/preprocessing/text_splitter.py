@@ -1,6 +1,9 @@
 # src/preprocessing/text_splitter.py
 
-from typing import List
+import re
+from typing import List, Tuple
+
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+|\n+')
 
 class TextSplitter:
     """Divise le texte en chunks pour le traitement."""
@@ -35,10 +38,36 @@ class TextSplitter:
         
         return chunks
     
+    def sentence_spans(self, text: str) -> List[Tuple[int, int]]:
+        """(début, fin) de chunks contigus d'au plus `chunk_size` caractères, coupés entre deux
+        phrases ; une phrase trop longue est coupée sur un espace (à défaut, à la position
+        exacte). Sans overlap : `text[début:fin]` mis bout à bout redonne le texte."""
+        boundaries = [m.end() for m in SENTENCE_BREAK.finditer(text)] + [len(text)]
+        spans = []
+        start = end = 0
+        
+        for boundary in boundaries:
+            if boundary - start <= self.chunk_size:
+                end = boundary
+                continue
+            if end > start:
+                spans.append((start, end))
+                start = end
+            # Phrase plus longue qu'un chunk
+            while boundary - start > self.chunk_size:
+                cut = max(text.rfind(' ', start + 1, start + self.chunk_size),
+                          text.rfind('\n', start + 1, start + self.chunk_size))
+                cut = cut + 1 if cut > start else start + self.chunk_size
+                spans.append((start, cut))
+                start = cut
+            end = boundary
+        
+        if end > start or not spans:
+            spans.append((start, end))
+        return spans
+    
     def split_by_sentences(self, text: str, max_sentences: int = 5) -> List[str]:
         """Divise le texte par phrases."""
-        import re
-        
         # Séparation basique par ponctuation
         sentences = re.split(r'(?<=[.!?])\s+', text)
         
@@ -2,15 +2,27 @@
 
 from typing import List, Dict
 from src.graph.graph_queries import GraphQueries
+from src.graph.backend import expand_entities_per_call
 
 class GraphTraverser:
     """Parcourt le graphe avec limites mémoire strictes."""
     
-    def __init__(self, graph_queries: GraphQueries):
+    def __init__(self, graph_queries: GraphQueries, hub_limits: Dict = None):
         self.graph = graph_queries
+        self.hub_limits = hub_limits
     
-    def traverse_from_entities(self, entity_names: List[str], max_depth: int = 2) -> Dict:
-        """Parcourt le graphe avec limites strictes."""
+    def _document_text(self, doc_info: Dict, max_chars: int) -> str:
+        """Texte d'un document retenu : déjà présent dans le résultat ou lu à la demande."""
+        if 'doc_text' in doc_info:
+            return doc_info['doc_text'] or ''
+        return self.graph.document_text(doc_info['doc_id'], max_chars)
+    
+    def traverse_from_entities(self, entity_names: List[str], max_depth: int = 2, batched: bool = True) -> Dict:
+        """Parcourt le graphe avec limites strictes.
+        
+        Avec batched=True, toutes les entités de départ sont développées en un seul
+        appel au backend (expand_entities) au lieu de trois appels par entité.
+        """
         context = {
             'entities': [],
             'relationships': [],
@@ -24,11 +36,19 @@ class GraphTraverser:
         max_entities = 50
         max_docs = 10
         
-        for entity_name in entity_names[:5]:
+        limits = {'max_depth': max_depth, 'limit_docs': 3, 'limit_related': 5, 'limit_neighbors': 5,
+                  'hub_limits': self.hub_limits}
+        if batched:
+            expanded = self.graph.expand_entities(entity_names[:5], **limits)
+        else:
+            expanded = expand_entities_per_call(self.graph, entity_names[:5], **limits)
+        
+        for item in expanded:
             if len(context['entities']) >= max_entities:
                 break
             
-            entity_data = self.graph.get_entity_with_documents(entity_name, limit_docs=3)
+            entity_name = item['name']
+            entity_data = item['entity_data']
             if entity_data:
                 entity = entity_data['entity']
                 if entity['name'] not in seen_entities:
@@ -44,7 +64,7 @@ class GraphTraverser:
                         context['documents'][doc_id] = {
                             'id': doc_id,
                             'title': doc_info.get('doc_title', doc_id),
-                            'text': doc_info.get('doc_text', '')
+                            'text': self._document_text(doc_info, 3000)
                         }
                         seen_docs.add(doc_id)
                     
@@ -57,8 +77,7 @@ class GraphTraverser:
                         })
                 
                 if len(context['entities']) < max_entities // 2:
-                    related = self.graph.get_related_entities(entity_name, limit=5)
-                    for rel_data in related[:5]:
+                    for rel_data in item['related'][:5]:
                         if len(context['entities']) >= max_entities:
                             break
                         
@@ -85,13 +104,12 @@ class GraphTraverser:
                                     context['documents'][doc_id] = {
                                         'id': doc_id,
                                         'title': doc_info.get('doc_title', doc_id),
-                                        'text': doc_info.get('doc_text', '')
+                                        'text': self._document_text(doc_info, 2000)
                                     }
                                     seen_docs.add(doc_id)
                 
                 if max_depth > 1 and len(context['entities']) < max_entities // 2:
-                    neighbors = self.graph.get_neighbors(entity_name, max_depth=max_depth, limit=5)
-                    for neighbor_data in neighbors[:5]:
+                    for neighbor_data in item['neighbors'][:5]:
                         if len(context['entities']) >= max_entities:
                             break
                         
@@ -110,7 +128,7 @@ class GraphTraverser:
                                     context['documents'][doc_id] = {
                                         'id': doc_id,
                                         'title': doc_info.get('doc_title', doc_id),
-                                        'text': doc_info.get('doc_text', '')
+                                        'text': self._document_text(doc_info, 2000)
                                     }
                                     seen_docs.add(doc_id)
         
@@ -0,0 +1,353 @@
+# src/utils/columnar.py
+
+"""
+Artefacts colonnaires du pipeline (entités et mentions, relations) : un répertoire
+de fichiers .npy ouverts en mmap. Les chaînes sont encodées par dictionnaire (bloc
+UTF-8 + fins de valeurs, chaque ligne ne garde qu'un code int32) et les documents
+sont désignés par un entier. Le texte des documents n'y est pas recopié.
+"""
+
+import json
+import os
+import shutil
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Iterable
+
+META_FILE = 'meta.json'
+FORMAT_VERSION = 1
+
+
+class StringDictionary:
+    """Valeurs distinctes d'une colonne de chaînes, dans l'ordre de première apparition."""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class StringColumn:
+    """Dictionnaire relu : bloc UTF-8 et fins de valeurs, décodés à la demande."""
+
+    def __init__(self, blob: np.ndarray, ends: np.ndarray):
+        self.blob = blob
+        self.ends = ends
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def __getitem__(self, code: int) -> str:
+        start = int(self.ends[code - 1]) if code > 0 else 0
+        return bytes(self.blob[start:int(self.ends[code])]).decode('utf-8')
+
+    def tolist(self) -> List[str]:
+        data = bytes(self.blob)
+        starts = np.concatenate(([0], self.ends[:-1])).astype(np.int64)
+        return [data[start:end].decode('utf-8') for start, end in zip(starts.tolist(), self.ends.tolist())]
+
+
+class TableWriter:
+    """Écrit une table par blocs : chaque colonne est ajoutée à un fichier brut, converti en .npy
+    à la fermeture ; seuls les dictionnaires de chaînes restent en mémoire.
+
+    La table est écrite dans un répertoire temporaire puis remplace l'ancienne.
+    """
+
+    FLUSH_VALUES = 1 << 16
+
+    def __init__(self, path: str | Path, kind: str, dtypes: Dict[str, str], strings: Iterable[str] = ()):
+        self.path = Path(path)
+        self.kind = kind
+        self.tmp = self.path.with_name(self.path.name + '.tmp')
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        self.tmp.mkdir(parents=True)
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in dtypes.items()}
+        self.buffers = {name: [] for name in dtypes}
+        self.sizes = {name: 0 for name in dtypes}
+        self.files = {name: open(self.tmp / f'{name}.raw', 'wb') for name in dtypes}
+        self.strings = {name: StringDictionary() for name in strings}
+        self.rows = 0
+
+    def append(self, name: str, values: Iterable):
+        buffer = self.buffers[name]
+        buffer.extend(values)
+        if len(buffer) >= self.FLUSH_VALUES:
+            self.flush(name)
+
+    def flush(self, name: str):
+        buffer = self.buffers[name]
+        if buffer:
+            self.files[name].write(np.asarray(buffer, dtype=self.dtypes[name]).tobytes())
+            self.sizes[name] += len(buffer)
+            buffer.clear()
+
+    def close(self):
+        for name, f in self.files.items():
+            self.flush(name)
+            f.close()
+            raw = self.tmp / f'{name}.raw'
+            with open(self.tmp / f'{name}.npy', 'wb') as out, open(raw, 'rb') as src:
+                np.lib.format.write_array_header_1_0(out, {
+                    'descr': np.lib.format.dtype_to_descr(self.dtypes[name]),
+                    'fortran_order': False,
+                    'shape': (self.sizes[name],)
+                })
+                shutil.copyfileobj(src, out, 1 << 20)
+            raw.unlink()
+        for name, dictionary in self.strings.items():
+            encoded = [value.encode('utf-8') for value in dictionary.values]
+            np.save(self.tmp / f'{name}.utf8.npy', np.frombuffer(b''.join(encoded), dtype=np.uint8))
+            np.save(self.tmp / f'{name}.ends.npy', np.cumsum([len(value) for value in encoded], dtype=np.int64))
+        with open(self.tmp / META_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'kind': self.kind, 'version': FORMAT_VERSION, 'rows': self.rows,
+                       'columns': sorted(self.dtypes), 'strings': sorted(self.strings)}, f)
+
+        old = self.path.with_name(self.path.name + '.old')
+        if self.path.exists():
+            os.replace(self.path, old)
+        os.replace(self.tmp, self.path)
+        shutil.rmtree(old, ignore_errors=True)
+        return self.rows
+
+    def abort(self):
+        for f in self.files.values():
+            f.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ColumnTable:
+    """Table colonnaire relue depuis son répertoire (mmap par défaut)."""
+
+    kind = None
+
+    def __init__(self, path: str | Path, mmap: bool = True):
+        self.path = Path(path)
+        meta_path = self.path / META_FILE
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Artefact colonnaire introuvable: {self.path}")
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.kind and self.meta.get('kind') != self.kind:
+            raise ValueError(f"{self.path} contient des {self.meta.get('kind')}, pas des {self.kind}")
+
+        mode = 'r' if mmap else None
+        self.columns = {name: np.load(self.path / f'{name}.npy', mmap_mode=mode)
+                        for name in self.meta['columns']}
+        self.strings = {name: StringColumn(np.load(self.path / f'{name}.utf8.npy', mmap_mode=mode),
+                                           np.load(self.path / f'{name}.ends.npy', mmap_mode=mode))
+                        for name in self.meta['strings']}
+
+    def __len__(self) -> int:
+        return self.meta['rows']
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+# ------------------------------------------------------- entités et mentions
+
+class EntityWriter(TableWriter):
+    """Entités par document (format de `extract_from_documents`) → table colonnaire :
+    entités uniques (nom, label) et mentions (entité, début, fin) regroupées par document."""
+
+    def __init__(self, path: str | Path):
+        super().__init__(path, 'entities', {
+            'entity_name': 'int32', 'entity_label': 'int32', 'mention_entity': 'int32',
+            'mention_start': 'int64', 'mention_end': 'int64', 'doc_indptr': 'int64'
+        }, strings=('documents', 'names', 'labels'))
+        self.entity_codes = {}
+        self.mentions = 0
+        self.append('doc_indptr', [0])
+
+    def add(self, doc_entities: Dict):
+        self.strings['documents'].encode(doc_entities['document_id'])
+        codes, starts, ends = [], [], []
+        for entity in doc_entities['entities']:
+            key = (entity['text'], entity['label'])
+            code = self.entity_codes.get(key)
+            if code is None:
+                code = self.entity_codes[key] = len(self.entity_codes)
+                self.append('entity_name', [self.strings['names'].encode(entity['text'])])
+                self.append('entity_label', [self.strings['labels'].encode(entity['label'])])
+            codes.append(code)
+            starts.append(entity['start'])
+            ends.append(entity['end'])
+        self.append('mention_entity', codes)
+        self.append('mention_start', starts)
+        self.append('mention_end', ends)
+        self.mentions += len(codes)
+        self.append('doc_indptr', [self.mentions])
+        self.rows += 1
+
+
+def write_entities(entities_data: Iterable[Dict], path: str | Path) -> int:
+    """Écrit les entités par document ; renvoie le nombre de documents."""
+    with EntityWriter(path) as writer:
+        for doc_entities in entities_data:
+            writer.add(doc_entities)
+    return writer.rows
+
+
+class EntityTable(ColumnTable):
+    """Entités par document relues d'une table colonnaire ; chaque ligne est un document
+    au format de `extract_from_documents`, avec son texte si `texts` le fournit."""
+
+    kind = 'entities'
+
+    def __init__(self, path: str | Path, texts: Dict[str, str] = None, mmap: bool = True):
+        super().__init__(path, mmap)
+        self.texts = texts
+        self.document_ids = self.strings['documents'].tolist()
+        self._names = self.strings['names'].tolist()
+        self._labels = self.strings['labels'].tolist()
+
+    def mention_doc(self) -> np.ndarray:
+        """Document (entier) de chaque mention."""
+        indptr = self.columns['doc_indptr']
+        return np.repeat(np.arange(len(self), dtype=np.int32), np.diff(indptr))
+
+    def __getitem__(self, i: int) -> Dict:
+        doc_id = self.document_ids[i]
+        indptr = self.columns['doc_indptr']
+        lo, hi = int(indptr[i]), int(indptr[i + 1])
+        codes = self.columns['mention_entity'][lo:hi].tolist()
+        names = self.columns['entity_name']
+        labels = self.columns['entity_label']
+        entities = [{
+            'text': self._names[names[code]],
+            'label': self._labels[labels[code]],
+            'start': start,
+            'end': end,
+            'doc_id': doc_id
+        } for code, start, end in zip(codes, self.columns['mention_start'][lo:hi].tolist(),
+                                      self.columns['mention_end'][lo:hi].tolist())]
+        doc_entities = {'document_id': doc_id, 'entities': entities}
+        if self.texts is not None:
+            doc_entities['text'] = self.texts.get(doc_id, '')
+        return doc_entities
+
+
+# -------------------------------------------------------------- relations
+
+class RelationWriter(TableWriter):
+    """Relations → table colonnaire : sujet, prédicat, objet, méthode, et selon le cas
+    common_docs, strength, distance, doc_id (-1 = absent) et doc_ids (documents d'une
+    relation dédupliquée).
+
+    `documents` : identifiants à conserver dans le dictionnaire des documents même
+    sans relation (documents déjà traités).
+    """
+
+    def __init__(self, path: str | Path, documents: Iterable[str] = ()):
+        super().__init__(path, 'relations', {
+            'subject': 'int32', 'object': 'int32', 'predicate': 'int32', 'method': 'int32',
+            'strength': 'int32', 'distance': 'int32', 'doc': 'int32',
+            'has_common_docs': 'bool', 'common_docs': 'int32', 'common_indptr': 'int64',
+            'doc_ids': 'int32', 'doc_ids_indptr': 'int64'
+        }, strings=('terms', 'predicates', 'methods', 'documents'))
+        for doc_id in documents:
+            self.add_document(doc_id)
+        self.common = 0
+        self.doc_ids = 0
+        self.append('common_indptr', [0])
+        self.append('doc_ids_indptr', [0])
+
+    def add_document(self, doc_id: str):
+        """Document traité, conservé dans le dictionnaire même s'il n'a aucune relation."""
+        self.strings['documents'].encode(doc_id)
+
+    def add(self, relation: Dict):
+        terms, docs = self.strings['terms'], self.strings['documents']
+        self.append('subject', [terms.encode(relation['subject'])])
+        self.append('object', [terms.encode(relation['object'])])
+        self.append('predicate', [self.strings['predicates'].encode(relation.get('predicate', 'relates_to'))])
+        self.append('method', [self.strings['methods'].encode(relation.get('method', 'unknown'))])
+        self.append('strength', [relation.get('strength', -1)])
+        self.append('distance', [relation.get('distance', -1)])
+        self.append('doc', [docs.encode(relation['doc_id']) if relation.get('doc_id') else -1])
+        self.append('has_common_docs', ['common_docs' in relation])
+        common = [docs.encode(doc_id) for doc_id in relation.get('common_docs', ())]
+        self.append('common_docs', common)
+        self.common += len(common)
+        self.append('common_indptr', [self.common])
+        doc_ids = [docs.encode(doc_id) for doc_id in relation.get('doc_ids', ())]
+        self.append('doc_ids', doc_ids)
+        self.doc_ids += len(doc_ids)
+        self.append('doc_ids_indptr', [self.doc_ids])
+        self.rows += 1
+
+
+def write_relations(relations: Iterable[Dict], path: str | Path, documents: Iterable[str] = ()) -> int:
+    """Écrit les relations ; renvoie leur nombre."""
+    with RelationWriter(path, documents) as writer:
+        for relation in relations:
+            writer.add(relation)
+    return writer.rows
+
+
+class RelationTable(ColumnTable):
+    """Relations relues d'une table colonnaire, au format de RelationExtractor."""
+
+    kind = 'relations'
+
+    def __init__(self, path: str | Path, mmap: bool = True):
+        super().__init__(path, mmap)
+        self.document_ids = self.strings['documents'].tolist()
+        self._terms = self.strings['terms'].tolist()
+        self._predicates = self.strings['predicates'].tolist()
+        self._methods = self.strings['methods'].tolist()
+        self._document_codes = {doc_id: code for code, doc_id in enumerate(self.document_ids)}
+
+    def document_relations(self, doc_id: str) -> List[Dict]:
+        """Relations d'un document, lues à la demande : la table doit être écrite dans l'ordre des
+        documents (relations syntaxiques), la colonne `doc` est alors croissante."""
+        code = self._document_codes.get(doc_id)
+        if code is None:
+            return []
+        lo, hi = np.searchsorted(self.columns['doc'], [code, code + 1])
+        return [self[i] for i in range(int(lo), int(hi))]
+
+    def __getitem__(self, i: int) -> Dict:
+        c = self.columns
+        relation = {
+            'subject': self._terms[c['subject'][i]],
+            'predicate': self._predicates[c['predicate'][i]],
+            'object': self._terms[c['object'][i]],
+            'method': self._methods[c['method'][i]]
+        }
+        if c['has_common_docs'][i]:
+            lo, hi = int(c['common_indptr'][i]), int(c['common_indptr'][i + 1])
+            relation['common_docs'] = [self.document_ids[d] for d in c['common_docs'][lo:hi].tolist()]
+        if c['strength'][i] >= 0:
+            relation['strength'] = int(c['strength'][i])
+        if c['distance'][i] >= 0:
+            relation['distance'] = int(c['distance'][i])
+        if c['doc'][i] >= 0:
+            relation['doc_id'] = self.document_ids[c['doc'][i]]
+        if 'doc_ids' in c:
+            lo, hi = int(c['doc_ids_indptr'][i]), int(c['doc_ids_indptr'][i + 1])
+            if hi > lo:
+                relation['doc_ids'] = [self.document_ids[d] for d in c['doc_ids'][lo:hi].tolist()]
+        return relation
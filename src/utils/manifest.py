@@ -0,0 +1,106 @@
+# src/utils/manifest.py
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List
+from ..graph.document_store import content_hash
+
+MANIFEST_PATH = 'data/manifest.json'
+
+
+def file_hash(path: str | Path) -> str:
+    """Empreinte du contenu d'un fichier, lu par blocs."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def document_hashes(documents: List[Dict]) -> Dict[str, str]:
+    """Empreinte du texte de chaque document (filename → content_hash)."""
+    return {doc['filename']: content_hash(doc['text']) for doc in documents}
+
+
+def _normalized(settings: Dict) -> Dict:
+    # Même forme qu'après relecture du JSON (tuples → listes)
+    return json.loads(json.dumps(settings or {}, sort_keys=True))
+
+
+class PipelineManifest:
+    """Manifeste du pipeline : pour chaque étape, l'empreinte des documents traités,
+    les paramètres utilisés (modèle, configuration) et les artefacts produits.
+
+    Une étape ne retraite que les documents nouveaux ou modifiés, sauf si ses
+    paramètres ont changé ; le nombre d'éléments des artefacts évite de les relire.
+    """
+
+    def __init__(self, path: str | Path = MANIFEST_PATH):
+        self.path = Path(path)
+        self.data = {'stages': {}}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+
+    def stage(self, name: str) -> Dict:
+        return self.data['stages'].get(name, {})
+
+    def plan(self, name: str, documents: Dict[str, str], settings: Dict = None) -> Dict:
+        """Répartit les documents (id → empreinte) de l'étape `name`.
+
+        'changed' : à traiter ; 'unchanged' : à reprendre des sorties précédentes ;
+        'removed' : traités la dernière fois mais absents aujourd'hui. 'full' est vrai
+        s'il n'y a pas d'exécution précédente utilisable (paramètres différents).
+        """
+        stage = self.stage(name)
+        full = not stage or stage.get('settings') != _normalized(settings)
+        previous = {} if full else stage.get('documents', {})
+        changed = [doc_id for doc_id, digest in documents.items() if previous.get(doc_id) != digest]
+        return {
+            'changed': changed,
+            'unchanged': [doc_id for doc_id, digest in documents.items() if previous.get(doc_id) == digest],
+            'removed': [doc_id for doc_id in previous if doc_id not in documents],
+            'full': full
+        }
+
+    def record(self, name: str, documents: Dict[str, str], settings: Dict = None,
+               artifacts: Dict[str, int] = None):
+        """Enregistre une exécution terminée (artefact → nombre d'éléments) et sauvegarde."""
+        entries = {}
+        for path, count in (artifacts or {}).items():
+            stat = Path(path).stat()
+            entries[str(Path(path))] = {'count': count, 'bytes': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        self.data['stages'][name] = {
+            'documents': dict(documents),
+            'settings': _normalized(settings),
+            'artifacts': entries,
+            'updated': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def artifact_count(self, path: str | Path) -> int:
+        """Nombre d'éléments d'un artefact enregistré, ou None s'il est inconnu ou modifié depuis
+        (un répertoire, comme le vector store, n'est pas vérifié)."""
+        path = Path(path)
+        for stage in self.data['stages'].values():
+            entry = stage.get('artifacts', {}).get(str(path))
+            if entry is None:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                return None
+            if path.is_dir() or (stat.st_size, stat.st_mtime_ns) == (entry['bytes'], entry['mtime_ns']):
+                return entry['count']
+            return None
+        return None
@@ -6,8 +6,14 @@ This prevents UnicodeDecodeError on Windows where the default encoding is cp1252
 """
 
 import json
+import re
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Iterable, Iterator
+from .columnar import EntityTable, RelationTable, write_entities, write_relations
+
+ENTITIES_PATH = "data/entities/columns"
+RELATIONS_PATH = "data/relations/columns"
+WHITESPACE = re.compile(r'[ \t\n\r]*')
 
 def load_json_utf8(filepath: str | Path) -> Any:
     """
@@ -31,6 +37,62 @@ def load_json_utf8(filepath: str | Path) -> Any:
         return json.load(f)
 
 
+def iter_json_utf8(filepath: str | Path, chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """
+    Iterate over the elements of a JSON array file without loading it whole.
+    
+    Args:
+        filepath: Path to a file holding a JSON array (of objects or arrays)
+        chunk_size: Characters read at a time (doubled while an element does not fit)
+        
+    Yields:
+        Parsed elements, in file order
+    """
+    decoder = json.JSONDecoder()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size)
+        pos = WHITESPACE.match(buffer).end()
+        while pos == len(buffer) and buffer:
+            buffer = f.read(chunk_size)
+            pos = WHITESPACE.match(buffer).end()
+        if not buffer.startswith('[', pos):
+            raise json.JSONDecodeError("Expected a JSON array", buffer, pos)
+        pos += 1
+        read_size = chunk_size
+        while True:
+            # Separators are skipped by index; the buffer is only compacted when a chunk is read
+            pos = WHITESPACE.match(buffer, pos).end()
+            if buffer.startswith(']', pos):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # The element is complete only once its separator is read (a number may go on)
+                after = WHITESPACE.match(buffer, end).end()
+                if after == len(buffer) or buffer[after] not in ',]':
+                    raise json.JSONDecodeError("Truncated JSON array", buffer, after)
+            except json.JSONDecodeError:
+                chunk = f.read(read_size)
+                if not chunk:
+                    raise
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                read_size = max(read_size, len(buffer))
+                continue
+            yield item
+            pos = after + 1 if buffer[after] == ',' else after
+            read_size = chunk_size
+
+
+class JsonArrayFile:
+    """JSON array file streamed again on each iteration (see iter_json_utf8)."""
+    
+    def __init__(self, filepath: str | Path):
+        self.filepath = Path(filepath)
+    
+    def __iter__(self) -> Iterator[Any]:
+        return iter_json_utf8(self.filepath)
+
+
 def save_json_utf8(data: Any, filepath: str | Path, indent: int = 2):
     """
     Save data to a JSON file with UTF-8 encoding.
@@ -98,14 +160,24 @@ def read_documents_json() -> List[Dict]:
     return load_json_utf8("data/processed/documents.json")
 
 
-def read_entities_json() -> List[Dict]:
-    """Load extracted entities."""
-    return load_json_utf8("data/entities/entities.json")
+def read_entities(path: str | Path = ENTITIES_PATH, documents: List[Dict] = None) -> EntityTable:
+    """
+    Load extracted entities (columnar artifact, memory-mapped).
+    
+    Args:
+        path: Artifact directory
+        documents: Processed documents whose text is attached to each row (mention contexts)
+        
+    Returns:
+        Sequence of {'document_id', 'entities'[, 'text']}, one per document
+    """
+    texts = {doc['filename']: doc['text'] for doc in documents} if documents is not None else None
+    return EntityTable(path, texts=texts)
 
 
-def read_relations_json() -> List[Dict]:
-    """Load extracted relations."""
-    return load_json_utf8("data/relations/relations.json")
+def read_relations(path: str | Path = RELATIONS_PATH) -> RelationTable:
+    """Load extracted relations (columnar artifact, memory-mapped)."""
+    return RelationTable(path)
 
 
 def save_documents_json(documents: List[Dict]):
@@ -113,11 +185,11 @@ def save_documents_json(documents: List[Dict]):
     save_json_utf8(documents, "data/processed/documents.json")
 
 
-def save_entities_json(entities: List[Dict]):
-    """Save extracted entities."""
-    save_json_utf8(entities, "data/entities/entities.json")
+def save_entities(entities: Iterable[Dict], path: str | Path = ENTITIES_PATH) -> int:
+    """Save extracted entities as a columnar artifact (document text is not copied)."""
+    return write_entities(entities, path)
 
 
-def save_relations_json(relations: List[Dict]):
-    """Save extracted relations."""
-    save_json_utf8(relations, "data/relations/relations.json")
\ No newline at end of file
+def save_relations(relations: Iterable[Dict], path: str | Path = RELATIONS_PATH, documents: Iterable[str] = ()) -> int:
+    """Save extracted relations as a columnar artifact."""
+    return write_relations(relations, path, documents)
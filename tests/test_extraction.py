@@ -6,6 +6,16 @@ sys.path.append('.')
 
 from src.extraction.entity_extractor import EntityExtractor
 from src.extraction.relation_extractor import RelationExtractor
+from src.extraction.gazetteer import Gazetteer
+from src.extraction.document_analyzer import DocumentAnalyzer, DocBinStore
+from src.extraction.nlp_models import load_model
+from src.extraction.cooccurrence import CooccurrenceMatrix
+from src.extraction.external_aggregation import CooccurrenceAggregator, ExternalDeduplicator
+from src.evaluation.synthetic_corpus import generate_french_texts
+from src.preprocessing.text_splitter import TextSplitter
+import math
+import random
+import tempfile
 
 class TestEntityExtraction(unittest.TestCase):
     
@@ -31,6 +41,97 @@ class TestEntityExtraction(unittest.TestCase):
         
         # "Paris" devrait apparaître normalisé
         self.assertIn('GPE', normalized)
+    
+    def test_batched_extraction_keeps_order(self):
+        """Test que l'extraction par lots (nlp.pipe) donne les mêmes entités, dans l'ordre."""
+        documents = generate_french_texts(12, sentences_per_doc=3)
+        expected = [(doc['filename'], self.extractor.extract_entities(doc['text'], doc_id=doc['filename']))
+                    for doc in documents]
+        self.assertEqual(list(self.extractor.iter_entities(documents, batch_size=5)), expected)
+
+class TestGazetteer(unittest.TestCase):
+    
+    def setUp(self):
+        self.gazetteer = Gazetteer([('Paris', 'GPE'), ('Paris Saint-Germain', 'ORG'), ('Napoléon', 'PERSON'),
+                                    ('Île-de-France', 'LOC'), ('France', 'GPE'), ('Le', 'ORG')])
+    
+    def test_longest_match_on_word_boundaries(self):
+        """Test la détection sans accents, la plus longue correspondance et les frontières de mots."""
+        text = "Le Paris Saint-Germain, NAPOLEON et les Parisiens en Île-de-France"
+        found = self.gazetteer.find(text)
+        self.assertEqual([e['name'] for e in found], ['Paris Saint-Germain', 'Napoléon', 'Île-de-France'])
+        self.assertEqual([text[e['start']:e['end']] for e in found],
+                         ['Paris Saint-Germain', 'NAPOLEON', 'Île-de-France'])
+    
+    def test_incremental_sync(self):
+        """Test la mise à jour de l'automate par différence avec les entités du graphe."""
+        stats = self.gazetteer.sync([('Paris', 'GPE'), ('Lyon', 'GPE')])
+        self.assertEqual(stats, {'added': 1, 'removed': 4})
+        self.assertEqual([e['name'] for e in self.gazetteer.find("Napoléon à Lyon puis Paris")], ['Lyon', 'Paris'])
+    
+    def test_extractor_uses_gazetteer_first(self):
+        """Test que les entités connues sont détectées sans charger spaCy."""
+        extractor = EntityExtractor(gazetteer=self.gazetteer)
+        entities = extractor.extract_entities("Qui était Napoléon ?")
+        self.assertEqual(entities, [{'text': 'Napoléon', 'label': 'PERSON', 'start': 10, 'end': 18}])
+        self.assertIsNone(extractor._nlp)
+
+class TestDocumentAnalyzer(unittest.TestCase):
+    
+    def setUp(self):
+        self.entity_extractor = EntityExtractor()
+        self.relation_extractor = RelationExtractor()
+        self.analyzer = DocumentAnalyzer(self.entity_extractor, self.relation_extractor)
+    
+    def test_model_loaded_once(self):
+        """Test que les extracteurs partagent le modèle du registre."""
+        self.assertIs(self.relation_extractor.nlp, self.entity_extractor.nlp)
+        self.assertIs(load_model(self.entity_extractor.model_name), self.entity_extractor.nlp)
+    
+    def test_single_parse_matches_extractors(self):
+        """Test qu'une seule analyse donne les mêmes entités et relations que les extracteurs."""
+        text = "Marie dirige l'entreprise. Emmanuel Macron est président de la France depuis 2017."
+        analysis = self.analyzer.analyze(text, doc_id='doc.txt')
+        self.assertEqual(analysis['entities'], self.entity_extractor.extract_entities(text, doc_id='doc.txt'))
+        self.assertEqual(analysis['relations'], self.relation_extractor.extract_with_dependencies(text))
+        self.assertEqual(len(analysis['sentences']), 2)
+    
+    def test_docbin_store_roundtrip(self):
+        """Test la sérialisation des Doc analysés et leur relecture sans ré-analyse."""
+        documents = generate_french_texts(5, sentences_per_doc=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = DocBinStore(tmp, shard_size=2)
+            self.analyzer.store = store
+            expected = dict(self.analyzer.iter_analyses(documents))
+            store.close()
+            reloaded = DocBinStore(tmp)
+            self.assertEqual(len(reloaded), 5)
+            for doc_id, doc in reloaded.docs(self.analyzer.nlp.vocab):
+                self.assertEqual(self.analyzer.analyze_doc(doc, doc_id), expected[doc_id])
+            reloaded.close(keep=['wiki_00001.txt'])
+            self.assertEqual([doc_id for doc_id, _ in DocBinStore(tmp).docs(self.analyzer.nlp.vocab)],
+                             ['wiki_00001.txt'])
+
+    def test_chunked_analysis_keeps_document_offsets(self):
+        """Test que l'analyse par chunks ramène les positions à celles du document."""
+        documents = generate_french_texts(3, sentences_per_doc=30)
+        whole = dict(self.analyzer.iter_analyses(documents))
+        for doc, (doc_id, analysis) in zip(documents, self.analyzer.iter_analyses(documents, chunk_chars=300)):
+            self.assertEqual([(e['text'], e['label'], e['start'], e['end']) for e in analysis['entities']],
+                             [(e['text'], e['label'], e['start'], e['end']) for e in whole[doc_id]['entities']])
+            for entity in analysis['entities']:
+                self.assertEqual(doc['text'][entity['start']:entity['end']], entity['text'])
+
+class TestTextSplitter(unittest.TestCase):
+    
+    def test_sentence_spans(self):
+        """Test le découpage entre deux phrases, sans perte ni chevauchement."""
+        text = "Marie dirige l'entreprise. Paris est en France ! Un très long passage sans ponctuation qui continue"
+        spans = TextSplitter(chunk_size=40).sentence_spans(text)
+        self.assertEqual([text[start:end] for start, end in spans],
+                         ["Marie dirige l'entreprise. ", "Paris est en France ! ",
+                          "Un très long passage sans ponctuation ", "qui continue"])
+        self.assertEqual(TextSplitter(chunk_size=40).sentence_spans(""), [(0, 0)])
 
 class TestRelationExtraction(unittest.TestCase):
     
@@ -45,5 +146,97 @@ class TestRelationExtraction(unittest.TestCase):
         # On devrait avoir au moins une relation
         self.assertGreater(len(relations), 0)
 
+class TestExternalAggregation(unittest.TestCase):
+    
+    def setUp(self):
+        self.extractor = RelationExtractor()
+        rng = random.Random(7)
+        names = [('Napoléon', 'PERSON'), ('Paris', 'GPE'), ('PARIS', 'GPE'), ('Moscou', 'GPE'),
+                 ('Wellington', 'PERSON'), ('Waterloo', 'LOC'), ('1815', 'DATE')]
+        self.entities = []
+        for d in range(40):
+            mentions = []
+            for m in range(rng.randint(0, 8)):
+                text, label = rng.choice(names)
+                start = m * 30 + rng.randint(0, 20)
+                mentions.append({'text': text, 'label': label, 'start': start, 'end': start + len(text)})
+            self.entities.append({'document_id': f'doc{d}.txt', 'entities': mentions})
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+    
+    def test_cooccurrence_matches_in_memory(self):
+        """Test que l'agrégation par partitions donne les mêmes co-occurrences."""
+        expected = self.extractor.extract_cooccurrence_relations(self.entities, min_strength=3)
+        aggregator = CooccurrenceAggregator(self.tmp.name, partitions=4)
+        for doc in self.entities:
+            aggregator.add_document(doc['document_id'], doc['entities'])
+        found = [relation for _, relation in sorted(aggregator.relations(min_strength=3), key=lambda r: r[0])]
+        for relation in expected + found:
+            relation['common_docs'] = sorted(relation['common_docs'])
+        self.assertEqual(found, expected)
+    
+    def test_deduplication_matches_in_memory(self):
+        """Test la déduplication hors mémoire : mêmes relations, fusionnées, dans le même ordre."""
+        relations = self.extractor.extract_cooccurrence_relations(self.entities, min_strength=1)
+        for doc in self.entities:
+            relations.extend(self.extractor.extract_proximity_relations(doc, window=150, max_per_doc=20))
+        relations += [dict(relation) for relation in relations[:5]]
+        
+        deduplicator = ExternalDeduplicator(self.tmp.name, self.extractor.normalize_relation,
+                                            self.extractor.merge_relation, partitions=3)
+        for i, relation in enumerate(relations):
+            deduplicator.add(i, dict(relation))
+        found = list(deduplicator)
+        expected = self.extractor.deduplicate_relations(relations)
+        for relation in expected + found:
+            relation['common_docs'] = sorted(relation.get('common_docs', []))
+        self.assertEqual(found, expected)
+
+class TestCooccurrenceMatrix(unittest.TestCase):
+    
+    def setUp(self):
+        rng = random.Random(11)
+        names = ['Napoléon', 'Paris', 'PARIS', 'Moscou', 'Wellington', 'Waterloo', '1815']
+        self.entities = [{'document_id': f'doc{d}.txt',
+                          'entities': [{'text': rng.choice(names), 'label': 'GPE'} for _ in range(rng.randint(0, 9))]}
+                         for d in range(50)]
+    
+    def pairwise(self, min_strength):
+        """Double boucle sur les paires de mentions (méthode de référence)."""
+        pairs = {}
+        for doc in self.entities:
+            mentions = [entity['text'].lower() for entity in doc['entities']]
+            for i, e1 in enumerate(mentions):
+                for e2 in mentions[i + 1:]:
+                    if e1 != e2:
+                        pairs.setdefault(tuple(sorted([e1, e2])), []).append(doc['document_id'])
+        return [{'subject': e1, 'predicate': 'co_occurs_with', 'object': e2, 'method': 'cooccurrence',
+                 'common_docs': list(dict.fromkeys(docs)), 'strength': len(set(docs))}
+                for (e1, e2), docs in pairs.items() if len(set(docs)) >= min_strength]
+    
+    def test_same_relations_in_same_order(self):
+        """Test que XᵀX donne les relations de la double boucle, dans le même ordre."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for min_strength in (1, 3):
+            for workdir in (None, tmp.name):
+                matrix = CooccurrenceMatrix(workdir, block_docs=7)
+                for doc in self.entities:
+                    matrix.add_document(doc['document_id'], doc['entities'])
+                found = [relation for _, relation in matrix.relations(min_strength)]
+                self.assertEqual(found, self.pairwise(min_strength))
+    
+    def test_association_scores(self):
+        """Test les scores PMI et NPMI."""
+        relations = RelationExtractor().extract_cooccurrence_relations(self.entities, min_strength=2, scores=True)
+        document_frequency = {}
+        for doc in self.entities:
+            RelationExtractor.count_entity_documents(doc, document_frequency)
+        for relation in relations:
+            expected = math.log(relation['strength'] * len(self.entities) / (
+                document_frequency[relation['subject']] * document_frequency[relation['object']]))
+            self.assertAlmostEqual(relation['pmi'], expected)
+            self.assertLessEqual(relation['npmi'], 1.0)
+
 if __name__ == '__main__':
     unittest.run()
@@ -5,8 +5,31 @@ import sys
 sys.path.append('.')
 
 from src.graph.graph_builder import GraphBuilder
-from src.graph.graph_queries import GraphQueries
+from src.graph.graph_queries import GraphQueries, EXPAND_ENTITIES_QUERY, neighbors_block
+import re
+from src.graph.batch_writer import (BatchWriter, ENTITIES_QUERY, MENTIONS_QUERY, RELATIONS_QUERY, DEGREE_STATS_QUERY,
+                                    DOCUMENT_HASHES_QUERY, DETACH_MENTIONS_QUERY, COOCCURRENCE_QUERY,
+                                    ORPHAN_ENTITIES_QUERY, ENTITY_DOCUMENTS_QUERY, ENTITY_PARTNERS_QUERY,
+                                    STALE_RELATIONS_QUERY, LABELS_QUERY, document_relations_query)
+from src.graph.graph_manager import GraphManager
+from src.graph.backend import entity_label
+from src.graph.mention_aggregator import MentionAggregator
+from src.graph.bulk_exporter import BulkExporter
+from src.graph.document_store import DocumentStore, append_document_store, content_hash, write_document_store
+from src.graph.graph_metrics import GraphMetrics, adjacency_matrix, pagerank, metrics_from_config
+from src.utils.config_loader import ConfigLoader
+from src.graph.memory_backend import MemoryGraphBuilder, MemoryGraphQueries, CSRGraph
+from src.graph.sqlite_backend import SQLiteGraphBuilder, SQLiteGraphQueries
+from src.graph.text_index import TrigramIndex, query_terms
+from src.graph.autocomplete import AutocompleteIndex
+from src.graph.entity_filter import BloomFilter, FilteredGraphQueries
+from src.graph.query_cache import CachedGraphQueries, DiskCache, GraphVersion
+from src.extraction.relation_extractor import RelationExtractor
+import csv
+import numpy as np
 import os
+import tempfile
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -51,5 +74,863 @@ class TestGraphOperations(unittest.TestCase):
         cls.builder.close()
         cls.queries.close()
 
+class RecordingSession:
+    """Session factice qui enregistre les requêtes envoyées (et renvoie `results[requête]`,
+    ou `results[requête](paramètres)`)."""
+    
+    def __init__(self, calls, results=None):
+        self.calls = calls
+        self.results = results or {}
+        self.records = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        return False
+    
+    def run(self, query, parameters=None, **kwargs):
+        params = dict(parameters or {}, **kwargs)
+        self.calls.append((query, params))
+        self.records = self.results.get(query, [])
+        if callable(self.records):
+            self.records = self.records(params)
+        return self
+    
+    def __iter__(self):
+        return iter(self.records)
+    
+    def single(self):
+        return self.records[0] if self.records else None
+    
+    def consume(self):
+        return None
+    
+    def execute_write(self, func, *args, **kwargs):
+        return func(self, *args, **kwargs)
+
+class RecordingDriver:
+    def __init__(self, results=None):
+        self.calls = []
+        self.results = results or {}
+    
+    def session(self, **kwargs):
+        return RecordingSession(self.calls, self.results)
+    
+    def close(self):
+        pass
+
+class TestBatchWriter(unittest.TestCase):
+    
+    def test_rows_are_grouped_by_batch_size(self):
+        """Test que les lignes sont envoyées par lots UNWIND."""
+        driver = RecordingDriver()
+        writer = BatchWriter(driver, batch_size=2)
+        rows = [{'entity_name': f'E{i}', 'document_id': 'doc', 'context': None} for i in range(5)]
+        
+        stats = writer.write_mentions(iter(rows))
+        
+        self.assertEqual([len(params['rows']) for _, params in driver.calls], [2, 2, 1])
+        self.assertTrue(all(query == MENTIONS_QUERY for query, _ in driver.calls))
+        self.assertEqual(stats['rows'], 5)
+        self.assertEqual(stats['batches'], 3)
+    
+    def test_entities_grouped_by_label(self):
+        """Test l'écriture des entités avec leur label de type, une requête par label."""
+        self.assertEqual([entity_label(t) for t in ('PERSON', 'GPE', 'WORK_OF_ART', 'ENTITY', 'a-b', '')],
+                         ['Person', 'Gpe', 'WorkOfArt', None, None, None])
+        
+        driver = RecordingDriver({LABELS_QUERY: [{'label': 'Entity'}, {'label': 'Document'}, {'label': 'Person'},
+                                                 {'label': 'Org'}]})
+        writer = BatchWriter(driver, batch_size=2)
+        rows = [{'name': name, 'type': etype, 'normalized_name': name.lower()}
+                for name, etype in (('Paris', 'GPE'), ('Napoléon', 'PERSON'), ('Lyon', 'GPE'), ('x', 'a-b'),
+                                    ('Nice', 'GPE'))]
+        
+        stats = writer.write_entities(rows)
+        
+        # Un lot par label dès qu'il est plein, les autres en fin de flux
+        self.assertEqual(stats['rows'], 5)
+        self.assertEqual(driver.calls[0][0], LABELS_QUERY)
+        writes = driver.calls[1:]
+        self.assertEqual([[row['name'] for row in params['rows']] for _, params in writes],
+                         [['Paris', 'Lyon'], ['Napoléon'], ['x'], ['Nice']])
+        gpe_query = writes[0][0]
+        self.assertIn('SET e:Gpe', gpe_query)
+        self.assertIn('REMOVE e:Person:Org', gpe_query)
+        self.assertIn('REMOVE e:Org', writes[1][0])
+        self.assertEqual(writes[2][0], ENTITIES_QUERY)
+        self.assertEqual(writes[3][0], gpe_query)
+    
+    def test_build_graph_batched(self):
+        """Test que build_graph écrit chaque phase en lots."""
+        driver = RecordingDriver()
+        store_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(store_dir.cleanup)
+        builder = GraphBuilder(None, None, None, batch_size=1000, driver=driver,
+                               document_store_path=store_dir.name)
+        driver.calls.clear()
+        
+        documents = [{'filename': 'wiki_paris.txt', 'path': 'data/raw/wiki_paris.txt',
+                      'text': 'Paris est en France.'}]
+        entities = [{'document_id': 'wiki_paris.txt', 'text': documents[0]['text'], 'entities': [
+            {'text': 'Paris', 'label': 'GPE', 'start': 0, 'end': 5},
+            {'text': 'France', 'label': 'GPE', 'start': 13, 'end': 19}
+        ]}]
+        relations = [{'subject': 'Paris', 'predicate': 'near', 'object': 'France',
+                      'method': 'proximity', 'distance': 8}]
+        
+        stats = builder.build_graph(entities, relations, documents)
+        
+        # documents, labels de la base, entités, mentions, relations, degrés
+        self.assertEqual(len(driver.calls), 6)
+        self.assertEqual(driver.calls[1][0], LABELS_QUERY)
+        self.assertEqual(driver.calls[-1][0], DEGREE_STATS_QUERY)
+        self.assertEqual(stats['entities']['rows'], 2)
+        self.assertEqual(driver.calls[-2][0], RELATIONS_QUERY % 'NEAR')
+        relation_row = driver.calls[-2][1]['rows'][0]
+        self.assertEqual(relation_row['props'], {'method': 'proximity', 'distance': 8})
+        
+        document_row = driver.calls[0][1]['rows'][0]
+        self.assertNotIn('text', document_row)
+        self.assertEqual(document_row['num_chars'], len(documents[0]['text']))
+        store = DocumentStore(store_dir.name)
+        self.assertEqual(store.text('wiki_paris.txt'), documents[0]['text'])
+        store.close()
+
+class KeywordExtractor:
+    """Extracteur factice : les mots capitalisés connus sont des entités GPE."""
+    
+    def __init__(self, names):
+        self.names = names
+        self.extracted = []
+    
+    def extract_from_documents(self, documents):
+        results = []
+        for doc in documents:
+            self.extracted.append(doc['filename'])
+            entities = [{'text': name, 'label': 'GPE', 'start': doc['text'].index(name),
+                         'end': doc['text'].index(name) + len(name)}
+                        for name in self.names if name in doc['text']]
+            results.append({'document_id': doc['filename'], 'entities': entities, 'text': doc['text']})
+        return results
+
+class TestExpandEntitiesQuery(unittest.TestCase):
+    """Requête groupée de GraphTraverser : un seul aller-retour Bolt pour toutes les entités de départ."""
+    
+    def setUp(self):
+        self.driver = RecordingDriver()
+        self.queries = GraphQueries(None, None, None, document_store_path='inexistant', driver=self.driver)
+    
+    def assertParametersBound(self, query, params):
+        self.assertLessEqual(set(re.findall(r'\$(\w+)', query)), set(params))
+    
+    def test_single_query_without_neighbors(self):
+        """Test le texte Cypher et les paramètres à profondeur 1 (pas de bloc de voisins)."""
+        query = EXPAND_ENTITIES_QUERY % ('CO_OCCURS_WITH|NEAR|SYNTACTIC', '', '[]')
+        self.driver.results[query] = [{
+            'name': 'paris', 'e': {'name': 'Paris'},
+            'documents': [{'doc_id': 'wiki_paris.txt', 'doc_title': 'Paris', 'num_chars': 40,
+                           'context': 'Paris', 'mention_count': 2}],
+            'related': [{'entity': {'name': 'France'}, 'relation': {'type': 'co_occurs_with'}, 'documents': []}],
+            'neighbors': []
+        }, {'name': 'Berlin', 'e': None, 'documents': [], 'related': [], 'neighbors': []}]
+        
+        expanded = self.queries.expand_entities(['paris', 'Berlin'], max_depth=1, limit_docs=2, limit_related=4)
+        
+        self.assertEqual(len(self.driver.calls), 1)
+        sent, params = self.driver.calls[0]
+        self.assertEqual(sent, query)
+        self.assertIn('UNWIND range(0, size($names) - 1) AS idx', sent)
+        self.assertIn('MATCH (e:Entity {normalized_name: toLower(name)})', sent)
+        self.assertTrue(sent.rstrip().endswith('ORDER BY idx'))
+        self.assertNotIn('$fanout', sent)
+        self.assertEqual((params['names'], params['doc_limit'], params['rel_limit']), (['paris', 'Berlin'], 2, 4))
+        self.assertParametersBound(sent, params)
+        self.assertEqual([item['name'] for item in expanded], ['paris', 'Berlin'])
+        self.assertEqual(expanded[0]['entity_data']['entity'], {'name': 'Paris'})
+        self.assertEqual(expanded[0]['related'][0]['relation'], {'type': 'co_occurs_with'})
+        self.assertIsNone(expanded[1]['entity_data'])
+    
+    def test_bounded_neighbors_in_same_query(self):
+        """Test que le voisinage borné est une sous-requête de la même requête, avec ses paramètres."""
+        hub_limits = {'fanout': 7, 'hub_types': ['DATE'], 'hub_degree': 50}
+        self.queries.expand_entities(['Paris'], max_depth=2, limit_neighbors=6, hub_limits=hub_limits)
+        
+        self.assertEqual(len(self.driver.calls), 1)
+        sent, params = self.driver.calls[0]
+        self.assertEqual(sent, EXPAND_ENTITIES_QUERY % ('CO_OCCURS_WITH|NEAR|SYNTACTIC',
+                                                        neighbors_block(2, bounded=True), 'neighbors'))
+        self.assertIn('LIMIT $fanout', sent)
+        self.assertEqual((params['neighbor_limit'], params['fanout'], params['hub_types'], params['hub_degree']),
+                         (6, 7, ['DATE'], 50))
+        self.assertParametersBound(sent, params)
+        self.assertEqual(self.queries.expand_entities([]), [])
+        self.assertEqual(len(self.driver.calls), 1)
+
+class TestGraphManager(unittest.TestCase):
+    
+    def test_add_documents_writes_only_the_delta(self):
+        """Test l'ingestion incrémentale : documents inchangés ignorés, paires touchées recalculées."""
+        unchanged = {'filename': 'a.txt', 'path': 'a.txt', 'text': 'Paris et Lyon.'}
+        changed = {'filename': 'b.txt', 'path': 'b.txt', 'text': 'Lyon et Marseille.'}
+        new = {'filename': 'c.txt', 'path': 'c.txt', 'text': 'Paris et Marseille.'}
+        driver = RecordingDriver({
+            DOCUMENT_HASHES_QUERY: [{'id': 'a.txt', 'content_hash': content_hash(unchanged['text'])},
+                                    {'id': 'b.txt', 'content_hash': 'ancienne version'}],
+            DETACH_MENTIONS_QUERY: [{'id': 'b.txt', 'names': ['Lyon', 'Nice']}],
+            ENTITY_DOCUMENTS_QUERY: lambda params: [
+                {'name': name, 'docs': docs} for name, docs in
+                {'paris': ['a.txt', 'c.txt', 'x.txt'], 'lyon': ['a.txt', 'b.txt'], 'marseille': ['b.txt', 'c.txt'],
+                 'rouen': ['x.txt']}.items() if name in params['names']],
+            ENTITY_PARTNERS_QUERY: [{'name': 'paris', 'partners': ['lyon', 'marseille', 'rouen']}]
+        })
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        store_path = os.path.join(tmp.name, 'documents')
+        write_document_store([unchanged, dict(changed, text='Lyon et Nice.')], store_path)
+        filter_path = os.path.join(tmp.name, 'entity_filter.npz')
+        BloomFilter.from_keys(['paris', 'lyon', 'nice']).save(filter_path)
+        version = GraphVersion(os.path.join(tmp.name, 'graph_version'))
+        
+        manager = GraphManager(None, None, None, document_store_path=store_path, version=version,
+                               entity_filter_path=filter_path, driver=driver)
+        driver.calls.clear()
+        extractor = KeywordExtractor(['Paris', 'Lyon', 'Marseille'])
+        stats = manager.add_documents([unchanged, changed, new], extractor, min_strength=1)
+        
+        self.assertEqual(extractor.extracted, ['b.txt', 'c.txt'])
+        self.assertEqual(stats['changed'], 2)
+        self.assertEqual(stats['pairs'], 5)
+        queries = [query for query, _ in driver.calls]
+        self.assertEqual(queries[0], DOCUMENT_HASHES_QUERY)
+        cooccurrences = driver.calls[queries.index(COOCCURRENCE_QUERY)][1]['rows']
+        # Paris passe de 2 à 3 documents : ses paires des documents inchangés sont recalculées
+        self.assertEqual(driver.calls[queries.index(ENTITY_PARTNERS_QUERY)][1]['names'], ['paris'])
+        self.assertEqual([(row['subject'], row['object']) for row in cooccurrences],
+                         [('lyon', 'marseille'), ('lyon', 'nice'), ('lyon', 'paris'), ('marseille', 'paris'),
+                          ('paris', 'rouen')])
+        self.assertEqual(driver.calls[queries.index(STALE_RELATIONS_QUERY % 'NEAR')][1]['ids'], ['b.txt', 'c.txt'])
+        # Lyon et Marseille sont cités dans moins de 3 documents : relation filtrée comme à l'extraction
+        near = driver.calls[queries.index(document_relations_query('NEAR'))][1]['rows']
+        self.assertEqual([(row['subject'], row['object'], row['props']['doc_ids']) for row in near],
+                         [('paris', 'marseille', ['c.txt'])])
+        orphans = driver.calls[queries.index(ORPHAN_ENTITIES_QUERY)][1]['rows']
+        self.assertEqual(orphans, [{'name': 'Nice'}])
+        self.assertNotEqual(version.current(), '0')
+        self.assertIn('marseille', BloomFilter.load(filter_path))
+        
+        store = DocumentStore(store_path)
+        self.assertEqual(store.texts(['a.txt', 'b.txt', 'c.txt']),
+                         {'a.txt': unchanged['text'], 'b.txt': changed['text'], 'c.txt': new['text']})
+        store.close()
+        manager.close()
+        
+        self.assertEqual(manager.add_documents([unchanged], extractor), {'documents': 1, 'changed': 0})
+    
+    def test_document_relations_list_their_sources(self):
+        """Test les documents d'une relation de proximité dédupliquée (retirés un par un à l'ingestion)."""
+        relations = RelationExtractor().deduplicate_relations([
+            {'subject': 'lyon', 'predicate': 'near', 'object': 'paris', 'method': 'proximity', 'doc_id': 'a.txt'},
+            {'subject': 'paris', 'predicate': 'near', 'object': 'lyon', 'method': 'proximity', 'doc_id': 'b.txt'}
+        ])
+        self.assertEqual([GraphBuilder.relation_row(rel)['props']['doc_ids'] for rel in relations], [['a.txt', 'b.txt']])
+        self.assertIn('-[r:NEAR {type: row.predicate}]-(b)', document_relations_query('NEAR'))
+        self.assertIn('-[r:SYNTACTIC {type: row.predicate}]->(b)', document_relations_query('SYNTACTIC'))
+
+class TestIncrementalCooccurrence(unittest.TestCase):
+    """L'ingestion incrémentale donne les mêmes relations de co-occurrence qu'une construction complète."""
+    
+    MIN_STRENGTH = 2
+    MIN_MENTIONS = 3
+    
+    @staticmethod
+    def corpus(names_by_doc):
+        return [{'document_id': doc_id, 'entities': [{'text': name, 'label': 'GPE', 'start': 0, 'end': len(name)}
+                                                     for name in names]}
+                for doc_id, names in names_by_doc.items()]
+    
+    def full_build(self, names_by_doc):
+        """Relations CO_OCCURS_WITH écrites par build_graph (extraction, is_frequent, nœuds par nom)."""
+        entities = self.corpus(names_by_doc)
+        extractor = RelationExtractor()
+        counts = {}
+        for doc_entities in entities:
+            extractor.count_entity_documents(doc_entities, counts)
+        nodes = {name for names in names_by_doc.values() for name in names}
+        return {(rel['subject'], rel['object']): sorted(rel['common_docs'])
+                for rel in extractor.extract_cooccurrence_relations(entities, min_strength=self.MIN_STRENGTH)
+                if extractor.is_frequent(rel, counts, self.MIN_MENTIONS)
+                and rel['subject'] in nodes and rel['object'] in nodes}
+    
+    def test_upsert_matches_full_build(self):
+        # Marseille atteint 3 documents et Brest retombe à 2 : les paires (marseille, toulon) et
+        # (brest, quimper), citées seulement par des documents inchangés, changent de décision
+        before = {'a.txt': ['Paris', 'lyon'], 'b.txt': ['paris', 'Lyon', 'nice'], 'c.txt': ['PARIS', 'nice', 'brest'],
+                  'd.txt': ['lyon', 'nice'], 'f.txt': ['marseille', 'toulon'], 'g.txt': ['marseille', 'toulon'],
+                  'h.txt': ['brest', 'quimper'], 'i.txt': ['brest', 'quimper']}
+        after = dict(before, **{'c.txt': ['Paris', 'lyon'], 'e.txt': ['paris', 'Nice', 'lyon', 'marseille']})
+        changed = ['c.txt', 'e.txt']
+        
+        docs_by_name = {}
+        for doc_id, names in after.items():
+            for name in {name.lower() for name in names}:
+                docs_by_name.setdefault(name, []).append(doc_id)
+        partners = {name: sorted({other.lower() for names in after.values() if name in {n.lower() for n in names}
+                                  for other in names} - {name})
+                    for name in docs_by_name}
+        driver = RecordingDriver({
+            DETACH_MENTIONS_QUERY: [{'id': 'c.txt', 'names': before['c.txt']}],
+            ENTITY_DOCUMENTS_QUERY: lambda params: [{'name': name, 'docs': docs_by_name[name]}
+                                                    for name in params['names'] if name in docs_by_name],
+            ENTITY_PARTNERS_QUERY: lambda params: [{'name': name, 'partners': partners[name]}
+                                                   for name in params['names'] if name in partners]
+        })
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        builder = GraphBuilder(None, None, None, driver=driver,
+                               document_store_path=os.path.join(tmp.name, 'documents'))
+        builder.upsert_documents(self.corpus({doc_id: after[doc_id] for doc_id in changed}),
+                                 [{'filename': doc_id, 'path': doc_id, 'text': ' '.join(after[doc_id])}
+                                  for doc_id in changed],
+                                 min_strength=self.MIN_STRENGTH, min_mentions=self.MIN_MENTIONS)
+        
+        # Application des lignes de COOCCURRENCE_QUERY au graphe de la construction précédente
+        edges = self.full_build(before)
+        nodes = {name for names in after.values() for name in names}
+        rows = [row for query, params in driver.calls if query == COOCCURRENCE_QUERY for row in params['rows']]
+        for row in rows:
+            if row['subject'] in nodes and row['object'] in nodes:
+                edges.pop((row['subject'], row['object']), None)
+                if row['keep']:
+                    edges[(row['subject'], row['object'])] = row['common_docs']
+        
+        self.assertEqual(edges, self.full_build(after))
+        self.assertIn(('lyon', 'paris'), edges)
+        self.assertIn(('marseille', 'toulon'), edges)
+        self.assertNotIn(('brest', 'quimper'), edges)
+        self.assertIn(('brest', 'quimper'), self.full_build(before))
+
+class TestMentionAggregator(unittest.TestCase):
+    
+    def test_aggregate_repeated_mentions(self):
+        """Test la réduction des mentions répétées en paires (entité, document)."""
+        text = "Paris. Paris et Lyon. Paris."
+        entities = [
+            {'document_id': 'd1', 'text': text, 'entities': [
+                {'text': 'Paris', 'label': 'GPE', 'start': 7, 'end': 12},
+                {'text': 'Paris', 'label': 'LOC', 'start': 0, 'end': 5},
+                {'text': 'Lyon', 'label': 'GPE', 'start': 16, 'end': 20},
+                {'text': 'Paris', 'label': 'GPE', 'start': 22, 'end': 27}
+            ]},
+            {'document_id': 'd2', 'text': 'Paris', 'entities': [
+                {'text': 'Paris', 'label': 'GPE', 'start': 0, 'end': 5}
+            ]}
+        ]
+        aggregator = MentionAggregator(context_window=2).add_documents(entities)
+        
+        entity_rows = {row['name']: row for row in aggregator.entity_rows()}
+        self.assertEqual(set(entity_rows), {'Paris', 'Lyon'})
+        self.assertEqual(entity_rows['Paris']['type'], 'GPE')
+        
+        mentions = {(m['entity_name'], m['document_id']): m for m in aggregator.mention_rows()}
+        self.assertEqual(len(mentions), 3)
+        self.assertEqual(mentions[('Paris', 'd1')]['count'], 3)
+        self.assertEqual(mentions[('Paris', 'd1')]['first_offset'], 0)
+        self.assertEqual(mentions[('Paris', 'd1')]['context'], 'Paris. ')
+        self.assertEqual(aggregator.summary()['mentions'], 5)
+
+class TestBulkExporter(unittest.TestCase):
+    
+    def test_export_csv_files(self):
+        """Test la génération des CSV neo4j-admin sans base de données."""
+        documents = [
+            {'filename': 'wiki_paris.txt', 'path': 'data/raw/wiki_paris.txt', 'text': '# Paris\nParis, France.'},
+            {'filename': 'wiki_lyon.txt', 'path': 'data/raw/wiki_lyon.txt', 'text': 'Lyon, France.'}
+        ]
+        entities = [
+            {'document_id': 'wiki_paris.txt', 'text': documents[0]['text'], 'entities': [
+                {'text': 'Paris', 'label': 'GPE', 'start': 8, 'end': 13},
+                {'text': 'France', 'label': 'GPE', 'start': 15, 'end': 21}
+            ]},
+            {'document_id': 'wiki_lyon.txt', 'text': documents[1]['text'], 'entities': [
+                {'text': 'Lyon', 'label': 'GPE', 'start': 0, 'end': 4},
+                {'text': 'France', 'label': 'GPE', 'start': 6, 'end': 12}
+            ]}
+        ]
+        relations = [
+            {'subject': 'Paris', 'predicate': 'co_occurs_with', 'object': 'France',
+             'method': 'cooccurrence', 'common_docs': ['wiki_paris.txt'], 'strength': 1},
+            {'subject': 'inconnue', 'predicate': 'near', 'object': 'France', 'method': 'proximity'},
+            {'subject': 'Paris', 'predicate': 'co_occurs_with', 'object': 'France',
+             'method': 'cooccurrence', 'common_docs': ['wiki_lyon.txt'], 'strength': 5}
+        ]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            store_path = os.path.join(tmp, 'store')
+            stats = BulkExporter(tmp, document_store_path=store_path).export(entities, relations, documents)
+            self.assertEqual(stats, {'documents': 2, 'entities': 3, 'mentions': 4, 'relations': 1})
+            
+            def read(name):
+                with open(os.path.join(tmp, name), encoding='utf-8', newline='') as f:
+                    return list(csv.reader(f))
+            
+            self.assertEqual(read('entities_header.csv')[0][0], 'uid:ID(Entity)')
+            docs = read('documents.csv')
+            self.assertEqual([row[0] for row in docs], ['0', '1'])
+            self.assertEqual(docs[0][3], 'Paris')
+            self.assertEqual(docs[0][5], str(len(documents[0]['text'])))
+            self.assertEqual(DocumentStore(store_path).text('wiki_paris.txt'), documents[0]['text'])
+            
+            entity_rows = read('entities.csv')
+            entity_ids = {row[1]: row[0] for row in entity_rows}
+            self.assertEqual({row[1]: row[4:7] for row in entity_rows}['France'], ['1', '2', 'Entity;Gpe'])
+            mentions = read('mentions.csv')
+            self.assertIn([entity_ids['France'], '1', 'Lyon, France.', '1', '6', 'MENTIONED_IN'],
+                          [row for row in mentions])
+            self.assertEqual(read('relations.csv'), [[entity_ids['Paris'], entity_ids['France'],
+                                                      'co_occurs_with', 'cooccurrence', '1', '',
+                                                      'wiki_paris.txt', '', 'CO_OCCURS_WITH']])
+            self.assertTrue(os.path.exists(os.path.join(tmp, 'import.sh')))
+
+class TestDocumentStore(unittest.TestCase):
+    
+    def test_store_roundtrip_and_slices(self):
+        """Test l'écriture du blob UTF-8 et la lecture de tranches par caractères."""
+        documents = [
+            {'filename': 'wiki_paris.txt', 'text': 'Paris, capitale de la France.'},
+            {'filename': 'wiki_besancon.txt', 'text': 'Besançon — ville de Franche-Comté, née en 1×.'},
+            {'filename': 'wiki_paris.txt', 'text': 'doublon ignoré'}
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            stats = write_document_store(documents, tmp)
+            self.assertEqual(stats['documents'], 2)
+            
+            store = DocumentStore(tmp)
+            self.assertEqual(len(store), 2)
+            self.assertEqual(store.text('wiki_paris.txt'), documents[0]['text'])
+            self.assertEqual(store.text('wiki_besancon.txt'), documents[1]['text'])
+            for n in range(len(documents[1]['text']) + 2):
+                self.assertEqual(store.text('wiki_besancon.txt', n), documents[1]['text'][:n])
+            self.assertEqual(store.num_chars('wiki_besancon.txt'), len(documents[1]['text']))
+            self.assertEqual(store.text('inconnu.txt'), '')
+            store.close()
+    
+    def test_empty_store(self):
+        """Test l'ouverture d'un store sans document."""
+        with tempfile.TemporaryDirectory() as tmp:
+            write_document_store([], tmp)
+            self.assertTrue(DocumentStore.exists(tmp))
+            store = DocumentStore(tmp)
+            self.assertEqual(store.text('wiki_paris.txt'), '')
+            store.close()
+    
+    def test_publish_new_version(self):
+        """Test qu'un store ouvert garde sa version quand une autre est publiée (index et textes ensemble)."""
+        with tempfile.TemporaryDirectory() as tmp:
+            write_document_store([{'filename': 'a.txt', 'text': 'Paris'}], tmp)
+            old = DocumentStore(tmp)
+            write_document_store([{'filename': 'b.txt', 'text': 'Lyon'}, {'filename': 'a.txt', 'text': 'Nice'}], tmp)
+            append_document_store([{'filename': 'a.txt', 'text': 'Marseille'}], tmp)
+            new = DocumentStore(tmp)
+            self.assertEqual(old.texts(['a.txt', 'b.txt']), {'a.txt': 'Paris', 'b.txt': ''})
+            self.assertEqual(new.texts(['a.txt', 'b.txt']), {'a.txt': 'Marseille', 'b.txt': 'Lyon'})
+            self.assertEqual(len([name for name in os.listdir(tmp) if name.endswith('.bin')]), 1)
+            old.close()
+            new.close()
+
+class TestGraphMetrics(unittest.TestCase):
+    
+    def test_metrics_from_config(self):
+        """Test que `graph.compute_metrics` active le calcul, paramétré par `graph.metrics`."""
+        config = ConfigLoader('config.yaml')
+        self.assertTrue(config.get('graph.compute_metrics'))
+        config.config['graph']['metrics']['damping'] = 0.5
+        self.assertEqual(metrics_from_config(config).damping, 0.5)
+        config.config['graph']['compute_metrics'] = False
+        self.assertIsNone(metrics_from_config(config))
+        self.assertIsNone(metrics_from_config(None))
+    
+    def test_pagerank_matches_dense_solution(self):
+        """Test le PageRank creux contre la solution dense (nœud isolé compris)."""
+        src, dst, weights = [0, 1, 1], [1, 2, 3], [2.0, 1.0, 1.0]
+        rank = pagerank(adjacency_matrix(5, src, dst, weights), damping=0.85, tol=1e-12, max_iter=500)
+        
+        dense = adjacency_matrix(5, src, dst, weights).toarray()
+        out = dense.sum(axis=1)
+        transition = np.where(out[:, None] > 0, dense / np.maximum(out, 1)[:, None], 1 / 5).T
+        google = 0.85 * transition + 0.15 / 5
+        values, vectors = np.linalg.eig(google)
+        expected = np.real(vectors[:, np.argmax(np.real(values))])
+        
+        np.testing.assert_allclose(rank, expected / expected.sum(), atol=1e-9)
+        self.assertAlmostEqual(rank.sum(), 1.0)
+    
+    def test_sampled_betweenness_on_path(self):
+        """Test la betweenness exacte (toutes les sources) sur un chemin 0-1-2-3."""
+        metrics = GraphMetrics(betweenness_samples=4).compute(4, [0, 1, 2], [1, 2, 3])
+        np.testing.assert_allclose(metrics['betweenness'], [0, 2, 2, 0])
+        self.assertEqual(metrics['degree'].tolist(), [1, 2, 2, 1])
+
+class TestTrigramIndex(unittest.TestCase):
+    
+    def test_search_folds_and_ranks(self):
+        """Test la recherche par sous-chaîne sans accents, les noms courts d'abord."""
+        index = TrigramIndex(['Napoléon Bonaparte', 'Napoléon', 'Élysée', 'Paris', 'Bonaparte'])
+        self.assertEqual([i for i, _ in index.search('napoléon')], [1, 0])
+        self.assertEqual([i for i, _ in index.search('ELYSEE')], [2])
+        self.assertEqual([i for i, _ in index.search('le palais de l\'Élysée à Paris')], [2, 3])
+        self.assertEqual(index.search('apart', limit=1), [(4, index.search('apart')[0][1])])
+        self.assertEqual(index.search('Berlin'), [])
+        self.assertEqual(query_terms('Qui était Napoléon ?'), ['napoleon'])
+
+class TestAutocompleteIndex(unittest.TestCase):
+    
+    def setUp(self):
+        self.index = AutocompleteIndex(['Napoléon Ier', 'Napoléon Bonaparte', 'Paris', 'Parisiens', 'Jean-Paul Sartre'],
+                                       ['PERSON', 'PERSON', 'GPE', 'NORP', 'PERSON'], [3, 5, 10, 1, 2])
+    
+    def names(self, query, **kwargs):
+        return [s['name'] for s in self.index.complete(query, **kwargs)]
+    
+    def test_prefix_without_accents(self):
+        """Test la complétion par préfixe d'un mot quelconque, les plus importantes d'abord."""
+        self.assertEqual(self.names('napoleon'), ['Napoléon Bonaparte', 'Napoléon Ier'])
+        self.assertEqual(self.names('PARIS'), ['Paris', 'Parisiens'])
+        self.assertEqual(self.names('sartre'), ['Jean-Paul Sartre'])
+        self.assertEqual(self.names('napoléon i', max_edits=0), ['Napoléon Ier'])
+        self.assertEqual(self.names('napoléon i'), ['Napoléon Ier', 'Napoléon Bonaparte'])
+        self.assertEqual(self.names('napo', limit=1), ['Napoléon Bonaparte'])
+        self.assertEqual(self.names('!?'), [])
+    
+    def test_typos(self):
+        """Test la tolérance aux fautes (substitution, omission, inversion), bornée par la longueur."""
+        self.assertEqual(self.names('napoloen'), ['Napoléon Bonaparte', 'Napoléon Ier'])
+        self.assertEqual([s['distance'] for s in self.index.complete('satre')], [1])
+        self.assertEqual(self.names('prais'), ['Paris', 'Parisiens'])
+        self.assertEqual(self.names('pra'), [])
+        self.assertEqual(self.names('prais', max_edits=0), [])
+    
+    def test_snapshot_roundtrip(self):
+        """Test l'instantané depuis entities.json, rechargé à l'identique."""
+        entities, _, _ = sample_corpus()
+        index = AutocompleteIndex.from_entities(entities)
+        with tempfile.TemporaryDirectory() as tmp:
+            index.save(os.path.join(tmp, 'autocomplete.npz'))
+            loaded = AutocompleteIndex.load(os.path.join(tmp, 'autocomplete.npz'))
+        self.assertEqual(len(loaded), 4)
+        self.assertEqual(loaded.complete('fran'), [{'name': 'France', 'type': 'GPE', 'distance': 0, 'weight': 2.0}])
+        self.assertEqual(loaded.complete('napo'), index.complete('napo'))
+
+def sample_corpus():
+    """Petit corpus : Paris et Lyon reliés à France, Napoléon lié à Paris."""
+    documents = [
+        {'filename': 'wiki_paris.txt', 'path': 'data/raw/wiki_paris.txt',
+         'text': '# Paris\nParis est la capitale de la France. Napoléon à Paris.'},
+        {'filename': 'wiki_lyon.txt', 'path': 'data/raw/wiki_lyon.txt',
+         'text': '# Lyon\nLyon est une ville de France.'}
+    ]
+    entities = [
+        {'document_id': 'wiki_paris.txt', 'text': documents[0]['text'], 'entities': [
+            {'text': 'Paris', 'label': 'GPE', 'start': 8, 'end': 13},
+            {'text': 'France', 'label': 'GPE', 'start': 38, 'end': 44},
+            {'text': 'Napoléon', 'label': 'PERSON', 'start': 46, 'end': 54},
+            {'text': 'Paris', 'label': 'GPE', 'start': 57, 'end': 62}
+        ]},
+        {'document_id': 'wiki_lyon.txt', 'text': documents[1]['text'], 'entities': [
+            {'text': 'Lyon', 'label': 'GPE', 'start': 7, 'end': 11},
+            {'text': 'France', 'label': 'GPE', 'start': 33, 'end': 39}
+        ]}
+    ]
+    relations = [
+        {'subject': 'Paris', 'predicate': 'co_occurs_with', 'object': 'France',
+         'method': 'cooccurrence', 'common_docs': ['wiki_paris.txt'], 'strength': 2},
+        {'subject': 'Lyon', 'predicate': 'near', 'object': 'France', 'method': 'proximity', 'distance': 20},
+        {'subject': 'Napoléon', 'predicate': 'near', 'object': 'Paris', 'method': 'proximity', 'distance': 3}
+    ]
+    return entities, relations, documents
+
+class BackendContractTests:
+    """Tests communs à tous les backends implémentant GraphQueries."""
+    
+    def test_statistics(self):
+        """Test les statistiques du graphe en mémoire."""
+        self.assertEqual(self.stats, {'entities': 4, 'relationships': 8, 'documents': 2})
+    
+    def test_entity_with_documents(self):
+        """Test la recherche d'entité (nom normalisé) avec ses documents."""
+        result = self.queries.get_entity_with_documents('paris')
+        self.assertEqual(result['entity']['name'], 'Paris')
+        self.assertEqual(result['documents'][0]['doc_title'], 'Paris')
+        self.assertEqual(result['documents'][0]['mention_count'], 2)
+        self.assertIsNone(self.queries.get_entity_with_documents('Berlin'))
+    
+    def test_neighbors_and_related(self):
+        """Test les voisins par profondeur et les entités reliées."""
+        depth1 = {n['entity']['name'] for n in self.queries.get_neighbors('Lyon', max_depth=1)}
+        self.assertEqual(depth1, {'France'})
+        
+        depth2 = {n['entity']['name']: n['depth'] for n in self.queries.get_neighbors('Lyon', max_depth=2)}
+        self.assertEqual(depth2, {'France': 1, 'Paris': 2})
+        
+        related = self.queries.get_related_entities('Paris')
+        self.assertEqual({r['entity']['name'] for r in related}, {'France', 'Napoléon'})
+        strengths = {r['entity']['name']: r['relation'].get('strength') for r in related}
+        self.assertEqual(strengths['France'], 2)
+    
+    def test_degree_statistics(self):
+        """Test les degrés maintenus sur les entités."""
+        france = self.queries.find_entity('France')
+        self.assertEqual((france['degree'], france['document_count']), (2, 2))
+        self.assertEqual(self.queries.find_entity('Napoléon')['degree'], 1)
+    
+    def test_bounded_neighbors(self):
+        """Test le parcours borné : fan-out par force et hubs non développés."""
+        def names(**kwargs):
+            return [(n['entity']['name'], n['depth']) for n in self.queries.get_neighbors_bounded(**kwargs)]
+        
+        self.assertEqual(names(entity_name='Lyon', max_depth=3, hub_types=()),
+                         [('France', 1), ('Paris', 2), ('Napoléon', 3)])
+        self.assertEqual(names(entity_name='Lyon', max_depth=3, hub_types=('GPE',)), [('France', 1)])
+        self.assertEqual(names(entity_name='Lyon', max_depth=3, hub_types=(), hub_degree=2), [('France', 1)])
+        self.assertEqual(names(entity_name='France', max_depth=1, fanout=1), [('Paris', 1)])
+        self.assertEqual(names(entity_name='Berlin'), [])
+    
+    def test_importance_ranking(self):
+        """Test que les voisins sont classés par PageRank précalculé."""
+        self.assertEqual(self.summary['entities'], 4)
+        self.assertEqual({name for name, _ in self.summary['top_pagerank'][:2]}, {'Paris', 'France'})
+        self.assertGreater(self.queries.find_entity('Paris')['pagerank'], self.queries.find_entity('Lyon')['pagerank'])
+        
+        self.assertEqual([n['entity']['name'] for n in self.queries.get_neighbors('France', max_depth=1)],
+                         ['Paris', 'Lyon'])
+        self.assertEqual([r['entity']['name'] for r in self.queries.get_related_entities('France')],
+                         ['Paris', 'Lyon'])
+        self.assertEqual([n['entity']['name'] for n in self.queries.get_neighbors_bounded('France', max_depth=1)],
+                         ['Paris', 'Lyon'])
+    
+    def test_count_entities_by_type(self):
+        """Test le comptage des entités par type."""
+        self.assertEqual(self.queries.count_entities_by_type(['GPE', 'PERSON', 'ORG']),
+                         {'GPE': 3, 'PERSON': 1, 'ORG': 0})
+    
+    def test_relation_types(self):
+        """Test le filtrage par type de relation natif pendant l'expansion."""
+        related = self.queries.get_related_entities('France', relation_types=['NEAR'])
+        self.assertEqual([r['entity']['name'] for r in related], ['Lyon'])
+        
+        near = self.queries.get_neighbors('Lyon', max_depth=3, relation_types=['NEAR'])
+        self.assertEqual([(n['entity']['name'], n['depth']) for n in near], [('France', 1)])
+        both = self.queries.get_neighbors('Lyon', max_depth=3, relation_types=['near', 'CO_OCCURS_WITH'])
+        self.assertEqual([n['entity']['name'] for n in both], ['France', 'Paris', 'Napoléon'])
+        
+        bounded = self.queries.get_neighbors_bounded('Paris', max_depth=2, relation_types=['NEAR'])
+        self.assertEqual([n['entity']['name'] for n in bounded], ['Napoléon'])
+        self.assertEqual(self.queries.get_related_entities('Paris', relation_types=['SYNTACTIC']), [])
+        with self.assertRaises(ValueError):
+            self.queries.get_related_entities('Paris', relation_types=['RELATES_TO'])
+    
+    def test_find_path(self):
+        """Test le plus court chemin entre deux entités."""
+        path = self.queries.find_path('Lyon', 'Napoléon')
+        self.assertEqual([n.get('name') for n in path['nodes']], ['Lyon', 'France', 'Paris', 'Napoléon'])
+        self.assertEqual(len(path['relationships']), 3)
+        self.assertIsNone(self.queries.find_path('Lyon', 'Berlin'))
+    
+    def test_search_and_documents(self):
+        """Test la recherche textuelle, par type et par document."""
+        found = self.queries.search_by_query('napo')
+        self.assertEqual([e['entity']['name'] for e in found['entities']], ['Napoléon'])
+        self.assertEqual(len(self.queries.search_entities_by_type('GPE')), 3)
+        
+        doc = self.queries.get_document('wiki_lyon.txt')
+        self.assertEqual({e['entity']['name'] for e in doc['entities']}, {'Lyon', 'France'})
+        self.assertEqual(self.queries.get_document_by_title('Lyon')['document']['id'], 'wiki_lyon.txt')
+    
+    def test_full_text_search(self):
+        """Test la recherche plein texte : accents repliés, mots outils ignorés, tri par score."""
+        found = self.queries.search_by_query('napoleon')
+        self.assertEqual([e['entity']['name'] for e in found['entities']], ['Napoléon'])
+        
+        found = self.queries.search_by_query('Qui était Napoléon à Paris ?')
+        self.assertEqual({e['entity']['name'] for e in found['entities']}, {'Napoléon', 'Paris'})
+        scores = [e['score'] for e in found['entities']]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        
+        self.assertEqual(self.queries.search_by_query('à la'), {'entities': []})
+        self.assertIsNone(self.queries.get_document_by_title('Berlin'))
+    
+    def test_document_text(self):
+        """Test la lecture du texte d'un document, tronqué à la demande."""
+        self.assertEqual(self.queries.document_text('wiki_lyon.txt'), '# Lyon\nLyon est une ville de France.')
+        self.assertEqual(self.queries.document_text('wiki_lyon.txt', 6), '# Lyon')
+        self.assertEqual(self.queries.document_text('inconnu.txt'), '')
+        self.assertEqual(self.queries.get_document('wiki_lyon.txt')['document']['text'],
+                         '# Lyon\nLyon est une ville de France.')
+        refs = self.queries.get_entity_with_documents('Lyon')['documents']
+        self.assertEqual([(ref['doc_id'], ref['num_chars']) for ref in refs], [('wiki_lyon.txt', 36)])
+        self.assertNotIn('doc_text', refs[0])
+    
+class TestMemoryBackend(BackendContractTests, unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        builder = MemoryGraphBuilder(cls.tmp.name)
+        cls.stats = builder.build_graph(*sample_corpus())
+        cls.summary = builder.compute_metrics()
+        cls.queries = MemoryGraphQueries.load(cls.tmp.name)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+    
+    def test_reload_preserves_graph(self):
+        """Test que la sauvegarde CSR se recharge à l'identique."""
+        graph = CSRGraph.load(self.tmp.name)
+        self.assertEqual(graph.entity_names, self.queries.graph.entity_names)
+        self.assertTrue((graph.adj_neighbors == self.queries.graph.adj_neighbors).all())
+
+class TestEntityFilter(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        entities, relations, documents = sample_corpus()
+        builder = MemoryGraphBuilder(cls.tmp.name)
+        builder.build_graph(entities, relations, documents)
+        builder.close()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+    
+    def test_bloom_filter(self):
+        """Test l'absence de faux négatifs, le taux de faux positifs et la sauvegarde."""
+        bloom = BloomFilter.from_keys([f"entité {i}" for i in range(2000)], error_rate=0.01)
+        self.assertTrue(all(f"entité {i}" in bloom for i in range(2000)))
+        false_positives = sum(f"absente {i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+        
+        path = os.path.join(self.tmp.name, 'filter.npz')
+        bloom.save(path)
+        loaded = BloomFilter.load(path)
+        self.assertEqual((loaded.num_bits, loaded.num_hashes, loaded.count), (bloom.num_bits, bloom.num_hashes, 2000))
+        self.assertIn("entité 7", loaded)
+    
+    def test_misses_answered_locally(self):
+        """Test les absences tranchées par le filtre puis par le cache négatif (faux positif « Berlin »)."""
+        queries = FilteredGraphQueries(MemoryGraphQueries.load(self.tmp.name),
+                                       BloomFilter.from_keys(['paris', 'france', 'lyon', 'napoléon', 'berlin']))
+        self.assertEqual(queries.find_entity('PARIS')['name'], 'Paris')
+        self.assertIsNone(queries.get_entity_with_documents('Tokyo'))
+        self.assertIsNone(queries.find_entity('Berlin'))
+        self.assertIsNone(queries.find_entity('berlin'))
+        self.assertEqual(queries.get_neighbors('Berlin'), [])
+        
+        expanded = queries.expand_entities(['Tokyo', 'Lyon', 'Berlin'])
+        self.assertEqual([item['name'] for item in expanded], ['Tokyo', 'Lyon', 'Berlin'])
+        self.assertEqual(expanded[1]['entity_data']['entity']['name'], 'Lyon')
+        self.assertIsNone(expanded[0]['entity_data'])
+        
+        stats = queries.filter_stats()
+        self.assertEqual((stats['lookups'], stats['bloom_rejected'], stats['negative_cache_hits']), (8, 2, 3))
+        self.assertEqual((stats['backend_lookups'], stats['backend_misses']), (3, 1))
+        self.assertEqual(queries.search_entities_by_type('GPE', 10)[0]['type'], 'GPE')
+        
+        queries.add_entities(['Berlin'])
+        self.assertEqual(queries.filter_stats()['negative_cache_size'], 0)
+
+class TestQueryCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.version = GraphVersion(os.path.join(self.tmp.name, 'graph_version'))
+        entities, relations, documents = sample_corpus()
+        self.builder = MemoryGraphBuilder(os.path.join(self.tmp.name, 'memory'))
+        self.builder.version = self.version
+        self.builder.build_graph(entities, relations, documents)
+        self.backend = MemoryGraphQueries.load(os.path.join(self.tmp.name, 'memory'))
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_hits_and_isolation(self):
+        """Test le LRU borné, les compteurs et l'indépendance des résultats renvoyés."""
+        cache = CachedGraphQueries(self.backend, self.version, max_entries=2)
+        first = cache.get_entity_with_documents('Paris', limit_docs=3)
+        first['entity']['name'] = 'modifié'
+        self.assertEqual(cache.get_entity_with_documents('Paris', limit_docs=3)['entity']['name'], 'Paris')
+        cache.get_related_entities('Lyon')
+        cache.get_related_entities('France')
+        cache.get_entity_with_documents('Paris', limit_docs=3)
+        self.assertEqual(cache.document_text('wiki_lyon.txt', 6), '# Lyon')
+        
+        stats = cache.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['memory_entries']), (1, 4, 2))
+        self.assertAlmostEqual(stats['hit_ratio'], 0.2)
+        self.assertGreater(stats['memory_bytes'], 0)
+    
+    def test_version_and_ttl_invalidation(self):
+        """Test l'invalidation par écriture du graphe (version) et par durée de vie."""
+        cache = CachedGraphQueries(self.backend, self.version)
+        cache.find_entity('Paris')
+        self.builder.compute_metrics()
+        cache.find_entity('Paris')
+        self.assertEqual((cache.counters['misses'], cache.counters['invalidations']), (2, 1))
+        
+        expiring = CachedGraphQueries(self.backend, self.version, ttl=0.01)
+        expiring.find_entity('Paris')
+        time.sleep(0.02)
+        expiring.find_entity('Paris')
+        self.assertEqual(expiring.counters['misses'], 2)
+    
+    def test_disk_cache_shared(self):
+        """Test le partage du cache disque entre deux processus (deux instances) et son éviction."""
+        path = os.path.join(self.tmp.name, 'cache.sqlite')
+        worker1 = CachedGraphQueries(self.backend, self.version, disk=DiskCache(path, 1024 * 1024))
+        worker2 = CachedGraphQueries(self.backend, self.version, disk=DiskCache(path, 1024 * 1024))
+        expected = worker1.get_neighbors('Paris', 2, 5)
+        self.assertEqual(worker2.get_neighbors('Paris', 2, 5), expected)
+        self.assertEqual((worker2.counters['disk_hits'], worker2.counters['misses']), (1, 0))
+        
+        small = DiskCache(path, 1)
+        small.evict()
+        self.assertEqual(small.usage()['disk_entries'], 0)
+        for cache in (worker1, worker2):
+            cache.disk.close()
+        small.close()
+
+class TestSQLiteBackend(BackendContractTests, unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.db_path = os.path.join(cls.tmp.name, 'graph.sqlite')
+        builder = SQLiteGraphBuilder(cls.db_path)
+        cls.stats = builder.build_graph(*sample_corpus())
+        cls.summary = builder.compute_metrics()
+        builder.close()
+        cls.queries = SQLiteGraphQueries(cls.db_path)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.queries.close()
+        cls.tmp.cleanup()
+    
+    def test_wal_mode(self):
+        """Test que la base est en mode WAL (lecteurs concurrents)."""
+        mode = self.queries.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, 'wal')
+    
+    def test_build_from_entities_artifact_only(self):
+        """Test le chargement sans documents.json (texte repris de entities.json)."""
+        entities, relations, _ = sample_corpus()
+        path = os.path.join(self.tmp.name, 'artifacts.sqlite')
+        builder = SQLiteGraphBuilder(path)
+        stats = builder.build_graph(entities, relations)
+        builder.close()
+        self.assertEqual(stats, self.stats)
+
 if __name__ == '__main__':
     unittest.main()
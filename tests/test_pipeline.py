@@ -0,0 +1,184 @@
+# tests/test_pipeline.py
+
+import unittest
+import sys
+sys.path.append('.')
+
+from src.utils.manifest import PipelineManifest, document_hashes, file_hash
+from src.pipeline.runner import PipelineRunner, Stage
+from src.pipeline.stages import PipelineContext
+from src.utils.utf8_helpers import read_entities, read_relations, save_entities, save_relations, iter_json_utf8
+import numpy as np
+import json
+import os
+import tempfile
+
+class TestPipelineManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'manifest.json')
+
+    def test_plan_only_changed_documents(self):
+        """Test que seuls les documents nouveaux ou modifiés sont à retraiter."""
+        documents = [{'filename': 'a.txt', 'text': 'Paris'}, {'filename': 'b.txt', 'text': 'Lyon'}]
+        settings = {'model': 'fr_core_news_lg', 'entity_types': ('PERSON', 'GPE')}
+
+        manifest = PipelineManifest(self.path)
+        self.assertTrue(manifest.plan('extract', document_hashes(documents), settings)['full'])
+        manifest.record('extract', document_hashes(documents), settings)
+
+        documents = [{'filename': 'b.txt', 'text': 'Lyon, France'}, {'filename': 'c.txt', 'text': 'Nice'}]
+        plan = PipelineManifest(self.path).plan('extract', document_hashes(documents), settings)
+        self.assertEqual(plan, {'changed': ['b.txt', 'c.txt'], 'unchanged': [], 'removed': ['a.txt'], 'full': False})
+
+        plan = PipelineManifest(self.path).plan('extract', document_hashes(documents), dict(settings, model='autre'))
+        self.assertTrue(plan['full'])
+        self.assertEqual(plan['removed'], [])
+
+    def test_artifact_counts(self):
+        """Test la lecture des comptes d'artefacts sans relire les fichiers (invalidés s'ils changent)."""
+        artifact = os.path.join(self.tmp.name, 'entities.json')
+        with open(artifact, 'w', encoding='utf-8') as f:
+            json.dump([{'document_id': 'a.txt'}], f)
+
+        manifest = PipelineManifest(self.path)
+        manifest.record('extract', {'a.txt': file_hash(artifact)}, artifacts={artifact: 1})
+        self.assertEqual(PipelineManifest(self.path).artifact_count(artifact), 1)
+        self.assertIsNone(manifest.artifact_count(os.path.join(self.tmp.name, 'relations.json')))
+
+        with open(artifact, 'w', encoding='utf-8') as f:
+            json.dump([], f)
+        self.assertIsNone(PipelineManifest(self.path).artifact_count(artifact))
+
+class TestPipelineRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.manifest_path = os.path.join(self.tmp.name, 'manifest.json')
+        self.calls = []
+
+    def runner(self, fail=None, checkpoint=None):
+        def step(name, value):
+            def run(ctx, *inputs):
+                self.calls.append((name, inputs))
+                if name == fail:
+                    raise RuntimeError(name)
+                return value
+            return run
+
+        loads = {'prepare': lambda ctx: checkpoint}
+        stages = [
+            Stage('embeddings', step('embeddings', 'vecteurs'), requires=('extract',)),
+            Stage('prepare', step('prepare', ['doc']), load=loads['prepare']),
+            Stage('extract', step('extract', {'entities': []}), requires=('prepare',))
+        ]
+        context = PipelineContext(manifest=PipelineManifest(self.manifest_path), checkpoints=[])
+        return PipelineRunner(stages, context)
+
+    def test_dependency_order_and_memory_handoff(self):
+        """Test l'ordre des dépendances et le passage des sorties en mémoire."""
+        results = self.runner().run()
+        self.assertEqual([name for name, _ in self.calls], ['prepare', 'extract', 'embeddings'])
+        self.assertEqual(self.calls[1][1], (['doc'],))
+        self.assertEqual(self.calls[2][1], ({'entities': []},))
+        self.assertEqual(results['embeddings'], 'vecteurs')
+        with self.assertRaises(ValueError):
+            self.runner().resolve(['index'])
+
+    def test_resume_skips_completed_stages(self):
+        """Test la reprise après échec : les étapes terminées ne sont pas relancées."""
+        with self.assertRaises(RuntimeError):
+            self.runner(fail='extract', checkpoint=['doc']).run()
+        self.calls.clear()
+
+        self.runner(checkpoint=['doc']).run(resume=True)
+        self.assertEqual([name for name, _ in self.calls], ['extract', 'embeddings'])
+        self.assertEqual(self.calls[0][1], (['doc'],))
+        self.assertEqual(PipelineManifest(self.manifest_path).data['pipeline']['completed'], [])
+
+    def test_missing_checkpoint(self):
+        """Test qu'une étape requise non sélectionnée et sans point de reprise est signalée."""
+        with self.assertRaises(RuntimeError):
+            self.runner().run(['extract'])
+        self.runner(checkpoint=['doc']).run(['extract'])
+        self.assertEqual(self.calls[-1], ('extract', (['doc'],)))
+
+class TestColumnarArtifacts(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_entities_round_trip(self):
+        """Test l'aller-retour des entités sans recopier le texte des documents."""
+        text = "Napoléon quitte Paris pour Moscou. Napoléon"
+        entities = [
+            {'document_id': 'a.txt', 'text': text, 'entities': [
+                {'text': 'Napoléon', 'label': 'PERSON', 'start': 0, 'end': 8, 'doc_id': 'a.txt'},
+                {'text': 'Paris', 'label': 'GPE', 'start': 16, 'end': 21, 'doc_id': 'a.txt'},
+                {'text': 'Napoléon', 'label': 'PERSON', 'start': 35, 'end': 43, 'doc_id': 'a.txt'}]},
+            {'document_id': 'b.txt', 'text': '', 'entities': []},
+            {'document_id': 'c.txt', 'text': 'Paris', 'entities': [
+                {'text': 'Paris', 'label': 'GPE', 'start': 0, 'end': 5, 'doc_id': 'c.txt'}]}
+        ]
+        path = os.path.join(self.tmp.name, 'entities')
+        self.assertEqual(save_entities(entities, path), 3)
+
+        table = read_entities(path)
+        self.assertEqual(list(table), [{k: v for k, v in doc.items() if k != 'text'} for doc in entities])
+        self.assertIsInstance(table.columns['mention_entity'], np.memmap)
+        self.assertEqual(len(table.columns['entity_name']), 2)
+        self.assertEqual(table.mention_doc().tolist(), [0, 0, 0, 2])
+
+        documents = [{'filename': 'a.txt', 'text': text}, {'filename': 'c.txt', 'text': 'Paris'}]
+        self.assertEqual(read_entities(path, documents)[0], entities[0])
+
+    def test_relations_round_trip(self):
+        """Test l'aller-retour des relations (documents communs, distance nulle, documents d'origine)."""
+        relations = [
+            {'subject': 'napoléon', 'predicate': 'co_occurs_with', 'object': 'paris', 'method': 'cooccurrence',
+             'common_docs': ['a.txt', 'c.txt'], 'strength': 2},
+            {'subject': 'napoléon', 'predicate': 'near', 'object': 'paris', 'method': 'proximity',
+             'distance': 0, 'doc_id': 'a.txt', 'doc_ids': ['a.txt', 'c.txt']},
+            {'subject': 'Napoléon', 'predicate': 'quitte', 'object': 'Paris', 'method': 'dependency'}
+        ]
+        path = os.path.join(self.tmp.name, 'relations')
+        save_relations(relations, path, documents=['b.txt'])
+        table = read_relations(path)
+        self.assertEqual(list(table), relations)
+        self.assertEqual(table.document_ids, ['b.txt', 'a.txt', 'c.txt'])
+
+        save_relations([], path)
+        self.assertEqual(len(read_relations(path)), 0)
+
+    def test_document_relations_slices(self):
+        """Test la lecture des relations d'un document dans une table écrite dans l'ordre des documents."""
+        relations = [{'subject': s, 'predicate': 'voit', 'object': o, 'method': 'dependency', 'doc_id': doc_id}
+                     for s, o, doc_id in [('A', 'B', 'a.txt'), ('B', 'C', 'a.txt'), ('C', 'D', 'c.txt')]]
+        path = os.path.join(self.tmp.name, 'syntactic')
+        save_relations(relations, path, documents=['a.txt', 'b.txt', 'c.txt'])
+        table = read_relations(path)
+        self.assertEqual(table.document_relations('a.txt'), relations[:2])
+        self.assertEqual(table.document_relations('b.txt'), [])
+        self.assertEqual(table.document_relations('c.txt'), relations[2:])
+        self.assertEqual(table.document_relations('d.txt'), [])
+
+    def test_iter_json_matches_json_load(self):
+        """Test la lecture en flux d'un tableau JSON, quelle que soit la taille des blocs lus."""
+        path = os.path.join(self.tmp.name, 'array.json')
+        for text in ('[]', '  [ ]', '[1, 22, 333, -4.5e2]', '[{"a": [1, 2]} ,\n {"b": "x], é"}, [], "y"]'):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            for chunk_size in (1, 2, 3, 1 << 20):
+                self.assertEqual(list(iter_json_utf8(path, chunk_size=chunk_size)), json.loads(text))
+        for text in ('{}', '[1', '[{"a": 1}'):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            with self.assertRaises(json.JSONDecodeError):
+                list(iter_json_utf8(path, chunk_size=2))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,10 @@ import sys
 sys.path.append('.')
 
 from src.rag.context_builder import ContextBuilder
+from src.rag.graph_traverser import GraphTraverser
+from src.graph.memory_backend import CSRGraph, MemoryGraphQueries
+from src.graph.document_store import DocumentStore, write_document_store
+import tempfile
 
 class TestRAGPipeline(unittest.TestCase):
     
@@ -41,5 +45,53 @@ class TestRAGPipeline(unittest.TestCase):
         context = self.builder.build_context([], large_graph)
         self.assertLessEqual(len(context), 150)  # Avec marge pour le message de troncature
 
+class TestGraphTraverserMemoryBackend(unittest.TestCase):
+    
+    def setUp(self):
+        text = "# Paris\nParis est la capitale de la France."
+        graph = CSRGraph.from_rows(
+            entity_rows=[{'name': 'Paris', 'type': 'GPE'}, {'name': 'France', 'type': 'GPE'}],
+            mention_rows=[
+                {'entity_name': 'Paris', 'document_id': 'wiki_paris.txt', 'count': 2,
+                 'first_offset': 8, 'context': text},
+                {'entity_name': 'France', 'document_id': 'wiki_paris.txt', 'count': 1,
+                 'first_offset': 38, 'context': text}
+            ],
+            relation_rows=[{'subject': 'Paris', 'predicate': 'co_occurs_with', 'object': 'France',
+                            'props': {'method': 'cooccurrence', 'strength': 3}}],
+            documents=[{'id': 'wiki_paris.txt', 'title': 'Paris', 'num_chars': len(text)}]
+        )
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        write_document_store([{'filename': 'wiki_paris.txt', 'text': text}], tmp.name)
+        queries = MemoryGraphQueries(graph, DocumentStore(tmp.name))
+        self.addCleanup(queries.close)
+        self.traverser = GraphTraverser(queries)
+    
+    def test_traverse_from_entities(self):
+        """Test le parcours du graphe sur le backend en mémoire."""
+        context = self.traverser.traverse_from_entities(['Paris'], max_depth=2)
+        
+        self.assertEqual([e['name'] for e in context['entities']], ['Paris', 'France'])
+        self.assertEqual(context['relationships'][0]['type'], 'co_occurs_with')
+        self.assertEqual(context['relationships'][0]['strength'], 3)
+        self.assertIn('wiki_paris.txt', context['documents'])
+        self.assertEqual(context['contexts'][0]['entity'], 'Paris')
+    
+    def test_batched_traversal_matches_per_call(self):
+        """Test que le parcours groupé produit le même contexte que les appels successifs."""
+        batched = self.traverser.traverse_from_entities(['Paris', 'France', 'Berlin'], max_depth=2)
+        per_call = self.traverser.traverse_from_entities(['Paris', 'France', 'Berlin'], max_depth=2,
+                                                         batched=False)
+        self.assertEqual(batched, per_call)
+        self.assertEqual(batched['documents']['wiki_paris.txt']['text'], "# Paris\nParis est la capitale de la France.")
+    
+    def test_bounded_traversal_skips_hubs(self):
+        """Test que le parcours borné ne développe pas les types hubs au-delà du premier saut."""
+        traverser = GraphTraverser(self.traverser.graph, hub_limits={'fanout': 5, 'hub_types': ['GPE'],
+                                                                   'hub_degree': 1000})
+        context = traverser.traverse_from_entities(['Paris'], max_depth=2)
+        self.assertEqual([e['name'] for e in context['entities']], ['Paris', 'France'])
+
 if __name__ == '__main__':
     unittest.main()